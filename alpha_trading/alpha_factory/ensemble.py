@@ -0,0 +1,143 @@
+"""
+Layer 1: Alpha Factory - Ensemble helpers for the Daily Signal Generator
+
+Rolling IC cache, IC-based model weights and weighted combination of
+model signals, kept free of lab setup imports so they can be tested alone.
+"""
+from pathlib import Path
+from datetime import datetime
+
+import polars as pl
+
+
+IC_SCHEMA = {"datetime": pl.Datetime("us"), "model": pl.Utf8, "version": pl.Int64, "ic": pl.Float64}
+
+
+def get_file_version(*file_paths: Path) -> int:
+    """Version of model files, changed whenever any of them is rewritten"""
+    return max(path.stat().st_mtime_ns for path in file_paths if path.exists())
+
+
+def load_ic_cache(file_path: Path) -> pl.DataFrame:
+    """Load cached daily IC of every model"""
+    empty = pl.DataFrame(schema=IC_SCHEMA)
+
+    if not file_path.exists():
+        return empty
+
+    ic_df = pl.read_parquet(file_path)
+
+    # Caches written without model versions are scored again
+    if ic_df.columns != empty.columns:
+        return empty
+
+    return ic_df.cast(IC_SCHEMA)
+
+
+def save_ic_cache(file_path: Path, ic_df: pl.DataFrame, keep_start: datetime) -> None:
+    """Save daily IC cache, dropping records that fell out of the rolling window"""
+    ic_df = (
+        ic_df
+        .filter(pl.col("datetime") >= keep_start)
+        .unique(subset=["datetime", "model"], keep="last", maintain_order=True)
+        .sort(["model", "datetime"])
+    )
+    ic_df.write_parquet(file_path)
+
+
+def get_cached_ic(ic_cache: pl.DataFrame, model_name: str, version: int) -> pl.DataFrame:
+    """Cached daily IC of a model, records of other versions are ignored"""
+    return ic_cache.filter((pl.col("model") == model_name) & (pl.col("version") == version))
+
+
+def update_ic_cache(
+    ic_cache: pl.DataFrame,
+    model_name: str,
+    version: int,
+    ic_df: pl.DataFrame
+) -> pl.DataFrame:
+    """Append newly scored daily IC of a model, replacing records of its other versions"""
+    new_df = ic_df.select(
+        "datetime",
+        pl.lit(model_name).alias("model"),
+        pl.lit(version).alias("version"),
+        "ic"
+    ).cast(IC_SCHEMA)
+
+    kept_df = ic_cache.filter((pl.col("model") != model_name) | (pl.col("version") == version))
+    return pl.concat([kept_df, new_df])
+
+
+def get_uncached_days(cached_ic: pl.DataFrame, window_days: pl.Series) -> pl.Series:
+    """Days in the IC window without a cached IC"""
+    window_days = window_days.unique().sort()
+    return window_days.filter(~window_days.is_in(cached_ic["datetime"].implode()))
+
+
+def calculate_daily_ic(signal_df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Calculate daily rank IC between signal and label.
+
+    Days without a finite label (e.g. the most recent days whose forward
+    return is still unknown) are excluded, so they are scored again later.
+    """
+    return (
+        signal_df
+        .filter(pl.col("label").is_finite() & pl.col("signal").is_finite())
+        .group_by("datetime")
+        .agg(pl.corr("signal", "label", method="spearman").alias("ic"))
+        .filter(pl.col("ic").is_finite())
+        .sort("datetime")
+    )
+
+
+def calculate_weights(model_ics: dict[str, pl.Series]) -> dict[str, float]:
+    """
+    Weight each model by the absolute mean of its daily IC.
+
+    Models without IC get zero weight, equal weights are used when all
+    of them are zero.
+    """
+    model_weights = {}
+    for model_type, ics in model_ics.items():
+        ic = ics.mean() if not ics.is_empty() else 0.0
+        model_weights[model_type] = abs(ic)     # Use absolute IC for weighting
+
+    total_ic = sum(model_weights.values())
+    if total_ic > 0:
+        return {m: w / total_ic for m, w in model_weights.items()}
+
+    print("Warning: All model ICs are zero. Using equal weights.")
+    return {m: 1.0 / len(model_weights) for m in model_weights}
+
+
+def combine_signals(signals: dict[str, pl.DataFrame], model_weights: dict[str, float]) -> pl.DataFrame:
+    """
+    Combine the signal column of each model into one weighted signal.
+
+    Symbols missing from some models are kept, with the weights of the
+    models that do have a signal normalized to sum to one. Symbols only
+    signaled by zero-weight models are dropped.
+    """
+    merged_df = None
+    for model_type, df in signals.items():
+        df = df.select("datetime", "vt_symbol", pl.col("signal").alias(model_type))
+
+        if merged_df is None:
+            merged_df = df
+        else:
+            merged_df = merged_df.join(df, on=["datetime", "vt_symbol"], how="full", coalesce=True)
+
+    if merged_df is None:
+        return pl.DataFrame(schema={"datetime": pl.Datetime("us"), "vt_symbol": pl.Utf8, "signal": pl.Float64})
+
+    weights = {m: model_weights[m] for m in signals}
+
+    weighted_sum = pl.sum_horizontal([pl.col(m) * w for m, w in weights.items()])
+    weight_sum = pl.sum_horizontal([pl.col(m).is_not_null() * w for m, w in weights.items()])
+
+    return merged_df.select(
+        "datetime",
+        "vt_symbol",
+        pl.when(weight_sum > 0).then(weighted_sum / weight_sum).alias("signal")
+    ).filter(pl.col("signal").is_not_null()).sort(["datetime", "vt_symbol"])
@@ -7,127 +7,190 @@ Performs the final step of the Alpha Factory: Dynamic Ensemble.
 - Generates a weighted-average signal based on IC.
 - Saves the final signal for the portfolio manager.
 """
+from pathlib import Path
+from datetime import datetime
+
 import polars as pl
-import numpy as np
-from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
-import torch
 
 from vnpy.alpha.lab import AlphaLab
 from vnpy.alpha.dataset import AlphaDataset, Segment
 
 from alpha_trading.alpha_factory.setup_lab import LAB_NAME
 from alpha_trading.alpha_factory.dataset_generator import DATASET_NAME
+from alpha_trading.alpha_factory.ensemble import (
+    get_file_version,
+    load_ic_cache,
+    save_ic_cache,
+    get_cached_ic,
+    update_ic_cache,
+    get_uncached_days,
+    calculate_daily_ic,
+    calculate_weights,
+    combine_signals
+)
 
 # --- Configuration ---
 # The date for which to generate signals
 PREDICTION_DATE = datetime.now()
 # PREDICTION_DATE = datetime(2024, 2, 1) # For testing
 
-IC_CALCULATION_PERIOD = ("1m", "1-month") # vnpy period tuple for IC calculation
+IC_WINDOW_MONTHS = 2                    # Rolling window used for IC weighting
+IC_CACHE_NAME = "ensemble_ic.parquet"   # Daily IC cache, stored in the lab root
 FINAL_SIGNAL_NAME = "adaptive_ensemble"
 
+
+def scan_infer_frame(lab: AlphaLab, name: str) -> pl.LazyFrame | None:
+    """
+    Scan the inference frame of a stored dataset from a memory-mapped Arrow IPC file.
+
+    The pickled dataset is only unpickled when the IPC copy is missing or
+    older than the pickle, so daily runs never load the full dataset object.
+    """
+    pkl_path: Path = lab.dataset_path.joinpath(f"{name}.pkl")
+    ipc_path: Path = lab.dataset_path.joinpath(f"{name}.infer.arrow")
+
+    if not pkl_path.exists():
+        print(f"  Warning: Dataset {name} not found.")
+        return None
+
+    if not ipc_path.exists() or ipc_path.stat().st_mtime < pkl_path.stat().st_mtime:
+        print(f"  Exporting inference frame of {name} for memory mapping...")
+        dataset: AlphaDataset | None = lab.load_dataset(name)
+        if dataset is None:
+            return None
+
+        # Uncompressed IPC so that the file can be memory-mapped
+        dataset.infer_df.sort(["datetime", "vt_symbol"]).write_ipc(ipc_path, compression="uncompressed")
+
+    return pl.scan_ipc(ipc_path)
+
+
 def generate_ensemble_signal(prediction_date: datetime):
     """
     Orchestrates the daily signal generation and dynamic ensemble process.
     """
     print(f"--- Alpha Factory: Step 4: Dynamic Signal Generation for {prediction_date.date()} ---")
-    
+
     lab = AlphaLab(LAB_NAME)
-    
+
     # 1. Identify and load the latest set of trained models
     # Models are trained at month-end, so for any day in month M, use models from M-1.
     model_timestamp = (prediction_date - relativedelta(months=1)).strftime("%Y%m")
     model_types = ["mlp", "lgbm"] # Add "lasso" if it was trained
-    
+
     models = {}
+    model_names = {}
+    model_versions = {}
     print(f"Loading models for timestamp: {model_timestamp}")
     for m_type in model_types:
         model_name = f"{DATASET_NAME}_{m_type}_{model_timestamp}"
-        try:
-            models[m_type] = lab.load_model(model_name)
-            print(f"  Loaded {model_name}")
-        except FileNotFoundError:
+        model = lab.load_model(model_name)
+        if model is None:
             print(f"  Warning: Model {model_name} not found. Skipping.")
-    
+            continue
+
+        models[m_type] = model
+        model_names[m_type] = model_name
+
+        # Cached IC is invalidated when the model or its dataset is rewritten
+        model_versions[m_type] = get_file_version(
+            lab.model_path.joinpath(f"{model_name}.pkl"),
+            lab.dataset_path.joinpath(f"{DATASET_NAME}_{m_type}.pkl")
+        )
+        print(f"  Loaded {model_name}")
+
     if not models:
         print("Error: No models found. Cannot generate signals.")
         return
 
-    # 2. Calculate IC-based weights for the ensemble
-    model_weights = {}
-    print("Calculating dynamic weights based on recent IC...")
+    # 2. Score every model once over the uncached IC days plus the prediction day
+    ic_start_date = prediction_date - relativedelta(months=IC_WINDOW_MONTHS)
+    ic_cache_path = lab.lab_path.joinpath(IC_CACHE_NAME)
+    ic_cache = load_ic_cache(ic_cache_path)
+    today_signals: dict[str, pl.DataFrame] = {}
+    day_start = prediction_date.replace(hour=0, minute=0, second=0, microsecond=0)
 
+    print("Scoring models over uncached IC days and the prediction day...")
     for model_type, model in models.items():
-        dataset: AlphaDataset = lab.load_dataset(f"{DATASET_NAME}_{model_type}")
-
-        # Set the test_period to the last ~2 months to calculate performance
-        ic_start_date = prediction_date - relativedelta(months=2)
-        dataset.test_period = (ic_start_date.strftime("%Y-%m-%d"), prediction_date.strftime("%Y-%m-%d"))
+        infer_lf = scan_infer_frame(lab, f"{DATASET_NAME}_{model_type}")
+        if infer_lf is None:
+            continue
+
+        window_df = infer_lf.filter(
+            (pl.col("datetime") >= ic_start_date) & (pl.col("datetime") <= prediction_date)
+        ).collect()
+        if window_df.is_empty():
+            print(f"  Warning: No inference data for {model_type} in the IC window. Skipping.")
+            continue
+
+        # Only days without a cached IC need to be scored
+        model_name = model_names[model_type]
+        version = model_versions[model_type]
+        cached_ic = get_cached_ic(ic_cache, model_name, version)
+        missing_days = get_uncached_days(cached_ic, window_df["datetime"])
+
+        score_start: datetime = day_start
+        if not missing_days.is_empty():
+            score_start = min(score_start, missing_days.min())
+
+        # Wrap the memory-mapped frame for the model, without unpickling the dataset
+        dataset = AlphaDataset(
+            df=pl.DataFrame(),
+            train_period=("", ""),
+            valid_period=("", ""),
+            test_period=(score_start.strftime("%Y-%m-%d"), prediction_date.strftime("%Y-%m-%d"))
+        )
+        dataset.infer_df = window_df
+
+        signal_df = dataset.fetch_infer(Segment.TEST).select(["datetime", "vt_symbol", "label"])
+        signal_df = signal_df.with_columns(pl.Series("signal", model.predict(dataset, Segment.TEST)))
+
+        ic_df = calculate_daily_ic(signal_df.filter(pl.col("datetime") < day_start))
+        ic_cache = update_ic_cache(ic_cache, model_name, version, ic_df)
+
+        today_signals[model_type] = signal_df.filter(pl.col("datetime") >= day_start)
+        print(f"  {model_type.upper()}: scored {signal_df['datetime'].n_unique()} day(s)")
+
+    if not today_signals:
+        print("Error: Could not generate final signal.")
+        return
 
-        signal = model.predict(dataset, Segment.TEST)
+    # 3. Calculate IC-based weights for the ensemble from the rolling cache
+    save_ic_cache(ic_cache_path, ic_cache, ic_start_date)
 
-        # Use vnpy's built-in performance calculation
-        perf = dataset.get_signal_performance(signal, period=IC_CALCULATION_PERIOD[0])
+    model_ics = {}
+    print("Calculating dynamic weights based on recent IC...")
+    for model_type in today_signals:
+        ics = get_cached_ic(ic_cache, model_names[model_type], model_versions[model_type]).filter(
+            pl.col("datetime") >= ic_start_date
+        )["ic"]
+        model_ics[model_type] = ics
 
-        if perf is None or "ic" not in perf or perf["ic"].is_empty():
-            ic = 0.0
+        if ics.is_empty():
             print(f"  Could not calculate IC for {model_type}. Defaulting to 0.")
         else:
-            ic = perf["ic"].item()
-            print(f"  {model_type.upper()} IC ({IC_CALCULATION_PERIOD[1]}): {ic:.4f}")
+            print(f"  {model_type.upper()} IC ({IC_WINDOW_MONTHS}-month, {len(ics)} days): {ics.mean():.4f}")
 
-        model_weights[model_type] = abs(ic)  # Use absolute IC for weighting
-
-    # Normalize weights
-    total_ic = sum(model_weights.values())
-    if total_ic > 0:
-        model_weights = {m: w / total_ic for m, w in model_weights.items()}
-    else:
-        print("Warning: All model ICs are zero. Using equal weights.")
-        model_weights = {m: 1.0 / len(models) for m in models.keys()}
+    model_weights = calculate_weights(model_ics)
 
     print("Ensemble Weights:")
     for m, w in model_weights.items():
         print(f"  - {m.upper()}: {w:.2%}")
 
-    # 3. Generate final ensembled signal for the prediction date
-    final_signal_df = None
-    
+    # 4. Combine all model signals for the prediction date, keeping symbols missing from some models
     print("Generating final ensembled signal...")
-    for model_type, model in models.items():
-        dataset: AlphaDataset = lab.load_dataset(f"{DATASET_NAME}_{model_type}")
-
-        # Set test_period to the single day
-        dataset.test_period = (prediction_date.strftime("%Y-%m-%d"), prediction_date.strftime("%Y-%m-%d"))
-
-        # Generate signal for the specific date
-        signal_array = model.predict(dataset, Segment.TEST)
-        signal_df = dataset.fetch_predict(Segment.TEST)
-        signal_df = signal_df.with_columns(pl.Series("signal", signal_array))
-
-        # Weight the signal
-        weighted_signal = signal_df["signal"] * model_weights[model_type]
-        
-        if final_signal_df is None:
-            final_signal_df = signal_df.select(["datetime", "vt_symbol"])
-            final_signal_df = final_signal_df.with_columns(weighted_signal.alias("final_signal"))
-        else:
-            final_signal_df = final_signal_df.with_columns(
-                pl.col("final_signal") + weighted_signal
-            )
-
-    # 4. Save the final signal
-    if final_signal_df is not None:
-        # Rename column for consistency
-        final_signal_df = final_signal_df.rename({"final_signal": "signal"})
-        
-        lab.save_signal(FINAL_SIGNAL_NAME, final_signal_df)
-        print(f"
-Successfully saved final signal '{FINAL_SIGNAL_NAME}'.")
-        print(final_signal_df.head())
-    else:
+    final_signal_df = combine_signals(today_signals, model_weights)
+
+    # 5. Save the final signal
+    if final_signal_df.is_empty():
         print("Error: Could not generate final signal.")
+        return
+
+    lab.save_signal(FINAL_SIGNAL_NAME, final_signal_df)
+    print(f"\nSuccessfully saved final signal '{FINAL_SIGNAL_NAME}'.")
+    print(final_signal_df.head())
+
 
 if __name__ == "__main__":
     generate_ensemble_signal(PREDICTION_DATE)
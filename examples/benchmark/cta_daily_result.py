@@ -0,0 +1,98 @@
+"""
+Microbenchmark of CTA backtesting daily result calculation.
+
+Compares the object-based calculate_result (DailyResult.calculate_pnl
+per day and DataFrame assembled from object attributes) with the
+vectorized path, on a few years of daily closes and a dense trade log.
+Both are followed by calculate_statistics as in optimization runs.
+"""
+import random
+from copy import copy
+from datetime import date, datetime, timedelta
+from time import perf_counter
+
+from vnpy.trader.constant import Direction, Exchange, Interval, Offset
+from vnpy.trader.object import TradeData
+from vnpy_ctastrategy.backtesting import BacktestingEngine, DailyResult
+
+
+DAY_COUNT: int = 1_000
+TRADES_PER_DAY: int = 20
+REPEAT: int = 20
+
+
+def create_engine(vectorized: bool) -> BacktestingEngine:
+    """Create engine with daily closes and trades filled in"""
+    rng: random.Random = random.Random(42)
+
+    engine: BacktestingEngine = BacktestingEngine()
+    engine.output = lambda msg: None
+    engine.set_parameters(
+        vt_symbol="rb2501.SHFE",
+        interval=Interval.MINUTE,
+        start=datetime(2020, 1, 1),
+        rate=0.0001,
+        slippage=1,
+        size=10,
+        pricetick=1,
+        capital=1_000_000,
+        vectorized=vectorized
+    )
+
+    price: float = 3000
+    start: date = date(2020, 1, 1)
+
+    for i in range(DAY_COUNT):
+        d: date = start + timedelta(days=i)
+        price += rng.gauss(0, 20)
+        engine.daily_results[d] = DailyResult(d, price)
+
+        for _ in range(TRADES_PER_DAY):
+            engine.trade_count += 1
+            trade: TradeData = TradeData(
+                symbol="rb2501",
+                exchange=Exchange.SHFE,
+                orderid=str(engine.trade_count),
+                tradeid=str(engine.trade_count),
+                direction=rng.choice([Direction.LONG, Direction.SHORT]),
+                offset=Offset.OPEN,
+                price=price + rng.gauss(0, 5),
+                volume=rng.randint(1, 5),
+                datetime=datetime(d.year, d.month, d.day, 10),
+                gateway_name="BACKTESTING"
+            )
+            engine.trades[trade.vt_tradeid] = trade
+
+    return engine
+
+
+def run(vectorized: bool) -> float:
+    """Run result and statistics calculation on fresh copies of daily results"""
+    engine: BacktestingEngine = create_engine(vectorized)
+    daily_results: dict[date, DailyResult] = engine.daily_results
+    cost: float = 0
+
+    for _ in range(REPEAT):
+        engine.daily_results = {d: copy(r) for d, r in daily_results.items()}
+        for daily_result in engine.daily_results.values():
+            daily_result.trades = []
+
+        start: float = perf_counter()
+        engine.calculate_result()
+        engine.calculate_statistics(output=False)
+        cost += perf_counter() - start
+
+    return cost / REPEAT
+
+
+def main() -> None:
+    """"""
+    print(f"{DAY_COUNT} days, {DAY_COUNT * TRADES_PER_DAY} trades")
+
+    for name, vectorized in [("object", False), ("vectorized", True)]:
+        cost: float = run(vectorized)
+        print(f"{name:>10}: {cost * 1000:.1f}ms per calculation")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark of bar data import from csv file in DataManager.
+
+Compares row-by-row parsing with csv.DictReader and strptime (previous
+logic) with chunked vectorized parsing, for a minute bar csv file. The
+database only counts saved rows, so that parsing cost is measured.
+"""
+import csv
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from time import perf_counter
+
+import polars as pl
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData
+from vnpy.trader.utility import ZoneInfo
+from vnpy_datamanager.engine import ManagerEngine
+
+
+ROW_COUNT: int = 1_000_000
+START: datetime = datetime(2020, 1, 2, 9)
+DATETIME_FORMAT: str = "%Y-%m-%d %H:%M:%S"
+
+
+class CountingDatabase:
+    """Database only counting saved rows"""
+
+    def __init__(self) -> None:
+        """"""
+        self.count: int = 0
+
+    def save_bar_data(self, bars: list[BarData], stream: bool = False) -> bool:
+        """"""
+        self.count += len(bars)
+        return True
+
+    def save_bar_df(
+        self,
+        df: pl.DataFrame,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        stream: bool = False
+    ) -> bool:
+        """"""
+        self.count += df.height
+        return True
+
+
+def write_csv(file_path: Path) -> None:
+    """Write minute bars into csv file"""
+    pl.DataFrame({
+        "datetime": pl.datetime_range(START, START + timedelta(minutes=ROW_COUNT - 1), "1m", eager=True),
+        "open": [3000.0 + i % 100 for i in range(ROW_COUNT)],
+        "high": [3002.0 + i % 100 for i in range(ROW_COUNT)],
+        "low": [2998.0 + i % 100 for i in range(ROW_COUNT)],
+        "close": [3001.0 + i % 100 for i in range(ROW_COUNT)],
+        "volume": [float(i % 1000) for i in range(ROW_COUNT)],
+        "open_interest": [float(i) for i in range(ROW_COUNT)],
+    }).write_csv(file_path, datetime_format=DATETIME_FORMAT)
+
+
+def import_rows(file_path: Path, database: CountingDatabase) -> None:
+    """Previous row-by-row import"""
+    with open(file_path) as f:
+        buf: list = [line.replace("\0", "") for line in f]
+
+    reader: csv.DictReader = csv.DictReader(buf, delimiter=",")
+    tz: ZoneInfo = ZoneInfo("Asia/Shanghai")
+    bars: list[BarData] = []
+
+    for item in reader:
+        dt: datetime = datetime.strptime(item["datetime"], DATETIME_FORMAT).replace(tzinfo=tz)
+
+        bar: BarData = BarData(
+            symbol="rb2405",
+            exchange=Exchange.SHFE,
+            datetime=dt,
+            interval=Interval.MINUTE,
+            volume=float(item["volume"]),
+            open_price=float(item["open"]),
+            high_price=float(item["high"]),
+            low_price=float(item["low"]),
+            close_price=float(item["close"]),
+            turnover=float(item.get("turnover", 0)),
+            open_interest=float(item.get("open_interest", 0)),
+            gateway_name="DB",
+        )
+        bars.append(bar)
+
+    database.save_bar_data(bars)
+
+
+def import_chunks(file_path: Path, database: CountingDatabase) -> None:
+    """Chunked vectorized import"""
+    engine: ManagerEngine = ManagerEngine.__new__(ManagerEngine)
+    engine.database = database
+
+    engine.import_data_from_csv(
+        str(file_path), "rb2405", Exchange.SHFE, Interval.MINUTE, "Asia/Shanghai",
+        "datetime", "open", "high", "low", "close", "volume", "turnover", "open_interest",
+        DATETIME_FORMAT
+    )
+
+
+def main() -> None:
+    """Run benchmark"""
+    with tempfile.TemporaryDirectory() as folder:
+        file_path: Path = Path(folder).joinpath("bars.csv")
+        write_csv(file_path)
+
+        for name, func in [("row-by-row", import_rows), ("chunked", import_chunks)]:
+            database: CountingDatabase = CountingDatabase()
+
+            start: float = perf_counter()
+            func(file_path, database)
+            cost: float = perf_counter() - start
+
+            print(f"{name}: {database.count} rows, {cost:.2f}s, {database.count / cost:,.0f} rows per second")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Microbenchmark of content search in vnag file tools.
+
+Searches a generated tree of source files with the previous search_content
+(walk the tree, detect encoding with chardet and read every file for every
+query) and with the persistent trigram index, cold, warm and after a few
+files are changed.
+"""
+import random
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from vnag.tools import file_tools
+from vnag.tools.file_tools import ContentIndex, _get_encoding, search_content
+
+
+FILE_COUNT: int = 1000
+LINE_COUNT: int = 200
+CHANGED_COUNT: int = 10
+
+QUERIES: list[tuple[str, bool]] = [
+    ("self.atr_value", False),
+    ("boll_window = 18", False),
+    (r"def on_\w+_bar\(self", True),
+]
+
+WORDS: list[str] = [
+    "self", "bar", "tick", "price", "volume", "atr", "boll", "window", "value",
+    "pos", "order", "trade", "fixed", "size", "long", "short", "stop", "entry",
+]
+
+
+def create_tree(root: Path) -> None:
+    """Create source files of random python-like lines"""
+    rng: random.Random = random.Random(7)
+
+    for i in range(FILE_COUNT):
+        lines: list[str] = [f"class Strategy{i}:"]
+
+        for _ in range(LINE_COUNT):
+            words: list[str] = rng.sample(WORDS, 3)
+            lines.append(f"    {words[0]}.{words[1]}_{words[2]} = {rng.randint(0, 100)}")
+
+        if i % 100 == 0:
+            lines.append("    def on_15min_bar(self, bar):")
+            lines.append("        self.atr_value = 0")
+
+        folder: Path = root.joinpath(f"package{i % 20}")
+        folder.mkdir(exist_ok=True)
+        folder.joinpath(f"strategy{i}.py").write_text("\n".join(lines), encoding="utf-8")
+
+
+def legacy_search(path: str, content: str) -> list[Path]:
+    """Previous search_content"""
+    files: list[Path] = []
+
+    for file in Path(path).resolve().rglob("**/*"):
+        if file.is_file() and content in file.read_text(encoding=_get_encoding(file)):
+            files.append(file)
+
+    return files
+
+
+def run_queries(root: Path) -> tuple[float, int]:
+    """Return time and matched line count of all queries"""
+    start: float = perf_counter()
+    count: int = 0
+
+    for content, regex in QUERIES:
+        count += len(search_content(str(root), content, regex).splitlines()) - 1
+
+    return perf_counter() - start, count
+
+
+def main() -> None:
+    """"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root: Path = Path(temp_dir).joinpath("repo")
+        root.mkdir()
+        create_tree(root)
+
+        file_tools.ALL_READ_PATHS = {root}
+        file_tools._content_index = ContentIndex(Path(temp_dir).joinpath("index.db"))
+
+        print(f"{FILE_COUNT} files of {LINE_COUNT} lines, {len(QUERIES)} queries")
+
+        start: float = perf_counter()
+        count: int = 0
+        for content, regex in QUERIES:
+            if not regex:
+                count += len(legacy_search(str(root), content))
+        print(f"   legacy: {perf_counter() - start:.2f}s, {count} files (literal queries only)")
+
+        cost, count = run_queries(root)
+        print(f"     cold: {cost:.2f}s, {count} lines")
+
+        cost, count = run_queries(root)
+        print(f"     warm: {cost:.2f}s, {count} lines")
+
+        for file in list(root.rglob("*.py"))[:CHANGED_COUNT]:
+            file.write_text(file.read_text() + "\n# changed", encoding="utf-8")
+
+        cost, count = run_queries(root)
+        print(f"  changed: {cost:.2f}s, {count} lines, {CHANGED_COUNT} files changed")
+
+        # Reload index from database as in a new process
+        file_tools._content_index.connection.close()
+        start = perf_counter()
+        file_tools._content_index = ContentIndex(Path(temp_dir).joinpath("index.db"))
+        load_cost: float = perf_counter() - start
+
+        cost, count = run_queries(root)
+        print(f" reloaded: {load_cost + cost:.2f}s, {count} lines, including index loading")
+
+        file_tools._content_index.connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Microbenchmark of history data caching in backtesting loaders.
+
+Loads a sequence of distinct monthly bar ranges, as a long-lived
+backtester session does, and compares memory held by the previous
+lru_cache(maxsize=999) with the byte-bounded HistoryCache, then times
+reloading an evicted range from the spilled columnar file (including
+spilling the entry it evicts in turn) against creating the objects.
+"""
+import gc
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from time import perf_counter
+
+from vnpy.trader.cache import HistoryCache, estimate_size
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData
+from vnpy.trader.utility import ZoneInfo
+
+
+RANGE_COUNT: int = 40
+BARS_PER_RANGE: int = 20_000
+CACHE_SIZE: int = 64 * 1024 * 1024
+
+START: datetime = datetime(2020, 1, 1, tzinfo=ZoneInfo("Asia/Shanghai"))
+
+
+def load_range(ix: int) -> list[BarData]:
+    """Create bars of one range, standing in for a database query"""
+    start: datetime = START + timedelta(days=30 * ix)
+
+    return [
+        BarData(
+            symbol="rb2501",
+            exchange=Exchange.SHFE,
+            datetime=start + timedelta(minutes=i),
+            interval=Interval.MINUTE,
+            open_price=3000.0 + i,
+            high_price=3001.0 + i,
+            low_price=2999.0 + i,
+            close_price=3000.5 + i,
+            volume=float(i),
+            gateway_name="DB"
+        )
+        for i in range(BARS_PER_RANGE)
+    ]
+
+
+def measure(name: str, func) -> None:
+    """Print memory still held after loading all ranges"""
+    gc.collect()
+    tracemalloc.start()
+
+    for ix in range(RANGE_COUNT):
+        func(ix)
+
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:>14}: {current / 1024 / 1024:.0f}MB held after {RANGE_COUNT} ranges")
+
+
+def main() -> None:
+    """"""
+    size: int = estimate_size(load_range(0))
+    print(f"{BARS_PER_RANGE} bars per range, estimated {size / 1024 / 1024:.1f}MB each")
+
+    measure("lru_cache", lru_cache(maxsize=999)(load_range))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache: HistoryCache = HistoryCache(CACHE_SIZE, 1024 * 1024 * 1024, Path(temp_dir))
+        measure("HistoryCache", lambda ix: cache.get(ix, lambda: load_range(ix)))
+        print(cache.get_stats())
+
+        start: float = perf_counter()
+        load_range(0)
+        print(f"{'query':>14}: {(perf_counter() - start) * 1000:.0f}ms per range")
+
+        start = perf_counter()
+        cache.get(0, lambda: load_range(0))
+        print(f"{'disk reload':>14}: {(perf_counter() - start) * 1000:.0f}ms per range")
+
+
+if __name__ == "__main__":
+    main()
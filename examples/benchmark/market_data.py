@@ -0,0 +1,103 @@
+"""
+Benchmark of memory usage and construction time of market data objects.
+
+Compares regular tick and bar data classes with the opt-in compact
+slotted classes, and the struct-of-arrays TickBatch for bulk storage.
+"""
+import gc
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import TickData, BarData, CompactTickData, CompactBarData, TickBatch
+
+
+COUNT: int = 200_000
+SYMBOLS: list[str] = [f"rb{2401 + i}" for i in range(10)]
+START: datetime = datetime(2024, 1, 2, 9)
+
+
+def create_ticks(tick_class: type) -> list:
+    """Create ticks of several contracts"""
+    ticks: list = []
+
+    for i in range(COUNT):
+        price: float = 3000 + i % 100
+        tick = tick_class(
+            symbol=SYMBOLS[i % len(SYMBOLS)],
+            exchange=Exchange.SHFE,
+            datetime=START + timedelta(milliseconds=500 * i),
+            volume=i,
+            last_price=price,
+            bid_price_1=price - 1,
+            ask_price_1=price + 1,
+            bid_volume_1=10,
+            ask_volume_1=10,
+            gateway_name="BENCHMARK"
+        )
+        ticks.append(tick)
+
+    return ticks
+
+
+def create_bars(bar_class: type) -> list:
+    """Create minute bars of several contracts"""
+    bars: list = []
+
+    for i in range(COUNT):
+        price: float = 3000 + i % 100
+        bar = bar_class(
+            symbol=SYMBOLS[i % len(SYMBOLS)],
+            exchange=Exchange.SHFE,
+            datetime=START + timedelta(minutes=i),
+            interval=Interval.MINUTE,
+            volume=i,
+            open_price=price,
+            high_price=price + 2,
+            low_price=price - 2,
+            close_price=price + 1,
+            gateway_name="BENCHMARK"
+        )
+        bars.append(bar)
+
+    return bars
+
+
+def measure(func: Callable[[], object]) -> tuple[float, float]:
+    """Return construction time and allocated bytes per object"""
+    gc.collect()
+    start: float = perf_counter()
+    func()
+    cost: float = perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    size: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+
+    return cost / COUNT * 1e6, size / COUNT
+
+
+def main() -> None:
+    """Run benchmark"""
+    ticks: list[TickData] = create_ticks(TickData)
+
+    cases: list[tuple[str, Callable[[], object]]] = [
+        ("TickData", lambda: create_ticks(TickData)),
+        ("CompactTickData", lambda: create_ticks(CompactTickData)),
+        ("TickBatch", lambda: TickBatch.from_ticks(ticks)),
+        ("BarData", lambda: create_bars(BarData)),
+        ("CompactBarData", lambda: create_bars(CompactBarData)),
+    ]
+
+    for name, func in cases:
+        cost, size = measure(func)
+        print(f"{name}: {cost:.2f}us per object, {size:.0f} bytes per object")
+
+
+if __name__ == "__main__":
+    main()
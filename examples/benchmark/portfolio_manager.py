@@ -0,0 +1,162 @@
+"""
+Microbenchmark of portfolio manager PnL refresh on timer.
+
+Compares recalculating all contract results and putting one event per
+contract and portfolio (the previous PortfolioEngine logic) with dirty
+tracking and one batched snapshot, with 5k (reference, symbol) pairs
+of which only a few symbols tick between timer refreshes.
+"""
+import random
+from datetime import datetime
+from time import perf_counter
+
+from vnpy.event import Event, EventEngine
+from vnpy.trader.constant import Exchange, Product
+from vnpy.trader.event import EVENT_TICK
+from vnpy.trader.object import ContractData, TickData
+from vnpy_portfoliomanager.engine import PortfolioEngine
+
+
+REFERENCE_COUNT: int = 50
+SYMBOL_COUNT: int = 100
+TICKING_COUNT: int = 20
+REFRESH_COUNT: int = 200
+
+# Events put by the previous logic for each row
+EVENT_PM_CONTRACT = "ePmContract"
+EVENT_PM_PORTFOLIO = "ePmPortfolio"
+
+
+class FakeMainEngine:
+    """Main engine providing latest ticks and contracts"""
+
+    def __init__(self) -> None:
+        """"""
+        self.ticks: dict[str, TickData] = {}
+        self.contracts: dict[str, ContractData] = {}
+
+    def get_tick(self, vt_symbol: str) -> TickData | None:
+        """"""
+        return self.ticks.get(vt_symbol, None)
+
+    def get_contract(self, vt_symbol: str) -> ContractData | None:
+        """"""
+        return self.contracts.get(vt_symbol, None)
+
+
+class CountingEventEngine(EventEngine):
+    """Event engine counting events put instead of processing"""
+
+    def __init__(self) -> None:
+        """"""
+        super().__init__()
+        self.count: int = 0
+
+    def put(self, event: Event) -> None:
+        """"""
+        self.count += 1
+
+
+class BenchmarkEngine(PortfolioEngine):
+    """Portfolio engine without setting and data files"""
+
+    def load_setting(self) -> None:
+        """"""
+        pass
+
+    def load_data(self) -> None:
+        """"""
+        for i in range(REFERENCE_COUNT):
+            for j in range(SYMBOL_COUNT):
+                self.add_contract_result(f"strategy{i}", f"symbol{j}.LOCAL", 1)
+
+    def load_order(self) -> None:
+        """"""
+        pass
+
+    def refresh_all(self) -> None:
+        """Recalculate all results and put one event per row"""
+        for portfolio_result in self.portfolio_results.values():
+            portfolio_result.trading_pnl = 0
+            portfolio_result.holding_pnl = 0
+            portfolio_result.total_pnl = 0
+
+        for contract_result in self.contract_results.values():
+            contract_result.calculate_pnl()
+
+            portfolio_result = self.get_portfolio_result(contract_result.reference)
+            portfolio_result.trading_pnl += contract_result.trading_pnl
+            portfolio_result.holding_pnl += contract_result.holding_pnl
+            portfolio_result.total_pnl += contract_result.total_pnl
+
+            self.event_engine.put(Event(EVENT_PM_CONTRACT, contract_result.get_data()))
+
+        for portfolio_result in self.portfolio_results.values():
+            self.event_engine.put(Event(EVENT_PM_PORTFOLIO, portfolio_result.get_data()))
+
+
+def create_engine() -> BenchmarkEngine:
+    """Create engine with contracts and initial ticks of all symbols"""
+    main_engine: FakeMainEngine = FakeMainEngine()
+
+    for j in range(SYMBOL_COUNT):
+        main_engine.contracts[f"symbol{j}.LOCAL"] = ContractData(
+            symbol=f"symbol{j}",
+            exchange=Exchange.LOCAL,
+            name=f"symbol{j}",
+            product=Product.FUTURES,
+            size=10,
+            pricetick=1,
+            gateway_name="BENCHMARK"
+        )
+        main_engine.ticks[f"symbol{j}.LOCAL"] = create_tick(j, 100)
+
+    return BenchmarkEngine(main_engine, CountingEventEngine())
+
+
+def create_tick(j: int, last_price: float) -> TickData:
+    """"""
+    return TickData(
+        symbol=f"symbol{j}",
+        exchange=Exchange.LOCAL,
+        datetime=datetime.now(),
+        last_price=last_price,
+        pre_close=100,
+        gateway_name="BENCHMARK"
+    )
+
+
+def run(engine: BenchmarkEngine, incremental: bool) -> tuple[float, int]:
+    """Run timer refreshes with a few symbols ticking in between"""
+    rng: random.Random = random.Random(42)
+    engine.publish_snapshot()
+    engine.event_engine.count = 0
+
+    start: float = perf_counter()
+
+    for _ in range(REFRESH_COUNT):
+        for j in rng.sample(range(SYMBOL_COUNT), TICKING_COUNT):
+            tick: TickData = create_tick(j, 100 + rng.randint(-10, 10))
+            engine.main_engine.ticks[tick.vt_symbol] = tick
+            engine.process_tick_event(Event(EVENT_TICK, tick))
+
+        if incremental:
+            engine.publish_snapshot()
+        else:
+            engine.refresh_all()
+
+    return perf_counter() - start, engine.event_engine.count
+
+
+def main() -> None:
+    """"""
+    pairs: int = REFERENCE_COUNT * SYMBOL_COUNT
+    print(f"{pairs} contract results, {TICKING_COUNT} of {SYMBOL_COUNT} symbols ticking per refresh")
+
+    for name, incremental in [("full refresh", False), ("incremental", True)]:
+        cost, count = run(create_engine(), incremental)
+        print(f"{name:>14}: {cost / REFRESH_COUNT * 1000:.2f}ms and {count / REFRESH_COUNT:.0f} events per refresh")
+
+
+if __name__ == "__main__":
+    main()
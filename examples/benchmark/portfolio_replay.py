@@ -0,0 +1,144 @@
+"""
+Microbenchmark of multi-symbol replay in portfolio strategy backtesting.
+
+Runs a strategy keeping a few resting orders per bar over minute bars of
+many symbols with missing bars, and compares load plus replay time and
+memory held by the history data in the dict based mode with the panel
+mode. Database loading is replaced by pre-generated bars.
+"""
+import gc
+import random
+import tracemalloc
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData
+from vnpy_portfoliostrategy import StrategyTemplate, backtesting
+from vnpy_portfoliostrategy.backtesting import BacktestingEngine
+
+
+SYMBOL_COUNT: int = 100
+DAY_COUNT: int = 20
+BARS_PER_DAY: int = 240
+MISSING_RATIO: float = 0.1
+
+START: datetime = datetime(2024, 1, 1, 9)
+
+
+class RestingStrategy(StrategyTemplate):
+    """Keep a few far away orders resting to be checked on every bar"""
+
+    def on_init(self) -> None:
+        """"""
+        self.load_bars(1)
+
+    def on_bars(self, bars: dict[str, BarData]) -> None:
+        """"""
+        if not self.trading or self.active_orderids:
+            return
+
+        for vt_symbol in self.vt_symbols[:10]:
+            bar: BarData | None = bars.get(vt_symbol, None)
+            if bar:
+                self.buy(vt_symbol, bar.close_price / 2, 1)
+
+
+def create_history() -> dict[str, list[BarData]]:
+    """"""
+    rng: random.Random = random.Random(3)
+    history: dict[str, list[BarData]] = {}
+
+    for i in range(SYMBOL_COUNT):
+        symbol: str = f"s{i:03d}"
+        price: float = 100
+        bars: list[BarData] = []
+
+        for day in range(DAY_COUNT):
+            for minute in range(BARS_PER_DAY):
+                if rng.random() < MISSING_RATIO:
+                    continue
+
+                price += rng.gauss(0, 0.1)
+                bars.append(BarData(
+                    symbol=symbol,
+                    exchange=Exchange.SSE,
+                    datetime=START + timedelta(days=day, minutes=minute),
+                    interval=Interval.MINUTE,
+                    open_price=price,
+                    high_price=price + 0.1,
+                    low_price=price - 0.1,
+                    close_price=price,
+                    volume=100,
+                    gateway_name="DB"
+                ))
+
+        history[f"{symbol}.SSE"] = bars
+
+    return history
+
+
+def run(panel: bool) -> None:
+    """Print time and memory of loading data and running backtesting"""
+    vt_symbols: list[str] = list(history)
+
+    engine: BacktestingEngine = BacktestingEngine()
+    engine.output = lambda msg: None
+    engine.set_parameters(
+        vt_symbols=vt_symbols,
+        interval=Interval.MINUTE,
+        start=START,
+        end=START + timedelta(days=DAY_COUNT),
+        rates={vt_symbol: 0 for vt_symbol in vt_symbols},
+        slippages={vt_symbol: 0 for vt_symbol in vt_symbols},
+        sizes={vt_symbol: 1 for vt_symbol in vt_symbols},
+        priceticks={vt_symbol: 0.01 for vt_symbol in vt_symbols},
+        capital=1_000_000,
+        panel=panel
+    )
+    engine.add_strategy(RestingStrategy, {})
+
+    start: float = perf_counter()
+    engine.load_data()
+    load_cost: float = perf_counter() - start
+
+    # Load again with memory tracing, which slows down allocation heavy code
+    gc.collect()
+    tracemalloc.start()
+    engine.load_data()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = perf_counter()
+    engine.run_backtesting()
+    run_cost: float = perf_counter() - start
+
+    name: str = "panel" if panel else "dict"
+    print(
+        f"{name:>5}: load {load_cost:.2f}s, replay {run_cost:.2f}s, "
+        f"history data {current / 1024 / 1024:.0f}MB, {len(engine.daily_results)} days"
+    )
+
+
+history: dict[str, list[BarData]] = {}
+
+
+def load_bar_data(vt_symbol: str, interval: Interval, start: datetime, end: datetime) -> list[BarData]:
+    """"""
+    return [bar for bar in history[vt_symbol] if start <= bar.datetime <= end]
+
+
+def main() -> None:
+    """"""
+    history.update(create_history())
+    backtesting.load_bar_data = load_bar_data
+
+    bar_count: int = sum(len(bars) for bars in history.values())
+    print(f"{SYMBOL_COUNT} symbols, {bar_count} bars")
+
+    for panel in [False, True]:
+        run(panel)
+
+
+if __name__ == "__main__":
+    main()
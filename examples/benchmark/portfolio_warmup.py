@@ -0,0 +1,158 @@
+"""
+Microbenchmark of portfolio strategy warm-up in the live StrategyEngine.
+
+Initializes two strategies over 300 stocks with 200 shared, each symbol
+query taking a fixed latency as a datafeed request does, and compares
+the previous serial load_bars (one query per symbol and strategy, then
+replay through a (datetime, vt_symbol) dict) with concurrent loading,
+history shared between strategies and aligned replay.
+"""
+import random
+from datetime import datetime, timedelta
+from time import perf_counter, sleep
+
+from vnpy.event import EventEngine
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import DB_TZ
+from vnpy.trader.engine import MainEngine
+from vnpy.trader.object import BarData
+from vnpy_portfoliostrategy import StrategyEngine, StrategyTemplate
+
+
+SYMBOL_COUNT: int = 300
+SHARED_COUNT: int = 200
+DAYS: int = 250
+QUERY_LATENCY: float = 0.02
+
+END: datetime = datetime.now(DB_TZ).replace(hour=15, minute=0, second=0, microsecond=0)
+
+
+class WarmupStrategy(StrategyTemplate):
+    """Strategy counting bars pushed on init"""
+
+    def on_init(self) -> None:
+        """"""
+        self.count: int = 0
+        self.load_bars(DAYS, Interval.DAILY)
+
+    def on_bars(self, bars: dict[str, BarData]) -> None:
+        """"""
+        self.count += len(bars)
+
+
+class BenchmarkEngine(StrategyEngine):
+    """Strategy engine with generated history and query latency"""
+
+    def load_bar(self, vt_symbol: str, days: int, interval: Interval) -> list[BarData]:
+        """"""
+        sleep(QUERY_LATENCY)
+        return history[vt_symbol]
+
+
+class SerialEngine(BenchmarkEngine):
+    """Strategy engine with previous load_bars"""
+
+    def load_bars(self, strategy: StrategyTemplate, days: int, interval: Interval) -> None:
+        """"""
+        vt_symbols: list = strategy.vt_symbols
+        dts_set: set[datetime] = set()
+        history_data: dict[tuple, BarData] = {}
+
+        for vt_symbol in vt_symbols:
+            for bar in self.load_bar(vt_symbol, days, interval):
+                dts_set.add(bar.datetime)
+                history_data[(bar.datetime, vt_symbol)] = bar
+
+        bars: dict = {}
+
+        for dt in sorted(dts_set):
+            for vt_symbol in vt_symbols:
+                bar: BarData | None = history_data.get((dt, vt_symbol), None)
+
+                if bar:
+                    bars[vt_symbol] = bar
+                elif vt_symbol in bars:
+                    old_bar: BarData = bars[vt_symbol]
+                    bars[vt_symbol] = BarData(
+                        symbol=old_bar.symbol,
+                        exchange=old_bar.exchange,
+                        datetime=dt,
+                        open_price=old_bar.close_price,
+                        high_price=old_bar.close_price,
+                        low_price=old_bar.close_price,
+                        close_price=old_bar.close_price,
+                        gateway_name=old_bar.gateway_name
+                    )
+
+            self.call_strategy_func(strategy, strategy.on_bars, bars)
+
+
+def create_history() -> dict[str, list[BarData]]:
+    """Daily bars with suspended days"""
+    rng: random.Random = random.Random(5)
+    history: dict[str, list[BarData]] = {}
+
+    for i in range(SYMBOL_COUNT * 2 - SHARED_COUNT):
+        vt_symbol: str = f"{600000 + i}.SSE"
+        bars: list[BarData] = []
+
+        for day in reversed(range(DAYS)):
+            if rng.random() < 0.05:
+                continue
+
+            price: float = rng.uniform(5, 50)
+            bars.append(BarData(
+                symbol=vt_symbol.split(".")[0],
+                exchange=Exchange.SSE,
+                datetime=END - timedelta(days=day),
+                interval=Interval.DAILY,
+                open_price=price,
+                high_price=price,
+                low_price=price,
+                close_price=price,
+                gateway_name="DB"
+            ))
+
+        history[vt_symbol] = bars
+
+    return history
+
+
+history: dict[str, list[BarData]] = create_history()
+
+
+def run(engine_class: type[StrategyEngine]) -> None:
+    """Print time of initializing both strategies"""
+    event_engine: EventEngine = EventEngine()
+    main_engine: MainEngine = MainEngine(event_engine)
+
+    engine: StrategyEngine = engine_class(main_engine, event_engine)
+    engine.save_strategy_setting = lambda: None
+    engine.classes["WarmupStrategy"] = WarmupStrategy
+
+    vt_symbols: list[str] = list(history)
+    engine.add_strategy("WarmupStrategy", "first", vt_symbols[:SYMBOL_COUNT], {})
+    engine.add_strategy("WarmupStrategy", "second", vt_symbols[-SYMBOL_COUNT:], {})
+
+    start: float = perf_counter()
+
+    for future in engine.init_all_strategies().values():
+        future.result()
+
+    cost: float = perf_counter() - start
+    count: int = sum(strategy.count for strategy in engine.strategies.values())
+    print(f"{engine_class.__name__:>15}: {cost:.2f}s, {count} bars pushed")
+
+    main_engine.close()
+
+
+def main() -> None:
+    """"""
+    print(f"2 strategies of {SYMBOL_COUNT} symbols, {SHARED_COUNT} shared, {DAYS} days")
+
+    run(SerialEngine)
+    run(BenchmarkEngine)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Microbenchmark of frozen volume accounting in PositionHolding.
+
+Compares full recalculation over all active orders (previous logic) with
+incremental update of frozen volume, for order status updates on a
+contract with hundreds of resting close orders.
+"""
+import random
+from copy import copy
+from time import perf_counter
+
+from vnpy.trader.constant import Direction, Offset, Exchange, Product, Status
+from vnpy.trader.converter import PositionHolding
+from vnpy.trader.object import ContractData, OrderData, PositionData
+
+
+RESTING_COUNT: int = 500
+UPDATE_COUNT: int = 20_000
+
+
+def create_holding() -> PositionHolding:
+    """Create holding with positions on both sides"""
+    contract = ContractData(
+        symbol="rb2501",
+        exchange=Exchange.SHFE,
+        name="rb2501",
+        product=Product.FUTURES,
+        size=10,
+        pricetick=1,
+        gateway_name="BENCHMARK"
+    )
+    holding = PositionHolding(contract)
+
+    for direction in [Direction.LONG, Direction.SHORT]:
+        position = PositionData(
+            symbol="rb2501",
+            exchange=Exchange.SHFE,
+            direction=direction,
+            volume=100_000,
+            yd_volume=50_000,
+            gateway_name="BENCHMARK"
+        )
+        holding.update_position(position)
+
+    return holding
+
+
+def create_updates(rng: random.Random) -> list[OrderData]:
+    """Create resting close orders followed by partial fills of them"""
+    orders: list[OrderData] = []
+
+    for i in range(RESTING_COUNT):
+        order = OrderData(
+            symbol="rb2501",
+            exchange=Exchange.SHFE,
+            orderid=str(i),
+            direction=rng.choice([Direction.LONG, Direction.SHORT]),
+            offset=rng.choice([Offset.CLOSETODAY, Offset.CLOSEYESTERDAY]),
+            volume=100,
+            status=Status.NOTTRADED,
+            gateway_name="BENCHMARK"
+        )
+        orders.append(order)
+
+    updates: list[OrderData] = list(orders)
+
+    for _ in range(UPDATE_COUNT):
+        order = copy(rng.choice(orders))
+        order.traded = rng.randint(0, 99)
+        order.status = Status.PARTTRADED
+        updates.append(order)
+
+    return updates
+
+
+def recalculate_frozen(holding: PositionHolding) -> None:
+    """Previous frozen calculation, walking through all active orders"""
+    holding.long_yd_frozen = 0
+    holding.long_td_frozen = 0
+    holding.short_yd_frozen = 0
+    holding.short_td_frozen = 0
+
+    for order in holding.active_orders.values():
+        if order.offset == Offset.OPEN:
+            continue
+
+        frozen: float = order.volume - order.traded
+
+        if order.direction == Direction.LONG:
+            if order.offset == Offset.CLOSETODAY:
+                holding.short_td_frozen += frozen
+            elif order.offset == Offset.CLOSEYESTERDAY:
+                holding.short_yd_frozen += frozen
+        else:
+            if order.offset == Offset.CLOSETODAY:
+                holding.long_td_frozen += frozen
+            elif order.offset == Offset.CLOSEYESTERDAY:
+                holding.long_yd_frozen += frozen
+
+    holding.sum_pos_frozen()
+
+
+def run(updates: list[OrderData], incremental: bool) -> float:
+    """Feed order updates and return time cost"""
+    holding: PositionHolding = create_holding()
+
+    start: float = perf_counter()
+
+    for order in updates:
+        if incremental:
+            holding.update_order(order)
+        else:
+            holding.active_orders[order.vt_orderid] = order
+            recalculate_frozen(holding)
+
+    return perf_counter() - start
+
+
+def main() -> None:
+    """Run benchmark"""
+    updates: list[OrderData] = create_updates(random.Random(0))
+
+    for name, incremental in [("recalculate", False), ("incremental", True)]:
+        cost: float = run(updates, incremental)
+        print(f"{name}: {len(updates)} updates, {cost:.3f}s, {cost / len(updates) * 1e6:.1f}us per update")
+
+
+if __name__ == "__main__":
+    main()
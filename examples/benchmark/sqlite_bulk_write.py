@@ -0,0 +1,146 @@
+"""
+Benchmark of bulk writing into sqlite database.
+
+Writes generated minute bars and ticks of one contract into a temporary
+database in chunks through the columnar write path, and bars through
+the object write path for comparison, reporting rows per second.
+"""
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from time import perf_counter
+
+import polars as pl
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import DB_TZ
+from vnpy.trader.object import BarData
+from vnpy_sqlite.sqlite_database import SqliteDatabase, db, pragmas
+
+
+BAR_COUNT: int = 10_000_000
+TICK_COUNT: int = 50_000_000
+OBJECT_COUNT: int = 1_000_000
+CHUNK_SIZE: int = 1_000_000
+START: datetime = datetime(2000, 1, 3, 9)
+
+
+def create_bar_df(offset: int, size: int) -> pl.DataFrame:
+    """Create chunk of minute bars"""
+    index: pl.Series = pl.int_range(offset, offset + size, eager=True)
+    price: pl.Series = 3000 + index % 100
+
+    return pl.DataFrame({
+        "datetime": pl.datetime_range(
+            START + timedelta(minutes=offset),
+            START + timedelta(minutes=offset + size - 1),
+            "1m",
+            eager=True,
+            time_zone=DB_TZ.key
+        ),
+        "open_price": price,
+        "high_price": price + 2,
+        "low_price": price - 2,
+        "close_price": price + 1,
+        "volume": index % 1000,
+        "open_interest": index,
+    }).with_columns(pl.exclude("datetime").cast(pl.Float64))
+
+
+def create_tick_df(offset: int, size: int) -> pl.DataFrame:
+    """Create chunk of ticks with 5 levels of order book"""
+    index: pl.Series = pl.int_range(offset, offset + size, eager=True)
+    price: pl.Series = 3000 + index % 100
+
+    columns: dict = {
+        "datetime": pl.datetime_range(
+            START + timedelta(milliseconds=500 * offset),
+            START + timedelta(milliseconds=500 * (offset + size - 1)),
+            "500ms",
+            eager=True,
+            time_zone=DB_TZ.key
+        ),
+        "name": pl.repeat("rb2405", size, eager=True),
+        "last_price": price,
+        "volume": index,
+    }
+
+    for i in range(1, 6):
+        columns[f"bid_price_{i}"] = price - i
+        columns[f"ask_price_{i}"] = price + i
+        columns[f"bid_volume_{i}"] = index % 50 + i
+        columns[f"ask_volume_{i}"] = index % 30 + i
+
+    return pl.DataFrame(columns).with_columns(pl.exclude("datetime", "name").cast(pl.Float64))
+
+
+def run_bar_df(database: SqliteDatabase, count: int) -> float:
+    """Write bars in columnar chunks and return time cost"""
+    cost: float = 0
+
+    for offset in range(0, count, CHUNK_SIZE):
+        df: pl.DataFrame = create_bar_df(offset, min(CHUNK_SIZE, count - offset))
+
+        start: float = perf_counter()
+        database.save_bar_df(df, "rb2405", Exchange.SHFE, Interval.MINUTE)
+        cost += perf_counter() - start
+
+    return cost
+
+
+def run_tick_df(database: SqliteDatabase, count: int) -> float:
+    """Write ticks in columnar chunks and return time cost"""
+    cost: float = 0
+
+    for offset in range(0, count, CHUNK_SIZE):
+        df: pl.DataFrame = create_tick_df(offset, min(CHUNK_SIZE, count - offset))
+
+        start: float = perf_counter()
+        database.save_tick_df(df, "rb2405", Exchange.SHFE)
+        cost += perf_counter() - start
+
+    return cost
+
+
+def run_bar_objects(database: SqliteDatabase, count: int) -> float:
+    """Write bars as BarData objects in chunks and return time cost"""
+    cost: float = 0
+
+    for offset in range(0, count, CHUNK_SIZE):
+        df: pl.DataFrame = create_bar_df(offset, min(CHUNK_SIZE, count - offset))
+        bars: list[BarData] = [
+            BarData(symbol="rb2405", exchange=Exchange.SHFE, interval=Interval.MINUTE, gateway_name="DB", **row)
+            for row in df.iter_rows(named=True)
+        ]
+
+        start: float = perf_counter()
+        database.save_bar_data(bars)
+        cost += perf_counter() - start
+
+    return cost
+
+
+def main() -> None:
+    """Run benchmark, row counts can be scaled down with a factor argument"""
+    factor: float = float(sys.argv[1]) if len(sys.argv) > 1 else 1
+
+    cases: list = [
+        ("bar objects", run_bar_objects, int(OBJECT_COUNT * factor)),
+        ("bar columnar", run_bar_df, int(BAR_COUNT * factor)),
+        ("tick columnar", run_tick_df, int(TICK_COUNT * factor)),
+    ]
+
+    for name, func, count in cases:
+        with tempfile.TemporaryDirectory() as folder:
+            db.init(str(Path(folder).joinpath("database.db")), pragmas=pragmas)
+            database: SqliteDatabase = SqliteDatabase()
+
+            cost: float = func(database, count)
+            print(f"{name}: {count} rows, {cost:.1f}s, {count / cost:,.0f} rows per second")
+
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Microbenchmark of checking local stop orders on every tick.
+
+Compares scanning all resting stop orders (the previous CtaEngine logic)
+with the per-symbol StopOrderBook, with 10k resting stop orders spread
+over a few symbols.
+"""
+import random
+from datetime import datetime
+from time import perf_counter
+
+from vnpy.trader.constant import Direction, Offset
+from vnpy_ctastrategy.base import StopOrder, StopOrderBook
+
+
+STOP_COUNT: int = 10_000
+SYMBOL_COUNT: int = 20
+TICK_COUNT: int = 20_000
+
+
+def create_stop_orders(rng: random.Random) -> list[StopOrder]:
+    """Create resting stop orders far away from the current price"""
+    stop_orders: list[StopOrder] = []
+
+    for i in range(STOP_COUNT):
+        direction: Direction = rng.choice([Direction.LONG, Direction.SHORT])
+        distance: float = rng.uniform(5, 50)
+
+        stop_order: StopOrder = StopOrder(
+            vt_symbol=f"symbol{i % SYMBOL_COUNT}.LOCAL",
+            direction=direction,
+            offset=Offset.OPEN,
+            price=100 + distance if direction == Direction.LONG else 100 - distance,
+            volume=1,
+            stop_orderid=f"STOP.{i}",
+            strategy_name=f"strategy{i % 400}",
+            datetime=datetime.now()
+        )
+        stop_orders.append(stop_order)
+
+    return stop_orders
+
+
+def run_scan(stop_orders: list[StopOrder], ticks: list[tuple[str, float]]) -> int:
+    """Check stop orders by scanning all of them on each tick"""
+    orders: dict[str, StopOrder] = {stop_order.stop_orderid: stop_order for stop_order in stop_orders}
+    triggered: int = 0
+
+    for vt_symbol, last_price in ticks:
+        for stop_order in list(orders.values()):
+            if stop_order.vt_symbol != vt_symbol:
+                continue
+
+            if (
+                (stop_order.direction == Direction.LONG and last_price >= stop_order.price)
+                or (stop_order.direction == Direction.SHORT and last_price <= stop_order.price)
+            ):
+                orders.pop(stop_order.stop_orderid)
+                triggered += 1
+
+    return triggered
+
+
+def run_book(stop_orders: list[StopOrder], ticks: list[tuple[str, float]]) -> int:
+    """Check stop orders with per-symbol stop order books"""
+    books: dict[str, StopOrderBook] = {}
+    for stop_order in stop_orders:
+        books.setdefault(stop_order.vt_symbol, StopOrderBook()).add(stop_order)
+
+    triggered: int = 0
+
+    for vt_symbol, last_price in ticks:
+        book: StopOrderBook | None = books.get(vt_symbol, None)
+        if book:
+            triggered += len(book.pop_triggered(last_price))
+
+    return triggered
+
+
+def main() -> None:
+    """Run benchmark"""
+    rng = random.Random(0)
+    stop_orders: list[StopOrder] = create_stop_orders(rng)
+
+    # Prices mostly stay around 100, occasionally crossing a few stops
+    ticks: list[tuple[str, float]] = [
+        (f"symbol{rng.randrange(SYMBOL_COUNT)}.LOCAL", rng.gauss(100, 3))
+        for _ in range(TICK_COUNT)
+    ]
+
+    for name, func in [("scan", run_scan), ("book", run_book)]:
+        start: float = perf_counter()
+        triggered: int = func(stop_orders, ticks)
+        cost: float = perf_counter() - start
+
+        print(f"{name}: {TICK_COUNT} ticks, {triggered} triggered, {cost:.3f}s, {cost / TICK_COUNT * 1e6:.1f}us per tick")
+
+
+if __name__ == "__main__":
+    main()
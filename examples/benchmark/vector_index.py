@@ -0,0 +1,129 @@
+"""
+Benchmark of NumpyVector against ChromaVector.
+
+Ingests clustered random embeddings, then loads each store in a fresh
+process and measures load time (opening the store and the first query),
+mean query latency, resident memory added by loading and recall@10
+against exact search. NumpyVector is run with float32 and int8 vectors,
+and with an IVF index probing 8 clusters.
+"""
+import multiprocessing
+import resource
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+from numpy.typing import NDArray
+
+from vnag.embedder import BaseEmbedder
+from vnag.object import Segment
+from vnag.vector import BaseVector
+from vnag.vectors import chromadb_vector, numpy_vector
+
+
+SEGMENT_COUNT: int = 100_000
+DIMENSION: int = 384
+CLUSTER_COUNT: int = 500
+QUERY_COUNT: int = 100
+K: int = 10
+
+
+class ClusterEmbedder(BaseEmbedder):
+    """Vectors around cluster centers, texts are "doc {i}" or "query {i}\""""
+
+    def encode(self, texts: list[str]) -> NDArray[np.float32]:
+        """"""
+        vectors: NDArray[np.float32] = np.empty((len(texts), DIMENSION), dtype=np.float32)
+
+        for i, text in enumerate(texts):
+            kind, number = text.split()
+            seed: int = int(number) if kind == "doc" else SEGMENT_COUNT + int(number)
+
+            center: NDArray = np.random.default_rng(10 ** 9 + seed % CLUSTER_COUNT).standard_normal(DIMENSION)
+            vectors[i] = center + 0.7 * np.random.default_rng(seed).standard_normal(DIMENSION)
+
+        return vectors
+
+
+def create_store(kind: str, temp_dir: str) -> BaseVector:
+    """"""
+    chromadb_vector.get_folder_path = lambda name: Path(temp_dir)
+    numpy_vector.get_folder_path = lambda name: Path(temp_dir)
+
+    if kind == "chroma":
+        return chromadb_vector.ChromaVector(kind, ClusterEmbedder())
+
+    #IVF index is built on float32 store
+    name: str = "float32" if kind == "ivf" else kind
+    return numpy_vector.NumpyVector(name, ClusterEmbedder(), quantize=(kind == "int8"), nprobe=8)
+
+
+def get_rss() -> float:
+    """Resident memory in MB"""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize() / 1024 / 1024
+
+
+def measure(kind: str, temp_dir: str, queue: multiprocessing.Queue) -> None:
+    """Load store in a fresh process and run queries"""
+    queries: list[str] = [f"query {i}" for i in range(QUERY_COUNT)]
+    rss: float = get_rss()
+
+    start: float = perf_counter()
+    vector: BaseVector = create_store(kind, temp_dir)
+    vector.retrieve(queries[0], K)
+    load_cost: float = perf_counter() - start
+
+    start = perf_counter()
+    results: list[list[str]] = [[seg.text for seg in vector.retrieve(query, K)] for query in queries]
+    query_cost: float = (perf_counter() - start) / QUERY_COUNT
+
+    queue.put((load_cost, query_cost, get_rss() - rss, results))
+
+
+def main() -> None:
+    """"""
+    texts: list[str] = [f"doc {i}" for i in range(SEGMENT_COUNT)]
+    segments: list[Segment] = [
+        Segment(text=text, metadata={"source": f"doc{i // 20}.md", "chunk_index": str(i % 20)})
+        for i, text in enumerate(texts)
+    ]
+
+    print(f"{SEGMENT_COUNT} segments of {DIMENSION} dimensions, {QUERY_COUNT} queries of top {K}")
+
+    context = multiprocessing.get_context("spawn")
+    exact_results: list[list[str]] = []
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for kind in ["float32", "int8", "ivf", "chroma"]:
+            start: float = perf_counter()
+            vector: BaseVector = create_store(kind, temp_dir)
+            if kind == "ivf":
+                vector.build_index()
+            else:
+                vector.add_segments(segments)
+            ingest_cost: float = perf_counter() - start
+            del vector
+
+            queue: multiprocessing.Queue = context.Queue()
+            process = context.Process(target=measure, args=(kind, temp_dir, queue))
+            process.start()
+            load_cost, query_cost, memory, results = queue.get()
+            process.join()
+
+            if kind == "float32":
+                exact_results = results
+
+            recall: float = np.mean([
+                len(set(result) & set(exact)) / K for result, exact in zip(results, exact_results)
+            ])
+
+            print(
+                f"{kind:>7}: {'index' if kind == 'ivf' else 'ingest'} {ingest_cost:.1f}s, load {load_cost:.2f}s, "
+                f"query {query_cost * 1000:.1f}ms, memory {memory:.0f}MB, recall {recall:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
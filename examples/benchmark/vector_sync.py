@@ -0,0 +1,126 @@
+"""
+Microbenchmark of re-ingesting a documentation tree into ChromaVector.
+
+Segments of generated documents are embedded with a fixed cost per text as
+an embedding model does. Re-ingesting after a few documents changed is
+compared between adding all segments again, as before, and sync_segments
+with the persistent embedding cache.
+"""
+import random
+import tempfile
+from pathlib import Path
+from time import perf_counter, sleep
+
+import numpy as np
+from numpy.typing import NDArray
+
+from vnag import embedder as embedder_module
+from vnag.embedder import BaseEmbedder, CachedEmbedder
+from vnag.object import Segment
+from vnag.vectors import chromadb_vector
+from vnag.vectors.chromadb_vector import ChromaVector
+
+
+DOC_COUNT: int = 200
+CHUNK_COUNT: int = 20
+CHANGED_COUNT: int = 5
+DIMENSION: int = 384
+TEXT_COST: float = 0.0005
+
+
+class SlowEmbedder(BaseEmbedder):
+    """Random vectors with fixed cost per text"""
+
+    batch_size: int = 64
+
+    def __init__(self) -> None:
+        """"""
+        self.count: int = 0
+
+    def encode(self, texts: list[str]) -> NDArray[np.float32]:
+        """"""
+        self.count += len(texts)
+        sleep(TEXT_COST * len(texts))
+        return np.random.default_rng(len(texts)).random((len(texts), DIMENSION), dtype=np.float32)
+
+
+def create_segments(version: int) -> list[Segment]:
+    """Segments of all documents, first documents changed in later version"""
+    segments: list[Segment] = []
+
+    for doc in range(DOC_COUNT):
+        rng: random.Random = random.Random(doc)
+        changed: bool = doc < CHANGED_COUNT * version
+
+        for chunk in range(CHUNK_COUNT):
+            text: str = " ".join(str(rng.random()) for _ in range(20))
+            if changed and chunk == 3:
+                text += f" version {version}"
+
+            segments.append(Segment(
+                text=text,
+                metadata={"source": f"/docs/doc{doc}.md", "chunk_index": str(chunk)}
+            ))
+
+    return segments
+
+
+def run(name: str, ingest) -> None:
+    """Print time and encoded texts of ingesting twice"""
+    embedder: SlowEmbedder = SlowEmbedder()
+    vector: ChromaVector = ChromaVector(name, CachedEmbedder(embedder, name) if name == "sync" else embedder)
+
+    start: float = perf_counter()
+    ingest(vector, create_segments(0))
+    first_cost: float = perf_counter() - start
+    first_count: int = embedder.count
+
+    start = perf_counter()
+    ingest(vector, create_segments(1))
+    second_cost: float = perf_counter() - start
+
+    print(
+        f"{name:>4}: first {first_cost:.2f}s ({first_count} encoded), "
+        f"re-ingest {second_cost:.2f}s ({embedder.count - first_count} encoded), {vector.count} segments"
+    )
+
+
+def add(vector: ChromaVector, segments: list[Segment]) -> None:
+    """Previous add_segments, keyed by source and chunk index"""
+    texts: list[str] = [segment.text for segment in segments]
+    embeddings: NDArray[np.float32] = vector.embedder.encode(texts)
+
+    ids: list[str] = [
+        f"{segment.metadata['source']}_{segment.metadata['chunk_index']}"
+        for segment in segments
+    ]
+
+    for i in range(0, len(ids), 3000):
+        j: int = i + 3000
+        vector.collection.upsert(
+            embeddings=embeddings[i:j],
+            documents=texts[i:j],
+            metadatas=[segment.metadata for segment in segments[i:j]],
+            ids=ids[i:j]
+        )
+
+
+def sync(vector: ChromaVector, segments: list[Segment]) -> None:
+    """"""
+    vector.sync_segments(segments)
+
+
+def main() -> None:
+    """"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        embedder_module.get_folder_path = lambda name: Path(temp_dir)
+        chromadb_vector.get_folder_path = lambda name: Path(temp_dir)
+
+        print(f"{DOC_COUNT} documents of {CHUNK_COUNT} chunks, {CHANGED_COUNT} changed")
+
+        run("add", add)
+        run("sync", sync)
+
+
+if __name__ == "__main__":
+    main()
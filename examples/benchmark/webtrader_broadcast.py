@@ -0,0 +1,96 @@
+"""
+Benchmark of websocket fan-out in WebTrader.
+
+Compares sequential broadcast of every tick to every client (previous
+logic) with subscription-filtered, conflating per-client queues, for
+200 dashboard clients where a few of them are slow.
+"""
+import asyncio
+import json
+from time import perf_counter
+
+from vnpy.trader.event import EVENT_TICK
+from vnpy_webtrader.broadcast import WebsocketBroadcaster, WebsocketClient
+
+
+CLIENT_COUNT: int = 200
+SLOW_COUNT: int = 5
+SYMBOL_COUNT: int = 50
+TICK_COUNT: int = 2_000
+SEND_DELAY: float = 0.001
+
+
+class Websocket:
+    """Websocket counting sent messages, with a delay for slow clients"""
+
+    def __init__(self, slow: bool) -> None:
+        """"""
+        self.slow: bool = slow
+        self.count: int = 0
+
+    async def send_text(self, msg: str) -> None:
+        """"""
+        if self.slow:
+            await asyncio.sleep(SEND_DELAY)
+        else:
+            await asyncio.sleep(0)
+        self.count += 1
+
+    async def close(self, code: int) -> None:
+        """"""
+        pass
+
+
+def create_ticks() -> list[tuple[str, dict]]:
+    """"""
+    ticks: list[tuple[str, dict]] = []
+
+    for i in range(TICK_COUNT):
+        vt_symbol: str = f"rb{2501 + i % SYMBOL_COUNT}.SHFE"
+        ticks.append((vt_symbol, {"vt_symbol": vt_symbol, "last_price": 3000 + i % 7, "volume": i}))
+
+    return ticks
+
+
+async def run_sequential(ticks: list[tuple[str, dict]]) -> float:
+    """Encode each tick and send it to every client in sequence"""
+    websockets: list[Websocket] = [Websocket(i < SLOW_COUNT) for i in range(CLIENT_COUNT)]
+
+    start: float = perf_counter()
+
+    for _, data in ticks:
+        msg: str = json.dumps({"topic": EVENT_TICK, "data": data}, ensure_ascii=False)
+        for websocket in websockets:
+            await websocket.send_text(msg)
+
+    return perf_counter() - start
+
+
+async def run_broadcaster(ticks: list[tuple[str, dict]]) -> float:
+    """Publish ticks into client queues, each client subscribing 5 symbols"""
+    broadcaster: WebsocketBroadcaster = WebsocketBroadcaster()
+
+    for i in range(CLIENT_COUNT):
+        client: WebsocketClient = broadcaster.add_client(Websocket(i < SLOW_COUNT))
+        client.vt_symbols = {f"rb{2501 + (i + j) % SYMBOL_COUNT}.SHFE" for j in range(5)}
+
+    start: float = perf_counter()
+
+    for vt_symbol, data in ticks:
+        broadcaster.publish(EVENT_TICK, vt_symbol, data)
+        await asyncio.sleep(0)
+
+    return perf_counter() - start
+
+
+def main() -> None:
+    """Run benchmark"""
+    ticks: list[tuple[str, dict]] = create_ticks()
+
+    for name, func in [("sequential", run_sequential), ("broadcaster", run_broadcaster)]:
+        cost: float = asyncio.run(func(ticks))
+        print(f"{name}: {TICK_COUNT} ticks to {CLIENT_COUNT} clients, {cost:.3f}s, {cost / TICK_COUNT * 1e6:.0f}us per tick")
+
+
+if __name__ == "__main__":
+    main()
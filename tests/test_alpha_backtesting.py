@@ -0,0 +1,158 @@
+import random
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import pytest
+import polars as pl
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData
+from vnpy.alpha.lab import AlphaLab
+from vnpy.alpha.strategy.backtesting import BacktestingEngine, attach_shared_data
+from vnpy.alpha.strategy.strategies.equity_demo_strategy import EquityDemoStrategy
+
+
+START: datetime = datetime(2023, 1, 1)
+
+
+def create_lab(lab_path: Path, n_symbols: int = 20, n_days: int = 150) -> tuple[AlphaLab, pl.DataFrame]:
+    """
+    Create lab with random daily bars and signals.
+
+    Symbols start trading on different days, skip some days and
+    occasionally have zero close prices.
+    """
+    rng = random.Random(42)
+    lab = AlphaLab(str(lab_path))
+
+    signals: list[tuple] = []
+
+    for i in range(n_symbols):
+        symbol: str = str(600000 + i)
+        price: float = 10 + i
+        bars: list[BarData] = []
+
+        for day in range(rng.randint(0, 30), n_days):
+            if rng.random() < 0.08:
+                continue
+
+            price *= 1 + rng.gauss(0, 0.03)
+            close_price: float = round(price, 2) if rng.random() > 0.02 else 0
+            open_price: float = round(price * (1 + rng.gauss(0, 0.01)), 2)
+
+            bar = BarData(
+                symbol=symbol,
+                exchange=Exchange.SSE,
+                datetime=START + timedelta(days=day),
+                interval=Interval.DAILY,
+                open_price=open_price,
+                high_price=max(open_price, close_price) * 1.02,
+                low_price=min(open_price, close_price or open_price) * 0.98,
+                close_price=close_price,
+                volume=1000,
+                turnover=1000 * price,
+                gateway_name="DB"
+            )
+            bars.append(bar)
+            signals.append((bar.datetime, bar.vt_symbol, rng.random()))
+
+        lab.save_bar_data(bars)
+        lab.add_contract_setting(f"{symbol}.SSE", 0.0003, 0.0013, 1, 0.01)
+
+    signal_df = pl.DataFrame(signals, schema=["datetime", "vt_symbol", "signal"], orient="row")
+    return lab, signal_df
+
+
+def run_backtesting(
+    lab: AlphaLab,
+    signal_df: pl.DataFrame,
+    panel: bool,
+    bar_df: pl.DataFrame | None = None
+) -> tuple[BacktestingEngine, dict]:
+    """Run demo strategy backtesting"""
+    vt_symbols: list[str] = [f"{600000 + i}.SSE" for i in range(20)]
+
+    engine = BacktestingEngine(lab)
+    engine.set_parameters(vt_symbols, Interval.DAILY, START, START + timedelta(days=200), panel=panel)
+    engine.add_strategy(EquityDemoStrategy, {"top_k": 5, "n_drop": 2, "min_days": 2}, signal_df)
+
+    engine.load_data(bar_df)
+    engine.run_backtesting()
+    engine.calculate_result()
+    statistics: dict = engine.calculate_statistics()
+
+    return engine, statistics
+
+
+@pytest.fixture(scope="module")
+def results(tmp_path_factory: pytest.TempPathFactory) -> list[tuple[BacktestingEngine, dict]]:
+    """Run backtesting with object-based and panel-based modes."""
+    lab, signal_df = create_lab(tmp_path_factory.mktemp("lab"))
+    return [run_backtesting(lab, signal_df, panel) for panel in (False, True)]
+
+
+@pytest.fixture(scope="module")
+def shared_results(tmp_path_factory: pytest.TempPathFactory) -> list[tuple[BacktestingEngine, dict]]:
+    """Run backtesting with data exported for optimization processes."""
+    lab, signal_df = create_lab(tmp_path_factory.mktemp("lab"))
+
+    engine, _ = run_backtesting(lab, signal_df, False)
+    data_path: Path = tmp_path_factory.mktemp("shared")
+    engine.export_shared_data(data_path)
+
+    bar_df, shared_signal_df = attach_shared_data(str(data_path))
+    return [run_backtesting(lab, shared_signal_df, panel, bar_df) for panel in (False, True)]
+
+
+class TestPanelBacktesting:
+    """Test panel-based backtesting against object-based backtesting"""
+
+    def test_trades(self, results: list[tuple[BacktestingEngine, dict]]) -> None:
+        """Test trades are identical"""
+        (object_engine, _), (panel_engine, _) = results
+
+        object_trades = [trade.__dict__ for trade in object_engine.get_all_trades()]
+        panel_trades = [trade.__dict__ for trade in panel_engine.get_all_trades()]
+
+        assert object_trades
+        assert object_trades == panel_trades
+        assert object_engine.cash == panel_engine.cash
+
+    def test_daily_result(self, results: list[tuple[BacktestingEngine, dict]]) -> None:
+        """Test daily profit and loss and statistics are identical"""
+        (object_engine, object_statistics), (panel_engine, panel_statistics) = results
+
+        assert object_engine.daily_df.equals(panel_engine.daily_df)
+        assert object_statistics == panel_statistics
+
+    def test_daily_objects(self, results: list[tuple[BacktestingEngine, dict]]) -> None:
+        """Test daily result objects are created from panel arrays"""
+        (object_engine, _), (panel_engine, _) = results
+
+        object_results = object_engine.get_all_daily_results()
+        panel_results = panel_engine.get_all_daily_results()
+        assert len(object_results) == len(panel_results) > 0
+
+        for object_result, panel_result in zip(object_results, panel_results, strict=True):
+            assert object_result.close_prices == panel_result.close_prices
+            assert object_result.end_poses == panel_result.end_poses
+            assert object_result.net_pnl == panel_result.net_pnl
+            assert object_result.trade_count == panel_result.trade_count
+
+
+class TestSharedData:
+    """Test backtesting with data shared by optimization processes"""
+
+    def test_results(
+        self,
+        results: list[tuple[BacktestingEngine, dict]],
+        shared_results: list[tuple[BacktestingEngine, dict]]
+    ) -> None:
+        """Test results are identical to loading data from the lab"""
+        for (engine, statistics), (shared_engine, shared_statistics) in zip(results, shared_results, strict=True):
+            trades = [trade.__dict__ for trade in engine.get_all_trades()]
+            shared_trades = [trade.__dict__ for trade in shared_engine.get_all_trades()]
+
+            assert trades == shared_trades
+            assert engine.daily_df.equals(shared_engine.daily_df)
+            assert statistics == shared_statistics
@@ -0,0 +1,133 @@
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import polars as pl
+import pytest
+
+from alpha_trading.alpha_factory.ensemble import (
+    get_file_version,
+    load_ic_cache,
+    save_ic_cache,
+    get_cached_ic,
+    update_ic_cache,
+    get_uncached_days,
+    calculate_daily_ic,
+    calculate_weights,
+    combine_signals
+)
+
+
+START: datetime = datetime(2024, 1, 2)
+
+
+def create_signal_df(days: int, symbols: list[str], reverse: bool = False) -> pl.DataFrame:
+    """Signal ranked the same as label, or reversed"""
+    rows: list[dict] = []
+
+    for i in range(days):
+        for j, symbol in enumerate(symbols):
+            rows.append({
+                "datetime": START + timedelta(days=i),
+                "vt_symbol": symbol,
+                "label": float(j),
+                "signal": float(-j if reverse else j)
+            })
+
+    return pl.DataFrame(rows)
+
+
+class TestWeights:
+    """Test IC-based model weights"""
+
+    def test_daily_ic(self) -> None:
+        """Test daily rank IC, days without label are left to later runs"""
+        signal_df = create_signal_df(3, ["a", "b", "c"])
+        signal_df = signal_df.with_columns(
+            pl.when(pl.col("datetime") == START + timedelta(days=2))
+            .then(float("nan"))
+            .otherwise(pl.col("label"))
+            .alias("label")
+        )
+
+        ic_df = calculate_daily_ic(signal_df)
+        assert ic_df["datetime"].to_list() == [START, START + timedelta(days=1)]
+        assert ic_df["ic"].to_list() == pytest.approx([1.0, 1.0])
+
+    def test_weights(self) -> None:
+        """Test weights are proportional to absolute mean IC"""
+        weights = calculate_weights({
+            "mlp": pl.Series([0.1, 0.3]),
+            "lgbm": pl.Series([-0.1, -0.1]),
+            "lasso": pl.Series([], dtype=pl.Float64)
+        })
+        assert weights == pytest.approx({"mlp": 2 / 3, "lgbm": 1 / 3, "lasso": 0})
+
+        weights = calculate_weights({"mlp": pl.Series([0.0]), "lgbm": pl.Series([], dtype=pl.Float64)})
+        assert weights == pytest.approx({"mlp": 0.5, "lgbm": 0.5})
+
+
+class TestIcCache:
+    """Test rolling IC cache"""
+
+    def test_reuse(self, tmp_path: Path) -> None:
+        """Test cached days are not scored again and old days are dropped"""
+        file_path: Path = tmp_path.joinpath("ic.parquet")
+        ic_cache = load_ic_cache(file_path)
+
+        ic_df = calculate_daily_ic(create_signal_df(5, ["a", "b", "c"]))
+        ic_cache = update_ic_cache(ic_cache, "mlp_202401", 1, ic_df)
+        save_ic_cache(file_path, ic_cache, START + timedelta(days=1))
+
+        ic_cache = load_ic_cache(file_path)
+        cached_ic = get_cached_ic(ic_cache, "mlp_202401", 1)
+        assert len(cached_ic) == 4
+
+        window_days = create_signal_df(7, ["a"])["datetime"]
+        missing_days = get_uncached_days(cached_ic, window_days)
+        assert missing_days.to_list() == [START, START + timedelta(days=5), START + timedelta(days=6)]
+
+        # Other models do not share records
+        assert get_cached_ic(ic_cache, "lgbm_202401", 1).is_empty()
+
+    def test_invalidation(self, tmp_path: Path) -> None:
+        """Test records of a rewritten model are replaced"""
+        model_path: Path = tmp_path.joinpath("model.pkl")
+        model_path.write_bytes(b"model")
+        version: int = get_file_version(model_path, tmp_path.joinpath("missing.pkl"))
+
+        ic_df = calculate_daily_ic(create_signal_df(3, ["a", "b", "c"]))
+        ic_cache = update_ic_cache(load_ic_cache(tmp_path.joinpath("ic.parquet")), "mlp", version, ic_df)
+        ic_cache = update_ic_cache(ic_cache, "lgbm", version, ic_df)
+
+        assert get_cached_ic(ic_cache, "mlp", version + 1).is_empty()
+
+        reversed_df = calculate_daily_ic(create_signal_df(1, ["a", "b", "c"], reverse=True))
+        ic_cache = update_ic_cache(ic_cache, "mlp", version + 1, reversed_df)
+
+        assert get_cached_ic(ic_cache, "mlp", version + 1)["ic"].to_list() == pytest.approx([-1.0])
+        assert ic_cache.filter(pl.col("model") == "mlp")["version"].to_list() == [version + 1]
+        assert len(get_cached_ic(ic_cache, "lgbm", version)) == 3
+
+    def test_legacy_cache(self, tmp_path: Path) -> None:
+        """Test cache without model versions is discarded"""
+        file_path: Path = tmp_path.joinpath("ic.parquet")
+        pl.DataFrame({"datetime": [START], "model": ["mlp"], "ic": [0.1]}).write_parquet(file_path)
+
+        assert load_ic_cache(file_path).is_empty()
+
+
+class TestCombineSignals:
+    """Test weighted combination of model signals"""
+
+    def test_missing_symbols(self) -> None:
+        """Test symbols missing from one model keep the signal of the others"""
+        signals: dict[str, pl.DataFrame] = {
+            "mlp": create_signal_df(1, ["a", "b"]).with_columns(pl.lit(1.0).alias("signal")),
+            "lgbm": create_signal_df(1, ["b", "c"]).with_columns(pl.lit(4.0).alias("signal")),
+            "lasso": create_signal_df(1, ["d"])
+        }
+
+        final_df = combine_signals(signals, {"mlp": 0.75, "lgbm": 0.25, "lasso": 0})
+
+        assert final_df["vt_symbol"].to_list() == ["a", "b", "c"]
+        assert final_df["signal"].to_list() == pytest.approx([1.0, 1.75, 4.0])
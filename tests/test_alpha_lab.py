@@ -0,0 +1,114 @@
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import pytest
+import polars as pl
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData
+from vnpy.alpha.lab import AlphaLab
+
+
+def create_bars(symbol: str, start: datetime, n_days: int) -> list[BarData]:
+    """
+    Create daily bars with a suspended day every 7 days.
+    """
+    bars: list[BarData] = []
+
+    for i in range(n_days):
+        suspended: bool = i % 7 == 3
+        price: float = 0 if suspended else 10 + i * 0.1
+
+        bar = BarData(
+            symbol=symbol,
+            exchange=Exchange.SSE,
+            datetime=start + timedelta(days=i),
+            interval=Interval.DAILY,
+            open_price=price,
+            high_price=price * 1.01,
+            low_price=price * 0.99,
+            close_price=price,
+            volume=0 if suspended else 1000 + i,
+            turnover=0 if suspended else (1000 + i) * price,
+            open_interest=0,
+            gateway_name="TEST"
+        )
+        bars.append(bar)
+
+    return bars
+
+
+def fill_labs(labs: list[AlphaLab]) -> None:
+    """Save the same history, plus overlapping daily updates, into each lab"""
+    start: datetime = datetime(2022, 12, 1)
+
+    for lab in labs:
+        for symbol in ["600000", "600001", "600002"]:
+            bars: list[BarData] = create_bars(symbol, start, 420)
+            lab.save_bar_data(bars[:400])
+
+            for i in range(400, 420, 4):
+                lab.save_bar_data(bars[i - 2: i + 4])
+
+
+@pytest.fixture
+def labs(tmp_path: Path) -> tuple[AlphaLab, AlphaLab]:
+    """Create a flat lab and a partitioned lab holding the same data."""
+    flat_lab = AlphaLab(str(tmp_path.joinpath("flat")))
+    partitioned_lab = AlphaLab(str(tmp_path.joinpath("partitioned")), partitioned=True, compact_threshold=3)
+
+    fill_labs([flat_lab, partitioned_lab])
+    partitioned_lab.compact_bar_data(Interval.DAILY)
+
+    return flat_lab, partitioned_lab
+
+
+class TestAlphaLab:
+    """Test AlphaLab bar storage"""
+
+    def test_compaction(self, labs: tuple[AlphaLab, AlphaLab]) -> None:
+        """Test fragments are merged into one file per symbol and partition"""
+        _, partitioned_lab = labs
+
+        file_names: list[str] = sorted(p.name for p in partitioned_lab.daily_path.joinpath("year=2024").iterdir())
+        assert file_names == ["600000.SSE.0.parquet", "600001.SSE.0.parquet", "600002.SSE.0.parquet"]
+
+    def test_load_bar_data(self, labs: tuple[AlphaLab, AlphaLab]) -> None:
+        """Test single symbol loading is identical for both layouts"""
+        flat_lab, partitioned_lab = labs
+
+        flat_bars = flat_lab.load_bar_data("600001.SSE", Interval.DAILY, "2023-12-01", "2024-01-20")
+        partitioned_bars = partitioned_lab.load_bar_data("600001.SSE", Interval.DAILY, "2023-12-01", "2024-01-20")
+
+        assert len(flat_bars) == 51
+        assert flat_bars == partitioned_bars
+
+    def test_load_bar_df(self, labs: tuple[AlphaLab, AlphaLab]) -> None:
+        """Test panel loading is identical for both layouts"""
+        flat_lab, partitioned_lab = labs
+
+        vt_symbols: list[str] = ["600002.SSE", "600000.SSE"]
+
+        flat_df = flat_lab.load_bar_df(vt_symbols, Interval.DAILY, "2023-01-01", "2024-01-20", 10)
+        partitioned_df = partitioned_lab.load_bar_df(vt_symbols, Interval.DAILY, "2023-01-01", "2024-01-20", 10)
+
+        assert flat_df is not None and partitioned_df is not None
+        assert flat_df.fill_nan(None).equals(partitioned_df.fill_nan(None))
+        assert flat_df["vt_symbol"].unique(maintain_order=True).to_list() == vt_symbols
+
+    def test_load_bar_df_lazy(self, labs: tuple[AlphaLab, AlphaLab]) -> None:
+        """Test lazy panel loading gives the same result as eager loading"""
+        _, partitioned_lab = labs
+
+        vt_symbols: list[str] = ["600000.SSE", "600001.SSE"]
+
+        eager_df = partitioned_lab.load_bar_df(vt_symbols, Interval.DAILY, "2023-01-01", "2024-01-20", 10)
+        lazy_df = partitioned_lab.load_bar_df(vt_symbols, Interval.DAILY, "2023-01-01", "2024-01-20", 10, lazy=True)
+
+        assert isinstance(eager_df, pl.DataFrame)
+        assert isinstance(lazy_df, pl.LazyFrame)
+        assert eager_df.fill_nan(None).equals(lazy_df.collect().fill_nan(None))
+
+        # Prices are normalized by the first close of each symbol
+        first_close: pl.DataFrame = eager_df.group_by("vt_symbol").agg(pl.col("close").first())
+        assert (first_close["close"] == 1.0).all()
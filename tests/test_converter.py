@@ -0,0 +1,167 @@
+import random
+from collections import defaultdict
+from collections.abc import Callable
+from copy import copy
+
+from vnpy.trader.constant import Direction, Offset, Exchange, Product, Status
+from vnpy.trader.converter import PositionHolding
+from vnpy.trader.object import ContractData, OrderData, TradeData, PositionData
+
+
+FROZEN_NAMES: list[str] = [
+    "long_pos_frozen", "long_yd_frozen", "long_td_frozen",
+    "short_pos_frozen", "short_yd_frozen", "short_td_frozen"
+]
+
+
+def recalculate_frozen(holding: PositionHolding) -> None:
+    """Previous frozen calculation, walking through all active orders"""
+    holding.long_yd_frozen = 0
+    holding.long_td_frozen = 0
+    holding.short_yd_frozen = 0
+    holding.short_td_frozen = 0
+
+    for order in holding.active_orders.values():
+        if order.offset == Offset.OPEN:
+            continue
+
+        frozen: float = order.volume - order.traded
+
+        if order.direction == Direction.LONG:
+            if order.offset == Offset.CLOSETODAY:
+                holding.short_td_frozen += frozen
+            elif order.offset == Offset.CLOSEYESTERDAY:
+                holding.short_yd_frozen += frozen
+            elif order.offset == Offset.CLOSE:
+                holding.short_td_frozen += frozen
+
+                if holding.short_td_frozen > holding.short_td:
+                    holding.short_yd_frozen += holding.short_td_frozen - holding.short_td
+                    holding.short_td_frozen = holding.short_td
+        else:
+            if order.offset == Offset.CLOSETODAY:
+                holding.long_td_frozen += frozen
+            elif order.offset == Offset.CLOSEYESTERDAY:
+                holding.long_yd_frozen += frozen
+            elif order.offset == Offset.CLOSE:
+                holding.long_td_frozen += frozen
+
+                if holding.long_td_frozen > holding.long_td:
+                    holding.long_yd_frozen += holding.long_td_frozen - holding.long_td
+                    holding.long_td_frozen = holding.long_td
+
+    holding.sum_pos_frozen()
+
+
+def get_frozen(holding: PositionHolding) -> list[float]:
+    """"""
+    return [getattr(holding, name) for name in FROZEN_NAMES]
+
+
+def run_orders(exchange: Exchange, offsets: list[Offset], check: Callable) -> None:
+    """Feed random position, order and trade updates, checking frozen volume after each one"""
+    rng = random.Random(exchange.value)
+
+    contract = ContractData(
+        symbol="test",
+        exchange=exchange,
+        name="test",
+        product=Product.FUTURES,
+        size=10,
+        pricetick=1,
+        gateway_name="TEST"
+    )
+    holding = PositionHolding(contract)
+    holding.check_interval = 10 ** 9
+
+    for direction in [Direction.LONG, Direction.SHORT]:
+        position = PositionData(
+            symbol="test",
+            exchange=exchange,
+            direction=direction,
+            volume=200,
+            yd_volume=120,
+            gateway_name="TEST"
+        )
+        holding.update_position(position)
+
+    orders: dict[str, OrderData] = {}
+
+    for i in range(3000):
+        n: float = rng.random()
+
+        # New order
+        if n < 0.4 or not orders:
+            order = OrderData(
+                symbol="test",
+                exchange=exchange,
+                orderid=str(i),
+                direction=rng.choice([Direction.LONG, Direction.SHORT]),
+                offset=rng.choice(offsets),
+                volume=rng.randint(1, 20),
+                status=Status.NOTTRADED,
+                gateway_name="TEST"
+            )
+        # Update of existing order, filled partly or finished
+        else:
+            order = copy(rng.choice(list(orders.values())))
+            volume: float = rng.randint(0, int(order.volume - order.traded))
+
+            if rng.random() < 0.3:
+                order.status = rng.choice([Status.CANCELLED, Status.REJECTED, Status.ALLTRADED])
+            elif volume:
+                order.traded += volume
+                order.status = Status.PARTTRADED if order.traded < order.volume else Status.ALLTRADED
+
+                trade = TradeData(
+                    symbol="test",
+                    exchange=exchange,
+                    orderid=order.orderid,
+                    tradeid=str(i),
+                    direction=order.direction,
+                    offset=order.offset,
+                    volume=volume,
+                    gateway_name="TEST"
+                )
+                holding.update_trade(trade)
+
+        if order.is_active():
+            orders[order.vt_orderid] = order
+        else:
+            orders.pop(order.vt_orderid, None)
+
+        holding.update_order(order)
+        check(holding)
+
+
+class TestPositionHolding:
+    """Test incremental frozen volume against recalculation"""
+
+    def check_previous(self, holding: PositionHolding) -> None:
+        """"""
+        expected: PositionHolding = copy(holding)
+        recalculate_frozen(expected)
+        assert get_frozen(holding) == get_frozen(expected)
+
+    def check_full(self, holding: PositionHolding) -> None:
+        """"""
+        expected: PositionHolding = copy(holding)
+        expected.order_frozens = {}
+        expected.offset_frozens = defaultdict(float)
+        expected.offset_counts = defaultdict(int)
+        expected.calculate_frozen()
+        assert get_frozen(holding) == get_frozen(expected)
+
+    def test_shfe(self) -> None:
+        """Test close today and close yesterday orders"""
+        offsets: list[Offset] = [Offset.OPEN, Offset.CLOSETODAY, Offset.CLOSEYESTERDAY]
+        run_orders(Exchange.SHFE, offsets, self.check_previous)
+
+    def test_close(self) -> None:
+        """Test close orders split into today and yesterday"""
+        run_orders(Exchange.DCE, [Offset.OPEN, Offset.CLOSE], self.check_previous)
+
+    def test_mixed(self) -> None:
+        """Test mixed offsets against full recalculation"""
+        offsets: list[Offset] = [Offset.OPEN, Offset.CLOSE, Offset.CLOSETODAY, Offset.CLOSEYESTERDAY]
+        run_orders(Exchange.CZCE, offsets, self.check_full)
@@ -0,0 +1,136 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData
+from vnpy_ctastrategy import CtaTemplate
+from vnpy_ctastrategy.backtesting import BacktestingEngine
+
+
+START: datetime = datetime(2024, 1, 1, 9)
+
+
+class RandomStrategy(CtaTemplate):
+    """Strategy trading randomly on bars, several times a day"""
+
+    seed: int = 0
+    trade_ratio: float = 0.2
+
+    parameters = ["seed", "trade_ratio"]
+
+    def on_init(self) -> None:
+        """"""
+        self.rng: random.Random = random.Random(self.seed)
+
+    def on_bar(self, bar: BarData) -> None:
+        """"""
+        self.cancel_all()
+
+        if self.rng.random() >= self.trade_ratio:
+            return
+
+        volume: int = self.rng.randint(1, 3)
+        price: float = bar.close_price
+
+        if self.pos > 0:
+            self.sell(price - 5, min(volume, self.pos))
+        elif self.pos < 0:
+            self.cover(price + 5, min(volume, -self.pos))
+        elif self.rng.random() > 0.5:
+            self.buy(price + 5, volume)
+        else:
+            self.short(price - 5, volume)
+
+
+def create_bars(n_days: int = 60, n_bars: int = 30) -> list[BarData]:
+    """Create random walk hourly bars, skipping some days"""
+    rng = random.Random(7)
+    price: float = 3000
+    bars: list[BarData] = []
+
+    for day in range(n_days):
+        if rng.random() < 0.1:
+            continue
+
+        for i in range(n_bars):
+            price = float(round(price + rng.gauss(0, 8)))
+
+            bar = BarData(
+                symbol="rb2501",
+                exchange=Exchange.SHFE,
+                datetime=START + timedelta(days=day, minutes=i),
+                interval=Interval.MINUTE,
+                open_price=price,
+                high_price=price + 3,
+                low_price=price - 3,
+                close_price=price,
+                volume=100,
+                gateway_name="DB"
+            )
+            bars.append(bar)
+
+    return bars
+
+
+def run_backtesting(bars: list[BarData], vectorized: bool, setting: dict) -> tuple[BacktestingEngine, dict]:
+    """Run random strategy on given bars"""
+    engine = BacktestingEngine()
+    engine.output = lambda msg: None
+    engine.set_parameters(
+        vt_symbol="rb2501.SHFE",
+        interval=Interval.MINUTE,
+        start=START,
+        end=START + timedelta(days=90),
+        rate=0.0001,
+        slippage=0.3,
+        size=10,
+        pricetick=1,
+        capital=1_000_000,
+        vectorized=vectorized
+    )
+    engine.add_strategy(RandomStrategy, setting)
+
+    engine.history_data = bars
+    engine.run_backtesting()
+    engine.calculate_result()
+    statistics: dict = engine.calculate_statistics(output=False)
+
+    return engine, statistics
+
+
+def assert_identical(object_engine: BacktestingEngine, vectorized_engine: BacktestingEngine) -> None:
+    """Check daily DataFrame values, columns and dtypes"""
+    object_df = object_engine.daily_df
+    vectorized_df = vectorized_engine.daily_df
+
+    assert object_df.equals(vectorized_df)
+    assert list(object_df.columns) == list(vectorized_df.columns)
+    assert object_df.dtypes.equals(vectorized_df.dtypes)
+
+
+class TestVectorizedResult:
+    """Test vectorized daily result against object-based daily result"""
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_daily_result(self, seed: int) -> None:
+        """Test daily DataFrame and statistics are identical"""
+        bars: list[BarData] = create_bars()
+
+        object_engine, object_statistics = run_backtesting(bars, False, {"seed": seed})
+        vectorized_engine, vectorized_statistics = run_backtesting(bars, True, {"seed": seed})
+
+        assert len(object_engine.trades) > 100
+        assert_identical(object_engine, vectorized_engine)
+        assert object_statistics == vectorized_statistics
+
+    def test_no_trade(self) -> None:
+        """Test daily DataFrame is identical without any trade"""
+        bars: list[BarData] = create_bars()
+
+        object_engine, _ = run_backtesting(bars, False, {"trade_ratio": 0})
+        vectorized_engine, _ = run_backtesting(bars, True, {"trade_ratio": 0})
+
+        assert not object_engine.trades
+        assert_identical(object_engine, vectorized_engine)
@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+from threading import Lock
+from time import sleep
+
+import pytest
+
+from vnpy.event import EventEngine
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import DB_TZ
+from vnpy.trader.engine import MainEngine
+from vnpy.trader.object import BarData
+from vnpy.trader.setting import SETTINGS
+from vnpy.trader.utility import load_json, save_json
+from vnpy_ctastrategy import CtaEngine, CtaTemplate
+
+
+class WarmupStrategy(CtaTemplate):
+    """Strategy loading history on init"""
+
+    days: int = 10
+    parameters = ["days"]
+
+    bar_count: int = 0
+    variables = ["bar_count"]
+
+    def on_init(self) -> None:
+        """"""
+        self.load_bar(self.days)
+
+    def on_bar(self, bar: BarData) -> None:
+        """"""
+        self.bar_count += 1
+
+
+class CountingCtaEngine(CtaEngine):
+    """CTA engine counting history queries, with 1 bar per day of history"""
+
+    def __init__(self, main_engine: MainEngine, event_engine: EventEngine) -> None:
+        """"""
+        super().__init__(main_engine, event_engine)
+
+        self.queries: list[tuple] = []
+        self.query_lock: Lock = Lock()
+
+    def query_bar(self, vt_symbol: str, days: int, interval: Interval, use_database: bool) -> list[BarData]:
+        """"""
+        with self.query_lock:
+            self.queries.append((vt_symbol, days))
+
+        sleep(0.1)
+
+        symbol, exchange = vt_symbol.split(".")
+        end: datetime = datetime.now(DB_TZ)
+
+        return [
+            BarData(
+                symbol=symbol,
+                exchange=Exchange(exchange),
+                datetime=end - timedelta(days=i, hours=1),
+                interval=interval,
+                gateway_name="TEST"
+            )
+            for i in reversed(range(days))
+        ]
+
+
+@pytest.fixture
+def engine(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> CountingCtaEngine:
+    """Create engine with strategies on two symbols and different warm-up days."""
+    monkeypatch.setitem(SETTINGS, "cta.init_workers", 4)
+
+    event_engine = EventEngine()
+    main_engine = MainEngine(event_engine)
+
+    engine = CountingCtaEngine(main_engine, event_engine)
+    engine.setting_filename = str(tmp_path.joinpath("setting.json"))
+    engine.warmup_filename = str(tmp_path.joinpath("warmup.json"))
+    engine.classes["WarmupStrategy"] = WarmupStrategy
+
+    for i in range(8):
+        vt_symbol: str = "rb2501.SHFE" if i % 2 else "hc2501.SHFE"
+        engine.add_strategy("WarmupStrategy", f"strategy{i}", vt_symbol, {"days": 10 if i < 4 else 5})
+
+    yield engine
+
+    engine.init_executor.shutdown()
+    main_engine.close()
+
+
+def init_all(engine: CountingCtaEngine) -> None:
+    """Init all strategies and reset them for next initialization"""
+    for future in engine.init_all_strategies().values():
+        future.result()
+
+    for strategy in engine.strategies.values():
+        assert strategy.inited
+        assert strategy.bar_count == strategy.days
+
+        strategy.inited = False
+        strategy.bar_count = 0
+
+    assert not engine.history_cache
+
+
+class TestCtaEngineInit:
+    """Test parallel strategy initialization with shared history"""
+
+    def test_init_all(self, engine: CountingCtaEngine) -> None:
+        """Test history is shared by strategies and prefetched once per symbol next time"""
+        init_all(engine)
+
+        # Requests are deduplicated or served by a longer cached one
+        assert sorted(engine.queries) == [("hc2501.SHFE", 10), ("rb2501.SHFE", 10)]
+
+        engine.queries.clear()
+        engine.warmup_requests["rb2501.SHFE"].append(["1m", 20, False])
+        init_all(engine)
+
+        assert sorted(engine.queries) == [("hc2501.SHFE", 10), ("rb2501.SHFE", 20)]
+
+    def test_warmup_pruned(self, engine: CountingCtaEngine) -> None:
+        """Test warm-up requests of last process are replaced and unused symbols removed"""
+        assert engine.init_workers == 4
+
+        save_json(engine.warmup_filename, {
+            "rb2501.SHFE": [["1m", 20, False]],
+            "ag2501.SHFE": [["1m", 10, False]]
+        })
+        engine.load_warmup_requests()
+        assert list(engine.warmup_requests) == ["rb2501.SHFE"]
+
+        # Old request is prefetched once, then replaced by requests of this process
+        init_all(engine)
+        assert sorted(engine.queries) == [("hc2501.SHFE", 10), ("rb2501.SHFE", 20)]
+        assert sorted(load_json(engine.warmup_filename)["rb2501.SHFE"]) == [["1m", 5, False], ["1m", 10, False]]
+
+        for i in range(0, 8, 2):
+            engine.remove_strategy(f"strategy{i}")
+        assert list(load_json(engine.warmup_filename)) == ["rb2501.SHFE"]
+
+    def test_load_bar_after_init(self, engine: CountingCtaEngine) -> None:
+        """Test history is not cached outside initialization"""
+        strategy: WarmupStrategy = engine.strategies["strategy0"]
+
+        strategy.load_bar(3)
+        strategy.load_bar(3)
+
+        assert engine.queries == [("hc2501.SHFE", 3), ("hc2501.SHFE", 3)]
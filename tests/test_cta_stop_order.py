@@ -0,0 +1,77 @@
+import random
+from datetime import datetime
+
+from vnpy.trader.constant import Direction, Offset
+from vnpy_ctastrategy.base import StopOrder, StopOrderBook
+
+
+def create_stop_order(count: int, direction: Direction, price: float) -> StopOrder:
+    """Create a waiting stop order"""
+    return StopOrder(
+        vt_symbol="rb2501.SHFE",
+        direction=direction,
+        offset=Offset.OPEN,
+        price=price,
+        volume=1,
+        stop_orderid=f"STOP.{count}",
+        strategy_name="test",
+        datetime=datetime.now()
+    )
+
+
+def scan_triggered(stop_orders: dict[str, StopOrder], last_price: float) -> list[StopOrder]:
+    """Find triggered stop orders by scanning all of them"""
+    triggered: list[StopOrder] = []
+
+    for stop_order in list(stop_orders.values()):
+        if (
+            (stop_order.direction == Direction.LONG and last_price >= stop_order.price)
+            or (stop_order.direction == Direction.SHORT and last_price <= stop_order.price)
+        ):
+            stop_orders.pop(stop_order.stop_orderid)
+            triggered.append(stop_order)
+
+    return triggered
+
+
+class TestStopOrderBook:
+    """Test stop order book against scanning all stop orders"""
+
+    def test_pop_triggered(self) -> None:
+        """Test triggered orders and their order are identical with random adds, cancels and prices"""
+        rng = random.Random(7)
+
+        book = StopOrderBook()
+        stop_orders: dict[str, StopOrder] = {}
+        count: int = 0
+
+        for _ in range(2000):
+            for _ in range(rng.randint(0, 5)):
+                count += 1
+                direction: Direction = rng.choice([Direction.LONG, Direction.SHORT])
+                stop_order: StopOrder = create_stop_order(count, direction, rng.randint(90, 110))
+
+                book.add(stop_order)
+                stop_orders[stop_order.stop_orderid] = stop_order
+
+            if stop_orders and rng.random() < 0.3:
+                stop_orderid: str = rng.choice(list(stop_orders))
+                book.remove(stop_orderid)
+                stop_orders.pop(stop_orderid)
+
+            last_price: float = rng.gauss(100, 8)
+            assert book.pop_triggered(last_price) == scan_triggered(stop_orders, last_price)
+            assert len(book) == len(stop_orders)
+
+    def test_readd(self) -> None:
+        """Test an order added back after failing to be sent triggers again"""
+        book = StopOrderBook()
+        stop_order: StopOrder = create_stop_order(1, Direction.SHORT, 100)
+        book.add(stop_order)
+
+        assert book.pop_triggered(101) == []
+        assert book.pop_triggered(100) == [stop_order]
+
+        book.add(stop_order)
+        assert book.pop_triggered(99) == [stop_order]
+        assert not book
@@ -0,0 +1,179 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import BaseDatabase, BarOverview, TickOverview, DB_TZ
+from vnpy.trader.object import BarData, TickData
+from vnpy.trader.utility import ZoneInfo
+from vnpy_datamanager.engine import ManagerEngine, EXPORT_WINDOWS
+
+
+START: datetime = datetime(2024, 3, 1, 9, 0)
+
+
+class MemoryDatabase(BaseDatabase):
+    """Database keeping bars in memory, using the default columnar write path"""
+
+    def __init__(self) -> None:
+        """"""
+        self.bars: dict[datetime, BarData] = {}
+        self.save_count: int = 0
+
+    def save_bar_data(self, bars: list[BarData], stream: bool = False) -> bool:
+        """"""
+        self.save_count += 1
+
+        for bar in bars:
+            bar.datetime = bar.datetime.astimezone(DB_TZ)
+            self.bars[bar.datetime] = bar
+        return True
+
+    def save_tick_data(self, ticks: list[TickData], stream: bool = False) -> bool:
+        """"""
+        return False
+
+    def load_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> list[BarData]:
+        """"""
+        start = start.replace(tzinfo=DB_TZ)
+        end = end.replace(tzinfo=DB_TZ)
+        return [bar for dt, bar in sorted(self.bars.items()) if start <= dt <= end]
+
+    def load_tick_data(self, symbol: str, exchange: Exchange, start: datetime, end: datetime) -> list[TickData]:
+        """"""
+        return []
+
+    def delete_bar_data(self, symbol: str, exchange: Exchange, interval: Interval) -> int:
+        """"""
+        return 0
+
+    def delete_tick_data(self, symbol: str, exchange: Exchange) -> int:
+        """"""
+        return 0
+
+    def get_bar_overview(self) -> list[BarOverview]:
+        """"""
+        return []
+
+    def get_tick_overview(self) -> list[TickOverview]:
+        """"""
+        return []
+
+
+def create_engine() -> ManagerEngine:
+    """Create engine without main engine, datafeed and database setting"""
+    engine: ManagerEngine = ManagerEngine.__new__(ManagerEngine)
+    engine.database = MemoryDatabase()
+    return engine
+
+
+def write_csv(file_path: Path, n: int) -> None:
+    """Write minute bars with a null character and without turnover column"""
+    with open(file_path, "w") as f:
+        f.write("time,o,h,l,c,v,oi\n")
+
+        for i in range(n):
+            dt: datetime = START + timedelta(minutes=i)
+            price: float = 3000 + i % 17
+            volume: str = f"{i}\0" if i == 3 else str(i)
+            f.write(f"{dt:%Y/%m/%d %H:%M},{price},{price + 2},{price - 2},{price + 1},{volume},{i * 2}\n")
+
+
+def import_file(engine: ManagerEngine, file_path: Path, datetime_format: str, chunk_size: int = 100) -> tuple:
+    """"""
+    return engine.import_data_from_csv(
+        str(file_path), "rb2405", Exchange.SHFE, Interval.MINUTE, "Asia/Shanghai",
+        "time", "o", "h", "l", "c", "v", "turnover", "oi", datetime_format,
+        chunk_size=chunk_size
+    )
+
+
+class TestManagerEngine:
+    """Test importing and exporting bar data files"""
+
+    def test_import_csv(self, tmp_path: Path) -> None:
+        """Test csv rows are parsed into the same bars as row-by-row parsing"""
+        file_path: Path = tmp_path.joinpath("bars.csv")
+        write_csv(file_path, 1000)
+
+        engine: ManagerEngine = create_engine()
+        progress: list[int] = []
+        start, end, count, skipped = engine.import_data_from_csv(
+            str(file_path), "rb2405", Exchange.SHFE, Interval.MINUTE, "Asia/Shanghai",
+            "time", "o", "h", "l", "c", "v", "turnover", "oi", "%Y/%m/%d %H:%M",
+            progress=progress.append,
+            chunk_size=300
+        )
+
+        tz: ZoneInfo = ZoneInfo("Asia/Shanghai")
+        assert (start, end, count) == (START.replace(tzinfo=tz), (START + timedelta(minutes=999)).replace(tzinfo=tz), 1000)
+        assert skipped == 0
+        assert progress[-1] == 1000
+        assert engine.database.save_count == len(progress) > 1
+
+        bar: BarData = engine.database.bars[(START + timedelta(minutes=3)).replace(tzinfo=tz)]
+        expected: BarData = BarData(
+            symbol="rb2405",
+            exchange=Exchange.SHFE,
+            datetime=bar.datetime,
+            interval=Interval.MINUTE,
+            volume=3,
+            open_price=3003,
+            high_price=3005,
+            low_price=3001,
+            close_price=3004,
+            open_interest=6,
+            gateway_name="DB"
+        )
+        assert bar == expected
+
+    def test_import_dst_gap(self, tmp_path: Path) -> None:
+        """Test rows of local times skipped by daylight saving are counted"""
+        file_path: Path = tmp_path.joinpath("bars.csv")
+        with open(file_path, "w") as f:
+            f.write("time,o,h,l,c,v,oi\n")
+            for time in ["01:30", "02:00", "02:30", "03:00"]:
+                f.write(f"2024-03-10 {time},1,1,1,1,1,1\n")
+
+        engine: ManagerEngine = create_engine()
+        start, end, count, skipped = engine.import_data_from_csv(
+            str(file_path), "SPY", Exchange.SMART, Interval.MINUTE, "America/New_York",
+            "time", "o", "h", "l", "c", "v", "turnover", "oi", "%Y-%m-%d %H:%M",
+            chunk_size=3
+        )
+
+        tz: ZoneInfo = ZoneInfo("America/New_York")
+        assert (start, end) == (datetime(2024, 3, 10, 1, 30, tzinfo=tz), datetime(2024, 3, 10, 3, 0, tzinfo=tz))
+        assert (count, skipped) == (2, 2)
+
+    @pytest.mark.parametrize("suffix", [".csv", ".parquet", ".feather"])
+    def test_export_round_trip(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, suffix: str) -> None:
+        """Test exported file is imported back into the same bars"""
+        monkeypatch.setitem(EXPORT_WINDOWS, Interval.MINUTE, timedelta(hours=5))
+
+        csv_path: Path = tmp_path.joinpath("bars.csv")
+        write_csv(csv_path, 2000)
+
+        engine: ManagerEngine = create_engine()
+        import_file(engine, csv_path, "%Y/%m/%d %H:%M")
+
+        file_path: Path = tmp_path.joinpath("export" + suffix)
+        assert engine.output_data_to_csv(
+            str(file_path), "rb2405", Exchange.SHFE, Interval.MINUTE, START - timedelta(days=1), START + timedelta(days=10)
+        )
+
+        new_engine: ManagerEngine = create_engine()
+        new_engine.import_data_from_csv(
+            str(file_path), "rb2405", Exchange.SHFE, Interval.MINUTE, DB_TZ.key,
+            "datetime", "open", "high", "low", "close", "volume", "turnover", "open_interest", "%Y-%m-%d %H:%M:%S"
+        )
+
+        assert list(new_engine.database.bars.values()) == list(engine.database.bars.values())
@@ -0,0 +1,218 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import pytest
+
+from vnpy.trader import cache as cache_module
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData, TickData
+from vnpy.trader.setting import SETTINGS
+from vnpy.trader.utility import ZoneInfo
+from vnpy.trader.cache import (
+    HistoryCache,
+    estimate_size,
+    get_history_cache,
+    save_columns,
+    load_columns
+)
+
+
+START: datetime = datetime(2024, 1, 2, 9, tzinfo=ZoneInfo("Asia/Shanghai"))
+
+
+def create_bars(symbol: str, count: int = 1000) -> list[BarData]:
+    """"""
+    return [
+        BarData(
+            symbol=symbol,
+            exchange=Exchange.SHFE,
+            datetime=START + timedelta(minutes=i),
+            interval=Interval.MINUTE,
+            open_price=3000 + i,
+            high_price=3000.5 + i,
+            low_price=2999.5 + i,
+            close_price=3000.25 + i,
+            volume=float(i % 7),
+            gateway_name="DB"
+        )
+        for i in range(count)
+    ]
+
+
+def create_ticks(symbol: str, count: int = 100) -> list[TickData]:
+    """"""
+    return [
+        TickData(
+            symbol=symbol,
+            exchange=Exchange.SHFE,
+            datetime=START + timedelta(seconds=i / 2),
+            name="rebar" if i % 2 else "",
+            last_price=3000.0 + i,
+            bid_price_1=2999.0 + i,
+            ask_price_1=3001.0 + i,
+            localtime=datetime(2024, 1, 2, 9) + timedelta(seconds=i) if i % 3 else None,
+            gateway_name="DB"
+        )
+        for i in range(count)
+    ]
+
+
+class CountingLoader:
+    """Loader counting calls of each key"""
+
+    def __init__(self) -> None:
+        """"""
+        self.calls: list[str] = []
+
+    def __call__(self, symbol: str) -> list[BarData]:
+        """"""
+        self.calls.append(symbol)
+        return create_bars(symbol)
+
+
+class TestHistoryCache:
+    """Test byte-bounded history cache"""
+
+    def test_lru_eviction(self) -> None:
+        """Test entries are evicted by bytes in least recently used order"""
+        entry_size: int = estimate_size(create_bars("a"))
+        cache = HistoryCache(max_bytes=entry_size * 2)
+        loader = CountingLoader()
+
+        for symbol in ["a", "b", "a", "c", "a", "b"]:
+            data: list[BarData] = cache.get(symbol, lambda: loader(symbol))
+            assert data[0].symbol == symbol
+
+        # b is evicted by c, c by b
+        assert loader.calls == ["a", "b", "c", "b"]
+
+        stats: dict = cache.get_stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 4
+        assert stats["evictions"] == 2
+        assert stats["entries"] == 2
+        assert stats["bytes"] == entry_size * 2
+
+    def test_oversized_entry(self) -> None:
+        """Test entry larger than limit is returned but not kept"""
+        cache = HistoryCache(max_bytes=1000)
+        loader = CountingLoader()
+
+        cache.get("a", lambda: loader("a"))
+        cache.get("a", lambda: loader("a"))
+
+        assert loader.calls == ["a", "a"]
+        assert cache.get_stats()["bytes"] == 0
+
+    def test_spill(self, tmp_path: Path) -> None:
+        """Test evicted entries are loaded back from disk"""
+        entry_size: int = estimate_size(create_bars("a"))
+        cache = HistoryCache(entry_size, 10_000_000, tmp_path)
+        loader = CountingLoader()
+
+        cache.get("a", lambda: loader("a"))
+        cache.get("b", lambda: loader("b"))
+        assert cache.get_stats()["spilled"] == 1
+
+        data: list[BarData] = cache.get("a", lambda: loader("a"))
+        assert data == create_bars("a")
+        assert loader.calls == ["a", "b"]
+
+        stats: dict = cache.get_stats()
+        assert stats["disk_hits"] == 1
+        assert stats["spilled"] == 1
+        assert len(list(tmp_path.glob("*.cache"))) == 1
+
+        cache.clear()
+        assert not list(tmp_path.glob("*.cache"))
+
+    def test_spill_limit(self, tmp_path: Path) -> None:
+        """Test oldest spilled files are removed over disk limit"""
+        file_path: Path = tmp_path.joinpath("size.cache")
+        save_columns(file_path, create_bars("a"))
+        file_size: int = file_path.stat().st_size
+        file_path.unlink()
+
+        cache = HistoryCache(1, int(file_size * 2.5), tmp_path)
+        loader = CountingLoader()
+
+        for symbol in ["a", "b", "c", "a"]:
+            cache.get(symbol, lambda: loader(symbol))
+
+        assert loader.calls == ["a", "b", "c", "a"]
+        assert cache.get_stats()["spilled"] == 2
+
+    def test_missing_spill_file(self, tmp_path: Path) -> None:
+        """Test spilled file removed by others is treated as a cache miss"""
+        entry_size: int = estimate_size(create_bars("a"))
+        cache = HistoryCache(entry_size, 10_000_000, tmp_path)
+        loader = CountingLoader()
+
+        cache.get("a", lambda: loader("a"))
+        cache.get("b", lambda: loader("b"))
+
+        for file_path in tmp_path.glob("*.cache"):
+            file_path.unlink()
+
+        assert cache.get("a", lambda: loader("a")) == create_bars("a")
+        assert loader.calls == ["a", "b", "a"]
+
+        stats: dict = cache.get_stats()
+        assert stats["disk_hits"] == 0
+        assert stats["misses"] == 3
+
+    def test_process_folder(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test shared cache spills into folder of its own process"""
+        other_path: Path = tmp_path.joinpath("1")
+        other_path.mkdir()
+        save_columns(other_path.joinpath("other.cache"), create_bars("a"))
+
+        monkeypatch.setattr(cache_module, "get_folder_path", lambda name: tmp_path)
+        monkeypatch.setattr(cache_module, "history_cache", None)
+        monkeypatch.setitem(SETTINGS, "history.spill_size", 1)
+
+        # Folder of a finished process is removed
+        process: subprocess.Popen = subprocess.Popen([sys.executable, "-c", "pass"])
+        process.wait()
+        stale_path: Path = tmp_path.joinpath(str(process.pid))
+        stale_path.mkdir()
+        save_columns(stale_path.joinpath("stale.cache"), create_bars("a"))
+
+        cache: HistoryCache = get_history_cache()
+        assert cache.spill_path == tmp_path.joinpath(str(os.getpid()))
+        assert other_path.joinpath("other.cache").exists()
+        assert not stale_path.exists()
+
+        # Own folder is removed on close
+        cache.get("a", lambda: create_bars("a"))
+        cache.close()
+        assert not cache.spill_path.exists()
+
+
+class TestColumns:
+    """Test columnar file format of spilled entries"""
+
+    def test_bars(self, tmp_path: Path) -> None:
+        """"""
+        bars: list[BarData] = create_bars("rb2501")
+
+        file_path: Path = tmp_path.joinpath("bars.cache")
+        save_columns(file_path, bars)
+
+        assert load_columns(file_path) == bars
+        assert file_path.stat().st_size < estimate_size(bars) / 10
+
+    def test_ticks(self, tmp_path: Path) -> None:
+        """"""
+        ticks: list[TickData] = create_ticks("rb2501")
+
+        file_path: Path = tmp_path.joinpath("ticks.cache")
+        save_columns(file_path, ticks)
+
+        loaded: list[TickData] = load_columns(file_path)
+        assert loaded == ticks
+        assert [t.datetime.tzinfo for t in loaded] == [t.datetime.tzinfo for t in ticks]
+        assert loaded[0].vt_symbol == "rb2501.SHFE"
@@ -0,0 +1,85 @@
+import pickle
+from copy import copy
+from datetime import datetime
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import TickData, BarData, CompactTickData, CompactBarData, TickBatch
+
+
+def create_tick(tick_class: type, i: int = 0) -> TickData:
+    """"""
+    return tick_class(
+        symbol="rb2401",
+        exchange=Exchange.SHFE,
+        datetime=datetime(2024, 1, 2, 9, 0, i),
+        last_price=3000 + i,
+        bid_price_1=2999 + i,
+        ask_price_1=3001 + i,
+        volume=100 * i,
+        gateway_name="TEST"
+    )
+
+
+def create_bar(bar_class: type) -> BarData:
+    """"""
+    return bar_class(
+        symbol="rb2401",
+        exchange=Exchange.SHFE,
+        datetime=datetime(2024, 1, 2, 9),
+        interval=Interval.MINUTE,
+        open_price=3000,
+        close_price=3001,
+        gateway_name="TEST"
+    )
+
+
+class TestCompactData:
+    """Test compact data classes against regular data classes"""
+
+    def test_attributes(self) -> None:
+        """Test compact objects expose the same attributes and dict"""
+        for regular, compact in [
+            (create_tick(TickData), create_tick(CompactTickData)),
+            (create_bar(BarData), create_bar(CompactBarData))
+        ]:
+            assert not hasattr(compact, "__weakref__")
+            assert compact.__dict__ == regular.__dict__
+            assert list(compact.__dict__) == list(regular.__dict__)
+            assert compact.vt_symbol is regular.vt_symbol
+
+            compact.extra = {"source": "test"}
+            assert compact.__dict__["extra"] == {"source": "test"}
+
+    def test_pickle(self) -> None:
+        """Test compact objects survive pickling and copying"""
+        tick: CompactTickData = create_tick(CompactTickData, 5)
+        tick.localtime = datetime(2024, 1, 2, 9, 0, 6)
+
+        for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+            assert pickle.loads(pickle.dumps(tick, protocol)) == tick
+
+        new_tick: CompactTickData = copy(tick)
+        new_tick.last_price = 0
+        assert new_tick != tick
+        assert tick.last_price == 3005
+
+
+class TestTickBatch:
+    """Test struct-of-arrays tick storage"""
+
+    def test_round_trip(self) -> None:
+        """Test ticks are restored from batch"""
+        ticks: list[TickData] = [create_tick(TickData, i) for i in range(10)]
+        batch: TickBatch = TickBatch.from_ticks(ticks)
+
+        assert len(batch) == 10
+        assert batch["last_price"].tolist() == [tick.last_price for tick in ticks]
+        assert batch.to_ticks() == ticks
+        assert [tick.__dict__ for tick in batch.to_ticks(compact=True)] == [tick.__dict__ for tick in ticks]
+
+    def test_empty(self) -> None:
+        """"""
+        batch: TickBatch = TickBatch.from_ticks([])
+
+        assert len(batch) == 0
+        assert batch.to_ticks() == []
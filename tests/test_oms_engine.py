@@ -0,0 +1,107 @@
+from pathlib import Path
+
+import pytest
+
+from vnpy.event import Event, EventEngine
+from vnpy.trader.constant import Direction, Exchange, Offset, Status
+from vnpy.trader.engine import OmsEngine
+from vnpy.trader.event import EVENT_ORDER, EVENT_TRADE
+from vnpy.trader.object import OrderData, TradeData
+from vnpy.trader.setting import SETTINGS
+
+
+def create_order(i: int, status: Status) -> OrderData:
+    """Create order on one of 2 symbols and 2 gateways"""
+    return OrderData(
+        symbol=f"symbol{i % 2}",
+        exchange=Exchange.LOCAL,
+        orderid=str(i),
+        direction=Direction.LONG,
+        offset=Offset.OPEN,
+        volume=1,
+        status=status,
+        gateway_name=f"GATEWAY{i % 3 // 2}"
+    )
+
+
+def create_trade(i: int) -> TradeData:
+    """Create trade of the order"""
+    return TradeData(
+        symbol=f"symbol{i % 2}",
+        exchange=Exchange.LOCAL,
+        orderid=str(i),
+        tradeid=str(i),
+        direction=Direction.LONG,
+        offset=Offset.OPEN,
+        volume=1,
+        gateway_name=f"GATEWAY{i % 3 // 2}"
+    )
+
+
+@pytest.fixture
+def engine(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> OmsEngine:
+    """Create OMS engine with 10 minutes retention, holding 12 orders and trades."""
+    monkeypatch.setitem(SETTINGS, "oms.retention", 10)
+    monkeypatch.setitem(SETTINGS, "oms.archive", str(tmp_path.joinpath("oms_archive.db")))
+
+    engine = OmsEngine(None, EventEngine())
+
+    for i in range(12):
+        engine.process_order_event(Event(EVENT_ORDER, create_order(i, Status.NOTTRADED)))
+
+        if i % 4:
+            engine.process_order_event(Event(EVENT_ORDER, create_order(i, Status.ALLTRADED)))
+            engine.process_trade_event(Event(EVENT_TRADE, create_trade(i)))
+
+    yield engine
+
+    engine.close()
+
+
+def get_ids(orders) -> list[str]:
+    """"""
+    return [order.orderid for order in orders]
+
+
+class TestOmsEngine:
+    """Test OMS indexes and archival"""
+
+    def test_indexes(self, engine: OmsEngine) -> None:
+        """Test indexed accessors give the same data as filtering all data"""
+        for vt_symbol in ["", "symbol0.LOCAL", "symbol1.LOCAL"]:
+            for gateway_name in ["", "GATEWAY0", "GATEWAY1"]:
+                def match(data) -> bool:
+                    return (
+                        (not vt_symbol or data.vt_symbol == vt_symbol)
+                        and (not gateway_name or data.gateway_name == gateway_name)
+                    )
+
+                orders = engine.iter_orders(vt_symbol, gateway_name)
+                assert get_ids(orders) == get_ids(filter(match, engine.get_all_orders()))
+
+                active_orders = engine.iter_active_orders(vt_symbol, gateway_name)
+                assert get_ids(active_orders) == get_ids(filter(match, engine.get_all_active_orders()))
+
+                trades = engine.iter_trades(vt_symbol, gateway_name)
+                assert get_ids(trades) == get_ids(filter(match, engine.get_all_trades()))
+
+        assert get_ids(engine.iter_active_orders()) == ["0", "4", "8"]
+
+    def test_archive(self, engine: OmsEngine) -> None:
+        """Test finished orders and trades older than retention are archived"""
+        # Orders 1 to 6 finished 20 minutes ago
+        for vt_orderid in list(engine.finished_times)[:5]:
+            engine.finished_times[vt_orderid] -= 20 * 60
+            engine.trade_times[vt_orderid] -= 20 * 60
+
+        engine.archive_data()
+
+        assert get_ids(engine.iter_orders()) == ["0", "4", "7", "8", "9", "10", "11"]
+        assert get_ids(engine.iter_orders("symbol1.LOCAL")) == ["7", "9", "11"]
+        assert get_ids(engine.iter_trades()) == ["7", "9", "10", "11"]
+        assert engine.get_order("GATEWAY0.1") is None
+
+        assert get_ids(engine.load_archived_orders()) == ["1", "2", "3", "5", "6"]
+        assert get_ids(engine.load_archived_orders("symbol1.LOCAL")) == ["1", "3", "5"]
+        assert get_ids(engine.load_archived_trades(gateway_name="GATEWAY1")) == ["2", "5"]
+        assert engine.archive.load_order("GATEWAY0.1").status == Status.ALLTRADED
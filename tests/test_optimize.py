@@ -0,0 +1,182 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from vnpy.trader.optimize import (
+    EvaluationCache,
+    OptimizationSetting,
+    OptimizationStudy,
+    get_context_key,
+    run_ga_optimization,
+    run_sh_optimization
+)
+
+
+def evaluate(setting: dict, budget: float = 1) -> tuple:
+    """Target is only accurate with full budget"""
+    x: int = setting["x"]
+    y: int = setting["y"]
+
+    target: float = -(x - 7) ** 2 - (y - 3) ** 2 + (1 - budget) * (x % 2)
+    return (setting, target, {"budget": budget})
+
+
+def fail_evaluate(setting: dict) -> tuple:
+    """Evaluate function for settings expected to be cached"""
+    raise RuntimeError(f"Setting evaluated: {setting}")
+
+
+def get_target_value(result: tuple) -> float:
+    """"""
+    return result[1]
+
+
+def create_setting() -> OptimizationSetting:
+    """Create setting with 81 parameter combinations"""
+    optimization_setting = OptimizationSetting()
+    optimization_setting.add_parameter("x", 0, 8, 1)
+    optimization_setting.add_parameter("y", 0, 8, 1)
+    optimization_setting.set_target("target")
+    return optimization_setting
+
+
+def run(study_path: str = "", hyperband: bool = False, context_key: str = "") -> list[tuple]:
+    """"""
+    return run_sh_optimization(
+        evaluate,
+        create_setting(),
+        get_target_value,
+        max_workers=2,
+        min_budget=1 / 9,
+        eta=3,
+        hyperband=hyperband,
+        study_path=study_path,
+        context_key=context_key,
+        output=lambda msg: None
+    )
+
+
+class TestSuccessiveHalving:
+    """Test successive halving optimization with study file"""
+
+    def test_halving(self, tmp_path: Path) -> None:
+        """Test settings are promoted from short to full budget"""
+        study_path: str = str(tmp_path.joinpath("study.pkl"))
+        results: list[tuple] = run(study_path)
+
+        assert len(results) == 9
+        assert results[0][0] == {"x": 7, "y": 3}
+        assert all(result[2]["budget"] == 1 for result in results)
+
+        # 81 + 27 + 9 evaluations saved
+        study = OptimizationStudy(study_path)
+        budgets: list[float] = [key[1] for key in study.results]
+        assert len(budgets) == 117
+        assert budgets.count(1) == 9
+
+    def test_resume(self, tmp_path: Path) -> None:
+        """Test interrupted optimization is resumed from study file"""
+        study_path: Path = tmp_path.joinpath("study.pkl")
+        results: list[tuple] = run(str(study_path))
+        size: int = study_path.stat().st_size
+
+        # Resume after interruption in the middle of writing a record
+        with open(study_path, "rb+") as f:
+            f.truncate(size - 10)
+
+        assert len(OptimizationStudy(str(study_path)).results) == 116
+        assert run(str(study_path)) == results
+        assert study_path.stat().st_size == size
+
+        # Nothing is evaluated again once completed
+        assert run(str(study_path)) == results
+        assert study_path.stat().st_size == size
+
+    def test_context(self, tmp_path: Path) -> None:
+        """Test results saved for another backtesting context are discarded"""
+        study_path: str = str(tmp_path.joinpath("study.pkl"))
+        run(study_path, context_key="a")
+        assert len(OptimizationStudy(study_path, "a").results) == 117
+
+        study = OptimizationStudy(study_path, "b")
+        assert study.discarded == 117
+        assert not study.results
+
+        run(study_path, context_key="b")
+        assert len(OptimizationStudy(study_path, "b").results) == 117
+        assert OptimizationStudy(study_path, "a").discarded == 117
+
+    def test_hyperband(self, tmp_path: Path) -> None:
+        """Test hyperband brackets share results of duplicate settings"""
+        study_path: str = str(tmp_path.joinpath("study.pkl"))
+        results: list[tuple] = run(study_path, hyperband=True)
+
+        assert results
+        assert all(result[2]["budget"] == 1 for result in results)
+        assert len({tuple(result[0].items()) for result in results}) == len(results)
+
+        # Bracket sizes are 9 + 3 + 1, 5 + 1 and 3 settings
+        study = OptimizationStudy(study_path)
+        assert len(study.results) <= 22
+
+
+def run_ga(evaluate_func, cache_path: str, cache_key: str = "context") -> tuple[list[tuple], list[str]]:
+    """Run ga optimization on 9 settings, return results and output messages"""
+    optimization_setting = OptimizationSetting()
+    optimization_setting.add_parameter("x", 6, 8, 1)
+    optimization_setting.add_parameter("y", 2, 4, 1)
+    optimization_setting.set_target("target")
+
+    messages: list[str] = []
+    random.seed(1)
+
+    results: list[tuple] = run_ga_optimization(
+        evaluate_func,
+        optimization_setting,
+        get_target_value,
+        max_workers=2,
+        pop_size=30,
+        ngen=3,
+        output=messages.append,
+        cache_path=cache_path,
+        cache_key=cache_key
+    )
+    return results, messages
+
+
+class TestEvaluationCache:
+    """Test evaluation cache of genetic algorithm optimization"""
+
+    def test_persistent(self, tmp_path: Path) -> None:
+        """Test results are evaluated once and shared with next run"""
+        cache_path: str = str(tmp_path.joinpath("cache.db"))
+        results, messages = run_ga(evaluate, cache_path)
+
+        assert len(results) == 9
+        assert results[0][0] == {"x": 7, "y": 3}
+
+        # Only 9 distinct settings are evaluated
+        requests: int = int(messages[-1].split("requests: ")[1].split(",")[0])
+        assert f"hits: {requests - 9} (disk: 0)" in messages[-1]
+
+        cache = EvaluationCache(cache_path, "context")
+        assert cache.load([{"x": 7, "y": 3}, {"x": 0, "y": 0}]) == [results[0], None]
+        cache.close()
+
+        # Nothing is evaluated again
+        cached_results, messages = run_ga(fail_evaluate, cache_path)
+        assert cached_results == results
+        assert "(disk: 9), hit rate: 100%" in messages[-1]
+
+        # Results of other context are not used
+        with pytest.raises(RuntimeError):
+            run_ga(fail_evaluate, cache_path, "other")
+
+    def test_context_key(self) -> None:
+        """"""
+        key: str = get_context_key(OptimizationSetting, "rb2501.SHFE", 0.0001)
+
+        assert key == get_context_key(OptimizationSetting, "rb2501.SHFE", 0.0001)
+        assert key != get_context_key(OptimizationSetting, "rb2501.SHFE", 0.0002)
+        assert key != get_context_key(OptimizationStudy, "rb2501.SHFE", 0.0001)
@@ -0,0 +1,163 @@
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData
+from vnpy.trader.utility import ZoneInfo
+from vnpy_portfoliostrategy import StrategyTemplate
+from vnpy_portfoliostrategy import backtesting
+from vnpy_portfoliostrategy.backtesting import BacktestingEngine
+
+
+START: datetime = datetime(2024, 1, 1, 9, tzinfo=ZoneInfo("Asia/Shanghai"))
+
+VT_SYMBOLS: list[str] = ["rb2501.SHFE", "hc2501.SHFE", "i2501.DCE"]
+
+
+class RandomStrategy(StrategyTemplate):
+    """Strategy trading randomly, also on symbols without bar of current time"""
+
+    seed: int = 0
+    trade_ratio: float = 0.2
+
+    parameters = ["seed", "trade_ratio"]
+
+    def on_init(self) -> None:
+        """"""
+        self.rng: random.Random = random.Random(self.seed)
+        self.last_prices: dict[str, float] = {}
+
+        self.load_bars(1)
+
+    def on_bars(self, bars: dict[str, BarData]) -> None:
+        """"""
+        self.cancel_all()
+
+        for vt_symbol, bar in bars.items():
+            self.last_prices[vt_symbol] = bar.close_price
+
+        if not self.trading:
+            return
+
+        for vt_symbol, price in self.last_prices.items():
+            if self.rng.random() >= self.trade_ratio:
+                continue
+
+            volume: int = self.rng.randint(1, 3)
+            pos: int = self.get_pos(vt_symbol)
+
+            if pos > 0:
+                self.sell(vt_symbol, price - 5, min(volume, pos))
+            elif pos < 0:
+                self.cover(vt_symbol, price + 5, min(volume, -pos))
+            elif self.rng.random() > 0.5:
+                self.buy(vt_symbol, price + self.rng.choice([-10, 5]), volume)
+            else:
+                self.short(vt_symbol, price - self.rng.choice([-10, 5]), volume)
+
+
+def create_bars(vt_symbol: str, seed: int) -> list[BarData]:
+    """Create random walk minute bars, with missing bars and late listing"""
+    rng = random.Random(seed)
+    symbol, exchange = vt_symbol.split(".")
+    price: float = 3000
+    bars: list[BarData] = []
+
+    for day in range(30):
+        for i in range(20):
+            if rng.random() < 0.3 or (seed == 3 and day < 5):
+                continue
+
+            price = float(round(price + rng.gauss(0, 8)))
+
+            bar = BarData(
+                symbol=symbol,
+                exchange=Exchange(exchange),
+                datetime=START + timedelta(days=day, minutes=i),
+                interval=Interval.MINUTE,
+                open_price=price,
+                high_price=price + 3,
+                low_price=price - 3,
+                close_price=price,
+                volume=100,
+                gateway_name="DB"
+            )
+            bars.append(bar)
+
+    return bars
+
+
+@pytest.fixture
+def history(monkeypatch: pytest.MonkeyPatch) -> dict[str, list[BarData]]:
+    """Replace database loading with generated bars"""
+    history: dict[str, list[BarData]] = {
+        vt_symbol: create_bars(vt_symbol, seed)
+        for seed, vt_symbol in enumerate(VT_SYMBOLS, start=1)
+    }
+
+    def load_bar_data(vt_symbol: str, interval: Interval, start: datetime, end: datetime) -> list[BarData]:
+        return [bar for bar in history[vt_symbol] if start <= bar.datetime <= end]
+
+    monkeypatch.setattr(backtesting, "load_bar_data", load_bar_data)
+    return history
+
+
+def run_backtesting(panel: bool, setting: dict) -> tuple[BacktestingEngine, dict]:
+    """Run random strategy on generated bars"""
+    engine = BacktestingEngine()
+    engine.output = lambda msg: None
+    engine.set_parameters(
+        vt_symbols=VT_SYMBOLS,
+        interval=Interval.MINUTE,
+        start=START,
+        end=START + timedelta(days=40),
+        rates={vt_symbol: 0.0001 for vt_symbol in VT_SYMBOLS},
+        slippages={vt_symbol: 0.3 for vt_symbol in VT_SYMBOLS},
+        sizes={vt_symbol: 10 for vt_symbol in VT_SYMBOLS},
+        priceticks={vt_symbol: 1 for vt_symbol in VT_SYMBOLS},
+        capital=1_000_000,
+        panel=panel
+    )
+    engine.add_strategy(RandomStrategy, setting)
+
+    engine.load_data()
+    engine.run_backtesting()
+    engine.calculate_result()
+    statistics: dict = engine.calculate_statistics(output=False)
+
+    return engine, statistics
+
+
+class TestPanelReplay:
+    """Test panel replay mode against dict based replay"""
+
+    @pytest.mark.parametrize("seed", [1, 2])
+    def test_replay(self, history: dict, seed: int) -> None:
+        """Test trades, daily results and statistics are identical"""
+        dict_engine, dict_statistics = run_backtesting(False, {"seed": seed})
+        panel_engine, panel_statistics = run_backtesting(True, {"seed": seed})
+
+        assert len(dict_engine.trades) > 100
+        assert list(dict_engine.trades.values()) == list(panel_engine.trades.values())
+        assert dict_engine.daily_df.equals(panel_engine.daily_df)
+        assert dict_statistics == panel_statistics
+
+    def test_panel(self, history: dict) -> None:
+        """Test missing bars are filled with last close price"""
+        engine, _ = run_backtesting(True, {"trade_ratio": 0})
+
+        assert not engine.history_data
+        assert engine.panel_dts == sorted({bar.datetime for bars in history.values() for bar in bars})
+
+        # Late listed symbol has no price before first bar
+        first_bar: BarData = history["i2501.DCE"][0]
+        first_ix: int = engine.panel_dts.index(first_bar.datetime)
+        assert np.isnan(engine.panel_prices[:first_ix, 2]).all()
+
+        for ix in range(first_ix, len(engine.panel_dts)):
+            if not engine.panel_present[ix, 2]:
+                close_price: float = engine.panel_prices[ix - 1, 2, 3]
+                assert engine.panel_prices[ix, 2].tolist() == [close_price] * 4
@@ -0,0 +1,169 @@
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from threading import Lock
+from time import sleep
+
+import pytest
+
+from vnpy.event import EventEngine
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import DB_TZ
+from vnpy.trader.engine import MainEngine
+from vnpy.trader.object import BarData
+from vnpy_portfoliostrategy import StrategyEngine, StrategyTemplate
+
+
+class WarmupStrategy(StrategyTemplate):
+    """Strategy recording bars pushed on init"""
+
+    days: int = 10
+    parameters = ["days"]
+
+    def on_init(self) -> None:
+        """"""
+        self.records: list[dict] = []
+        self.load_bars(self.days)
+
+    def on_bars(self, bars: dict[str, BarData]) -> None:
+        """"""
+        self.records.append(snapshot(bars))
+
+
+def snapshot(bars: dict[str, BarData]) -> dict:
+    """"""
+    return {
+        vt_symbol: (bar.datetime, bar.open_price, bar.close_price, bar.volume)
+        for vt_symbol, bar in bars.items()
+    }
+
+
+def create_bars(vt_symbol: str, days: int) -> list[BarData]:
+    """Create 4 bars per day with missing ones, different for each symbol"""
+    symbol, exchange = vt_symbol.split(".")
+    end: datetime = datetime.now(DB_TZ).replace(minute=0, second=0, microsecond=0)
+    bars: list[BarData] = []
+
+    for i in reversed(range(days * 4)):
+        rng = random.Random(f"{vt_symbol}{i}")
+        if rng.random() < 0.3:
+            continue
+
+        price: float = float(rng.randint(100, 200))
+        bars.append(BarData(
+            symbol=symbol,
+            exchange=Exchange(exchange),
+            datetime=end - timedelta(hours=i * 6),
+            interval=Interval.HOUR,
+            open_price=price,
+            close_price=price + 1,
+            volume=10,
+            gateway_name="TEST"
+        ))
+
+    return bars
+
+
+def replay_bars(vt_symbols: list[str], symbol_bars: list[list[BarData]]) -> list[dict]:
+    """Bars pushed by previous load_bars, with history data dict of all symbols"""
+    history_data: dict[tuple, BarData] = {}
+    for vt_symbol, data in zip(vt_symbols, symbol_bars):
+        for bar in data:
+            history_data[(bar.datetime, vt_symbol)] = bar
+
+    dts: list[datetime] = sorted({dt for dt, _ in history_data})
+    bars: dict[str, BarData] = {}
+    records: list[dict] = []
+
+    for dt in dts:
+        for vt_symbol in vt_symbols:
+            bar: BarData | None = history_data.get((dt, vt_symbol), None)
+
+            if bar:
+                bars[vt_symbol] = bar
+            elif vt_symbol in bars:
+                old_bar: BarData = bars[vt_symbol]
+                bars[vt_symbol] = BarData(
+                    symbol=old_bar.symbol,
+                    exchange=old_bar.exchange,
+                    datetime=dt,
+                    open_price=old_bar.close_price,
+                    close_price=old_bar.close_price,
+                    gateway_name=old_bar.gateway_name
+                )
+
+        records.append(snapshot(bars))
+
+    return records
+
+
+class CountingStrategyEngine(StrategyEngine):
+    """Strategy engine counting history queries"""
+
+    def __init__(self, main_engine: MainEngine, event_engine: EventEngine) -> None:
+        """"""
+        super().__init__(main_engine, event_engine)
+
+        self.queries: list[tuple] = []
+        self.query_lock: Lock = Lock()
+
+    def load_bar(self, vt_symbol: str, days: int, interval: Interval) -> list[BarData]:
+        """"""
+        with self.query_lock:
+            self.queries.append((vt_symbol, days))
+
+        sleep(0.05)
+        return create_bars(vt_symbol, days)
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> CountingStrategyEngine:
+    """Create engine with strategies on overlapping symbols"""
+    event_engine = EventEngine()
+    main_engine = MainEngine(event_engine)
+
+    engine = CountingStrategyEngine(main_engine, event_engine)
+    engine.setting_filename = str(tmp_path.joinpath("setting.json"))
+    engine.classes["WarmupStrategy"] = WarmupStrategy
+
+    vt_symbols: list[str] = [f"{i:06d}.SSE" for i in range(20)]
+    engine.add_strategy("WarmupStrategy", "strategy1", vt_symbols[:15], {"days": 10})
+    engine.add_strategy("WarmupStrategy", "strategy2", vt_symbols[5:], {"days": 5})
+
+    yield engine
+
+    engine.init_executor.shutdown()
+    engine.load_executor.shutdown()
+    main_engine.close()
+
+
+class TestLoadBars:
+    """Test history loading of strategy initialization"""
+
+    def test_init_all(self, engine: CountingStrategyEngine) -> None:
+        """Test history is shared by strategies with aligned bars pushed"""
+        for future in engine.init_all_strategies().values():
+            future.result()
+
+        # Overlapping symbols are served by cached longer history
+        assert len(engine.queries) == 20
+        assert not engine.history_cache
+
+        for strategy in engine.strategies.values():
+            assert strategy.inited
+
+            symbol_bars: list[list[BarData]] = [
+                create_bars(vt_symbol, strategy.days) for vt_symbol in strategy.vt_symbols
+            ]
+            assert strategy.records == replay_bars(strategy.vt_symbols, symbol_bars)
+
+    def test_load_bars_after_init(self, engine: CountingStrategyEngine) -> None:
+        """Test history is not cached outside initialization"""
+        strategy: WarmupStrategy = engine.strategies["strategy2"]
+        strategy.records = []
+
+        strategy.load_bars(3)
+        strategy.load_bars(3)
+
+        assert len(engine.queries) == 30
+        assert len(strategy.records) > 10
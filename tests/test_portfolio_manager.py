@@ -0,0 +1,193 @@
+from pathlib import Path
+from datetime import datetime
+
+import pytest
+
+from vnpy.event import Event, EventEngine
+from vnpy.trader.constant import Direction, Exchange, Product
+from vnpy.trader.event import EVENT_TICK, EVENT_TRADE, EVENT_ORDER
+from vnpy.trader.object import ContractData, OrderData, TickData, TradeData, SubscribeRequest
+from vnpy_portfoliomanager.engine import PortfolioEngine, EVENT_PM_SNAPSHOT
+from vnpy_portfoliomanager.base import ContractResult
+
+
+SYMBOLS: list[str] = ["rb2501", "hc2501", "i2501"]
+
+
+class FakeMainEngine:
+    """Main engine providing ticks and contracts of the test"""
+
+    def __init__(self) -> None:
+        """"""
+        self.ticks: dict[str, TickData] = {}
+        self.contracts: dict[str, ContractData] = {}
+
+        for symbol in SYMBOLS:
+            contract = ContractData(
+                symbol=symbol,
+                exchange=Exchange.SHFE,
+                name=symbol,
+                product=Product.FUTURES,
+                size=10,
+                pricetick=1,
+                gateway_name="TEST"
+            )
+            self.contracts[contract.vt_symbol] = contract
+
+    def get_tick(self, vt_symbol: str) -> TickData | None:
+        """"""
+        return self.ticks.get(vt_symbol, None)
+
+    def get_contract(self, vt_symbol: str) -> ContractData | None:
+        """"""
+        return self.contracts.get(vt_symbol, None)
+
+    def subscribe(self, req: SubscribeRequest, gateway_name: str) -> None:
+        """"""
+        pass
+
+
+class RecordingEventEngine(EventEngine):
+    """Event engine recording snapshot events instead of processing"""
+
+    def __init__(self) -> None:
+        """"""
+        super().__init__()
+        self.snapshots: list[dict] = []
+
+    def put(self, event: Event) -> None:
+        """"""
+        if event.type == EVENT_PM_SNAPSHOT:
+            self.snapshots.append(event.data)
+
+
+class CountingContractResult(ContractResult):
+    """Contract result counting recalculations"""
+
+    count: int = 0
+
+    def calculate_pnl(self) -> None:
+        """"""
+        CountingContractResult.count += 1
+        super().calculate_pnl()
+
+
+@pytest.fixture
+def engine(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> PortfolioEngine:
+    """Create engine with files in temporary folder"""
+    monkeypatch.setattr("vnpy_portfoliomanager.engine.ContractResult", CountingContractResult)
+    monkeypatch.setattr(PortfolioEngine, "setting_filename", str(tmp_path.joinpath("setting.json")))
+    monkeypatch.setattr(PortfolioEngine, "data_filename", str(tmp_path.joinpath("data.json")))
+    monkeypatch.setattr(PortfolioEngine, "order_filename", str(tmp_path.joinpath("order.json")))
+
+    engine = PortfolioEngine(FakeMainEngine(), RecordingEventEngine())
+
+    CountingContractResult.count = 0
+    return engine
+
+
+def update_tick(engine: PortfolioEngine, symbol: str, last_price: float) -> None:
+    """Update tick in main engine and push tick event"""
+    tick = TickData(
+        symbol=symbol,
+        exchange=Exchange.SHFE,
+        datetime=datetime.now(),
+        last_price=last_price,
+        pre_close=100,
+        gateway_name="TEST"
+    )
+    engine.main_engine.ticks[tick.vt_symbol] = tick
+    engine.process_tick_event(Event(EVENT_TICK, tick))
+
+
+def send_trade(engine: PortfolioEngine, reference: str, symbol: str, direction: Direction, price: float) -> None:
+    """Push order and trade events of reference"""
+    orderid: str = f"{reference}{symbol}{len(engine.order_reference_map)}"
+
+    order = OrderData(
+        symbol=symbol,
+        exchange=Exchange.SHFE,
+        orderid=orderid,
+        reference=reference,
+        gateway_name="TEST"
+    )
+    engine.process_order_event(Event(EVENT_ORDER, order))
+
+    trade = TradeData(
+        symbol=symbol,
+        exchange=Exchange.SHFE,
+        orderid=orderid,
+        tradeid=orderid,
+        direction=direction,
+        price=price,
+        volume=1,
+        gateway_name="TEST"
+    )
+    engine.process_trade_event(Event(EVENT_TRADE, trade))
+
+
+class TestIncrementalPnl:
+    """Test dirty tracking and batched snapshot of portfolio engine"""
+
+    def test_snapshot(self, engine: PortfolioEngine) -> None:
+        """Test only changed results are recalculated and published"""
+        for symbol in SYMBOLS:
+            update_tick(engine, symbol, 100)
+
+        send_trade(engine, "A", "rb2501", Direction.LONG, 100)
+        send_trade(engine, "A", "hc2501", Direction.SHORT, 100)
+        send_trade(engine, "B", "rb2501", Direction.SHORT, 100)
+        engine.publish_snapshot()
+
+        assert CountingContractResult.count == 3
+        assert len(engine.event_engine.snapshots) == 1
+        assert len(engine.event_engine.snapshots[0]["contracts"]) == 3
+        assert len(engine.event_engine.snapshots[0]["portfolios"]) == 2
+
+        # Nothing is recalculated or published without updates
+        engine.publish_snapshot()
+        assert CountingContractResult.count == 3
+        assert len(engine.event_engine.snapshots) == 1
+
+        # Tick of hc2501 only changes portfolio A
+        update_tick(engine, "hc2501", 105)
+        engine.publish_snapshot()
+
+        assert CountingContractResult.count == 4
+        snapshot: dict = engine.event_engine.snapshots[-1]
+        assert [(d["reference"], d["vt_symbol"]) for d in snapshot["contracts"]] == [("A", "hc2501.SHFE")]
+        assert [d["reference"] for d in snapshot["portfolios"]] == ["A"]
+        assert snapshot["contracts"][0]["trading_pnl"] == -50
+
+        # Unchanged price is recalculated but not published
+        update_tick(engine, "hc2501", 105)
+        engine.publish_snapshot()
+        assert len(engine.event_engine.snapshots) == 2
+
+        # Monitor created later gets all results, including unchanged ones
+        snapshot = engine.get_snapshot()
+        assert sorted((d["reference"], d["vt_symbol"]) for d in snapshot["contracts"]) == [
+            ("A", "hc2501.SHFE"), ("A", "rb2501.SHFE"), ("B", "rb2501.SHFE")
+        ]
+        assert sorted(d["reference"] for d in snapshot["portfolios"]) == ["A", "B"]
+
+    def test_portfolio_total(self, engine: PortfolioEngine) -> None:
+        """Test incremental portfolio results equal sum of contract results"""
+        prices: list[float] = [100, 103, 98, 101, 110, 95, 99]
+
+        for i, price in enumerate(prices):
+            for j, symbol in enumerate(SYMBOLS):
+                update_tick(engine, symbol, price + j)
+
+            direction: Direction = Direction.LONG if i % 2 else Direction.SHORT
+            send_trade(engine, "A" if i % 3 else "B", SYMBOLS[i % 3], direction, price)
+            engine.publish_snapshot()
+
+        for reference, portfolio_result in engine.portfolio_results.items():
+            contract_results: list[ContractResult] = [
+                r for r in engine.contract_results.values() if r.reference == reference
+            ]
+
+            for name in ["trading_pnl", "holding_pnl", "total_pnl"]:
+                total: float = sum(getattr(r, name) for r in contract_results)
+                assert getattr(portfolio_result, name) == pytest.approx(total)
@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import DB_TZ, BarOverview, TickOverview
+from vnpy.trader.object import BarData, TickData
+from vnpy_sqlite.sqlite_database import SqliteDatabase, db, pragmas
+
+
+START: datetime = datetime(2024, 3, 1, 9, 0, tzinfo=DB_TZ)
+
+
+def create_bars(start: int, end: int) -> list[BarData]:
+    """Create minute bars with index in [start, end)"""
+    bars: list[BarData] = []
+
+    for i in range(start, end):
+        bar = BarData(
+            symbol="rb2405",
+            exchange=Exchange.SHFE,
+            datetime=START + timedelta(minutes=i),
+            interval=Interval.MINUTE,
+            volume=i,
+            open_price=3000 + i,
+            high_price=3002 + i,
+            low_price=2998 + i,
+            close_price=3001 + i,
+            gateway_name="DB"
+        )
+        bars.append(bar)
+
+    return bars
+
+
+def to_bar_df(bars: list[BarData]) -> pl.DataFrame:
+    """"""
+    return pl.DataFrame({
+        "datetime": [bar.datetime for bar in bars],
+        "open_price": [bar.open_price for bar in bars],
+        "high_price": [bar.high_price for bar in bars],
+        "low_price": [bar.low_price for bar in bars],
+        "close_price": [bar.close_price for bar in bars],
+        "volume": [bar.volume for bar in bars],
+    }).with_columns(pl.col("datetime").dt.convert_time_zone(DB_TZ.key))
+
+
+@pytest.fixture
+def database(tmp_path: Path) -> SqliteDatabase:
+    """Create database in temporary folder."""
+    db.init(str(tmp_path.joinpath("database.db")), pragmas=pragmas)
+
+    yield SqliteDatabase()
+
+    db.close()
+
+
+def load_bars(database: SqliteDatabase) -> list[BarData]:
+    """"""
+    return database.load_bar_data("rb2405", Exchange.SHFE, Interval.MINUTE, START - timedelta(days=1), START + timedelta(days=1))
+
+
+def get_bar_overview(database: SqliteDatabase) -> BarOverview:
+    """"""
+    overviews: list[BarOverview] = database.get_bar_overview()
+    assert len(overviews) == 1
+    return overviews[0]
+
+
+class TestSqliteDatabase:
+    """Test object and columnar write paths of sqlite database"""
+
+    def test_save_bar_data(self, database: SqliteDatabase) -> None:
+        """Test bars are saved without being modified, and overview is updated with overlapping data"""
+        bars: list[BarData] = create_bars(0, 100)
+        database.save_bar_data(bars)
+
+        assert bars[0].datetime == START
+        assert bars[0].__dict__["exchange"] is Exchange.SHFE
+
+        database.save_bar_data(create_bars(50, 150))
+        database.save_bar_data(create_bars(150, 160), stream=True)
+
+        assert load_bars(database) == create_bars(0, 160)
+
+        overview: BarOverview = get_bar_overview(database)
+        assert overview.count == 160
+        assert overview.start == START.replace(tzinfo=None)
+        assert overview.end == (START + timedelta(minutes=159)).replace(tzinfo=None)
+
+    def test_save_bar_df(self, database: SqliteDatabase) -> None:
+        """Test columnar bulk write gives the same data and overview"""
+        database.save_bar_df(to_bar_df(create_bars(100, 200)), "rb2405", Exchange.SHFE, Interval.MINUTE)
+        database.save_bar_df(to_bar_df(create_bars(0, 120)), "rb2405", Exchange.SHFE, Interval.MINUTE)
+
+        assert load_bars(database) == create_bars(0, 200)
+
+        overview: BarOverview = get_bar_overview(database)
+        assert overview.count == 200
+        assert overview.start == START.replace(tzinfo=None)
+
+    def test_save_tick_df(self, database: SqliteDatabase) -> None:
+        """Test ticks saved in columnar form are loaded like ticks saved as objects"""
+        ticks: list[TickData] = [
+            TickData(
+                symbol="rb2405",
+                exchange=Exchange.SHFE,
+                datetime=START + timedelta(seconds=i / 2),
+                name="rb2405",
+                last_price=3000 + i,
+                bid_price_1=2999 + i,
+                ask_price_1=3001 + i,
+                gateway_name="DB"
+            )
+            for i in range(100)
+        ]
+        database.save_tick_data(ticks[:60])
+
+        df: pl.DataFrame = pl.DataFrame({
+            "datetime": [tick.datetime for tick in ticks[40:]],
+            "name": "rb2405",
+            "last_price": [tick.last_price for tick in ticks[40:]],
+            "bid_price_1": [tick.bid_price_1 for tick in ticks[40:]],
+            "ask_price_1": [tick.ask_price_1 for tick in ticks[40:]],
+        }).with_columns(pl.col("datetime").dt.convert_time_zone(DB_TZ.key))
+        database.save_tick_df(df, "rb2405", Exchange.SHFE)
+
+        loaded: list[TickData] = database.load_tick_data("rb2405", Exchange.SHFE, START - timedelta(days=1), START + timedelta(days=1))
+        assert loaded == ticks
+
+        overviews: list[TickOverview] = database.get_tick_overview()
+        assert overviews[0].count == 100
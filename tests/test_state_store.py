@@ -0,0 +1,93 @@
+import json
+from pathlib import Path
+
+from vnpy.trader.utility import StateStore
+
+
+def create_store(tmp_path: Path, **kwargs) -> StateStore:
+    """Create store with data file in temp folder"""
+    return StateStore(str(tmp_path.joinpath("strategy_data.json")), **kwargs)
+
+
+class TestStateStore:
+    """Test write-behind journaled state store"""
+
+    def test_close_and_load(self, tmp_path: Path) -> None:
+        """Test data is saved into snapshot file on close"""
+        store: StateStore = create_store(tmp_path)
+        assert store.load() == {}
+
+        for i in range(100):
+            store.put("strategy1", {"pos": i})
+        store.put("strategy2", {"pos": -1})
+        store.put("strategy3", {"pos": 2})
+        store.remove("strategy3")
+        store.close()
+
+        with open(store.file_path, encoding="UTF-8") as f:
+            assert json.load(f) == {"strategy1": {"pos": 99}, "strategy2": {"pos": -1}}
+
+        assert create_store(tmp_path).load() == {"strategy1": {"pos": 99}, "strategy2": {"pos": -1}}
+
+    def test_close_without_load(self, tmp_path: Path) -> None:
+        """Test snapshot is kept when store is closed without loading"""
+        store: StateStore = create_store(tmp_path)
+        store.load()
+        store.put("strategy1", {"pos": 5})
+        store.close()
+
+        create_store(tmp_path).close()
+
+        with open(store.file_path, encoding="UTF-8") as f:
+            assert json.load(f) == {"strategy1": {"pos": 5}}
+
+        # Updates before load are journaled and replayed later
+        store = create_store(tmp_path)
+        store.put("strategy2", {"pos": 1})
+        store.close()
+
+        assert create_store(tmp_path).load() == {"strategy1": {"pos": 5}, "strategy2": {"pos": 1}}
+
+    def test_recover_journal(self, tmp_path: Path) -> None:
+        """Test journal is replayed when store was not closed"""
+        store: StateStore = create_store(tmp_path, write_interval=60)
+        store.load()
+
+        store.put("strategy1", {"pos": 1})
+        store.flush()
+        store.put("strategy1", {"pos": 2})
+        store.put("strategy2", {"pos": 3})
+        store.flush()
+        store.remove("strategy2")
+        store.flush()
+
+        # Coalesced records are appended, followed by an incomplete one
+        with open(store.journal_path, encoding="UTF-8") as f:
+            assert len(f.readlines()) == 4
+
+        with open(store.journal_path, mode="a", encoding="UTF-8") as f:
+            f.write('["strategy1",{"pos":')
+
+        new_store: StateStore = create_store(tmp_path)
+        assert new_store.load() == {"strategy1": {"pos": 2}}
+        assert new_store.journal_path.stat().st_size == 0
+
+        new_store.close()
+        store.active = False
+
+    def test_compaction(self, tmp_path: Path) -> None:
+        """Test journal is compacted into snapshot file"""
+        store: StateStore = create_store(tmp_path, write_interval=60, compact_count=10)
+        store.load()
+
+        for i in range(25):
+            store.put(f"strategy{i % 3}", {"pos": i})
+            store.flush()
+
+        assert store.journal_count == 5
+
+        with open(store.file_path, encoding="UTF-8") as f:
+            assert json.load(f) == {"strategy0": {"pos": 18}, "strategy1": {"pos": 19}, "strategy2": {"pos": 17}}
+
+        store.close()
+        assert create_store(tmp_path).load() == {"strategy0": {"pos": 24}, "strategy1": {"pos": 22}, "strategy2": {"pos": 23}}
@@ -0,0 +1,107 @@
+import os
+import re
+from pathlib import Path
+
+import pytest
+
+from vnag.tools import file_tools
+from vnag.tools.file_tools import ContentIndex, search_content
+
+
+@pytest.fixture
+def root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Create allowed folder with text, GBK and binary files"""
+    root: Path = tmp_path.joinpath("repo")
+    root.joinpath("strategies").mkdir(parents=True)
+
+    root.joinpath("strategies", "atr_strategy.py").write_text(
+        "class AtrStrategy:\n    atr_length = 22\n\n    def on_bar(self):\n        self.atr_value = 0\n",
+        encoding="utf-8"
+    )
+    root.joinpath("strategies", "boll_strategy.py").write_bytes(
+        "# 布林带策略，基于布林带通道突破开仓，价格回到中轨平仓\r\nclass BollStrategy:\r\n    boll_window = 18\r\n".encode("gbk")
+    )
+    root.joinpath("data.bin").write_bytes(b"\0\1class AtrStrategy")
+
+    monkeypatch.setattr(file_tools, "ALL_READ_PATHS", {root})
+    monkeypatch.setattr(file_tools, "_content_index", ContentIndex(tmp_path.joinpath("index.db")))
+    return root
+
+
+def get_lines(result: str) -> list[str]:
+    """Get matched lines after the header, which may contain multi-line content"""
+    return result.split("':\n", 1)[1].splitlines()
+
+
+class TestSearchContent:
+    """Test indexed content search of file tools"""
+
+    def test_literal(self, root: Path) -> None:
+        """Test matched lines with line numbers, binary file skipped"""
+        atr_path: Path = root.joinpath("strategies", "atr_strategy.py")
+
+        assert get_lines(search_content(str(root), "atr_")) == [
+            f"{atr_path}:2:     atr_length = 22",
+            f"{atr_path}:5:         self.atr_value = 0",
+        ]
+
+        boll_path: Path = root.joinpath("strategies", "boll_strategy.py")
+        assert get_lines(search_content(str(root), "布林带")) == [f"{boll_path}:1: # 布林带策略，基于布林带通道突破开仓，价格回到中轨平仓"]
+
+        # Multi-line content reports line of match start
+        assert get_lines(search_content(str(root), "Strategy:\n    boll")) == [f"{boll_path}:2: class BollStrategy:"]
+
+        assert get_lines(search_content(str(root), "not found")) == []
+
+    def test_regex(self, root: Path) -> None:
+        """Test regex search with and without required literals"""
+        lines: list[str] = get_lines(search_content(str(root), r"^class \w+Strategy", regex=True))
+        assert [line.split(":")[1] for line in lines] == ["1", "2"]
+
+        lines = get_lines(search_content(str(root), r"_(length|window) = \d+", regex=True))
+        assert [line.split(": ")[1] for line in lines] == ["    atr_length = 22", "    boll_window = 18"]
+
+        assert search_content(str(root), "(", regex=True).startswith("Error: Invalid regular expression")
+
+    def test_incremental(self, root: Path) -> None:
+        """Test index is updated for changed, unchanged and deleted files"""
+        atr_path: Path = root.joinpath("strategies", "atr_strategy.py")
+        search_content(str(root), "atr_")
+
+        index: ContentIndex = file_tools._content_index
+        assert len(index.files) == 3
+        assert index.files[str(root.joinpath("data.bin"))][3] == ""
+
+        # Touched file keeps the same content hash
+        os.utime(atr_path, ns=(0, 0))
+        search_content(str(root), "atr_")
+        assert index.files[str(atr_path)][0] == 0
+
+        atr_path.write_text("atr_window = 10\n", encoding="utf-8")
+        assert get_lines(search_content(str(root), "atr_")) == [f"{atr_path}:1: atr_window = 10"]
+        assert str(atr_path) not in index.postings.get("lue", set())
+
+        atr_path.unlink()
+        assert get_lines(search_content(str(root), "atr_")) == []
+        assert len(index.files) == 2
+
+        # Index is persistent
+        reloaded: ContentIndex = ContentIndex(Path(root.parent, "index.db"))
+        assert reloaded.files == index.files
+        assert reloaded.postings == index.postings
+
+    def test_permission(self, root: Path) -> None:
+        """"""
+        assert search_content(str(root.parent), "atr_").startswith("Error: No permission")
+
+    @pytest.mark.parametrize("pattern, literals", [
+        (r"class \w+Strategy", ["class ", "Strategy"]),
+        (r"ab*cd+e", ["a", "c", "e"]),
+        (r"on_(bar|tick)\(self\)", ["on_", "(self)"]),
+        (r"[abc]def{2,3}", ["de"]),
+        (r"a|b", []),
+        (r"(?i)strategy", []),
+    ])
+    def test_literals(self, pattern: str, literals: list[str]) -> None:
+        """Test literals required by regex"""
+        assert file_tools._get_required_literals(re.compile(pattern)) == literals
@@ -0,0 +1,136 @@
+import asyncio
+from threading import Thread
+from time import perf_counter, sleep
+
+import pytest
+from fastmcp import Client, FastMCP
+
+from vnag.engine import AgentEngine
+from vnag.local import LocalTool
+from vnag.mcp import McpManager
+from vnag.object import ToolCall, ToolResult
+
+
+def wait(seconds: float) -> str:
+    """Sleep and return waited seconds"""
+    sleep(seconds)
+    return f"waited {seconds}"
+
+
+wait_tool: LocalTool = LocalTool(wait)
+
+
+def create_server() -> FastMCP:
+    """Create in-memory MCP server with async tool"""
+    server: FastMCP = FastMCP("test")
+
+    @server.tool
+    async def pause(seconds: float) -> str:
+        """Sleep and return paused seconds"""
+        await asyncio.sleep(seconds)
+        return f"paused {seconds}"
+
+    return server
+
+
+class LocalMcpManager(McpManager):
+    """MCP manager connected to in-memory server"""
+
+    def __init__(self, server: FastMCP) -> None:
+        """"""
+        super().__init__()
+
+        self.server_name = "test"
+        self.client = Client(server)
+        self.started_event.clear()
+
+        self.thread = Thread(target=self._run_loop, daemon=True)
+        self.thread.start()
+
+
+@pytest.fixture
+def engine() -> AgentEngine:
+    """Create engine with local wait tool and MCP pause tool"""
+    engine: AgentEngine = AgentEngine(None)
+    engine._mcp_manager = LocalMcpManager(create_server())
+    engine.register_tool(wait_tool)
+    engine.init()
+    return engine
+
+
+def create_calls(*calls: tuple[str, float]) -> list[ToolCall]:
+    """"""
+    return [
+        ToolCall(id=str(i), name=name, arguments={"seconds": seconds})
+        for i, (name, seconds) in enumerate(calls)
+    ]
+
+
+class TestExecuteTools:
+    """Test concurrent tool execution of agent engine"""
+
+    def test_order(self, engine: AgentEngine) -> None:
+        """Test tools run concurrently with results in call order"""
+        tool_calls: list[ToolCall] = create_calls(
+            (wait_tool.name, 0.4),
+            ("test_pause", 0.3),
+            (wait_tool.name, 0.1),
+            ("test_pause", 0.2),
+        )
+
+        start: float = perf_counter()
+        results: list[ToolResult] = list(engine.execute_tools(tool_calls))
+
+        assert perf_counter() - start < 0.8
+        assert [result.id for result in results] == ["0", "1", "2", "3"]
+        assert "waited 0.4" in results[0].content
+        assert "paused 0.3" in results[1].content
+
+    def test_concurrency(self, engine: AgentEngine) -> None:
+        """Test local tools are limited by max workers"""
+        engine.max_tool_workers = 2
+        tool_calls: list[ToolCall] = create_calls(*[(wait_tool.name, 0.2)] * 4)
+
+        start: float = perf_counter()
+        list(engine.execute_tools(tool_calls))
+
+        assert perf_counter() - start >= 0.4
+
+    def test_timeout(self, engine: AgentEngine) -> None:
+        """Test timed out tools return error without blocking others"""
+        engine.set_tool_timeout(wait_tool.name, 0.2)
+        engine.set_tool_timeout("test_pause", 0.2)
+        tool_calls: list[ToolCall] = create_calls(
+            (wait_tool.name, 1),
+            ("test_pause", 1),
+            (wait_tool.name, 0.1),
+        )
+
+        start: float = perf_counter()
+        results: list[ToolResult] = list(engine.execute_tools(tool_calls))
+
+        assert perf_counter() - start < 0.6
+        assert "timed out" in results[0].content and results[0].is_error
+        assert "timed out" in results[1].content
+        assert "waited 0.1" in results[2].content
+
+        # Synchronous interface is kept for single MCP call
+        assert "paused 0.1" in engine._mcp_manager.execute_tool("test_pause", {"seconds": 0.1})
+
+    def test_timeout_queued(self, engine: AgentEngine) -> None:
+        """Test timed out tools release their slots for queued tools"""
+        engine.max_tool_workers = 1
+        engine.set_tool_timeout(wait_tool.name, 0.2)
+        tool_calls: list[ToolCall] = create_calls(
+            (wait_tool.name, 3),
+            (wait_tool.name, 3),
+            (wait_tool.name, 0.1),
+        )
+
+        start: float = perf_counter()
+        results: list[ToolResult] = list(engine.execute_tools(tool_calls))
+
+        assert perf_counter() - start < 1
+        assert "timed out" in results[0].content
+        assert "timed out" in results[1].content
+        assert "waited 0.1" in results[2].content
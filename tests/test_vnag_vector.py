@@ -0,0 +1,267 @@
+from hashlib import sha1
+from pathlib import Path
+
+import numpy as np
+import pytest
+from numpy.typing import NDArray
+
+from vnag import embedder as embedder_module
+from vnag.embedder import BaseEmbedder, CachedEmbedder
+from vnag.object import Segment
+from vnag.vector import BaseVector, get_segment_id
+from vnag.vectors import numpy_vector
+from vnag.vectors.numpy_vector import NumpyVector
+
+
+class HashEmbedder(BaseEmbedder):
+    """Embedder of deterministic vectors recording encoded texts"""
+
+    batch_size: int = 4
+
+    def __init__(self) -> None:
+        """"""
+        self.batches: list[list[str]] = []
+
+    def encode(self, texts: list[str]) -> NDArray[np.float32]:
+        """"""
+        self.batches.append(texts)
+
+        vectors: list[NDArray] = []
+        for text in texts:
+            seed: int = int(sha1(text.encode()).hexdigest()[:8], 16)
+            vectors.append(np.random.default_rng(seed).random(8, dtype=np.float32))
+
+        return np.array(vectors)
+
+
+def create_segments(source: str, texts: list[str]) -> list[Segment]:
+    """"""
+    return [
+        Segment(text=text, metadata={"source": source, "chunk_index": str(i)})
+        for i, text in enumerate(texts)
+    ]
+
+
+@pytest.fixture
+def cache_folder(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Save embedding cache in temp folder"""
+    monkeypatch.setattr(embedder_module, "get_folder_path", lambda name: tmp_path)
+    return tmp_path
+
+
+class TestCachedEmbedder:
+    """Test persistent embedding cache"""
+
+    def test_cache(self, cache_folder: Path) -> None:
+        """Test only texts not cached are encoded in batches"""
+        hash_embedder = HashEmbedder()
+        embedder = CachedEmbedder(hash_embedder, "test")
+
+        texts: list[str] = [f"text {i}" for i in range(10)]
+        vectors: NDArray[np.float32] = embedder.encode(texts + texts[:2])
+
+        assert np.array_equal(vectors, HashEmbedder().encode(texts + texts[:2]))
+        assert [len(batch) for batch in hash_embedder.batches] == [4, 4, 2]
+
+        embedder.encode(texts[5:] + ["text 10"])
+        assert hash_embedder.batches[-1] == ["text 10"]
+        assert (embedder.hits, embedder.misses) == (7, 11)
+
+        # Vectors are reloaded from disk with partially written record dropped
+        with open(embedder.vector_path, "ab") as f:
+            f.write(b"\0" * 12)
+
+        reloaded = CachedEmbedder(HashEmbedder(), "test")
+        assert np.array_equal(reloaded.encode(texts), vectors[:10])
+        assert reloaded.misses == 0
+        assert embedder.vector_path.stat().st_size == 11 * 8 * 4
+
+
+@pytest.fixture(params=["numpy", "chromadb", "qdrant"])
+def vector(request: pytest.FixtureRequest, cache_folder: Path, monkeypatch: pytest.MonkeyPatch) -> BaseVector:
+    """Create vector store in temp folder with cached embedder"""
+    embedder = CachedEmbedder(HashEmbedder(), "test")
+
+    if request.param == "numpy":
+        monkeypatch.setattr(numpy_vector, "get_folder_path", lambda name: cache_folder)
+        return NumpyVector("test", embedder)
+    elif request.param == "chromadb":
+        pytest.importorskip("chromadb")
+        from vnag.vectors import chromadb_vector
+
+        monkeypatch.setattr(chromadb_vector, "get_folder_path", lambda name: cache_folder)
+        return chromadb_vector.ChromaVector("test", embedder)
+    else:
+        pytest.importorskip("qdrant_client")
+        from vnag.vectors import qdrant_vector
+
+        monkeypatch.setattr(qdrant_vector, "get_folder_path", lambda name: cache_folder)
+        return qdrant_vector.QdrantVector("test", embedder)
+
+
+class TestSyncSegments:
+    """Test incremental synchronization of vector stores"""
+
+    def test_sync(self, vector: BaseVector) -> None:
+        """Test only new or changed segments are added and stale ones deleted"""
+        embedder: CachedEmbedder = vector.embedder
+
+        doc_a: list[Segment] = create_segments("a.md", ["alpha", "beta", "gamma"])
+        doc_b: list[Segment] = create_segments("b.md", ["delta", "epsilon"])
+
+        added, deleted = vector.sync_segments(doc_a + doc_b)
+        assert len(added) == 5 and not deleted
+        assert vector.count == 5
+
+        # Unchanged documents are skipped
+        assert vector.sync_segments(doc_a + doc_b) == ([], [])
+
+        # Chunk changed in a.md, b.md emptied
+        misses: int = embedder.misses
+        doc_a = create_segments("a.md", ["alpha", "BETA", "gamma"])
+
+        added, deleted = vector.sync_segments(doc_a, ["a.md", "b.md"])
+        assert added == [get_segment_id(doc_a[1])]
+        assert len(deleted) == 3
+        assert embedder.misses == misses + 1
+
+        assert vector.count == 3
+        assert sorted(vector.get_source_ids(["a.md"])) == sorted(get_segment_id(seg) for seg in doc_a)
+        assert vector.get_segments(added)[0].text == "BETA"
+
+    def test_insert(self, vector: BaseVector) -> None:
+        """Test chunks after an inserted one keep their IDs with chunk index updated"""
+        doc_a: list[Segment] = create_segments("a.md", ["alpha", "beta", "gamma"])
+        ids: list[str] = [get_segment_id(seg) for seg in doc_a]
+        vector.sync_segments(doc_a)
+
+        doc_a = create_segments("a.md", ["alpha", "inserted", "beta", "gamma"])
+
+        added, deleted = vector.sync_segments(doc_a)
+        assert added == [get_segment_id(doc_a[1])]
+        assert not deleted
+        assert vector.count == 4
+
+        segments: list[Segment] = vector.get_segments(ids[1:])
+        assert sorted(seg.metadata["chunk_index"] for seg in segments) == ["2", "3"]
+
+        # Updated metadata is reloaded by numpy store
+        if isinstance(vector, NumpyVector):
+            reloaded: NumpyVector = NumpyVector("test", vector.embedder)
+            assert reloaded.get_segments(ids[2:])[0].metadata["chunk_index"] == "3"
+
+        # Moved chunks are not updated again
+        assert vector.sync_segments(doc_a) == ([], [])
+
+
+def create_store(folder: Path, monkeypatch: pytest.MonkeyPatch, **kwargs) -> NumpyVector:
+    """Create numpy vector store in folder"""
+    monkeypatch.setattr(numpy_vector, "get_folder_path", lambda name: folder)
+    return NumpyVector("test", HashEmbedder(), **kwargs)
+
+
+def search_exact(texts: list[str], query: str, k: int) -> list[str]:
+    """Texts with highest cosine similarity by brute force"""
+    vectors: NDArray[np.float32] = HashEmbedder().encode(texts)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    query_vector: NDArray[np.float32] = HashEmbedder().encode([query])[0]
+    scores: NDArray[np.float32] = vectors @ (query_vector / np.linalg.norm(query_vector))
+
+    return [texts[i] for i in np.argsort(-scores)[:k]]
+
+
+class TestNumpyVector:
+    """Test numpy vector store"""
+
+    @pytest.mark.parametrize("quantize", [False, True])
+    def test_retrieve(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, quantize: bool) -> None:
+        """Test blocked search results are the same as brute force search"""
+        vector: NumpyVector = create_store(tmp_path, monkeypatch, quantize=quantize, block_size=7)
+
+        texts: list[str] = [f"text {i}" for i in range(100)]
+        vector.add_segments(create_segments("a.md", texts))
+        vector.delete_segments(vector.get_source_ids(["a.md"])[:10])
+
+        results: list[Segment] = vector.retrieve("query", k=5)
+        expected: list[str] = search_exact(texts[10:], "query", 5)
+
+        if quantize:
+            assert len(set(segment.text for segment in results) & set(expected)) >= 4
+        else:
+            assert [segment.text for segment in results] == expected
+            assert results[0].score < results[-1].score
+
+        # Fewer segments than k
+        assert len(vector.retrieve("query", k=200)) == 90
+
+    def test_persistence(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test store is reloaded, compacted and recovered from interrupted writing"""
+        vector: NumpyVector = create_store(tmp_path, monkeypatch, quantize=True)
+
+        texts: list[str] = [f"text {i}" for i in range(3000)]
+        ids: list[str] = vector.add_segments(create_segments("a.md", texts))
+        vector.delete_segments(ids[:1000])
+
+        reloaded: NumpyVector = create_store(tmp_path, monkeypatch)
+        assert reloaded.quantize
+        assert reloaded.count == 2000
+        assert reloaded.get_segments(ids[999:1001])[0].text == "text 1000"
+        assert [s.text for s in reloaded.retrieve("query")] == [s.text for s in vector.retrieve("query")]
+
+        # Deleting most rows compacts files
+        vector.delete_segments(ids[1000:2500])
+        assert len(vector.ids) == 500
+        assert vector.vector_path.stat().st_size == 500 * 8
+
+        # Vectors written without segments are dropped
+        with open(vector.vector_path, "ab") as f:
+            f.write(b"\1" * 8 * 3)
+
+        reloaded = create_store(tmp_path, monkeypatch)
+        assert reloaded.count == 500
+        assert reloaded.vector_path.stat().st_size == 500 * 8
+
+    def test_partial_record(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test partially written record is removed before later appends"""
+        vector: NumpyVector = create_store(tmp_path, monkeypatch)
+        ids: list[str] = vector.add_segments(create_segments("a.md", ["alpha", "beta", "gamma"]))
+
+        with open(vector.segment_path, mode="a", encoding="UTF-8") as f:
+            f.write(f'{{"delete": "{ids[0]}"')
+
+        reloaded: NumpyVector = create_store(tmp_path, monkeypatch)
+        assert reloaded.count == 3
+
+        reloaded.add_segments(create_segments("b.md", ["delta", "epsilon"]))
+        assert reloaded.count == 5
+
+        reloaded = create_store(tmp_path, monkeypatch)
+        assert reloaded.count == 5
+        assert reloaded.get_segments(ids[:1])[0].text == "alpha"
+
+    def test_index(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test IVF index search probing nearest clusters"""
+        vector: NumpyVector = create_store(tmp_path, monkeypatch, nprobe=4)
+
+        texts: list[str] = [f"text {i}" for i in range(2000)]
+        vector.add_segments(create_segments("a.md", texts[:1500]))
+        vector.build_index(nlist=16)
+
+        # Rows added after building are assigned
+        vector.add_segments(create_segments("b.md", texts[1500:]))
+        assert len(vector.assignments) == 2000
+        assert sum(len(rows) for rows in vector.lists) == 2000
+
+        expected: list[str] = search_exact(texts, "query", 10)
+        results: list[Segment] = vector.retrieve("query", k=10)
+        assert len(set(segment.text for segment in results) & set(expected)) >= 5
+
+        # Index is reloaded
+        reloaded: NumpyVector = create_store(tmp_path, monkeypatch, nprobe=4)
+        assert np.array_equal(reloaded.assignments, vector.assignments)
+        assert reloaded.retrieve("query", k=10) == results
+
+        # Probing all clusters is exact search
+        reloaded.nprobe = 16
+        assert [segment.text for segment in reloaded.retrieve("query", k=10)] == expected
@@ -0,0 +1,112 @@
+import asyncio
+import json
+
+import pytest
+
+from vnpy.trader.event import EVENT_TICK, EVENT_ORDER
+pytest.importorskip("zmq")
+
+from vnpy_webtrader.broadcast import WebsocketBroadcaster, WebsocketClient, LAGGING_CLOSE_CODE  # noqa: E402
+
+
+class FakeWebsocket:
+    """Websocket recording sent messages, optionally blocking on send"""
+
+    def __init__(self, blocked: bool = False) -> None:
+        """"""
+        self.sent: list[str | bytes] = []
+        self.closed: int | None = None
+        self.unblocked: asyncio.Event = asyncio.Event()
+
+        if not blocked:
+            self.unblocked.set()
+
+    async def send_text(self, msg: str) -> None:
+        """"""
+        await self.unblocked.wait()
+        self.sent.append(msg)
+
+    async def send_bytes(self, msg: bytes) -> None:
+        """"""
+        await self.send_text(msg)
+
+    async def close(self, code: int) -> None:
+        """"""
+        self.closed = code
+
+
+def publish_ticks(broadcaster: WebsocketBroadcaster, price: float) -> None:
+    """"""
+    for vt_symbol in ["rb2501.SHFE", "IF2501.CFFEX"]:
+        broadcaster.publish(EVENT_TICK, vt_symbol, {"vt_symbol": vt_symbol, "last_price": price})
+
+
+class TestWebsocketBroadcaster:
+    """Test websocket fan-out of rpc events"""
+
+    def test_subscription(self) -> None:
+        """Test clients only receive subscribed topics and symbols"""
+        async def run() -> tuple[list, list]:
+            broadcaster = WebsocketBroadcaster()
+            all_websocket, rb_websocket = FakeWebsocket(), FakeWebsocket()
+
+            broadcaster.add_client(all_websocket)
+            client: WebsocketClient = broadcaster.add_client(rb_websocket)
+            client.process_request(json.dumps({"action": "subscribe", "topics": [EVENT_TICK], "vt_symbols": ["rb2501.SHFE"]}))
+
+            publish_ticks(broadcaster, 0)
+            broadcaster.publish(EVENT_ORDER, "rb2501.SHFE", {"orderid": "1"})
+            await asyncio.sleep(0.01)
+
+            return all_websocket.sent, rb_websocket.sent
+
+        all_sent, rb_sent = asyncio.run(run())
+
+        assert len(all_sent) == 3
+        assert [json.loads(msg)["data"]["vt_symbol"] for msg in rb_sent] == ["rb2501.SHFE"]
+        assert any(msg is rb_sent[0] for msg in all_sent)
+
+    def test_conflation(self) -> None:
+        """Test slow client only receives latest tick of each symbol, without blocking others"""
+        async def run() -> tuple[list, list]:
+            broadcaster = WebsocketBroadcaster()
+            fast_websocket, slow_websocket = FakeWebsocket(), FakeWebsocket(blocked=True)
+
+            broadcaster.add_client(fast_websocket)
+            broadcaster.add_client(slow_websocket)
+            await asyncio.sleep(0)
+
+            for i in range(100):
+                publish_ticks(broadcaster, i)
+                await asyncio.sleep(0)
+
+            slow_websocket.unblocked.set()
+            await asyncio.sleep(0.01)
+
+            return fast_websocket.sent, slow_websocket.sent
+
+        fast_sent, slow_sent = asyncio.run(run())
+
+        assert len(fast_sent) == 200
+        assert len(slow_sent) <= 3
+        assert [json.loads(msg)["data"]["last_price"] for msg in slow_sent[-2:]] == [99, 99]
+
+    def test_lagging(self) -> None:
+        """Test client is dropped when queued messages exceed the limit"""
+        async def run() -> tuple[WebsocketBroadcaster, FakeWebsocket]:
+            broadcaster = WebsocketBroadcaster(max_pending=10)
+            websocket = FakeWebsocket(blocked=True)
+
+            broadcaster.add_client(websocket)
+            await asyncio.sleep(0)
+
+            for i in range(20):
+                broadcaster.publish(EVENT_ORDER, "rb2501.SHFE", {"orderid": str(i)})
+            await asyncio.sleep(0.01)
+
+            return broadcaster, websocket
+
+        broadcaster, websocket = asyncio.run(run())
+
+        assert not broadcaster.clients
+        assert websocket.closed == LAGGING_CLOSE_CODE
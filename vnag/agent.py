@@ -2,7 +2,7 @@ import json
 from pathlib import Path
 from uuid import uuid4
 from typing import TYPE_CHECKING, Any
-from collections.abc import Generator
+from collections.abc import Generator, Iterator
 
 from .object import (
     Session, Profile, Delta, Request, Response, Message,
@@ -221,11 +221,12 @@ class TaskAgent:
                 finish_reason == FinishReason.TOOL_CALLS
                 and self.collected_tool_calls    #And received a specific tool call request
             ):
-                #Execute all tool calls in batches
+                #Submit all tool calls to be executed concurrently
                 tool_results: list[ToolResult] = []
+                results: Iterator[ToolResult] = self.engine.execute_tools(self.collected_tool_calls)
 
                 for tool_call in self.collected_tool_calls:
-                    #Before execution, send a notification through yield to tell the upper application "which tool is being executed"
+                    #Send a notification through yield to tell the upper application "which tool is being executed"
                     yield Delta(
                         id=response_id or str(uuid4()),
                         content=f"\n\n[Execution tool: {tool_call.name}]\n\n"
@@ -234,8 +235,8 @@ class TaskAgent:
                     #Call tracer: the logging tool starts execution
                     self.tracer.on_tool_start(tool_call)
 
-                    #Execute a single tool call and log the results
-                    result: ToolResult = self.engine.execute_tool(tool_call)
+                #Collect the results in original call order
+                for result in results:
                     tool_results.append(result)
 
                     #Call tracer: the recording tool is executed
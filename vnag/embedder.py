@@ -1,8 +1,15 @@
+import json
+import os
 from abc import ABC, abstractmethod
+from hashlib import sha1
+from pathlib import Path
+from threading import Lock
 
 import numpy as np
 from numpy.typing import NDArray
 
+from .utility import get_folder_path
+
 
 class BaseEmbedder(ABC):
     """Abstract base class for Embedding"""
@@ -11,3 +18,130 @@ class BaseEmbedder(ABC):
     def encode(self, texts: list[str]) -> NDArray[np.float32]:
         """Encode text list into vector"""
         pass
+
+
+class CachedEmbedder(BaseEmbedder):
+    """
+    带持久化缓存的 Embedding 包装器。
+
+    以文本的哈希作为键，向量追加写入磁盘文件并通过内存映射读取，
+    只有缓存中不存在的文本才会按批次调用被包装的 Embedding 编码。
+    缓存名称应当对应唯一的 Embedding 模型。
+    """
+
+    def __init__(
+        self,
+        embedder: BaseEmbedder,
+        name: str,
+        batch_size: int = 0
+    ) -> None:
+        """
+        初始化 CachedEmbedder。
+
+        参数:
+            embedder: 被包装的 Embedding 对象
+            name: 缓存名称，用于区分不同的模型
+            batch_size: 每次编码的文本数量，默认使用被包装对象的 batch_size，没有则为 64
+        """
+        self.embedder: BaseEmbedder = embedder
+        self.batch_size: int = batch_size or getattr(embedder, "batch_size", 64)
+
+        self.cache_dir: Path = get_folder_path("embedding_cache").joinpath(name)
+        self.cache_dir.mkdir(exist_ok=True)
+
+        self.meta_path: Path = self.cache_dir.joinpath("meta.json")
+        self.key_path: Path = self.cache_dir.joinpath("keys.txt")
+        self.vector_path: Path = self.cache_dir.joinpath("vectors.f32")
+
+        self.lock: Lock = Lock()
+
+        self.dimension: int = 0
+        self.rows: dict[str, int] = {}
+        self.vectors: np.memmap | None = None
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._load()
+
+    def _load(self) -> None:
+        """Load cached keys and map vector file"""
+        if not self.meta_path.exists():
+            return
+
+        with open(self.meta_path, encoding="UTF-8") as f:
+            self.dimension = json.load(f)["dimension"]
+
+        keys: list[str] = []
+        if self.key_path.exists():
+            keys = self.key_path.read_text(encoding="UTF-8").split()
+
+        #Drop records not completely written by both files
+        row_size: int = self.dimension * 4
+        row_count: int = 0
+
+        if self.vector_path.exists():
+            row_count = min(len(keys), self.vector_path.stat().st_size // row_size)
+            os.truncate(self.vector_path, row_count * row_size)
+
+        if len(keys) > row_count:
+            self.key_path.write_text("".join(f"{key}\n" for key in keys[:row_count]), encoding="UTF-8")
+
+        self.rows = {key: row for row, key in enumerate(keys[:row_count])}
+        self._map_vectors()
+
+    def _map_vectors(self) -> None:
+        """Map vector file into memory"""
+        if self.rows:
+            self.vectors = np.memmap(
+                self.vector_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(len(self.rows), self.dimension)
+            )
+
+    def _append(self, keys: list[str], embeddings: NDArray[np.float32]) -> None:
+        """Append new vectors to cache files"""
+        if not self.dimension:
+            self.dimension = embeddings.shape[1]
+
+            with open(self.meta_path, mode="w", encoding="UTF-8") as f:
+                json.dump({"dimension": self.dimension}, f)
+
+        with open(self.vector_path, mode="ab") as f:
+            f.write(np.ascontiguousarray(embeddings, dtype=np.float32).tobytes())
+
+        with open(self.key_path, mode="a", encoding="UTF-8") as f:
+            f.write("".join(f"{key}\n" for key in keys))
+
+        for key in keys:
+            self.rows[key] = len(self.rows)
+
+        self._map_vectors()
+
+    def encode(self, texts: list[str]) -> NDArray[np.float32]:
+        """Encode text as vector, only texts not cached are encoded"""
+        keys: list[str] = [sha1(text.encode("UTF-8")).hexdigest() for text in texts]
+
+        with self.lock:
+            #Distinct texts not cached
+            missing: dict[str, str] = {}
+            for key, text in zip(keys, texts, strict=True):
+                if key not in self.rows:
+                    missing[key] = text
+
+            self.misses += len(missing)
+            self.hits += len(texts) - len(missing)
+
+            #Encode in batches, each is saved once finished
+            missing_keys: list[str] = list(missing)
+
+            for i in range(0, len(missing_keys), self.batch_size):
+                batch_keys: list[str] = missing_keys[i:i + self.batch_size]
+                embeddings: NDArray[np.float32] = self.embedder.encode([missing[key] for key in batch_keys])
+                self._append(batch_keys, embeddings)
+
+            if self.vectors is None:
+                return np.zeros((0, self.dimension), dtype=np.float32)
+
+            return np.asarray(self.vectors[[self.rows[key] for key in keys]])
@@ -1,7 +1,11 @@
 import json
 from pathlib import Path
-from collections.abc import Generator
+from collections.abc import Generator, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
+from threading import Event, Lock, Semaphore, Timer
+from time import monotonic
 
 from .gateway import BaseGateway
 from .object import (
@@ -31,6 +35,9 @@ class AgentEngine:
     智能体引擎：负责智能体类的发现和注册，并提供智能体实例创建的工厂方法。
     """
 
+    max_tool_workers: int = 8       #Maximum number of local and agent tools executed at the same time
+    tool_timeout: float = 0         #Default tool timeout in seconds, 0 for no limit
+
     def __init__(self, gateway: BaseGateway) -> None:
         """Constructor"""
         self.gateway: BaseGateway = gateway
@@ -41,6 +48,7 @@ class AgentEngine:
         self._local_schemas: dict[str, ToolSchema] = {}
         self._mcp_schemas: dict[str, ToolSchema] = {}
         self._agent_tools: dict[str, AgentTool] = {}
+        self._tool_timeouts: dict[str, float] = {}
 
         self._profiles: dict[str, Profile] = {}
         self._agents: dict[str, TaskAgent] = {}
@@ -240,6 +248,136 @@ class AgentEngine:
             is_error=bool(result_content)
         )
 
+    def set_tool_timeout(self, tool_name: str, timeout: float) -> None:
+        """Set timeout in seconds of a tool, overriding the default one"""
+        self._tool_timeouts[tool_name] = timeout
+
+    def get_tool_timeout(self, tool_name: str) -> float:
+        """Get timeout in seconds of a tool"""
+        return self._tool_timeouts.get(tool_name, self.tool_timeout)
+
+    def execute_tools(self, tool_calls: list[ToolCall]) -> Iterator[ToolResult]:
+        """
+        并发执行多个工具，按照原始调用顺序返回结果。
+
+        所有工具在调用时立即提交：MCP工具在后台事件循环中异步执行，
+        本地工具和智能体工具在线程中执行，同时运行的数量受 max_tool_workers 限制。
+        返回的迭代器按顺序等待结果，超时的工具返回错误结果。线程中的本地工具无法中断，
+        会在后台继续运行，但超时后即释放占用的名额，不会阻塞排队中的工具。
+        """
+        local_count: int = len([c for c in tool_calls if c.name not in self._mcp_schemas])
+
+        #Each local tool has its own thread, concurrency is limited by slots
+        executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=max(local_count, 1),
+            thread_name_prefix="VnagTool"
+        )
+        slots: Semaphore = Semaphore(self.max_tool_workers)
+
+        futures: list[Future[ToolResult] | Future[str]] = []
+        start_events: list[Event] = []
+        start_times: dict[int, float] = {}
+
+        for ix, tool_call in enumerate(tool_calls):
+            start_event: Event = Event()
+            start_events.append(start_event)
+
+            if tool_call.name in self._mcp_schemas:
+                future: Future = self._mcp_manager.submit_tool(
+                    tool_call.name,
+                    tool_call.arguments,
+                    self.get_tool_timeout(tool_call.name)
+                )
+                start_event.set()
+            else:
+                future = executor.submit(
+                    self._run_tool, tool_call, ix, slots, start_event, start_times
+                )
+
+            futures.append(future)
+
+        #Threads of timed out tools are not waited for
+        executor.shutdown(wait=False)
+
+        return self._collect_results(tool_calls, futures, start_events, start_times)
+
+    def _run_tool(
+        self,
+        tool_call: ToolCall,
+        ix: int,
+        slots: Semaphore,
+        start_event: Event,
+        start_times: dict[int, float]
+    ) -> ToolResult:
+        """Execute a tool when a slot is free and record its start time"""
+        released: Lock = Lock()
+
+        def release_slot() -> None:
+            """Release slot only once, by timer or by finishing"""
+            if released.acquire(blocking=False):
+                slots.release()
+
+        slots.acquire()
+        start_times[ix] = monotonic()
+        start_event.set()
+
+        #Slot of a timed out tool is released for queued ones, as its thread cannot be interrupted
+        timer: Timer | None = None
+        timeout: float = self.get_tool_timeout(tool_call.name)
+
+        if timeout:
+            timer = Timer(timeout, release_slot)
+            timer.daemon = True
+            timer.start()
+
+        try:
+            return self.execute_tool(tool_call)
+        finally:
+            if timer:
+                timer.cancel()
+            release_slot()
+
+    def _collect_results(
+        self,
+        tool_calls: list[ToolCall],
+        futures: list[Future],
+        start_events: list[Event],
+        start_times: dict[int, float]
+    ) -> Generator[ToolResult, None, None]:
+        """Wait for tool results in original call order"""
+        for ix, (tool_call, future) in enumerate(zip(tool_calls, futures)):
+            #MCP tool timeout is handled in the event loop
+            if tool_call.name in self._mcp_schemas:
+                content: str = future.result()
+
+                yield ToolResult(
+                    id=tool_call.id,
+                    name=tool_call.name,
+                    content=content,
+                    is_error=bool(content)
+                )
+                continue
+
+            #Timeout is counted from the start of execution, not queuing in thread pool
+            timeout: float = self.get_tool_timeout(tool_call.name)
+
+            if not timeout:
+                yield future.result()
+                continue
+
+            start_events[ix].wait()
+            remaining: float = start_times[ix] + timeout - monotonic()
+
+            try:
+                yield future.result(max(remaining, 0))
+            except FutureTimeoutError:
+                yield ToolResult(
+                    id=tool_call.id,
+                    name=tool_call.name,
+                    content=f"Error: Tool [{tool_call.name}] timed out after {timeout} seconds",
+                    is_error=True
+                )
+
     def stream(self, request: Request) -> Generator[Delta, None, None]:
         """
         流式对话接口，通过生成器（Generator）实时返回 AI 的思考和回复。
@@ -15,6 +15,7 @@ class McpManager:
     """MCP Manager: Responsible for MCP tool management and execution"""
 
     config_path: str = "mcp_config.json"
+    max_concurrency: int = 8        #Maximum number of tool calls running at the same time
 
     def __init__(self) -> None:
         """Constructor"""
@@ -24,6 +25,7 @@ class McpManager:
         self.thread: Thread | None = None
 
         self.shutdown_future: asyncio.Future | None = None
+        self.semaphore: asyncio.Semaphore | None = None
         self.started_event: Event = Event()
 
         self.server_name: str = ""      #When only one MCP service is configured, you need to splice the server name prefix for the tool
@@ -52,6 +54,9 @@ class McpManager:
         #Create a future that closes the event loop
         self.shutdown_future = self.loop.create_future()
 
+        #Create a semaphore limiting concurrent tool calls
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
         #Run main loop
         async def main_loop() -> None:
             """Main loop"""
@@ -125,36 +130,60 @@ class McpManager:
         )
         return future.result()
 
-    def execute_tool(self, tool_name: str, arguments: dict[str, Any]) -> str:
-        """Execute MCP tool"""
-        #If the client does not exist (no configuration file), an error message is returned
-        if not self.client or not self.loop:
-            return ""
-
-        #Wait for the background service to start
-        self.started_event.wait()
-
+    async def aexecute_tool(
+        self,
+        tool_name: str,
+        arguments: dict[str, Any],
+        timeout: float = 0
+    ) -> str:
+        """Execute MCP tool in the background event loop"""
         #If the tool name contains a server name prefix, remove the prefix
         if self.server_name:
             tool_name = tool_name.replace(self.server_name + "_", "")
 
-        #Execute tasks in the background event loop
-        async def _async_execute_tool() -> str:
-            """Asynchronous functions for running in an event loop"""
-            try:
-                assert self.client is not None
+        assert self.client is not None
+        assert self.semaphore is not None
 
-                #Execute MCP tool call
-                result: CallToolResult = await self.client.call_tool(
-                    tool_name, arguments
+        async with self.semaphore:
+            try:
+                #Execute MCP tool call, cancelled if not finished within timeout
+                result: CallToolResult = await asyncio.wait_for(
+                    self.client.call_tool(tool_name, arguments),
+                    timeout or None
                 )
 
                 return str(result)
+            except asyncio.TimeoutError:
+                return f"Error executing MCP tool '{tool_name}': timed out after {timeout} seconds"
             except Exception as e:
                 return f"Error executing MCP tool '{tool_name}': {str(e)}"
 
-        future: Future[str] = asyncio.run_coroutine_threadsafe(
-            coro=_async_execute_tool(),
+    def submit_tool(
+        self,
+        tool_name: str,
+        arguments: dict[str, Any],
+        timeout: float = 0
+    ) -> Future[str]:
+        """Submit MCP tool to the background event loop without waiting for the result"""
+        future: Future[str] = Future()
+
+        #If the client does not exist (no configuration file), an empty result is returned
+        if not self.client:
+            future.set_result("")
+            return future
+
+        #Wait for the background service to start
+        self.started_event.wait()
+
+        if not self.loop:
+            future.set_result("")
+            return future
+
+        return asyncio.run_coroutine_threadsafe(
+            coro=self.aexecute_tool(tool_name, arguments, timeout),
             loop=self.loop
         )
-        return future.result()
+
+    def execute_tool(self, tool_name: str, arguments: dict[str, Any]) -> str:
+        """Execute MCP tool"""
+        return self.submit_tool(tool_name, arguments).result()
@@ -1,18 +1,33 @@
 """
 常用的文件系统函数工具
 """
+import os
+import re
+import sqlite3
 import traceback
+from collections import defaultdict
+from hashlib import sha1
 from pathlib import Path
+from threading import Lock
 
 import chardet
 
-from vnag.utility import load_json, save_json
+from vnag.utility import load_json, save_json, get_file_path
 from vnag.local import LocalTool
 
 
 #Profile name
 SETTING_NAME: str = "file_system_tool.json"
 
+#Content index file name
+INDEX_NAME: str = "file_index.db"
+
+#Maximum number of matched lines returned by search
+MAX_MATCHES: int = 1000
+
+#Maximum length of each matched line returned by search
+MAX_LINE_LENGTH: int = 300
+
 #Default configuration
 setting: dict[str, list[str]] = {
     "read_allowed": [],
@@ -80,6 +95,335 @@ def _check_write_allowed(path: Path) -> bool:
     return _is_path_allowed(path, WRITE_ALLOWED_PATHS)
 
 
+def _detect_encoding(data: bytes) -> str:
+    """
+    检测文件内容编码，优先尝试 utf-8，失败后使用 chardet。
+    """
+    try:
+        data.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError:
+        result: chardet.ResultDict = chardet.detect(data)
+        encoding: str | None = result.get("encoding")
+        return encoding if encoding else "utf-8"
+
+
+def _decode_text(data: bytes, encoding: str) -> str:
+    """
+    解码文件内容，并统一换行符。
+    """
+    text: str = data.decode(encoding)
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _get_trigrams(text: str) -> set[str]:
+    """
+    获取文本中所有长度为3的子串。
+    """
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _get_required_literals(pattern: re.Pattern) -> list[str]:
+    """
+    提取正则表达式任意匹配结果中都必须包含的字面量片段，用于筛选候选文件。
+    只分析顶层的字面字符，无法确定时返回空列表。
+    """
+    if pattern.flags & (re.IGNORECASE | re.VERBOSE):
+        return []
+
+    text: str = pattern.pattern
+    literals: list[str] = []
+    run: str = ""
+    i: int = 0
+
+    while i < len(text):
+        c: str = text[i]
+
+        #Escaped punctuation is literal, others are character classes or references
+        if c == "\\":
+            escaped: str = text[i + 1:i + 2]
+            i += 2
+
+            if escaped and not escaped.isalnum():
+                run += escaped
+                continue
+        #Skip character set
+        elif c == "[":
+            i = _skip_set(text, i)
+        #Skip group
+        elif c == "(":
+            level: int = 0
+
+            while i < len(text):
+                if text[i] == "\\":
+                    i += 2
+                    continue
+                elif text[i] == "[":
+                    i = _skip_set(text, i)
+                    continue
+                elif text[i] == "(":
+                    level += 1
+                elif text[i] == ")":
+                    level -= 1
+
+                i += 1
+
+                if not level:
+                    break
+        #Nothing is required with alternation at top level
+        elif c == "|":
+            return []
+        #The quantified character is optional
+        elif c in "*+?{":
+            run = run[:-1]
+
+            if c == "{":
+                i = text.find("}", i)
+                i = len(text) if i < 0 else i
+
+            i += 1
+        elif c in ".^$":
+            i += 1
+        else:
+            run += c
+            i += 1
+            continue
+
+        if run:
+            literals.append(run)
+        run = ""
+
+    if run:
+        literals.append(run)
+
+    return literals
+
+
+def _skip_set(text: str, i: int) -> int:
+    """
+    跳过从位置 i 开始的字符集，返回其结束后的位置。
+    """
+    i += 1
+
+    if text[i:i + 1] == "^":
+        i += 1
+
+    if text[i:i + 1] == "]":
+        i += 1
+
+    while i < len(text) and text[i] != "]":
+        if text[i] == "\\":
+            i += 1
+        i += 1
+
+    return i + 1
+
+
+class ContentIndex:
+    """
+    文件内容的三元组倒排索引。
+
+    根据文件修改时间和内容哈希增量更新，并持久化保存到 SQLite 数据库中。
+    二进制文件（包含空字节）只记录状态，不参与搜索。
+    """
+
+    def __init__(self, file_path: Path) -> None:
+        """Constructor"""
+        self.connection: sqlite3.Connection = sqlite3.connect(str(file_path), check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS files "
+            "(path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, hash TEXT, encoding TEXT, grams BLOB)"
+        )
+
+        #Tools may be executed concurrently in different threads
+        self.lock: Lock = Lock()
+
+        #File path: (mtime_ns, size, hash, encoding), encoding is empty for binary file
+        self.files: dict[str, tuple[int, int, str, str]] = {}
+        self.grams: dict[str, bytes] = {}
+        self.postings: defaultdict[str, set[str]] = defaultdict(set)
+
+        for path, mtime_ns, size, digest, encoding, grams in self.connection.execute("SELECT * FROM files"):
+            self.files[path] = (mtime_ns, size, digest, encoding)
+            self.add_grams(path, grams)
+
+    def add_grams(self, path: str, grams: bytes) -> None:
+        """Add file to postings of its trigrams"""
+        self.grams[path] = grams
+
+        if grams:
+            for gram in grams.decode("utf-8").split("\0"):
+                self.postings[gram].add(path)
+
+    def remove_grams(self, path: str) -> None:
+        """Remove file from postings of its trigrams"""
+        grams: bytes = self.grams.pop(path, b"")
+
+        if grams:
+            for gram in grams.decode("utf-8").split("\0"):
+                paths: set[str] = self.postings[gram]
+                paths.discard(path)
+
+                if not paths:
+                    self.postings.pop(gram)
+
+    def update(self, root: Path) -> None:
+        """Update index of all files under the root path"""
+        root_str: str = str(root)
+        root_prefix: str = os.path.join(root_str, "")
+
+        seen: set[str] = set()
+        updates: list[tuple] = []
+
+        for dirpath, _dirnames, filenames in os.walk(root_str):
+            for filename in filenames:
+                path: str = os.path.join(dirpath, filename)
+
+                try:
+                    stat: os.stat_result = os.stat(path)
+                    seen.add(path)
+
+                    #Unchanged modification time and size
+                    record: tuple | None = self.files.get(path, None)
+                    if record and record[:2] == (stat.st_mtime_ns, stat.st_size):
+                        continue
+
+                    with open(path, "rb") as f:
+                        data: bytes = f.read()
+                except OSError:
+                    continue
+
+                #Unchanged content with only modification time updated
+                digest: str = sha1(data).hexdigest()
+                if record and record[2] == digest:
+                    encoding: str = record[3]
+                    grams: bytes = self.grams.get(path, b"")
+                #New or changed file to be indexed
+                else:
+                    encoding, grams = self.index_content(data)
+
+                    self.remove_grams(path)
+                    self.add_grams(path, grams)
+
+                self.files[path] = (stat.st_mtime_ns, stat.st_size, digest, encoding)
+                updates.append((path, stat.st_mtime_ns, stat.st_size, digest, encoding, grams))
+
+        #Remove deleted files
+        removed: list[str] = [
+            path for path in self.files
+            if path not in seen and (path == root_str or path.startswith(root_prefix))
+        ]
+
+        for path in removed:
+            self.files.pop(path)
+            self.remove_grams(path)
+
+        if updates or removed:
+            self.connection.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)", updates)
+            self.connection.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in removed])
+            self.connection.commit()
+
+    def index_content(self, data: bytes) -> tuple[str, bytes]:
+        """Get encoding and joined trigrams of file content"""
+        if b"\0" in data:
+            return "", b""
+
+        encoding: str = _detect_encoding(data)
+
+        try:
+            text: str = _decode_text(data, encoding)
+        except (UnicodeDecodeError, LookupError):
+            return "", b""
+
+        grams: bytes = "\0".join(_get_trigrams(text)).encode("utf-8")
+        return encoding, grams
+
+    def get_candidates(self, root: Path, literals: list[str]) -> list[str]:
+        """Get text files under the root path containing all trigrams of literals"""
+        grams: set[str] = set()
+        for literal in literals:
+            grams.update(_get_trigrams(literal))
+
+        if grams:
+            #Intersect from the smallest posting
+            postings: list[set[str]] = sorted(
+                (self.postings.get(gram, set()) for gram in grams),
+                key=len
+            )
+            paths: set[str] = postings[0].intersection(*postings[1:])
+        else:
+            paths = {path for path, record in self.files.items() if record[3]}
+
+        root_str: str = str(root)
+        root_prefix: str = os.path.join(root_str, "")
+
+        return sorted(
+            path for path in paths
+            if path == root_str or path.startswith(root_prefix)
+        )
+
+    def search(self, root: Path, pattern: re.Pattern, literals: list[str]) -> list[tuple[str, int, str]]:
+        """Search pattern in files under the root path, return file path, line number and line"""
+        with self.lock:
+            self.update(root)
+
+            candidates: list[str] = self.get_candidates(root, literals)
+            encodings: dict[str, str] = {path: self.files[path][3] for path in candidates}
+
+        matches: list[tuple[str, int, str]] = []
+
+        for path in candidates:
+            try:
+                with open(path, "rb") as f:
+                    text: str = _decode_text(f.read(), encodings[path])
+            except (OSError, UnicodeDecodeError):
+                print(f"Failed to read file contents while searching: {path}")
+                continue
+
+            #Report each matched line once
+            line_number: int = 1
+            line_end: int = -1
+            position: int = 0
+
+            for match in pattern.finditer(text):
+                start: int = match.start()
+                if start <= line_end:
+                    continue
+
+                line_number += text.count("\n", position, start)
+                position = start
+
+                line_start: int = text.rfind("\n", 0, start) + 1
+                line_end = text.find("\n", start)
+                if line_end < 0:
+                    line_end = len(text)
+
+                matches.append((path, line_number, text[line_start:line_end]))
+
+                if len(matches) >= MAX_MATCHES:
+                    return matches
+
+        return matches
+
+
+#Content index created on first search
+_content_index: ContentIndex | None = None
+_content_index_lock: Lock = Lock()
+
+
+def _get_content_index() -> ContentIndex:
+    """
+    获取内容索引，首次调用时从数据库加载。
+    """
+    global _content_index
+
+    with _content_index_lock:
+        if not _content_index:
+            _content_index = ContentIndex(get_file_path(INDEX_NAME))
+
+    return _content_index
+
+
 def list_directory(path: str) -> str:
     """
     列出指定路径下的文件和目录。
@@ -180,9 +524,9 @@ def glob_files(path: str, pattern: str) -> str:
         return f"An unknown error occurred while matching files: {traceback.format_exc()}"
 
 
-def search_content(path: str, content: str) -> str:
+def search_content(path: str, content: str, regex: bool = False) -> str:
     """
-    在指定路径下搜索包含指定内容的文件。
+    在指定路径下搜索包含指定内容（或匹配正则表达式）的文本行，返回文件路径和行号。
     必须拥有该路径的读权限。
     """
     try:
@@ -190,20 +534,29 @@ def search_content(path: str, content: str) -> str:
         if not _check_read_allowed(target_path):
             return f"Error: No permission to access path '{path}'"
 
+        if regex:
+            try:
+                pattern: re.Pattern = re.compile(content, re.MULTILINE)
+            except re.error as e:
+                return f"Error: Invalid regular expression '{content}': {e}"
+
+            literals: list[str] = _get_required_literals(pattern)
+        else:
+            pattern = re.compile(re.escape(content))
+            literals = [content]
+
         abs_path: Path = target_path.resolve()
-        all_files: list[Path] = list(abs_path.rglob("**/*"))
+        matches: list[tuple[str, int, str]] = _get_content_index().search(abs_path, pattern, literals)
 
-        files: list[Path] = []
-        for file in all_files:
-            if file.is_file():
-                encoding: str = _get_encoding(file)
-                try:
-                    if content in file.read_text(encoding=encoding):
-                        files.append(file)
-                except Exception:
-                    print(f"Failed to read file contents while searching: {file}")
+        lines: list[str] = [
+            f"{file}:{line_number}: {line[:MAX_LINE_LENGTH]}"
+            for file, line_number, line in matches
+        ]
+
+        if len(matches) >= MAX_MATCHES:
+            lines.append(f"[Only the first {MAX_MATCHES} matched lines are shown]")
 
-        return f"File containing content '{content}':\n" + "\n".join([str(file.resolve()) for file in files])
+        return f"Lines containing content '{content}':\n" + "\n".join(lines)
     except Exception:
         return f"An unknown error occurred while searching for content: {traceback.format_exc()}"
 
@@ -1,8 +1,22 @@
+import json
 from abc import ABC, abstractmethod
+from hashlib import sha1
 
 from .object import Segment
 
 
+def get_segment_id(segment: Segment) -> str:
+    """
+    根据来源和内容哈希生成文档块ID，文本或元数据不变时ID保持不变。
+
+    块序号（chunk_index）不参与哈希，文档中插入或删除块时其他块的ID不变。
+    """
+    metadata: dict[str, str] = {k: v for k, v in segment.metadata.items() if k != "chunk_index"}
+    data: str = json.dumps([segment.text, metadata], sort_keys=True, ensure_ascii=False)
+    digest: str = sha1(data.encode("UTF-8")).hexdigest()[:16]
+    return f"{segment.metadata['source']}_{digest}"
+
+
 class BaseVector(ABC):
     """
     向量存储的抽象基类。
@@ -57,6 +71,91 @@ class BaseVector(ABC):
         """
         pass
 
+    @abstractmethod
+    def update_metadatas(self, metadatas: dict[str, dict[str, str]]) -> bool:
+        """
+        更新已存入文档块的元数据，不重新计算向量。
+
+        Args:
+            metadatas (dict[str, dict[str, str]]): 文档块ID到新元数据的映射。
+
+        Returns:
+            bool: 如果全部更新成功或文档块不存在，则返回 True，否则返回 False。
+        """
+        pass
+
+    @abstractmethod
+    def get_source_ids(self, sources: list[str]) -> list[str]:
+        """
+        获取属于指定来源的所有文档块ID。
+
+        Args:
+            sources (list[str]): 文档来源（元数据中的 source）列表。
+
+        Returns:
+            list[str]: 这些来源下已存入的文档块ID列表。
+        """
+        pass
+
+    def sync_segments(
+        self,
+        segments: list[Segment],
+        sources: list[str] | None = None
+    ) -> tuple[list[str], list[str]]:
+        """
+        将文档块增量同步到向量存储中。
+
+        以内容哈希ID比较已存入的文档块，只添加新增或变化的文档块，
+        并删除这些来源下已不存在的旧文档块。位置移动的文档块只更新元数据中的块序号。
+
+        Args:
+            segments (list[Segment]): 来源文档重新分段后的全部文档块。
+            sources (list[str] | None, optional): 需要同步的来源列表，默认为文档块中出现的来源。
+                已被清空或删除的来源需要在此传入，以删除其全部旧文档块。
+
+        Returns:
+            tuple[list[str], list[str]]: 新增的文档块ID列表和删除的文档块ID列表。
+        """
+        if sources is None:
+            sources = list(dict.fromkeys(seg.metadata["source"] for seg in segments))
+
+        existing_ids: set[str] = set(self.get_source_ids(sources))
+
+        new_segments: dict[str, Segment] = {}
+        for segment in segments:
+            new_segments.setdefault(get_segment_id(segment), segment)
+
+        #Add before deleting so that the source is always searchable
+        added_segments: list[Segment] = [
+            segment for segment_id, segment in new_segments.items()
+            if segment_id not in existing_ids
+        ]
+        added_ids: list[str] = self.add_segments(added_segments)
+
+        #Update metadata of kept segments moved to other positions
+        kept_ids: list[str] = [
+            segment_id for segment_id in new_segments
+            if segment_id in existing_ids
+        ]
+
+        moved_metadatas: dict[str, dict[str, str]] = {}
+        for stored in self.get_segments(kept_ids):
+            segment_id: str = get_segment_id(stored)
+            new_segment: Segment | None = new_segments.get(segment_id, None)
+
+            if new_segment and new_segment.metadata != stored.metadata:
+                moved_metadatas[segment_id] = new_segment.metadata
+
+        self.update_metadatas(moved_metadatas)
+
+        deleted_ids: list[str] = [
+            segment_id for segment_id in existing_ids
+            if segment_id not in new_segments
+        ]
+        self.delete_segments(deleted_ids)
+
+        return added_ids, deleted_ids
+
     @abstractmethod
     def get_segments(self, segment_ids: list[str]) -> list[Segment]:
         """
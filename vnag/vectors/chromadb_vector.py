@@ -12,7 +12,7 @@ from chromadb.config import Settings as ChromaSettings
 
 from vnag.object import Segment
 from vnag.utility import get_folder_path
-from vnag.vector import BaseVector
+from vnag.vector import BaseVector, get_segment_id
 from vnag.embedder import BaseEmbedder
 
 
@@ -42,19 +42,17 @@ class ChromaVector(BaseVector):
         if not segments:
             return []
 
-        texts: list[str] = [seg.text for seg in segments]
-        metadatas: list[Mapping[str, Any]] = [seg.metadata for seg in segments]
+        #Generate a unique ID using source (absolute path) and content hash, duplicates are removed
+        unique_segments: dict[str, Segment] = {get_segment_id(seg): seg for seg in segments}
+
+        ids: list[str] = list(unique_segments)
+        texts: list[str] = [seg.text for seg in unique_segments.values()]
+        metadatas: list[Mapping[str, Any]] = [seg.metadata for seg in unique_segments.values()]
 
         embeddings_np: NDArray[np.float32] = self.embedder.encode(
             texts
         )
 
-        #Generate a unique ID using a combination of source (absolute path) and chunk_index
-        ids: list[str] = [
-            f"{seg.metadata['source']}_{seg.metadata['chunk_index']}"
-            for seg in segments
-        ]
-
         #Write in batches to avoid triggering Chroma's single batch limit (approximately 5461)
         db_batch_size: int = 3000
         for i in range(0, len(ids), db_batch_size):
@@ -114,6 +112,34 @@ class ChromaVector(BaseVector):
             #Consider adding logging here
             return False
 
+    def update_metadatas(self, metadatas: dict[str, dict[str, str]]) -> bool:
+        """Update metadata of stored document chunks in ChromaDB"""
+        if not metadatas:
+            return True
+
+        ids: list[str] = list(metadatas)
+        values: list[Mapping[str, Any]] = list(metadatas.values())
+
+        try:
+            db_batch_size: int = 3000
+            for i in range(0, len(ids), db_batch_size):
+                j = i + db_batch_size
+                self.collection.update(ids=ids[i:j], metadatas=values[i:j])
+            return True
+        except Exception:
+            return False
+
+    def get_source_ids(self, sources: list[str]) -> list[str]:
+        """Get IDs of all document chunks of sources from ChromaDB"""
+        if not sources:
+            return []
+
+        results: GetResult = self.collection.get(
+            where={"source": {"$in": sources}},
+            include=[]
+        )
+        return results["ids"]
+
     def get_segments(self, segment_ids: list[str]) -> list[Segment]:
         """Get the original document chunk directly from ChromaDB based on the ID list"""
         if not segment_ids:
@@ -0,0 +1,569 @@
+import json
+import os
+from pathlib import Path
+from threading import Lock
+
+import numpy as np
+from numpy.typing import NDArray
+
+from vnag.object import Segment
+from vnag.utility import get_folder_path
+from vnag.vector import BaseVector, get_segment_id
+from vnag.embedder import BaseEmbedder
+
+
+#Rows of int8 vectors converted to float32 at a time
+QUANTIZED_CHUNK: int = 1024
+
+
+def normalize(embeddings: NDArray[np.float32]) -> NDArray[np.float32]:
+    """Normalize vectors to unit length"""
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms: NDArray[np.float32] = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+
+def nearest_centroids(vectors: NDArray[np.float32], centroids: NDArray[np.float32]) -> NDArray[np.int32]:
+    """Get nearest centroid of each vector, computed in blocks to limit memory"""
+    labels: list[NDArray[np.int32]] = []
+    block_size: int = max(1, 2 ** 22 // len(centroids))
+
+    for start in range(0, len(vectors), block_size):
+        scores: NDArray[np.float32] = vectors[start:start + block_size] @ centroids.T
+        labels.append(np.argmax(scores, axis=1).astype(np.int32))
+
+    if not labels:
+        return np.zeros(0, dtype=np.int32)
+
+    return np.concatenate(labels)
+
+
+class NumpyVector(BaseVector):
+    """
+    基于 NumPy 的进程内向量存储。
+
+    归一化后的向量（float32 或 int8 量化）追加写入磁盘文件并通过内存映射读取，
+    文本和元数据以 JSON Lines 格式保存在附属文件中，删除和元数据更新操作以标记记录追加。
+    默认通过分块矩阵乘法进行精确检索，也可以构建 IVF 粗量化索引加速大规模检索。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        embedder: BaseEmbedder,
+        quantize: bool = False,
+        block_size: int = 65536,
+        nprobe: int = 8
+    ) -> None:
+        """Initialize the NumPy vector store"""
+        self.persist_dir: Path = get_folder_path("numpy_db").joinpath(name)
+        self.persist_dir.mkdir(exist_ok=True)
+
+        self.embedder: BaseEmbedder = embedder
+        self.block_size: int = block_size
+        self.nprobe: int = nprobe
+
+        self.meta_path: Path = self.persist_dir.joinpath("meta.json")
+        self.segment_path: Path = self.persist_dir.joinpath("segments.jsonl")
+        self.scale_path: Path = self.persist_dir.joinpath("scales.f32")
+        self.index_path: Path = self.persist_dir.joinpath("ivf.npz")
+
+        self.lock: Lock = Lock()
+
+        self.dimension: int = 0
+        self.quantize: bool = quantize
+
+        #Data of each row, including deleted ones before compaction
+        self.ids: list[str] = []
+        self.texts: list[str] = []
+        self.metadatas: list[dict[str, str]] = []
+        self.alive: NDArray[np.bool_] = np.zeros(0, dtype=np.bool_)
+
+        #Row of each segment not deleted
+        self.rows: dict[str, int] = {}
+
+        self.vectors: np.memmap | None = None
+        self.scales: np.memmap | None = None
+
+        #IVF index: centroids, assigned centroid of each row and rows of each centroid
+        self.centroids: NDArray[np.float32] | None = None
+        self.assignments: NDArray[np.int32] = np.zeros(0, dtype=np.int32)
+        self.lists: list[NDArray[np.int64]] = []
+
+        self._load()
+
+    @property
+    def vector_path(self) -> Path:
+        """Path of vector file"""
+        if self.quantize:
+            return self.persist_dir.joinpath("vectors.i8")
+        else:
+            return self.persist_dir.joinpath("vectors.f32")
+
+    def _load(self) -> None:
+        """Load segments and map vector files"""
+        if not self.meta_path.exists():
+            return
+
+        #Settings of existing store are used
+        with open(self.meta_path, encoding="UTF-8") as f:
+            meta: dict = json.load(f)
+            self.dimension = meta["dimension"]
+            self.quantize = meta["quantize"]
+
+        deleted_rows: list[int] = []
+        complete: bool = True
+
+        if self.segment_path.exists():
+            with open(self.segment_path, encoding="UTF-8") as f:
+                for line in f:
+                    #Records appended later would be glued onto a partially written one
+                    if not line.endswith("\n"):
+                        complete = False
+
+                    try:
+                        record: dict = json.loads(line)
+                    except json.JSONDecodeError:
+                        complete = False
+                        break
+
+                    if "delete" in record:
+                        row: int | None = self.rows.pop(record["delete"], None)
+                        if row is not None:
+                            deleted_rows.append(row)
+                    elif "update" in record:
+                        row = self.rows.get(record["update"], None)
+                        if row is not None:
+                            self.metadatas[row] = record["metadata"]
+                    else:
+                        self.rows[record["id"]] = len(self.ids)
+                        self.ids.append(record["id"])
+                        self.texts.append(record["text"])
+                        self.metadatas.append(record["metadata"])
+
+        self.alive = np.ones(len(self.ids), dtype=np.bool_)
+        self.alive[deleted_rows] = False
+
+        if self.index_path.exists():
+            with np.load(self.index_path) as data:
+                self.centroids = data["centroids"]
+                self.assignments = data["assignments"]
+
+        #Rewrite files not consistently written by interrupted process
+        if not complete or not self._check_files():
+            self.compact()
+        else:
+            self._map_vectors(len(self.ids))
+            self._assign_rows()
+
+    def _get_file_rows(self) -> int:
+        """Get number of rows in vector files"""
+        if not self.vector_path.exists():
+            return 0
+
+        row_count: int = self.vector_path.stat().st_size // (self.dimension * self.vector_itemsize)
+
+        if self.quantize:
+            scale_rows: int = self.scale_path.stat().st_size // 4 if self.scale_path.exists() else 0
+            row_count = min(row_count, scale_rows)
+
+        return row_count
+
+    def _check_files(self) -> bool:
+        """Check whether vector files contain exactly all rows"""
+        vector_size: int = self.vector_path.stat().st_size if self.vector_path.exists() else 0
+        if vector_size != len(self.ids) * self.dimension * self.vector_itemsize:
+            return False
+
+        if self.quantize:
+            scale_size: int = self.scale_path.stat().st_size if self.scale_path.exists() else 0
+            if scale_size != len(self.ids) * 4:
+                return False
+
+        return True
+
+    @property
+    def vector_itemsize(self) -> int:
+        """Bytes of each vector element"""
+        return 1 if self.quantize else 4
+
+    def _map_vectors(self, row_count: int) -> None:
+        """Map given number of rows in vector files into memory"""
+        if not row_count:
+            self.vectors = None
+            self.scales = None
+            return
+
+        self.vectors = np.memmap(
+            self.vector_path,
+            dtype=np.int8 if self.quantize else np.float32,
+            mode="r",
+            shape=(row_count, self.dimension)
+        )
+
+        if self.quantize:
+            self.scales = np.memmap(self.scale_path, dtype=np.float32, mode="r", shape=(row_count,))
+
+    def _encode_rows(self, embeddings: NDArray[np.float32]) -> tuple[NDArray, NDArray[np.float32] | None]:
+        """Normalize embeddings and quantize if enabled"""
+        embeddings = normalize(embeddings)
+
+        if not self.quantize:
+            return embeddings, None
+
+        scales: NDArray[np.float32] = np.abs(embeddings).max(axis=1) / 127
+        scales = np.maximum(scales, 1e-12).astype(np.float32)
+        quantized: NDArray[np.int8] = np.round(embeddings / scales[:, None]).astype(np.int8)
+        return quantized, scales
+
+    def _get_block(self, rows: slice | NDArray[np.int64]) -> NDArray[np.float32]:
+        """Get dequantized vectors of rows"""
+        assert self.vectors is not None
+        block: NDArray = self.vectors[rows]
+
+        if not self.quantize:
+            return np.asarray(block)
+
+        assert self.scales is not None
+        return block.astype(np.float32) * self.scales[rows][:, None]
+
+    def _score_block(self, rows: slice | NDArray[np.int64], query: NDArray[np.float32]) -> NDArray[np.float32]:
+        """Get cosine similarity of rows with query"""
+        assert self.vectors is not None
+
+        if not self.quantize:
+            return self.vectors[rows] @ query
+
+        #Convert in small chunks staying in CPU cache, and scale the scores instead of vectors
+        assert self.scales is not None
+        block: NDArray[np.int8] = self.vectors[rows]
+        scores: NDArray[np.float32] = np.empty(len(block), dtype=np.float32)
+
+        for start in range(0, len(block), QUANTIZED_CHUNK):
+            end: int = start + QUANTIZED_CHUNK
+            scores[start:end] = block[start:end].astype(np.float32) @ query
+
+        return scores * self.scales[rows]
+
+    def add_segments(self, segments: list[Segment]) -> list[str]:
+        """Add a batch of document chunks to NumPy vector store"""
+        if not segments:
+            return []
+
+        #Generate a unique ID using source (absolute path) and content hash, duplicates are removed
+        unique_segments: dict[str, Segment] = {get_segment_id(seg): seg for seg in segments}
+        ids: list[str] = list(unique_segments)
+
+        with self.lock:
+            #Segments already stored have identical content
+            new_segments: dict[str, Segment] = {
+                segment_id: segment for segment_id, segment in unique_segments.items()
+                if segment_id not in self.rows
+            }
+            if not new_segments:
+                return ids
+
+            embeddings: NDArray[np.float32] = self.embedder.encode(
+                [seg.text for seg in new_segments.values()]
+            )
+            vectors, scales = self._encode_rows(embeddings)
+
+            if not self.dimension:
+                self.dimension = vectors.shape[1]
+
+                with open(self.meta_path, mode="w", encoding="UTF-8") as f:
+                    json.dump({"dimension": self.dimension, "quantize": self.quantize}, f)
+
+            #Vectors are written before segments, so that interrupted writing can be detected
+            with open(self.vector_path, mode="ab") as f:
+                f.write(vectors.tobytes())
+
+            if scales is not None:
+                with open(self.scale_path, mode="ab") as f:
+                    f.write(scales.tobytes())
+
+            with open(self.segment_path, mode="a", encoding="UTF-8") as f:
+                for segment_id, segment in new_segments.items():
+                    record: dict = {"id": segment_id, "text": segment.text, "metadata": segment.metadata}
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+                    self.rows[segment_id] = len(self.ids)
+                    self.ids.append(segment_id)
+                    self.texts.append(segment.text)
+                    self.metadatas.append(segment.metadata)
+
+            self.alive = np.concatenate([self.alive, np.ones(len(new_segments), dtype=np.bool_)])
+
+            self._map_vectors(len(self.ids))
+            self._assign_rows()
+
+        return ids
+
+    def retrieve(self, query_text: str, k: int = 5) -> list[Segment]:
+        """Retrieve similar document chunks based on query text"""
+        if self.count == 0:
+            return []
+
+        query_embedding_np: NDArray[np.float32] = self.embedder.encode([query_text])
+        query: NDArray[np.float32] = normalize(query_embedding_np)[0]
+
+        with self.lock:
+            candidates: NDArray[np.int64] | None = self._probe(query)
+            rows, scores = self._search(query, candidates, k)
+
+            #Convert cosine similarity to cosine distance, consistent with ChromaDB
+            return [
+                Segment(
+                    text=self.texts[row],
+                    metadata=dict(self.metadatas[row]),
+                    score=float(1 - score)
+                )
+                for row, score in zip(rows, scores, strict=True)
+            ]
+
+    def _search(
+        self,
+        query: NDArray[np.float32],
+        candidates: NDArray[np.int64] | None,
+        k: int
+    ) -> tuple[NDArray[np.int64], NDArray[np.float32]]:
+        """Exact top k search of candidate rows (all rows if None) with blocked matrix products"""
+        total: int = len(self.ids) if candidates is None else len(candidates)
+
+        best_rows: NDArray[np.int64] = np.zeros(0, dtype=np.int64)
+        best_scores: NDArray[np.float32] = np.zeros(0, dtype=np.float32)
+
+        for start in range(0, total, self.block_size):
+            end: int = min(start + self.block_size, total)
+
+            if candidates is None:
+                block_rows: NDArray[np.int64] = np.arange(start, end)
+                scores: NDArray[np.float32] = self._score_block(slice(start, end), query)
+            else:
+                block_rows = candidates[start:end]
+                scores = self._score_block(block_rows, query)
+
+            scores[~self.alive[block_rows]] = -np.inf
+
+            #Keep top k of current block and previous best
+            if len(scores) > k:
+                top: NDArray[np.int64] = np.argpartition(-scores, k)[:k]
+                block_rows = block_rows[top]
+                scores = scores[top]
+
+            best_rows = np.concatenate([best_rows, block_rows])
+            best_scores = np.concatenate([best_scores, scores])
+
+            if len(best_scores) > k:
+                top = np.argpartition(-best_scores, k)[:k]
+                best_rows = best_rows[top]
+                best_scores = best_scores[top]
+
+        order: NDArray[np.int64] = np.argsort(-best_scores, kind="stable")
+        valid: NDArray[np.bool_] = np.isfinite(best_scores[order])
+        return best_rows[order][valid], best_scores[order][valid]
+
+    def build_index(self, nlist: int = 0, iterations: int = 10, seed: int = 0) -> None:
+        """
+        构建 IVF 粗量化索引，之后的检索只计算距离查询最近的 nprobe 个聚类中的向量。
+
+        Args:
+            nlist (int, optional): 聚类数量，默认为向量数量平方根的 4 倍。
+            iterations (int, optional): 球面 k-means 的迭代次数。
+            seed (int, optional): 随机种子。
+        """
+        with self.lock:
+            alive_rows: NDArray[np.int64] = np.flatnonzero(self.alive)
+            if not len(alive_rows):
+                return
+
+            if not nlist:
+                nlist = int(4 * np.sqrt(len(alive_rows)))
+            nlist = max(1, min(nlist, len(alive_rows)))
+
+            #Train on a sample of rows
+            rng: np.random.Generator = np.random.default_rng(seed)
+            sample_size: int = min(len(alive_rows), nlist * 64)
+            sample: NDArray[np.float32] = self._get_block(
+                np.sort(rng.choice(alive_rows, sample_size, replace=False))
+            )
+
+            centroids: NDArray[np.float32] = sample[rng.choice(sample_size, nlist, replace=False)]
+
+            for _ in range(iterations):
+                labels: NDArray[np.int32] = nearest_centroids(sample, centroids)
+
+                order: NDArray[np.int64] = np.argsort(labels, kind="stable")
+                sorted_sample: NDArray[np.float32] = sample[order]
+                bounds: NDArray[np.int64] = np.searchsorted(labels[order], np.arange(nlist + 1))
+
+                for i in range(nlist):
+                    #Empty clusters are restarted at random samples
+                    if bounds[i] == bounds[i + 1]:
+                        centroids[i] = sample[rng.integers(sample_size)]
+                    else:
+                        centroids[i] = sorted_sample[bounds[i]:bounds[i + 1]].sum(axis=0)
+
+                centroids = normalize(centroids)
+
+            self.centroids = centroids
+            self.assignments = np.zeros(0, dtype=np.int32)
+            self._assign_rows()
+
+    def _assign_rows(self) -> None:
+        """Assign rows not yet indexed to nearest centroids, then update rows of each centroid"""
+        if self.centroids is None:
+            return
+
+        if len(self.assignments) != len(self.ids):
+            assignments: list[NDArray[np.int32]] = [self.assignments[:len(self.ids)]]
+
+            for start in range(len(assignments[0]), len(self.ids), self.block_size):
+                end: int = min(start + self.block_size, len(self.ids))
+                block: NDArray[np.float32] = self._get_block(slice(start, end))
+                assignments.append(nearest_centroids(block, self.centroids))
+
+            self.assignments = np.concatenate(assignments)
+
+            np.savez(self.index_path, centroids=self.centroids, assignments=self.assignments)
+
+        #Rows of each centroid, sorted for sequential reading
+        order: NDArray[np.int64] = np.argsort(self.assignments, kind="stable")
+        bounds: NDArray[np.int64] = np.searchsorted(self.assignments[order], np.arange(len(self.centroids) + 1))
+        self.lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(self.centroids))]
+
+    def _probe(self, query: NDArray[np.float32]) -> NDArray[np.int64] | None:
+        """Get candidate rows in nearest centroids, None for exact search"""
+        if self.centroids is None or self.nprobe >= len(self.centroids):
+            return None
+
+        scores: NDArray[np.float32] = self.centroids @ query
+        probes: NDArray[np.int64] = np.argpartition(-scores, self.nprobe)[:self.nprobe]
+
+        return np.sort(np.concatenate([self.lists[i] for i in probes]))
+
+    def compact(self) -> None:
+        """Rewrite vector and segment files without deleted rows"""
+        alive_rows: NDArray[np.int64] = np.flatnonzero(self.alive[:self._get_file_rows()])
+
+        vector_data: bytes = b""
+        scale_data: bytes = b""
+
+        if len(alive_rows):
+            self._map_vectors(self._get_file_rows())
+            assert self.vectors is not None
+            vector_data = np.ascontiguousarray(self.vectors[alive_rows]).tobytes()
+
+            if self.quantize:
+                assert self.scales is not None
+                scale_data = np.ascontiguousarray(self.scales[alive_rows]).tobytes()
+
+        self.vectors = None
+        self.scales = None
+
+        self._replace_file(self.vector_path, vector_data)
+        if self.quantize:
+            self._replace_file(self.scale_path, scale_data)
+
+        self.ids = [self.ids[row] for row in alive_rows]
+        self.texts = [self.texts[row] for row in alive_rows]
+        self.metadatas = [self.metadatas[row] for row in alive_rows]
+        self.alive = np.ones(len(self.ids), dtype=np.bool_)
+        self.rows = {segment_id: row for row, segment_id in enumerate(self.ids)}
+
+        lines: list[str] = [
+            json.dumps({"id": segment_id, "text": text, "metadata": metadata}, ensure_ascii=False) + "\n"
+            for segment_id, text, metadata in zip(self.ids, self.texts, self.metadatas, strict=True)
+        ]
+        self._replace_file(self.segment_path, "".join(lines).encode("UTF-8"))
+
+        self._map_vectors(len(self.ids))
+
+        #Rows of existing centroids are assigned again
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self._assign_rows()
+
+    @staticmethod
+    def _replace_file(file_path: Path, data: bytes) -> None:
+        """Replace file content atomically"""
+        temp_path: Path = file_path.with_name(file_path.name + ".tmp")
+
+        with open(temp_path, mode="wb") as f:
+            f.write(data)
+
+        os.replace(temp_path, file_path)
+
+    def delete_segments(self, segment_ids: list[str]) -> bool:
+        """Delete one or more documents based on a list of IDs"""
+        if not segment_ids:
+            return True
+
+        try:
+            with self.lock:
+                with open(self.segment_path, mode="a", encoding="UTF-8") as f:
+                    for segment_id in segment_ids:
+                        row: int | None = self.rows.pop(segment_id, None)
+                        if row is None:
+                            continue
+
+                        self.alive[row] = False
+                        f.write(json.dumps({"delete": segment_id}, ensure_ascii=False) + "\n")
+
+                #Compact when most rows are deleted
+                deleted_count: int = len(self.ids) - len(self.rows)
+                if deleted_count > 1000 and deleted_count > len(self.rows):
+                    self.compact()
+
+            return True
+        except OSError:
+            return False
+
+    def update_metadatas(self, metadatas: dict[str, dict[str, str]]) -> bool:
+        """Update metadata of stored document chunks, appended as update records"""
+        if not metadatas:
+            return True
+
+        try:
+            with self.lock:
+                with open(self.segment_path, mode="a", encoding="UTF-8") as f:
+                    for segment_id, metadata in metadatas.items():
+                        row: int | None = self.rows.get(segment_id, None)
+                        if row is None:
+                            continue
+
+                        self.metadatas[row] = metadata
+                        record: dict = {"update": segment_id, "metadata": metadata}
+                        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+            return True
+        except OSError:
+            return False
+
+    def get_source_ids(self, sources: list[str]) -> list[str]:
+        """Get IDs of all document chunks of sources"""
+        source_set: set[str] = set(sources)
+
+        with self.lock:
+            return [
+                segment_id for segment_id, row in self.rows.items()
+                if self.metadatas[row].get("source", "") in source_set
+            ]
+
+    def get_segments(self, segment_ids: list[str]) -> list[Segment]:
+        """Get the original document chunk directly based on the ID list"""
+        results: list[Segment] = []
+
+        with self.lock:
+            for segment_id in segment_ids:
+                row: int | None = self.rows.get(segment_id, None)
+
+                if row is not None:
+                    segment: Segment = Segment(text=self.texts[row], metadata=dict(self.metadatas[row]))
+                    results.append(segment)
+
+        return results
+
+    @property
+    def count(self) -> int:
+        """Get the total number of documents in the vector store"""
+        return len(self.rows)
@@ -9,12 +9,15 @@ from qdrant_client.models import (
     Distance,
     VectorParams,
     PointStruct,
-    CollectionDescription
+    CollectionDescription,
+    Filter,
+    FieldCondition,
+    MatchAny
 )
 
 from vnag.object import Segment
 from vnag.utility import get_folder_path
-from vnag.vector import BaseVector
+from vnag.vector import BaseVector, get_segment_id
 from vnag.embedder import BaseEmbedder
 
 
@@ -60,16 +63,15 @@ class QdrantVector(BaseVector):
         if not segments:
             return []
 
+        #Generate a unique ID from source and content hash (as a string, for return), duplicates are removed
+        unique_segments: dict[str, Segment] = {get_segment_id(seg): seg for seg in segments}
+
+        string_ids: list[str] = list(unique_segments)
+        segments = list(unique_segments.values())
         texts: list[str] = [seg.text for seg in segments]
 
         embeddings_np: NDArray[np.float32] = self.embedder.encode(texts)
 
-        #Generate a unique ID (as a string, for return)
-        string_ids: list[str] = [
-            f"{seg.metadata['source']}_{seg.metadata['chunk_index']}"
-            for seg in segments
-        ]
-
         #Build Qdrant Points
         points: list[PointStruct] = []
         for string_id, segment, embedding in zip(
@@ -164,6 +166,50 @@ class QdrantVector(BaseVector):
         except Exception:
             return False
 
+    def update_metadatas(self, metadatas: dict[str, dict[str, str]]) -> bool:
+        """Update metadata of stored document chunks in Qdrant"""
+        try:
+            for string_id, metadata in metadatas.items():
+                self.client.set_payload(
+                    collection_name=self.collection_name,
+                    payload=metadata,
+                    points=[str(uuid5(NAMESPACE_DNS, string_id))]
+                )
+            return True
+        except Exception:
+            return False
+
+    def get_source_ids(self, sources: list[str]) -> list[str]:
+        """Get IDs of all document chunks of sources from Qdrant"""
+        if not sources:
+            return []
+
+        scroll_filter: Filter = Filter(
+            must=[FieldCondition(key="source", match=MatchAny(any=sources))]
+        )
+
+        #Scroll through all matched points page by page
+        string_ids: list[str] = []
+        offset: Any = None
+
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=scroll_filter,
+                limit=1000,
+                offset=offset,
+                with_payload=["string_id"]
+            )
+
+            for point in points:
+                if point.payload:
+                    string_ids.append(point.payload["string_id"])
+
+            if offset is None:
+                break
+
+        return string_ids
+
     def get_segments(self, segment_ids: list[str]) -> list[Segment]:
         """Get the original document block directly from Qdrant based on the ID list"""
         if not segment_ids:
@@ -186,6 +232,7 @@ class QdrantVector(BaseVector):
             else:
                 payload = {}
             text: str = payload.pop("text", "")
+            payload.pop("string_id", None)
 
             safe_meta: dict[str, str] = {
                 str(key): str(value) for key, value in payload.items()
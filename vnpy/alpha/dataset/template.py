@@ -25,13 +25,17 @@ class AlphaDataset:
 
     def __init__(
         self,
-        df: pl.DataFrame,
+        df: pl.DataFrame | pl.LazyFrame,
         train_period: tuple[str, str],
         valid_period: tuple[str, str],
         test_period: tuple[str, str],
         process_type: str = "append"
     ) -> None:
         """Constructor"""
+        # Materialize lazy bar data with the streaming engine
+        if isinstance(df, pl.LazyFrame):
+            df = df.collect(engine="streaming")
+
         self.df: pl.DataFrame = df
 
         # DataFrames for processed data
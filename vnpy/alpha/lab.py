@@ -1,10 +1,14 @@
 import json
+import glob
+import time
 import shelve
 import pickle
 from pathlib import Path
 from datetime import datetime, timedelta
 from collections import defaultdict
 from functools import lru_cache
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
 
 import polars as pl
 
@@ -17,11 +21,36 @@ from .dataset import AlphaDataset, to_datetime
 from .model import AlphaModel
 
 
+# Columns stored for each bar
+BAR_COLUMNS: list[str] = [
+    "datetime",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "turnover",
+    "open_interest"
+]
+
+
 class AlphaLab:
     """Alpha Research Laboratory"""
 
-    def __init__(self, lab_path: str) -> None:
-        """Constructor"""
+    def __init__(
+        self,
+        lab_path: str,
+        partitioned: bool = False,
+        compact_threshold: int = 16
+    ) -> None:
+        """
+        Constructor
+
+        With partitioned enabled, bar data is stored as append-only fragments
+        in hive-style partitions (daily by year, minute by year and month),
+        and the fragments of each symbol are compacted in the background once
+        their number reaches compact_threshold.
+        """
         # Set data paths
         self.lab_path: Path = Path(lab_path)
 
@@ -48,6 +77,42 @@ class AlphaLab:
             if not path.exists():
                 path.mkdir(parents=True)
 
+        # Partitioned bar storage
+        self.partitioned: bool = partitioned
+        self.compact_threshold: int = compact_threshold
+
+        self.fragment_counts: dict[tuple[Path, str], int] = {}
+        self.compacting: set[tuple[Path, str]] = set()
+        self.compact_lock: Lock = Lock()
+        self.compact_executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+
+    def __getstate__(self) -> dict:
+        """Exclude compaction worker when pickled for process pools"""
+        state: dict = self.__dict__.copy()
+
+        for key in ["fragment_counts", "compacting", "compact_lock", "compact_executor"]:
+            state.pop(key)
+
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Recreate compaction worker after unpickling"""
+        self.__dict__.update(state)
+
+        self.fragment_counts = {}
+        self.compacting = set()
+        self.compact_lock = Lock()
+        self.compact_executor = ThreadPoolExecutor(max_workers=1)
+
+    def get_folder_path(self, interval: Interval) -> Path | None:
+        """Get bar data folder path of interval"""
+        if interval == Interval.DAILY:
+            return self.daily_path
+        elif interval == Interval.MINUTE:
+            return self.minute_path
+        else:
+            return None
+
     def save_bar_data(self, bars: list[BarData]) -> None:
         """Save bar data"""
         if not bars:
@@ -80,6 +145,11 @@ class AlphaLab:
 
         new_df: pl.DataFrame = pl.DataFrame(data)
 
+        # Append new fragments in partitioned layout
+        if self.partitioned:
+            self.append_bar_df(file_path.parent, bar.vt_symbol, bar.interval, new_df)
+            return
+
         # If file exists, read and merge
         if file_path.exists():
             old_df: pl.DataFrame = pl.read_parquet(file_path)
@@ -108,50 +178,15 @@ class AlphaLab:
         start = to_datetime(start)
         end = to_datetime(end)
 
-        # Get folder path
-        if interval == Interval.DAILY:
-            folder_path: Path = self.daily_path
-        elif interval == Interval.MINUTE:
-            folder_path = self.minute_path
-        else:
-            logger.error(f"Unsupported interval {interval.value}")
-            return []
-
-        # Check if file exists
-        file_path: Path = folder_path.joinpath(f"{vt_symbol}.parquet")
-        if not file_path.exists():
-            logger.error(f"File {file_path} does not exist")
+        # Scan data files
+        lf: pl.LazyFrame | None = self.scan_bar_data([vt_symbol], interval, start, end)
+        if lf is None:
             return []
 
-        # Open file
-        df: pl.DataFrame = pl.read_parquet(file_path)
-
-        # Filter by date range
-        df = df.filter((pl.col("datetime") >= start) & (pl.col("datetime") <= end))
+        df: pl.DataFrame = lf.collect()
 
         # Convert to BarData objects
-        bars: list[BarData] = []
-
-        symbol, exchange = extract_vt_symbol(vt_symbol)
-
-        for row in df.iter_rows(named=True):
-            bar = BarData(
-                symbol=symbol,
-                exchange=exchange,
-                datetime=row["datetime"],
-                interval=interval,
-                open_price=row["open"],
-                high_price=row["high"],
-                low_price=row["low"],
-                close_price=row["close"],
-                volume=row["volume"],
-                turnover=row["turnover"],
-                open_interest=row["open_interest"],
-                gateway_name="DB"
-            )
-            bars.append(bar)
-
-        return bars
+        return to_bar_data(df, vt_symbol, interval)
 
     def load_bar_df(
         self,
@@ -159,9 +194,17 @@ class AlphaLab:
         interval: Interval | str,
         start: datetime | str,
         end: datetime | str,
-        extended_days: int
-    ) -> pl.DataFrame | None:
-        """Load bar data as DataFrame"""
+        extended_days: int,
+        lazy: bool = False
+    ) -> pl.DataFrame | pl.LazyFrame | None:
+        """
+        Load bar data as DataFrame
+
+        All symbols are processed in one lazy query plan, with price
+        normalization evaluated as a window over vt_symbol. The plan is
+        collected with the streaming engine, or returned as LazyFrame if
+        lazy is True.
+        """
         if not vt_symbols:
             return None
 
@@ -172,75 +215,222 @@ class AlphaLab:
         start = to_datetime(start) - timedelta(days=extended_days)
         end = to_datetime(end) + timedelta(days=extended_days // 10)
 
-        # Get folder path
-        if interval == Interval.DAILY:
-            folder_path: Path = self.daily_path
-        elif interval == Interval.MINUTE:
-            folder_path = self.minute_path
-        else:
+        # Scan data of all symbols
+        lf: pl.LazyFrame | None = self.scan_bar_data(vt_symbols, interval, start, end)
+        if lf is None:
+            return None
+
+        # Add vwap column
+        lf = lf.with_columns((pl.col("turnover") / pl.col("volume")).alias("vwap"))
+
+        # Normalize prices by the first close of each symbol
+        close_0: pl.Expr = pl.col("close").first().over("vt_symbol")
+
+        lf = lf.with_columns(
+            (pl.col("open") / close_0).alias("open"),
+            (pl.col("high") / close_0).alias("high"),
+            (pl.col("low") / close_0).alias("low"),
+            (pl.col("close") / close_0).alias("close"),
+        )
+
+        # Convert zeros to NaN for suspended trading days
+        numeric_columns: list[str] = BAR_COLUMNS[1:] + ["vwap"]
+
+        mask: pl.Expr = pl.sum_horizontal(numeric_columns) == 0                # Sum by row, if 0 then suspended
+
+        lf = lf.with_columns(                                                   # Convert suspended day values to NaN
+            [pl.when(mask).then(float("nan")).otherwise(pl.col(col)).alias(col) for col in numeric_columns]
+        )
+
+        lf = lf.select(["datetime"] + numeric_columns + ["vt_symbol"])
+
+        if lazy:
+            return lf
+
+        result_df: pl.DataFrame = lf.collect(engine="streaming")
+        return result_df
+
+    def scan_bar_data(
+        self,
+        vt_symbols: list[str],
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> pl.LazyFrame | None:
+        """
+        Build a lazy scan of bar data for multiple symbols
+
+        Date range and symbol filters are pushed down into the parquet
+        readers, so only the matching partitions and row groups are read.
+        """
+        folder_path: Path | None = self.get_folder_path(interval)
+        if not folder_path:
             logger.error(f"Unsupported interval {interval.value}")
             return None
 
-        # Read data for each symbol
-        dfs: list = []
+        date_filter: pl.Expr = (pl.col("datetime") >= start) & (pl.col("datetime") <= end)
+
+        # Partitioned layout: one scan over all fragments
+        if self.partitioned:
+            if not next(folder_path.glob("year=*/**/*.parquet"), None):
+                logger.error(f"No bar data in {folder_path}")
+                return None
+
+            lf: pl.LazyFrame = (
+                pl.scan_parquet(folder_path.joinpath("year=*", "**", "*.parquet"), hive_partitioning=True)
+                .filter(
+                    pl.col("year").is_between(start.year, end.year)
+                    & pl.col("vt_symbol").is_in(vt_symbols)
+                    & date_filter
+                )
+                .select(BAR_COLUMNS + ["vt_symbol"])
+                .unique(subset=["vt_symbol", "datetime"], keep="last", maintain_order=True)
+                .sort([pl.col("vt_symbol").cast(pl.Enum(list(dict.fromkeys(vt_symbols)))), "datetime"])
+            )
+            return lf
+
+        # Flat layout: one file per symbol
+        lfs: list[pl.LazyFrame] = []
 
         for vt_symbol in vt_symbols:
-            # Check if file exists
             file_path: Path = folder_path.joinpath(f"{vt_symbol}.parquet")
             if not file_path.exists():
                 logger.error(f"File {file_path} does not exist")
                 continue
 
-            # Open file
-            df: pl.DataFrame = pl.read_parquet(file_path)
-
-            # Filter by date range
-            df = df.filter((pl.col("datetime") >= start) & (pl.col("datetime") <= end))
-
-            # Specify data types
-            df = df.with_columns(
-                pl.col("open"),
-                pl.col("high"),
-                pl.col("low"),
-                pl.col("close"),
-                pl.col("volume"),
-                pl.col("turnover"),
-                pl.col("open_interest"),
-                (pl.col("turnover") / pl.col("volume")).alias("vwap")
+            lf = (
+                pl.scan_parquet(file_path)
+                .filter(date_filter)
+                .select(BAR_COLUMNS)
+                .with_columns(pl.lit(vt_symbol).alias("vt_symbol"))
             )
+            lfs.append(lf)
 
-            # Check for empty data
-            if df.is_empty():
-                continue
+        if not lfs:
+            return None
 
-            # Normalize prices
-            close_0: float = df.select(pl.col("close")).item(0, 0)
+        return pl.concat(lfs)
 
-            df = df.with_columns(
-                (pl.col("open") / close_0).alias("open"),
-                (pl.col("high") / close_0).alias("high"),
-                (pl.col("low") / close_0).alias("low"),
-                (pl.col("close") / close_0).alias("close"),
+    def get_partition_path(self, folder_path: Path, interval: Interval, year: int, month: int) -> Path:
+        """Get partition folder path of bar data"""
+        if interval == Interval.MINUTE:
+            return folder_path.joinpath(f"year={year}", f"month={month:02d}")
+        else:
+            return folder_path.joinpath(f"year={year}")
+
+    def append_bar_df(
+        self,
+        folder_path: Path,
+        vt_symbol: str,
+        interval: Interval,
+        df: pl.DataFrame
+    ) -> None:
+        """Write bar data of a symbol as new fragments in each partition"""
+        df = df.with_columns(
+            pl.col("datetime").dt.year().alias("year"),
+            pl.col("datetime").dt.month().alias("month"),
+            pl.lit(vt_symbol).alias("vt_symbol")
+        )
+
+        # Only the partitions touched by the new bars are written
+        for partition_df in df.partition_by(["year", "month"]):
+            partition_path: Path = self.get_partition_path(
+                folder_path,
+                interval,
+                partition_df["year"][0],
+                partition_df["month"][0]
             )
 
-            # Convert zeros to NaN for suspended trading days
-            numeric_columns: list = df.columns[1:]                              # Extract numeric columns
+            if not partition_path.exists():
+                partition_path.mkdir(parents=True, exist_ok=True)
 
-            mask: pl.Series = df[numeric_columns].sum_horizontal() == 0         # Sum by row, if 0 then suspended
+            fragment_df: pl.DataFrame = partition_df.drop(["year", "month"]).sort("datetime")
 
-            df = df.with_columns(                                               # Convert suspended day values to NaN
-                [pl.when(mask).then(float("nan")).otherwise(pl.col(col)).alias(col) for col in numeric_columns]
-            )
+            file_path: Path = partition_path.joinpath(f"{vt_symbol}.{time.time_ns()}.parquet")
+            write_parquet_atomic(fragment_df, file_path)
 
-            # Add symbol column
-            df = df.with_columns(pl.lit(vt_symbol).alias("vt_symbol"))
+            self.count_fragment(partition_path, vt_symbol)
 
-            # Cache in list
-            dfs.append(df)
+    def count_fragment(self, partition_path: Path, vt_symbol: str) -> None:
+        """Count new fragment and schedule compaction if necessary"""
+        key: tuple[Path, str] = (partition_path, vt_symbol)
 
-        # Concatenate results
-        result_df: pl.DataFrame = pl.concat(dfs)
-        return result_df
+        with self.compact_lock:
+            if key in self.fragment_counts:
+                self.fragment_counts[key] += 1
+            else:
+                self.fragment_counts[key] = len(get_fragment_paths(partition_path, vt_symbol))
+
+            if self.fragment_counts[key] < self.compact_threshold or key in self.compacting:
+                return
+
+            self.compacting.add(key)
+
+        self.compact_executor.submit(self.compact_fragments, partition_path, vt_symbol)
+
+    def compact_fragments(self, partition_path: Path, vt_symbol: str) -> None:
+        """Merge all fragments of a symbol in a partition into one file"""
+        key: tuple[Path, str] = (partition_path, vt_symbol)
+
+        try:
+            file_paths: list[Path] = get_fragment_paths(partition_path, vt_symbol)
+
+            if len(file_paths) > 1:
+                # Later fragments take precedence over earlier ones
+                df: pl.DataFrame = pl.concat([pl.read_parquet(path) for path in file_paths])
+                df = df.unique(subset=["datetime"], keep="last", maintain_order=True).sort("datetime")
+
+                compact_path: Path = partition_path.joinpath(f"{vt_symbol}.0.parquet")
+                write_parquet_atomic(df, compact_path)
+
+                for path in file_paths:
+                    if path != compact_path:
+                        path.unlink()
+        except Exception as e:
+            logger.error(f"Failed to compact {vt_symbol} in {partition_path}: {e}")
+        finally:
+            with self.compact_lock:
+                self.fragment_counts[key] = len(get_fragment_paths(partition_path, vt_symbol))
+                self.compacting.discard(key)
+
+    def compact_bar_data(self, interval: Interval | str) -> None:
+        """Compact all bar data fragments of interval and wait for completion"""
+        if isinstance(interval, str):
+            interval = Interval(interval)
+
+        folder_path: Path | None = self.get_folder_path(interval)
+        if not folder_path or not self.partitioned:
+            return
+
+        # Wait for scheduled background compaction
+        self.compact_executor.submit(lambda: None).result()
+
+        keys: set[tuple[Path, str]] = set()
+        for file_path in folder_path.rglob("*.parquet"):
+            vt_symbol: str = file_path.name.rsplit(".", 2)[0]
+            keys.add((file_path.parent, vt_symbol))
+
+        for partition_path, vt_symbol in keys:
+            self.compact_fragments(partition_path, vt_symbol)
+
+    def migrate_bar_data(self, interval: Interval | str) -> None:
+        """Convert flat per-symbol bar files of interval into the partitioned layout"""
+        if isinstance(interval, str):
+            interval = Interval(interval)
+
+        folder_path: Path | None = self.get_folder_path(interval)
+        if not folder_path or not self.partitioned:
+            return
+
+        for file_path in folder_path.glob("*.parquet"):
+            vt_symbol: str = file_path.stem
+
+            df: pl.DataFrame = pl.read_parquet(file_path)
+            self.append_bar_df(folder_path, vt_symbol, interval, df)
+
+            file_path.unlink()
+
+        self.compact_bar_data(interval)
 
     def save_component_data(
         self,
@@ -478,3 +668,42 @@ class AlphaLab:
     def list_all_signals(self) -> list[str]:
         """List all signals"""
         return [file.stem for file in self.model_path.glob("*.parquet")]
+
+
+def get_fragment_paths(partition_path: Path, vt_symbol: str) -> list[Path]:
+    """Get fragment file paths of a symbol in a partition, oldest first"""
+    pattern: str = f"{glob.escape(vt_symbol)}.*.parquet"
+    return sorted(partition_path.glob(pattern), key=lambda path: int(path.name.rsplit(".", 2)[1]))
+
+
+def write_parquet_atomic(df: pl.DataFrame, file_path: Path) -> None:
+    """Write parquet file through a temporary file, so readers never see partial data"""
+    temp_path: Path = file_path.with_name(file_path.name + ".tmp")
+    df.write_parquet(temp_path, statistics=True)
+    temp_path.replace(file_path)
+
+
+def to_bar_data(df: pl.DataFrame, vt_symbol: str, interval: Interval) -> list[BarData]:
+    """Convert bar data DataFrame of a symbol to BarData objects"""
+    bars: list[BarData] = []
+
+    symbol, exchange = extract_vt_symbol(vt_symbol)
+
+    for row in df.iter_rows(named=True):
+        bar = BarData(
+            symbol=symbol,
+            exchange=exchange,
+            datetime=row["datetime"],
+            interval=interval,
+            open_price=row["open"],
+            high_price=row["high"],
+            low_price=row["low"],
+            close_price=row["close"],
+            volume=row["volume"],
+            turnover=row["turnover"],
+            open_interest=row["open_interest"],
+            gateway_name="DB"
+        )
+        bars.append(bar)
+
+    return bars
@@ -2,8 +2,11 @@ from collections import defaultdict
 from datetime import date, datetime
 from copy import copy
 from typing import cast
+from pathlib import Path
+from tempfile import TemporaryDirectory
 import traceback
 from functools import lru_cache, partial
+from hashlib import sha1
 from collections.abc import Callable
 
 import numpy as np
@@ -18,12 +21,14 @@ from vnpy.trader.utility import round_to, extract_vt_symbol
 from vnpy.trader.optimize import (
     OptimizationSetting,
     check_optimization_setting,
+    get_context_key,
     run_bf_optimization,
-    run_ga_optimization
+    run_ga_optimization,
+    run_sh_optimization
 )
 
 from ..logger import logger
-from ..lab import AlphaLab
+from ..lab import AlphaLab, to_bar_data
 from .template import AlphaStrategy
 
 
@@ -74,6 +79,13 @@ class BacktestingEngine:
 
         self.cash: float = 0
         self.signal_df: pl.DataFrame
+        self.signal_slices: dict[datetime, tuple[int, int]] | None = None
+
+        # Panel mode data
+        self.panel: bool = False
+        self.bar_panel: BarPanel | None = None
+        self.panel_index: int = -1
+        self.symbol_indexes: dict[str, int] = {}
 
     def set_parameters(
         self,
@@ -83,11 +95,21 @@ class BacktestingEngine:
         end: datetime,
         capital: int = 1_000_000,
         risk_free: float = 0,
-        annual_days: int = 240
+        annual_days: int = 240,
+        panel: bool = False
     ) -> None:
-        """Set parameters"""
+        """
+        Set parameters
+
+        With panel enabled, bar data is held as aligned (time x symbol)
+        matrices, orders are matched with array operations and daily
+        profit and loss is accumulated in arrays, producing the same
+        results as the default object-based path. Daily result objects
+        are only created from the arrays when requested.
+        """
         self.vt_symbols = vt_symbols
         self.interval = interval
+        self.panel = panel
 
         self.start = start
         self.end = end
@@ -115,10 +137,16 @@ class BacktestingEngine:
         self.strategy = strategy_class(
             self, strategy_class.__name__, copy(self.vt_symbols), setting
         )
-        self.signal_df = signal_df
+        self.signal_df = signal_df.sort("datetime", maintain_order=True)
+        self.signal_slices = None
+
+    def load_data(self, bar_df: pl.DataFrame | None = None) -> None:
+        """
+        Load historical data
 
-    def load_data(self) -> None:
-        """Load historical data"""
+        If bar_df is provided (e.g. shared by an optimization process),
+        it is used instead of reading bar data files from the lab.
+        """
         logger.info("Start loading historical data")
 
         if not self.end:
@@ -132,15 +160,28 @@ class BacktestingEngine:
         self.history_data.clear()
         self.dts.clear()
 
+        if self.panel:
+            self.load_panel_data(bar_df)
+            return
+
+        # Split shared data by symbol
+        symbol_dfs: dict[str, pl.DataFrame] = {}
+        if bar_df is not None and not bar_df.is_empty():
+            symbol_dfs = {df["vt_symbol"][0]: df for df in bar_df.partition_by("vt_symbol")}
+
         # Load historical data for each symbol
         empty_symbols: list[str] = []
-        for vt_symbol in tqdm(self.vt_symbols, total=len(self.vt_symbols)):
-            data: list[BarData] = self.lab.load_bar_data(
-                vt_symbol,
-                self.interval,
-                self.start,
-                self.end
-            )
+        for vt_symbol in tqdm(self.vt_symbols, total=len(self.vt_symbols), disable=bar_df is not None):
+            if bar_df is not None:
+                symbol_df: pl.DataFrame = symbol_dfs.get(vt_symbol, bar_df.clear())
+                data: list[BarData] = to_bar_data(symbol_df, vt_symbol, self.interval)
+            else:
+                data = self.lab.load_bar_data(
+                    vt_symbol,
+                    self.interval,
+                    self.start,
+                    self.end
+                )
 
             for bar in data:
                 self.dts.add(bar.datetime)
@@ -155,16 +196,67 @@ class BacktestingEngine:
 
         logger.info("All historical data is loaded")
 
+    def load_panel_data(self, bar_df: pl.DataFrame | None = None) -> None:
+        """Load historical data of all symbols into aligned matrices"""
+        self.bar_panel = None
+        self.panel_index = -1
+        self.symbol_indexes = {vt_symbol: ix for ix, vt_symbol in enumerate(self.vt_symbols)}
+
+        if bar_df is None:
+            bar_df = self.load_bar_df()
+
+        if bar_df is None or bar_df.is_empty():
+            logger.info("All contract historical data are empty")
+            return
+
+        self.bar_panel = BarPanel(bar_df, self.vt_symbols, self.interval)
+
+        empty_symbols: list[str] = [
+            vt_symbol for vt_symbol, active in zip(self.vt_symbols, self.bar_panel.active[-1], strict=True)
+            if not active
+        ]
+        if empty_symbols:
+            logger.info(f"Some contract historical data are empty: {empty_symbols}")
+
+        logger.info("All historical data is loaded")
+
+    def load_bar_df(self) -> pl.DataFrame | None:
+        """Load raw bar data of all symbols as one DataFrame"""
+        lf: pl.LazyFrame | None = self.lab.scan_bar_data(self.vt_symbols, self.interval, self.start, self.end)
+        if lf is None:
+            return None
+
+        return lf.collect()
+
+    def export_shared_data(self, folder_path: Path) -> None:
+        """Export bar data and signal within the backtesting range as Arrow IPC files"""
+        bar_df: pl.DataFrame | None = self.load_bar_df()
+        if bar_df is None:
+            bar_df = pl.DataFrame()
+
+        signal_df: pl.DataFrame = self.signal_df.filter(
+            (pl.col("datetime") >= self.start) & (pl.col("datetime") <= self.end)
+        )
+
+        # Uncompressed, so that worker processes can memory-map the files
+        bar_df.write_ipc(folder_path.joinpath("bar.arrow"), compression="uncompressed")
+        signal_df.write_ipc(folder_path.joinpath("signal.arrow"), compression="uncompressed")
+
     def run_backtesting(self) -> None:
         """Start backtesting"""
         self.strategy.on_init()
         logger.info("Strategy initialization completed")
 
+        logger.info("Start playing back historical data")
+
+        if self.panel:
+            self.run_panel_backtesting()
+            return
+
         # Use remaining historical data for strategy backtesting
         dts: list = list(self.dts)
         dts.sort()
 
-        logger.info("Start playing back historical data")
         for dt in dts:
             try:
                 self.new_bars(dt)
@@ -175,6 +267,21 @@ class BacktestingEngine:
 
         logger.info("Historical data playback ends")
 
+    def run_panel_backtesting(self) -> None:
+        """Play back historical data stored in matrices"""
+        if not self.bar_panel:
+            return
+
+        for ix in range(len(self.bar_panel.dts)):
+            try:
+                self.new_panel_bars(ix)
+            except Exception:
+                logger.info("An exception is triggered and the backtest is terminated")
+                logger.info(traceback.format_exc())
+                return
+
+        logger.info("Historical data playback ends")
+
     def calculate_result(self) -> pl.DataFrame | None:
         """Calculate daily mark-to-market profit and loss"""
         logger.info("Start calculating daily mark-to-market profit and loss")
@@ -183,28 +290,10 @@ class BacktestingEngine:
             logger.info("The transaction record is empty and cannot be calculated")
             return None
 
-        for trade in self.trades.values():
-            if not trade.datetime:
-                continue
-
-            d: date = trade.datetime.date()
-            daily_result: PortfolioDailyResult = self.daily_results[d]
-            daily_result.add_trade(trade)
-
-        pre_closes: dict[str, float] = {}
-        start_poses: dict[str, float] = {}
-
-        for daily_result in self.daily_results.values():
-            daily_result.calculate_pnl(
-                pre_closes,
-                start_poses,
-                self.sizes,
-                self.long_rates,
-                self.short_rates
-            )
+        if self.panel:
+            return self.calculate_panel_result()
 
-            pre_closes = daily_result.close_prices
-            start_poses = daily_result.end_poses
+        self.calculate_daily_results()
 
         results: dict = defaultdict(list)
 
@@ -233,6 +322,170 @@ class BacktestingEngine:
         logger.info("Daily mark-to-market profit and loss calculation completed")
         return self.daily_df
 
+    def calculate_daily_results(self) -> None:
+        """Add trades into daily result objects and calculate their profit and loss"""
+        for trade in self.trades.values():
+            if not trade.datetime:
+                continue
+
+            d: date = trade.datetime.date()
+            daily_result: PortfolioDailyResult = self.daily_results[d]
+            daily_result.add_trade(trade)
+
+        pre_closes: dict[str, float] = {}
+        start_poses: dict[str, float] = {}
+
+        for daily_result in self.daily_results.values():
+            daily_result.calculate_pnl(
+                pre_closes,
+                start_poses,
+                self.sizes,
+                self.long_rates,
+                self.short_rates
+            )
+
+            pre_closes = daily_result.close_prices
+            start_poses = daily_result.end_poses
+
+    def create_panel_daily_results(self) -> None:
+        """Create daily result objects from panel arrays, same as updated by object-based path"""
+        panel: BarPanel | None = self.bar_panel
+        if not panel:
+            return
+
+        order: np.ndarray = np.lexsort((np.arange(len(self.vt_symbols)), panel.first_index))
+
+        for ix in range(self.panel_index + 1):
+            d: date = panel.dts[ix].date()
+
+            close_prices: dict[str, float] = {
+                self.vt_symbols[symbol_ix]: float(panel.mark_close[ix, symbol_ix])
+                for symbol_ix in order if panel.active[ix, symbol_ix]
+            }
+
+            daily_result: PortfolioDailyResult | None = self.daily_results.get(d, None)
+            if daily_result:
+                daily_result.update_close_prices(close_prices)
+            else:
+                self.daily_results[d] = PortfolioDailyResult(d, close_prices)
+
+        self.calculate_daily_results()
+
+    def calculate_panel_result(self) -> pl.DataFrame | None:
+        """Calculate daily mark-to-market profit and loss with arrays"""
+        panel: BarPanel | None = self.bar_panel
+        if not panel:
+            return None
+
+        # Locate the last played back row of each day
+        dates: list[date] = [dt.date() for dt in panel.dts[:self.panel_index + 1]]
+
+        day_rows: list[int] = []
+        for ix, d in enumerate(dates):
+            if ix + 1 == len(dates) or dates[ix + 1] != d:
+                day_rows.append(ix)
+
+        day_indexes: dict[date, int] = {dates[ix]: n for n, ix in enumerate(day_rows)}
+        day_count: int = len(day_rows)
+        symbol_count: int = len(self.vt_symbols)
+
+        # Contracts are aggregated in the order they first received bar data
+        order: np.ndarray = np.lexsort((np.arange(symbol_count), panel.first_index))
+
+        active: np.ndarray = panel.active[day_rows][:, order]
+        close: np.ndarray = np.where(active, panel.mark_close[day_rows][:, order], 0)
+
+        pre_close: np.ndarray = np.zeros_like(close)
+        pre_close[1:] = close[:-1]
+
+        sizes: np.ndarray = np.array([self.sizes.get(self.vt_symbols[ix], 0) for ix in order], dtype=float)
+        long_rates: np.ndarray = np.array([self.long_rates.get(self.vt_symbols[ix], 0) for ix in order], dtype=float)
+        short_rates: np.ndarray = np.array([self.short_rates.get(self.vt_symbols[ix], 0) for ix in order], dtype=float)
+
+        # Collect trades into arrays
+        positions: dict[int, int] = {ix: n for n, ix in enumerate(order)}
+
+        trade_days: list[int] = []
+        trade_symbols: list[int] = []
+        trade_changes: list[float] = []
+        trade_prices: list[float] = []
+        trade_volumes: list[float] = []
+        trade_longs: list[bool] = []
+
+        for trade in self.trades.values():
+            if not trade.datetime:
+                continue
+
+            trade_days.append(day_indexes[trade.datetime.date()])
+            trade_symbols.append(positions[self.symbol_indexes[trade.vt_symbol]])
+            trade_prices.append(trade.price)
+            trade_volumes.append(trade.volume)
+            trade_longs.append(trade.direction == Direction.LONG)
+
+            if trade.direction == Direction.LONG:
+                trade_changes.append(trade.volume)
+            else:
+                trade_changes.append(-trade.volume)
+
+        d_ix: np.ndarray = np.array(trade_days, dtype=int)
+        s_ix: np.ndarray = np.array(trade_symbols, dtype=int)
+        changes: np.ndarray = np.array(trade_changes, dtype=float)
+        prices: np.ndarray = np.array(trade_prices, dtype=float)
+        volumes: np.ndarray = np.array(trade_volumes, dtype=float)
+        rates: np.ndarray = np.where(np.array(trade_longs, dtype=bool), long_rates[s_ix], short_rates[s_ix])
+
+        # Positions are carried forward from the last trade of each symbol
+        end_pos: np.ndarray = np.zeros_like(close)
+        traded: np.ndarray = np.zeros(close.shape, dtype=bool)
+
+        running_pos: np.ndarray = np.zeros(symbol_count)
+        for d, sym, change in zip(d_ix, s_ix, changes, strict=True):
+            running_pos[sym] += change
+            end_pos[d, sym] = running_pos[sym]
+            traded[d, sym] = True
+
+        last_traded: np.ndarray = np.maximum.accumulate(
+            np.where(traded, np.arange(day_count)[:, None], -1),
+            axis=0
+        )
+        end_pos = np.where(last_traded >= 0, end_pos[last_traded, np.arange(symbol_count)], 0)
+
+        start_pos: np.ndarray = np.zeros_like(end_pos)
+        start_pos[1:] = end_pos[:-1]
+
+        # Contract daily profit and loss, trades accumulated in order
+        holding_pnl: np.ndarray = start_pos * (close - pre_close) * sizes
+
+        trade_count: np.ndarray = np.zeros(close.shape, dtype=int)
+        trading_pnl: np.ndarray = np.zeros_like(close)
+        turnover: np.ndarray = np.zeros_like(close)
+        commission: np.ndarray = np.zeros_like(close)
+
+        trade_turnover: np.ndarray = volumes * sizes[s_ix] * prices
+
+        np.add.at(trade_count, (d_ix, s_ix), 1)
+        np.add.at(trading_pnl, (d_ix, s_ix), changes * (close[d_ix, s_ix] - prices) * sizes[s_ix])
+        np.add.at(turnover, (d_ix, s_ix), trade_turnover)
+        np.add.at(commission, (d_ix, s_ix), trade_turnover * rates)
+
+        total_pnl: np.ndarray = trading_pnl + holding_pnl
+        net_pnl: np.ndarray = total_pnl - commission
+
+        # Portfolio daily result, summed sequentially over contracts
+        self.daily_df = pl.DataFrame([
+            pl.Series("date", [dates[ix] for ix in day_rows], dtype=pl.Date),
+            pl.Series("trade_count", trade_count.sum(axis=1), dtype=pl.Int64),
+            pl.Series("turnover", np.cumsum(turnover, axis=1)[:, -1], dtype=pl.Float64),
+            pl.Series("commission", np.cumsum(commission, axis=1)[:, -1], dtype=pl.Float64),
+            pl.Series("trading_pnl", np.cumsum(trading_pnl, axis=1)[:, -1], dtype=pl.Float64),
+            pl.Series("holding_pnl", np.cumsum(holding_pnl, axis=1)[:, -1], dtype=pl.Float64),
+            pl.Series("total_pnl", np.cumsum(total_pnl, axis=1)[:, -1], dtype=pl.Float64),
+            pl.Series("net_pnl", np.cumsum(net_pnl, axis=1)[:, -1], dtype=pl.Float64),
+        ])
+
+        logger.info("Daily mark-to-market profit and loss calculation completed")
+        return self.daily_df
+
     def calculate_statistics(self) -> dict:
         """Calculate strategy statistics"""
         logger.info("Start calculating strategy statistical indicators")
@@ -624,6 +877,18 @@ class BacktestingEngine:
 
         self.update_daily_close(self.bars, dt)
 
+    def new_panel_bars(self, ix: int) -> None:
+        """Push historical data of a matrix row"""
+        panel: BarPanel = cast(BarPanel, self.bar_panel)
+
+        self.panel_index = ix
+        self.datetime = panel.dts[ix]
+
+        self.cross_panel_order()
+
+        bars: dict[str, BarData] = panel.get_bars(ix)
+        self.strategy.on_bars(bars)
+
     def cross_order(self) -> None:
         """Match limit orders"""
         for order in list(self.active_limit_orders.values()):
@@ -664,55 +929,121 @@ class BacktestingEngine:
             if not long_cross and not short_cross:
                 continue
 
-            # Push order status update for filled orders
-            order.traded = order.volume
-            order.status = Status.ALLTRADED
-            self.strategy.update_order(order)
-
-            if order.vt_orderid in self.active_limit_orders:
-                self.active_limit_orders.pop(order.vt_orderid)
-
-            # Generate trade information
-            self.trade_count += 1
-
             if long_cross:
                 trade_price = min(order.price, long_best_price)
             else:
                 trade_price = max(order.price, short_best_price)
 
-            trade: TradeData = TradeData(
-                symbol=order.symbol,
-                exchange=order.exchange,
-                orderid=order.orderid,
-                tradeid=str(self.trade_count),
-                direction=order.direction,
-                offset=order.offset,
-                price=trade_price,
-                volume=order.volume,
-                datetime=self.datetime,
-                gateway_name=self.gateway_name,
-            )
+            self.fill_order(order, trade_price)
 
-            # Update available funds
-            size: float = self.sizes[trade.vt_symbol]
+    def cross_panel_order(self) -> None:
+        """Match limit orders against matrix row with array operations"""
+        orders: list[OrderData] = list(self.active_limit_orders.values())
+        if not orders:
+            return
 
-            trade_turnover: float = trade.price * trade.volume * size
+        panel: BarPanel = cast(BarPanel, self.bar_panel)
+        ix: int = self.panel_index
 
-            if trade.direction == Direction.LONG:
-                trade_commission: float = trade_turnover * self.long_rates[trade.vt_symbol]
-            else:
-                trade_commission = trade_turnover * self.short_rates[trade.vt_symbol]
+        # Build active order table
+        symbol_ixs: np.ndarray = np.array([self.symbol_indexes[order.vt_symbol] for order in orders])
+        prices: np.ndarray = np.array([order.price for order in orders])
+        is_long: np.ndarray = np.array([order.direction == Direction.LONG for order in orders])
 
-            if trade.direction == Direction.LONG:
-                self.cash -= trade_turnover
-            else:
-                self.cash += trade_turnover
+        # Calculate price limits for the symbols with active orders
+        limit_ups: dict[int, float] = {}
+        limit_downs: dict[int, float] = {}
 
-            self.cash -= trade_commission
+        for symbol_ix in np.unique(symbol_ixs).tolist():
+            pricetick: float = self.priceticks[self.vt_symbols[symbol_ix]]
+            pre_close: float = float(panel.pre_close[ix, symbol_ix])
 
-            # Push trade information
-            self.strategy.update_trade(trade)
-            self.trades[trade.vt_tradeid] = trade
+            limit_ups[symbol_ix] = round_to(pre_close * 1.1, pricetick)
+            limit_downs[symbol_ix] = round_to(pre_close * 0.9, pricetick)
+
+        limit_up: np.ndarray = np.array([limit_ups[i] for i in symbol_ixs.tolist()])
+        limit_down: np.ndarray = np.array([limit_downs[i] for i in symbol_ixs.tolist()])
+
+        # Check limit orders that can be matched
+        open_prices: np.ndarray = panel.fill_open[ix, symbol_ixs]
+        high_prices: np.ndarray = panel.fill_high[ix, symbol_ixs]
+        low_prices: np.ndarray = panel.fill_low[ix, symbol_ixs]
+
+        long_cross: np.ndarray = (
+            is_long
+            & (prices >= low_prices)
+            & (low_prices > 0)
+            & (low_prices < limit_up)           # Not a full-day limit-up market
+        )
+
+        short_cross: np.ndarray = (
+            ~is_long
+            & (prices <= high_prices)
+            & (high_prices > 0)
+            & (high_prices > limit_down)        # Not a full-day limit-down market
+        )
+
+        trade_prices: np.ndarray = np.where(
+            long_cross,
+            np.minimum(prices, open_prices),
+            np.maximum(prices, open_prices)
+        )
+
+        # Push order status updates and trades in order sequence
+        for n, order in enumerate(orders):
+            if order.status == Status.SUBMITTING:
+                order.status = Status.NOTTRADED
+                self.strategy.update_order(order)
+
+            if long_cross[n] or short_cross[n]:
+                self.fill_order(order, float(trade_prices[n]))
+
+    def fill_order(self, order: OrderData, trade_price: float) -> None:
+        """Fill limit order and generate trade"""
+        # Push order status update for filled orders
+        order.traded = order.volume
+        order.status = Status.ALLTRADED
+        self.strategy.update_order(order)
+
+        if order.vt_orderid in self.active_limit_orders:
+            self.active_limit_orders.pop(order.vt_orderid)
+
+        # Generate trade information
+        self.trade_count += 1
+
+        trade: TradeData = TradeData(
+            symbol=order.symbol,
+            exchange=order.exchange,
+            orderid=order.orderid,
+            tradeid=str(self.trade_count),
+            direction=order.direction,
+            offset=order.offset,
+            price=trade_price,
+            volume=order.volume,
+            datetime=self.datetime,
+            gateway_name=self.gateway_name,
+        )
+
+        # Update available funds
+        size: float = self.sizes[trade.vt_symbol]
+
+        trade_turnover: float = trade.price * trade.volume * size
+
+        if trade.direction == Direction.LONG:
+            trade_commission: float = trade_turnover * self.long_rates[trade.vt_symbol]
+        else:
+            trade_commission = trade_turnover * self.short_rates[trade.vt_symbol]
+
+        if trade.direction == Direction.LONG:
+            self.cash -= trade_turnover
+        else:
+            self.cash += trade_turnover
+
+        self.cash -= trade_commission
+
+        # Push trade information
+        self.strategy.update_trade(trade)
+        self.trades[trade.vt_tradeid] = trade
 
     def get_signal(self) -> pl.DataFrame:
         """Get model prediction signal for current time"""
@@ -720,8 +1051,20 @@ class BacktestingEngine:
             self.write_log("Data playback has not started and model prediction values ​​cannot be loaded")
             return pl.DataFrame()
 
+        # Index row ranges of each datetime in the sorted signal once
+        if self.signal_slices is None:
+            counts: pl.DataFrame = self.signal_df.group_by("datetime", maintain_order=True).len()
+            offsets: list[int] = [0] + counts["len"].cum_sum().to_list()[:-1]
+
+            self.signal_slices = dict(zip(
+                counts["datetime"].to_list(),
+                zip(offsets, counts["len"].to_list(), strict=True),
+                strict=True
+            ))
+
         dt: datetime = self.datetime.replace(tzinfo=None)
-        signal: pl.DataFrame = self.signal_df.filter(pl.col("datetime") == dt)
+        offset, length = self.signal_slices.get(dt, (0, 0))
+        signal: pl.DataFrame = self.signal_df.slice(offset, length)
 
         if signal.is_empty():
             self.write_log(f"The signal model prediction value corresponding to {dt} cannot be found")
@@ -785,6 +1128,9 @@ class BacktestingEngine:
 
     def get_all_daily_results(self) -> list["PortfolioDailyResult"]:
         """Get all daily profit and loss information"""
+        if self.panel and not self.daily_results:
+            self.create_panel_daily_results()
+
         return list(self.daily_results.values())
 
     def get_cash_available(self) -> float:
@@ -796,31 +1142,63 @@ class BacktestingEngine:
         holding_value: float = 0
 
         for vt_symbol, pos in self.strategy.pos_data.items():
-            bar: BarData = self.bars[vt_symbol]
+            if self.panel and self.bar_panel:
+                close_price: float = float(self.bar_panel.fill_close[self.panel_index, self.symbol_indexes[vt_symbol]])
+            else:
+                close_price = self.bars[vt_symbol].close_price
+
             size: float = self.sizes[vt_symbol]
 
-            holding_value += bar.close_price * pos * size
+            holding_value += close_price * pos * size
 
         return holding_value
 
+    def get_optimization_key(self, target_name: str) -> str:
+        """Hash of backtesting context, for caching and resuming optimization results"""
+        # Signal content is hashed, as it can change without any parameter
+        return get_context_key(
+            self.strategy_class,
+            target_name,
+            self.vt_symbols,
+            self.interval,
+            self.start,
+            self.end,
+            self.capital,
+            self.risk_free,
+            self.annual_days,
+            str(self.lab.lab_path),
+            sha1(self.signal_df.hash_rows().to_numpy().tobytes()).hexdigest()
+        )
+
     def run_bf_optimization(
         self,
         optimization_setting: OptimizationSetting,
         output: bool = True,
-        max_workers: int | None = None
+        max_workers: int | None = None,
+        chunksize: int = 4
     ) -> list:
-        """Brute-force optimization"""
+        """
+        Brute-force optimization
+
+        Bar data and signal are loaded once and shared with the worker
+        processes through memory-mapped Arrow IPC files, and chunksize
+        parameter settings are evaluated per task.
+        """
         if not check_optimization_setting(optimization_setting):
             return []
 
-        evaluate_func: Callable = wrap_evaluate(self, optimization_setting.target_name)
-        results: list = run_bf_optimization(
-            evaluate_func,
-            optimization_setting,
-            get_target_value,
-            max_workers=max_workers,
-            output=logger.info,
-        )
+        with TemporaryDirectory() as data_path:
+            self.export_shared_data(Path(data_path))
+
+            evaluate_func: Callable = wrap_evaluate(self, optimization_setting.target_name, data_path)
+            results: list = run_bf_optimization(
+                evaluate_func,
+                optimization_setting,
+                get_target_value,
+                max_workers=max_workers,
+                output=logger.info,
+                chunksize=chunksize
+            )
 
         if output and results:
             results.sort(key=lambda x: x[1], reverse=True)
@@ -837,21 +1215,36 @@ class BacktestingEngine:
         optimization_setting: OptimizationSetting,
         max_workers: int | None = None,
         ngen: int = 30,
-        output: bool = True
+        output: bool = True,
+        chunksize: int = 4,
+        cache_path: str = ""
     ) -> list:
-        """Genetic algorithm optimization"""
+        """
+        Genetic algorithm optimization
+
+        Bar data and signal are shared with worker processes in the same
+        way as brute-force optimization.
+        """
         if not check_optimization_setting(optimization_setting):
             return []
 
-        evaluate_func: Callable = wrap_evaluate(self, optimization_setting.target_name)
-        results: list = run_ga_optimization(
-            evaluate_func,
-            optimization_setting,
-            get_target_value,
-            max_workers=max_workers,
-            ngen=ngen,
-            output=logger.info
-        )
+        cache_key: str = self.get_optimization_key(optimization_setting.target_name)
+
+        with TemporaryDirectory() as data_path:
+            self.export_shared_data(Path(data_path))
+
+            evaluate_func: Callable = wrap_evaluate(self, optimization_setting.target_name, data_path)
+            results: list = run_ga_optimization(
+                evaluate_func,
+                optimization_setting,
+                get_target_value,
+                max_workers=max_workers,
+                ngen=ngen,
+                output=logger.info,
+                chunksize=chunksize,
+                cache_path=cache_path,
+                cache_key=cache_key
+            )
 
         if output and results:
             results.sort(key=lambda x: x[1], reverse=True)
@@ -861,6 +1254,52 @@ class BacktestingEngine:
 
         return results
 
+    def run_sh_optimization(
+        self,
+        optimization_setting: OptimizationSetting,
+        max_workers: int | None = None,
+        min_budget: float = 1 / 9,
+        eta: int = 3,
+        hyperband: bool = False,
+        study_path: str = "",
+        output: bool = True,
+        chunksize: int = 4
+    ) -> list:
+        """
+        Successive halving optimization
+
+        Settings are evaluated with the starting part of backtesting period
+        first, only the best are promoted to longer periods. Bar data and
+        signal are shared with worker processes as in brute-force optimization.
+        """
+        if not check_optimization_setting(optimization_setting):
+            return []
+
+        with TemporaryDirectory() as data_path:
+            self.export_shared_data(Path(data_path))
+
+            evaluate_func: Callable = wrap_evaluate(self, optimization_setting.target_name, data_path)
+            results: list = run_sh_optimization(
+                evaluate_func,
+                optimization_setting,
+                get_target_value,
+                max_workers=max_workers,
+                min_budget=min_budget,
+                eta=eta,
+                hyperband=hyperband,
+                study_path=study_path,
+                context_key=self.get_optimization_key(optimization_setting.target_name),
+                output=logger.info,
+                chunksize=chunksize
+            )
+
+        if output and results:
+            for result in results:
+                msg: str = f"Parameters: {result[0]}, Target: {result[1]}"
+                logger.info(msg)
+
+        return results
+
 
 class ContractDailyResult:
     """Contract daily profit and loss result"""
@@ -1010,6 +1449,92 @@ class PortfolioDailyResult:
                 self.contract_results[vt_symbol] = ContractDailyResult(self.date, close_price)
 
 
+class BarPanel:
+    """Bar data of multiple symbols aligned as (time x symbol) matrices"""
+
+    def __init__(self, df: pl.DataFrame, vt_symbols: list[str], interval: Interval) -> None:
+        """Constructor"""
+        self.vt_symbols: list[str] = vt_symbols
+        self.interval: Interval = interval
+        self.contracts: list[tuple] = [extract_vt_symbol(vt_symbol) for vt_symbol in vt_symbols]
+
+        # Align rows by datetime and columns by symbol
+        dt_series: pl.Series = df["datetime"].unique().sort()
+        self.dts: list[datetime] = dt_series.to_list()
+
+        row_ixs: np.ndarray = np.searchsorted(dt_series.to_numpy(), df["datetime"].to_numpy())
+        col_ixs: np.ndarray = (
+            df["vt_symbol"]
+            .replace_strict({vt_symbol: ix for ix, vt_symbol in enumerate(vt_symbols)}, return_dtype=pl.Int64)
+            .to_numpy()
+        )
+
+        shape: tuple[int, int] = (len(self.dts), len(vt_symbols))
+
+        self.has_bar: np.ndarray = np.zeros(shape, dtype=bool)
+        self.has_bar[row_ixs, col_ixs] = True
+
+        self.data: dict[str, np.ndarray] = {}
+        for name in ["open", "high", "low", "close", "volume", "turnover", "open_interest"]:
+            matrix: np.ndarray = np.full(shape, np.nan)
+            matrix[row_ixs, col_ixs] = df[name].cast(pl.Float64).to_numpy()
+            self.data[name] = matrix
+
+        rows: np.ndarray = np.arange(shape[0])[:, None]
+        cols: np.ndarray = np.arange(shape[1])
+
+        # Forward fill missing bars with the last close price
+        last_ixs: np.ndarray = np.maximum.accumulate(np.where(self.has_bar, rows, -1), axis=0)
+
+        self.active: np.ndarray = last_ixs >= 0
+        self.first_index: np.ndarray = np.where(self.active.any(axis=0), self.active.argmax(axis=0), shape[0])
+
+        close: np.ndarray = self.data["close"]
+
+        self.fill_close: np.ndarray = np.where(self.active, close[last_ixs, cols], np.nan)
+        self.fill_open: np.ndarray = np.where(self.has_bar, self.data["open"], self.fill_close)
+        self.fill_high: np.ndarray = np.where(self.has_bar, self.data["high"], self.fill_close)
+        self.fill_low: np.ndarray = np.where(self.has_bar, self.data["low"], self.fill_close)
+
+        # Last non-zero close price up to and before each row
+        nonzero_ixs: np.ndarray = np.maximum.accumulate(
+            np.where(self.has_bar & (close != 0), rows, -1),
+            axis=0
+        )
+        self.mark_close: np.ndarray = np.where(nonzero_ixs >= 0, close[nonzero_ixs, cols], 0)
+
+        self.pre_close: np.ndarray = np.zeros(shape)
+        self.pre_close[1:] = self.mark_close[:-1]
+
+    def get_bars(self, ix: int) -> dict[str, BarData]:
+        """Create bar objects of symbols with data in the row"""
+        dt: datetime = self.dts[ix]
+        bars: dict[str, BarData] = {}
+
+        col_ixs: list[int] = np.flatnonzero(self.has_bar[ix]).tolist()
+        values: dict[str, list] = {name: matrix[ix, col_ixs].tolist() for name, matrix in self.data.items()}
+
+        for n, col_ix in enumerate(col_ixs):
+            symbol, exchange = self.contracts[col_ix]
+
+            bars[self.vt_symbols[col_ix]] = BarData(
+                symbol=symbol,
+                exchange=exchange,
+                datetime=dt,
+                interval=self.interval,
+                open_price=values["open"][n],
+                high_price=values["high"][n],
+                low_price=values["low"][n],
+                close_price=values["close"][n],
+                volume=values["volume"][n],
+                turnover=values["turnover"][n],
+                open_interest=values["open_interest"][n],
+                gateway_name="DB"
+            )
+
+        return bars
+
+
 def evaluate(
     target_name: str,
     strategy_class: type[AlphaStrategy],
@@ -1020,11 +1545,23 @@ def evaluate(
     capital: int,
     risk_free: float,
     annual_days: int,
+    panel: bool,
     lab: AlphaLab,
-    signal_df: pl.DataFrame,
-    setting: dict
+    data_path: str,
+    setting: dict,
+    budget: float = 1
 ) -> tuple:
-    """Wrapper function for running backtesting in a process pool."""
+    """
+    Wrapper function for running backtesting in a process pool.
+
+    Only the starting budget fraction of backtesting period is used.
+    """
+    bar_df, signal_df = attach_shared_data(data_path)
+
+    if budget < 1:
+        end = start + (end - start) * budget
+        bar_df = bar_df.filter(pl.col("datetime") <= end)
+
     engine: BacktestingEngine = BacktestingEngine(lab)
 
     engine.set_parameters(
@@ -1034,11 +1571,12 @@ def evaluate(
         end=end,
         capital=capital,
         risk_free=risk_free,
-        annual_days=annual_days
+        annual_days=annual_days,
+        panel=panel
     )
 
     engine.add_strategy(strategy_class, setting, signal_df)
-    engine.load_data()
+    engine.load_data(bar_df)
     engine.run_backtesting()
     engine.calculate_result()
     statistics: dict = engine.calculate_statistics()
@@ -1047,7 +1585,7 @@ def evaluate(
     return (str(setting), target_value, statistics)
 
 
-def wrap_evaluate(engine: BacktestingEngine, target_name: str) -> Callable:
+def wrap_evaluate(engine: BacktestingEngine, target_name: str, data_path: str) -> Callable:
     """Wrapper function for backtesting configuration for use in a process pool."""
     func: Callable = partial(
         evaluate,
@@ -1060,12 +1598,31 @@ def wrap_evaluate(engine: BacktestingEngine, target_name: str) -> Callable:
         engine.capital,
         engine.risk_free,
         engine.annual_days,
+        engine.panel,
         engine.lab,
-        engine.signal_df
+        data_path
     )
     return func
 
 
+# Data shared by optimization processes, attached once per process
+shared_data: dict[str, tuple[pl.DataFrame, pl.DataFrame]] = {}
+
+
+def attach_shared_data(data_path: str) -> tuple[pl.DataFrame, pl.DataFrame]:
+    """Attach bar data and signal exported by the optimization process"""
+    if data_path not in shared_data:
+        folder_path: Path = Path(data_path)
+
+        bar_df: pl.DataFrame = pl.read_ipc(folder_path.joinpath("bar.arrow"))
+        signal_df: pl.DataFrame = pl.read_ipc(folder_path.joinpath("signal.arrow"))
+
+        shared_data.clear()
+        shared_data[data_path] = (bar_df, signal_df)
+
+    return shared_data[data_path]
+
+
 def get_target_value(result: list) -> float:
     """Get optimization target"""
     target_value: float = result[1]
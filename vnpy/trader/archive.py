@@ -0,0 +1,111 @@
+"""
+On-disk archive of finished orders and trades removed from OmsEngine.
+"""
+
+import pickle
+import sqlite3
+from pathlib import Path
+from threading import Lock
+
+from .object import OrderData, TradeData
+
+
+class OmsArchive:
+    """
+    Stores archived orders and trades in a sqlite file, indexed by
+    vt_symbol and gateway_name.
+    """
+
+    def __init__(self, file_path: Path) -> None:
+        """"""
+        self.lock: Lock = Lock()
+
+        self.connection: sqlite3.Connection = sqlite3.connect(file_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+
+        for table in ["orders", "trades"]:
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(vt_id TEXT PRIMARY KEY, vt_symbol TEXT, gateway_name TEXT, data BLOB)"
+            )
+            self.connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_symbol ON {table} (vt_symbol)")
+            self.connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_gateway ON {table} (gateway_name)")
+
+        self.connection.commit()
+
+    def save_orders(self, orders: list[OrderData]) -> None:
+        """"""
+        rows: list[tuple] = [
+            (order.vt_orderid, order.vt_symbol, order.gateway_name, pickle.dumps(order))
+            for order in orders
+        ]
+        self.save_rows("orders", rows)
+
+    def save_trades(self, trades: list[TradeData]) -> None:
+        """"""
+        rows: list[tuple] = [
+            (trade.vt_tradeid, trade.vt_symbol, trade.gateway_name, pickle.dumps(trade))
+            for trade in trades
+        ]
+        self.save_rows("trades", rows)
+
+    def save_rows(self, table: str, rows: list[tuple]) -> None:
+        """"""
+        with self.lock:
+            self.connection.executemany(f"INSERT OR REPLACE INTO {table} VALUES (?, ?, ?, ?)", rows)
+            self.connection.commit()
+
+    def load_order(self, vt_orderid: str) -> OrderData | None:
+        """"""
+        data: list = self.load_rows("orders", "vt_id", vt_orderid)
+        return data[0] if data else None
+
+    def load_trade(self, vt_tradeid: str) -> TradeData | None:
+        """"""
+        data: list = self.load_rows("trades", "vt_id", vt_tradeid)
+        return data[0] if data else None
+
+    def load_orders(self, vt_symbol: str = "", gateway_name: str = "") -> list[OrderData]:
+        """
+        Load archived orders, filtered by vt_symbol or gateway_name if given.
+        """
+        return self.load_filtered("orders", vt_symbol, gateway_name)
+
+    def load_trades(self, vt_symbol: str = "", gateway_name: str = "") -> list[TradeData]:
+        """
+        Load archived trades, filtered by vt_symbol or gateway_name if given.
+        """
+        return self.load_filtered("trades", vt_symbol, gateway_name)
+
+    def load_filtered(self, table: str, vt_symbol: str, gateway_name: str) -> list:
+        """"""
+        if vt_symbol:
+            data: list = self.load_rows(table, "vt_symbol", vt_symbol)
+        elif gateway_name:
+            data = self.load_rows(table, "gateway_name", gateway_name)
+        else:
+            data = self.load_rows(table)
+
+        if vt_symbol and gateway_name:
+            data = [d for d in data if d.gateway_name == gateway_name]
+
+        return data
+
+    def load_rows(self, table: str, column: str = "", value: str = "") -> list:
+        """"""
+        sql: str = f"SELECT data FROM {table}"
+        params: tuple = ()
+
+        if column:
+            sql += f" WHERE {column} = ?"
+            params = (value,)
+
+        with self.lock:
+            rows: list[tuple] = self.connection.execute(sql + " ORDER BY rowid", params).fetchall()
+
+        return [pickle.loads(row[0]) for row in rows]
+
+    def close(self) -> None:
+        """"""
+        with self.lock:
+            self.connection.close()
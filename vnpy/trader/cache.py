@@ -0,0 +1,408 @@
+"""
+Memory-bounded cache of history data loaded from database.
+"""
+
+import os
+import sys
+import atexit
+import pickle
+import shutil
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import fields
+from datetime import datetime
+from enum import Enum
+from hashlib import sha1
+from itertools import repeat
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+import numpy as np
+
+from .constant import Exchange, Interval
+from .database import BaseDatabase, get_database
+from .object import BarData, TickData
+from .setting import SETTINGS
+from .utility import get_folder_path
+
+
+EPOCH_ORDINAL: int = datetime(1970, 1, 1).toordinal()
+
+
+class HistoryCache:
+    """
+    LRU cache of history data lists, bounded by estimated bytes in memory.
+
+    Entries evicted from memory can be spilled into columnar files on disk,
+    which are also bounded by bytes and loaded back on next request. The
+    spill folder is owned by the cache and should not be shared by other
+    processes.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        spill_bytes: int = 0,
+        spill_path: Path | None = None
+    ) -> None:
+        """"""
+        self.max_bytes: int = max_bytes
+        self.spill_bytes: int = spill_bytes
+        self.spill_path: Path | None = spill_path
+
+        self.lock: Lock = Lock()
+
+        self.entries: OrderedDict[Hashable, tuple[list, int]] = OrderedDict()
+        self.bytes: int = 0
+
+        self.spilled: OrderedDict[Hashable, tuple[Path, int]] = OrderedDict()
+        self.spilled_bytes: int = 0
+
+        self.hits: int = 0
+        self.disk_hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+        if self.spill_path and self.spill_bytes:
+            self.spill_path.mkdir(parents=True, exist_ok=True)
+
+            # Files left by last process of the same folder are not indexed
+            for file_path in self.spill_path.glob("*.cache"):
+                file_path.unlink()
+
+    def get(self, key: Hashable, loader: Callable[[], list]) -> list:
+        """
+        Get data of key, call loader on cache miss.
+
+        The returned list is shared by all callers and should not be modified.
+        """
+        with self.lock:
+            entry: tuple[list, int] | None = self.entries.get(key, None)
+            if entry:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            spilled: tuple[Path, int] | None = self.spilled.pop(key, None)
+
+        data: list | None = None
+
+        if spilled:
+            file_path, file_bytes = spilled
+
+            # File removed by others is treated as a cache miss
+            try:
+                data = load_columns(file_path)
+            except FileNotFoundError:
+                pass
+
+            file_path.unlink(missing_ok=True)
+
+            with self.lock:
+                self.spilled_bytes -= file_bytes
+                if data is not None:
+                    self.disk_hits += 1
+
+        if data is None:
+            data = loader()
+
+            with self.lock:
+                self.misses += 1
+
+        self.put(key, data)
+        return data
+
+    def put(self, key: Hashable, data: list) -> None:
+        """Put data into memory, evicting least recently used entries"""
+        size: int = estimate_size(data)
+        evicted: list[tuple[Hashable, list]] = []
+
+        with self.lock:
+            old: tuple[list, int] | None = self.entries.pop(key, None)
+            if old:
+                self.bytes -= old[1]
+
+            if size <= self.max_bytes:
+                self.entries[key] = (data, size)
+                self.bytes += size
+            else:
+                evicted.append((key, data))
+
+            while self.bytes > self.max_bytes:
+                old_key, (old_data, old_size) = self.entries.popitem(last=False)
+                self.bytes -= old_size
+                evicted.append((old_key, old_data))
+
+            self.evictions += len(evicted)
+
+        for old_key, old_data in evicted:
+            self.spill(old_key, old_data)
+
+    def spill(self, key: Hashable, data: list) -> None:
+        """Save evicted data into columnar file, dropping oldest files over limit"""
+        if not self.spill_path or not self.spill_bytes or not data:
+            return
+
+        file_path: Path = self.spill_path.joinpath(sha1(repr(key).encode()).hexdigest() + ".cache")
+        save_columns(file_path, data)
+        file_bytes: int = file_path.stat().st_size
+
+        removed: list[Path] = []
+
+        with self.lock:
+            self.spilled[key] = (file_path, file_bytes)
+            self.spilled_bytes += file_bytes
+
+            while self.spilled_bytes > self.spill_bytes:
+                _, (old_path, old_bytes) = self.spilled.popitem(last=False)
+                self.spilled_bytes -= old_bytes
+                removed.append(old_path)
+
+        for old_path in removed:
+            old_path.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Remove all entries in memory and on disk"""
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+            removed: list[Path] = [file_path for file_path, _ in self.spilled.values()]
+            self.spilled.clear()
+            self.spilled_bytes = 0
+
+        for file_path in removed:
+            file_path.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Remove all entries together with spill folder"""
+        self.clear()
+
+        if self.spill_path:
+            shutil.rmtree(self.spill_path, ignore_errors=True)
+
+    def get_stats(self) -> dict:
+        """Get cache statistics"""
+        with self.lock:
+            stats: dict = {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "spilled": len(self.spilled),
+                "spilled_bytes": self.spilled_bytes
+            }
+        return stats
+
+
+def estimate_size(data: list) -> int:
+    """
+    Estimate memory bytes of a list of data objects of the same type,
+    shared values like enums and None are not counted.
+    """
+    size: int = sys.getsizeof(data)
+    if not data:
+        return size
+
+    obj: Any = data[0]
+    item_size: int = sys.getsizeof(obj)
+
+    # Objects with slots have no instance dict
+    if type(obj).__dictoffset__:
+        item_size += sys.getsizeof(object.__getattribute__(obj, "__dict__"))
+
+    for value in [getattr(obj, field.name) for field in fields(obj)]:
+        if value is None or isinstance(value, Enum):
+            continue
+        item_size += sys.getsizeof(value)
+
+    return size + item_size * len(data)
+
+
+def save_columns(file_path: Path, data: list) -> None:
+    """
+    Save list of dataclass objects into file column by column.
+
+    Float fields are saved as float arrays and datetime fields as integer
+    microseconds, fields with the same value in all objects are saved once.
+    """
+    data_class: type = type(data[0])
+
+    columns: dict[str, Any] = {}
+    constants: dict[str, Any] = {}
+
+    for field in fields(data_class):
+        if not field.init:
+            continue
+
+        name: str = field.name
+        values: list = [getattr(obj, name) for obj in data]
+        first: Any = values[0]
+
+        if all(v == first and type(v) is type(first) for v in values):
+            constants[name] = first
+        elif all(type(v) is float for v in values):
+            columns[name] = np.array(values, dtype=float)
+        elif all(type(v) is datetime and v.tzinfo is first.tzinfo for v in values):
+            columns[name] = ("datetime", first.tzinfo, encode_datetime(values))
+        else:
+            columns[name] = values
+
+    content: dict = {
+        "class": data_class,
+        "length": len(data),
+        "constants": constants,
+        "columns": columns
+    }
+
+    with open(file_path, "wb") as f:
+        pickle.dump(content, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_columns(file_path: Path) -> list:
+    """Load list of objects saved by save_columns"""
+    with open(file_path, "rb") as f:
+        content: dict = pickle.load(f)
+
+    data_class: type = content["class"]
+    length: int = content["length"]
+    constants: dict = content["constants"]
+    columns: dict = content["columns"]
+
+    # Values of each init field in order, passed as positional arguments
+    values: list[Iterable] = []
+
+    for field in fields(data_class):
+        if not field.init:
+            continue
+
+        name: str = field.name
+
+        if name in constants:
+            values.append(repeat(constants[name], length))
+            continue
+
+        column: Any = columns[name]
+
+        if isinstance(column, np.ndarray):
+            values.append(column.tolist())
+        elif isinstance(column, tuple):
+            _, tzinfo, microseconds = column
+            values.append(decode_datetime(microseconds, tzinfo))
+        else:
+            values.append(column)
+
+    data: list = [data_class(*row) for row in zip(*values)]
+
+    return data
+
+
+def encode_datetime(values: list[datetime]) -> np.ndarray:
+    """Convert datetimes into microseconds since epoch in their own timezone"""
+    # Calculated from fields, much faster than converting datetime objects by numpy
+    microseconds: list[int] = [
+        ((v.toordinal() - EPOCH_ORDINAL) * 86400 + v.hour * 3600 + v.minute * 60 + v.second) * 1_000_000
+        + v.microsecond
+        for v in values
+    ]
+    return np.array(microseconds, dtype=np.int64)
+
+
+def decode_datetime(values: np.ndarray, tzinfo: Any) -> list[datetime]:
+    """"""
+    naive: list[datetime] = values.astype("datetime64[us]").astype(object).tolist()
+    return [dt.replace(tzinfo=tzinfo) for dt in naive]
+
+
+history_cache: HistoryCache | None = None
+
+
+def pid_exists(pid: int) -> bool:
+    """Check whether process is running, assumed running if not known"""
+    try:
+        import psutil
+        return bool(psutil.pid_exists(pid))
+    except ImportError:
+        pass
+
+    # Signal 0 only checks the process on posix, but terminates it on Windows
+    if os.name != "posix":
+        return True
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def remove_stale_folders(folder_path: Path) -> None:
+    """Remove spill folders of processes no longer running"""
+    for path in folder_path.iterdir():
+        if path.is_dir() and path.name.isdigit() and not pid_exists(int(path.name)):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def get_history_cache() -> HistoryCache:
+    """Get history cache shared by backtesting engines"""
+    global history_cache
+    if history_cache:
+        return history_cache
+
+    spill_bytes: int = int(SETTINGS["history.spill_size"] * 1024 * 1024)
+
+    # Each process spills into its own folder, as optimization workers run in parallel
+    spill_path: Path | None = None
+    if spill_bytes:
+        folder_path: Path = get_folder_path("history_cache")
+        remove_stale_folders(folder_path)
+        spill_path = folder_path.joinpath(str(os.getpid()))
+
+    history_cache = HistoryCache(
+        int(SETTINGS["history.cache_size"] * 1024 * 1024),
+        spill_bytes,
+        spill_path
+    )
+
+    # Spill folder is removed when process exits
+    if spill_path:
+        atexit.register(history_cache.close)
+
+    return history_cache
+
+
+def load_bar_data(
+    symbol: str,
+    exchange: Exchange,
+    interval: Interval,
+    start: datetime,
+    end: datetime
+) -> list[BarData]:
+    """Load bar data from database through history cache"""
+    def loader() -> list[BarData]:
+        database: BaseDatabase = get_database()
+        return database.load_bar_data(symbol, exchange, interval, start, end)
+
+    key: tuple = ("bar", symbol, exchange, interval, start, end)
+    return get_history_cache().get(key, loader)
+
+
+def load_tick_data(
+    symbol: str,
+    exchange: Exchange,
+    start: datetime,
+    end: datetime
+) -> list[TickData]:
+    """Load tick data from database through history cache"""
+    def loader() -> list[TickData]:
+        database: BaseDatabase = get_database()
+        return database.load_tick_data(symbol, exchange, start, end)
+
+    key: tuple = ("tick", symbol, exchange, start, end)
+    return get_history_cache().get(key, loader)
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from copy import copy
 from typing import TYPE_CHECKING
 
@@ -17,6 +18,8 @@ if TYPE_CHECKING:
 class PositionHolding:
     """"""
 
+    check_interval: int = 1000          # order updates between full recalculation of frozen volume
+
     def __init__(self, contract: ContractData) -> None:
         """"""
         self.vt_symbol: str = contract.vt_symbol
@@ -40,6 +43,12 @@ class PositionHolding:
         self.short_yd_frozen: float = 0
         self.short_td_frozen: float = 0
 
+        # Frozen volume of active close orders, summed by (direction, offset)
+        self.order_frozens: dict[str, tuple[tuple[Direction, Offset], float]] = {}
+        self.offset_frozens: dict[tuple[Direction, Offset], float] = defaultdict(float)
+        self.offset_counts: dict[tuple[Direction, Offset], int] = defaultdict(int)
+        self.update_count: int = 0
+
     def update_position(self, position: PositionData) -> None:
         """"""
         if position.direction == Direction.LONG:
@@ -59,7 +68,33 @@ class PositionHolding:
             if order.vt_orderid in self.active_orders:
                 self.active_orders.pop(order.vt_orderid)
 
-        self.calculate_frozen()
+        # Apply change of the order only, with full recalculation periodically
+        self.update_count += 1
+
+        if self.update_count % self.check_interval and self.active_orders:
+            self.update_order_frozen(order)
+            self.split_frozen()
+        else:
+            self.calculate_frozen()
+
+    def update_order_frozen(self, order: OrderData) -> None:
+        """"""
+        previous: tuple[tuple[Direction, Offset], float] | None = self.order_frozens.pop(order.vt_orderid, None)
+        if previous:
+            key, frozen = previous
+            self.offset_frozens[key] -= frozen
+            self.offset_counts[key] -= 1
+
+        # Ignore position open orders
+        if not order.is_active() or order.offset == Offset.OPEN:
+            return
+
+        key = (order.direction, order.offset)
+        frozen = order.volume - order.traded
+
+        self.offset_frozens[key] += frozen
+        self.offset_counts[key] += 1
+        self.order_frozens[order.vt_orderid] = (key, frozen)
 
     def update_order_request(self, req: OrderRequest, vt_orderid: str) -> None:
         """"""
@@ -111,48 +146,50 @@ class PositionHolding:
 
     def calculate_frozen(self) -> None:
         """"""
-        self.long_pos_frozen = 0
-        self.long_yd_frozen = 0
-        self.long_td_frozen = 0
-
-        self.short_pos_frozen = 0
-        self.short_yd_frozen = 0
-        self.short_td_frozen = 0
+        self.order_frozens.clear()
+        self.offset_frozens.clear()
+        self.offset_counts.clear()
 
         for order in self.active_orders.values():
             # Ignore position open orders
             if order.offset == Offset.OPEN:
                 continue
 
+            key: tuple[Direction, Offset] = (order.direction, order.offset)
             frozen: float = order.volume - order.traded
 
-            if order.direction == Direction.LONG:
-                if order.offset == Offset.CLOSETODAY:
-                    self.short_td_frozen += frozen
-                elif order.offset == Offset.CLOSEYESTERDAY:
-                    self.short_yd_frozen += frozen
-                elif order.offset == Offset.CLOSE:
-                    self.short_td_frozen += frozen
-
-                    if self.short_td_frozen > self.short_td:
-                        self.short_yd_frozen += (self.short_td_frozen
-                                                 - self.short_td)
-                        self.short_td_frozen = self.short_td
-            elif order.direction == Direction.SHORT:
-                if order.offset == Offset.CLOSETODAY:
-                    self.long_td_frozen += frozen
-                elif order.offset == Offset.CLOSEYESTERDAY:
-                    self.long_yd_frozen += frozen
-                elif order.offset == Offset.CLOSE:
-                    self.long_td_frozen += frozen
-
-                    if self.long_td_frozen > self.long_td:
-                        self.long_yd_frozen += (self.long_td_frozen
-                                                - self.long_td)
-                        self.long_td_frozen = self.long_td
+            self.offset_frozens[key] += frozen
+            self.offset_counts[key] += 1
+            self.order_frozens[order.vt_orderid] = (key, frozen)
+
+        self.split_frozen()
+
+    def split_frozen(self) -> None:
+        """
+        Split frozen volume of close orders into today and yesterday.
+
+        Close orders freeze today position first, with the volume
+        exceeding today position frozen from yesterday position.
+        """
+        self.short_td_frozen, self.short_yd_frozen = self.split_direction_frozen(Direction.LONG, self.short_td)
+        self.long_td_frozen, self.long_yd_frozen = self.split_direction_frozen(Direction.SHORT, self.long_td)
 
         self.sum_pos_frozen()
 
+    def split_direction_frozen(self, direction: Direction, td: float) -> tuple[float, float]:
+        """"""
+        td_frozen: float = self.offset_frozens.get((direction, Offset.CLOSETODAY), 0)
+        yd_frozen: float = self.offset_frozens.get((direction, Offset.CLOSEYESTERDAY), 0)
+
+        if self.offset_counts.get((direction, Offset.CLOSE), 0):
+            td_frozen += self.offset_frozens[(direction, Offset.CLOSE)]
+
+            if td_frozen > td:
+                yd_frozen += td_frozen - td
+                td_frozen = td
+
+        return td_frozen, yd_frozen
+
     def sum_pos_frozen(self) -> None:
         """"""
         # Frozen volume should be no more than total volume
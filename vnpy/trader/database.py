@@ -3,6 +3,7 @@ from datetime import datetime
 from types import ModuleType
 from dataclasses import dataclass
 from importlib import import_module
+from typing import TYPE_CHECKING
 
 from .constant import Interval, Exchange
 from .object import BarData, TickData
@@ -10,9 +11,46 @@ from .setting import SETTINGS
 from .utility import ZoneInfo
 from .locale import _
 
+if TYPE_CHECKING:
+    import polars as pl
+
 
 DB_TZ = ZoneInfo(SETTINGS["database.timezone"])
 
+# Columns of bar data in columnar form
+BAR_COLUMNS: list[str] = [
+    "datetime",
+    "open_price",
+    "high_price",
+    "low_price",
+    "close_price",
+    "volume",
+    "turnover",
+    "open_interest"
+]
+
+# Columns of tick data in columnar form
+TICK_COLUMNS: list[str] = [
+    "datetime",
+    "name",
+    "volume",
+    "turnover",
+    "open_interest",
+    "last_price",
+    "last_volume",
+    "limit_up",
+    "limit_down",
+    "open_price",
+    "high_price",
+    "low_price",
+    "pre_close",
+    *[f"bid_price_{i}" for i in range(1, 6)],
+    *[f"ask_price_{i}" for i in range(1, 6)],
+    *[f"bid_volume_{i}" for i in range(1, 6)],
+    *[f"ask_volume_{i}" for i in range(1, 6)],
+    "localtime"
+]
+
 
 def convert_tz(dt: datetime) -> datetime:
     """
@@ -68,6 +106,69 @@ class BaseDatabase(ABC):
         """
         pass
 
+    def save_bar_df(
+        self,
+        df: "pl.DataFrame",
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        stream: bool = False
+    ) -> bool:
+        """
+        Save bar data of one contract in columnar form.
+
+        Columns of the DataFrame are named after BarData fields, with
+        timezone-aware datetime, missing columns take default values.
+        Databases supporting bulk write should override this, the default
+        implementation converts rows into BarData objects.
+        """
+        if df.is_empty():
+            return True
+
+        columns: list[str] = [c for c in BAR_COLUMNS if c in df.columns]
+
+        bars: list[BarData] = [
+            BarData(
+                symbol=symbol,
+                exchange=exchange,
+                interval=interval,
+                gateway_name="DB",
+                **row
+            )
+            for row in df.select(columns).iter_rows(named=True)
+        ]
+
+        return self.save_bar_data(bars, stream)
+
+    def save_tick_df(
+        self,
+        df: "pl.DataFrame",
+        symbol: str,
+        exchange: Exchange,
+        stream: bool = False
+    ) -> bool:
+        """
+        Save tick data of one contract in columnar form.
+
+        Same as save_bar_df, columns are named after TickData fields.
+        """
+        if df.is_empty():
+            return True
+
+        columns: list[str] = [c for c in TICK_COLUMNS if c in df.columns]
+
+        ticks: list[TickData] = [
+            TickData(
+                symbol=symbol,
+                exchange=exchange,
+                gateway_name="DB",
+                **row
+            )
+            for row in df.select(columns).iter_rows(named=True)
+        ]
+
+        return self.save_tick_data(ticks, stream)
+
     @abstractmethod
     def load_bar_data(
         self,
@@ -3,12 +3,14 @@ import os
 import traceback
 from abc import ABC, abstractmethod
 from email.message import EmailMessage
+from collections import defaultdict
 from queue import Empty, Queue
 from threading import Thread
+from time import monotonic
 from typing import TypeVar
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 
-from vnpy.event import Event, EventEngine
+from vnpy.event import Event, EventEngine, EVENT_TIMER
 from .app import BaseApp
 from .event import (
     EVENT_TICK,
@@ -39,8 +41,9 @@ from .object import (
     Exchange
 )
 from .setting import SETTINGS
-from .utility import TRADER_DIR
+from .utility import TRADER_DIR, get_file_path
 from .converter import OffsetConverter
+from .archive import OmsArchive
 from .logger import logger, DEBUG, INFO, WARNING, ERROR, CRITICAL
 from .locale import _
 
@@ -150,6 +153,11 @@ class MainEngine:
         self.get_all_quotes: Callable[[], list[QuoteData]] = oms_engine.get_all_quotes
         self.get_all_active_orders: Callable[[], list[OrderData]] = oms_engine.get_all_active_orders
         self.get_all_active_quotes: Callable[[], list[QuoteData]] = oms_engine.get_all_active_quotes
+        self.iter_orders: Callable[[str, str], Iterable[OrderData]] = oms_engine.iter_orders
+        self.iter_trades: Callable[[str, str], Iterable[TradeData]] = oms_engine.iter_trades
+        self.iter_active_orders: Callable[[str, str], Iterable[OrderData]] = oms_engine.iter_active_orders
+        self.load_archived_orders: Callable[[str, str], list[OrderData]] = oms_engine.load_archived_orders
+        self.load_archived_trades: Callable[[str, str], list[TradeData]] = oms_engine.load_archived_trades
         self.update_order_request: Callable[[OrderRequest, str, str], None] = oms_engine.update_order_request
         self.convert_order_request: Callable[[OrderRequest, str, bool, bool], list[OrderRequest]] = oms_engine.convert_order_request
         self.get_converter: Callable[[str], OffsetConverter | None] = oms_engine.get_converter
@@ -356,8 +364,26 @@ class OmsEngine(BaseEngine):
         self.active_orders: dict[str, OrderData] = {}
         self.active_quotes: dict[str, QuoteData] = {}
 
+        # Secondary indexes: key: {vt_orderid/vt_tradeid: data}
+        self.symbol_orders: defaultdict[str, dict[str, OrderData]] = defaultdict(dict)
+        self.gateway_orders: defaultdict[str, dict[str, OrderData]] = defaultdict(dict)
+        self.symbol_active_orders: defaultdict[str, dict[str, OrderData]] = defaultdict(dict)
+        self.gateway_active_orders: defaultdict[str, dict[str, OrderData]] = defaultdict(dict)
+        self.symbol_trades: defaultdict[str, dict[str, TradeData]] = defaultdict(dict)
+        self.gateway_trades: defaultdict[str, dict[str, TradeData]] = defaultdict(dict)
+
         self.offset_converters: dict[str, OffsetConverter] = {}
 
+        # Archive finished orders and trades older than retention minutes
+        self.retention: int = SETTINGS["oms.retention"]
+        self.archive: OmsArchive | None = None
+        self.finished_times: dict[str, float] = {}          # vt_orderid: monotonic time of finish
+        self.trade_times: dict[str, float] = {}             # vt_tradeid: monotonic time of receipt
+        self.timer_count: int = 0
+
+        if self.retention:
+            self.archive = OmsArchive(get_file_path(SETTINGS["oms.archive"]))
+
         self.register_event()
 
     def register_event(self) -> None:
@@ -370,6 +396,9 @@ class OmsEngine(BaseEngine):
         self.event_engine.register(EVENT_CONTRACT, self.process_contract_event)
         self.event_engine.register(EVENT_QUOTE, self.process_quote_event)
 
+        if self.archive:
+            self.event_engine.register(EVENT_TIMER, self.process_timer_event)
+
     def process_tick_event(self, event: Event) -> None:
         """"""
         tick: TickData = event.data
@@ -378,14 +407,27 @@ class OmsEngine(BaseEngine):
     def process_order_event(self, event: Event) -> None:
         """"""
         order: OrderData = event.data
-        self.orders[order.vt_orderid] = order
+        vt_orderid: str = order.vt_orderid
+
+        self.orders[vt_orderid] = order
+        self.symbol_orders[order.vt_symbol][vt_orderid] = order
+        self.gateway_orders[order.gateway_name][vt_orderid] = order
 
         # If order is active, then update data in dict.
         if order.is_active():
-            self.active_orders[order.vt_orderid] = order
+            self.active_orders[vt_orderid] = order
+            self.symbol_active_orders[order.vt_symbol][vt_orderid] = order
+            self.gateway_active_orders[order.gateway_name][vt_orderid] = order
         # Otherwise, pop inactive order from in dict
-        elif order.vt_orderid in self.active_orders:
-            self.active_orders.pop(order.vt_orderid)
+        elif vt_orderid in self.active_orders:
+            self.active_orders.pop(vt_orderid)
+            self.symbol_active_orders[order.vt_symbol].pop(vt_orderid, None)
+            self.gateway_active_orders[order.gateway_name].pop(vt_orderid, None)
+
+        # Record finish time for archival
+        if self.archive and not order.is_active():
+            self.finished_times.pop(vt_orderid, None)
+            self.finished_times[vt_orderid] = monotonic()
 
         # Update to offset converter
         converter: OffsetConverter | None = self.offset_converters.get(order.gateway_name, None)
@@ -396,6 +438,11 @@ class OmsEngine(BaseEngine):
         """"""
         trade: TradeData = event.data
         self.trades[trade.vt_tradeid] = trade
+        self.symbol_trades[trade.vt_symbol][trade.vt_tradeid] = trade
+        self.gateway_trades[trade.gateway_name][trade.vt_tradeid] = trade
+
+        if self.archive:
+            self.trade_times.setdefault(trade.vt_tradeid, monotonic())
 
         # Update to offset converter
         converter: OffsetConverter | None = self.offset_converters.get(trade.gateway_name, None)
@@ -438,6 +485,60 @@ class OmsEngine(BaseEngine):
         elif quote.vt_quoteid in self.active_quotes:
             self.active_quotes.pop(quote.vt_quoteid)
 
+    def process_timer_event(self, event: Event) -> None:
+        """"""
+        self.timer_count += 1
+        if self.timer_count < 60:
+            return
+        self.timer_count = 0
+
+        self.archive_data()
+
+    def archive_data(self) -> None:
+        """
+        Move finished orders and trades older than retention to archive.
+        """
+        if not self.archive:
+            return
+
+        expiry: float = monotonic() - self.retention * 60
+
+        # Finish times are in insertion order, so stop at first recent one
+        orders: list[OrderData] = []
+
+        for vt_orderid, finished_time in self.finished_times.items():
+            if finished_time > expiry:
+                break
+
+            order: OrderData | None = self.orders.pop(vt_orderid, None)
+            if order:
+                self.symbol_orders[order.vt_symbol].pop(vt_orderid, None)
+                self.gateway_orders[order.gateway_name].pop(vt_orderid, None)
+                orders.append(order)
+
+        for order in orders:
+            self.finished_times.pop(order.vt_orderid)
+
+        trades: list[TradeData] = []
+
+        for vt_tradeid, trade_time in self.trade_times.items():
+            if trade_time > expiry:
+                break
+
+            trade: TradeData = self.trades.pop(vt_tradeid)
+            self.symbol_trades[trade.vt_symbol].pop(vt_tradeid, None)
+            self.gateway_trades[trade.gateway_name].pop(vt_tradeid, None)
+            trades.append(trade)
+
+        for trade in trades:
+            self.trade_times.pop(trade.vt_tradeid)
+
+        if orders:
+            self.archive.save_orders(orders)
+
+        if trades:
+            self.archive.save_trades(trades)
+
     def get_tick(self, vt_symbol: str) -> TickData | None:
         """
         Get latest market tick data by vt_symbol.
@@ -534,6 +635,49 @@ class OmsEngine(BaseEngine):
         """
         return list(self.active_quotes.values())
 
+    def iter_orders(self, vt_symbol: str = "", gateway_name: str = "") -> Iterable[OrderData]:
+        """
+        Iterate orders in memory, filtered by vt_symbol or gateway_name if given.
+
+        A live view is returned without copying, so it should be consumed
+        in the event thread or copied with list() first.
+        """
+        return filter_index(self.orders, self.symbol_orders, self.gateway_orders, vt_symbol, gateway_name)
+
+    def iter_trades(self, vt_symbol: str = "", gateway_name: str = "") -> Iterable[TradeData]:
+        """
+        Iterate trades in memory, filtered by vt_symbol or gateway_name if given.
+        """
+        return filter_index(self.trades, self.symbol_trades, self.gateway_trades, vt_symbol, gateway_name)
+
+    def iter_active_orders(self, vt_symbol: str = "", gateway_name: str = "") -> Iterable[OrderData]:
+        """
+        Iterate active orders, filtered by vt_symbol or gateway_name if given.
+        """
+        return filter_index(
+            self.active_orders,
+            self.symbol_active_orders,
+            self.gateway_active_orders,
+            vt_symbol,
+            gateway_name
+        )
+
+    def load_archived_orders(self, vt_symbol: str = "", gateway_name: str = "") -> list[OrderData]:
+        """
+        Load orders moved to archive, filtered by vt_symbol or gateway_name if given.
+        """
+        if not self.archive:
+            return []
+        return self.archive.load_orders(vt_symbol, gateway_name)
+
+    def load_archived_trades(self, vt_symbol: str = "", gateway_name: str = "") -> list[TradeData]:
+        """
+        Load trades moved to archive, filtered by vt_symbol or gateway_name if given.
+        """
+        if not self.archive:
+            return []
+        return self.archive.load_trades(vt_symbol, gateway_name)
+
     def update_order_request(self, req: OrderRequest, vt_orderid: str, gateway_name: str) -> None:
         """
         Update order request to offset converter.
@@ -565,6 +709,35 @@ class OmsEngine(BaseEngine):
         """
         return self.offset_converters.get(gateway_name, None)
 
+    def close(self) -> None:
+        """"""
+        if self.archive:
+            self.archive.close()
+
+
+def filter_index(
+    data: dict,
+    symbol_index: defaultdict[str, dict],
+    gateway_index: defaultdict[str, dict],
+    vt_symbol: str,
+    gateway_name: str
+) -> Iterable:
+    """
+    Select data by secondary index without copying.
+    """
+    if not vt_symbol and not gateway_name:
+        return data.values()
+
+    if vt_symbol:
+        values: Iterable = symbol_index.get(vt_symbol, {}).values()
+    else:
+        values = gateway_index.get(gateway_name, {}).values()
+
+    if vt_symbol and gateway_name:
+        return (d for d in values if d.gateway_name == gateway_name)
+
+    return values
+
 
 class EmailEngine(BaseEngine):
     """
@@ -2,8 +2,12 @@
 Basic data structure used for general trading function in the trading platform.
 """
 
-from dataclasses import dataclass, field
+import sys
+from dataclasses import dataclass, field, fields, make_dataclass
 from datetime import datetime as Datetime
+from operator import attrgetter
+
+import numpy as np
 
 from .constant import Direction, Exchange, Interval, Offset, Status, Product, OptionType, OrderType
 
@@ -14,6 +18,24 @@ INFO: int = 20
 ACTIVE_STATUSES = set([Status.SUBMITTING, Status.NOTTRADED, Status.PARTTRADED])
 
 
+vt_symbols: dict[tuple[str, Exchange], str] = {}
+
+
+def get_vt_symbol(symbol: str, exchange: Exchange) -> str:
+    """
+    Get vt_symbol of contract, interned so that all data objects
+    of the same contract share one string.
+    """
+    key: tuple[str, Exchange] = (symbol, exchange)
+
+    vt_symbol: str | None = vt_symbols.get(key)
+    if vt_symbol is None:
+        vt_symbol = sys.intern(f"{symbol}.{exchange.value}")
+        vt_symbols[key] = vt_symbol
+
+    return vt_symbol
+
+
 @dataclass
 class BaseData:
     """
@@ -81,7 +103,7 @@ class TickData(BaseData):
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
 
 
 @dataclass
@@ -105,7 +127,98 @@ class BarData(BaseData):
 
     def __post_init__(self) -> None:
         """"""
-        self.vt_symbol: str = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol: str = get_vt_symbol(self.symbol, self.exchange)
+
+
+def create_compact_class(data_class: type) -> type:
+    """
+    Create slotted version of a data class with the same fields.
+
+    Compact objects have no per-instance dict, __dict__ is provided as
+    a property returning a new dict of all fields for consumers which
+    convert data objects into dict.
+    """
+    field_list: list[tuple] = [
+        (f.name, f.type, field(default=f.default, init=f.init))
+        for f in fields(data_class)
+    ]
+    field_list.append(("vt_symbol", str, field(default="", init=False)))
+
+    name: str = "Compact" + data_class.__name__
+    namespace: dict = {"__post_init__": data_class.__post_init__, "__module__": __name__}
+    slotted_class: type = make_dataclass(name, field_list, namespace=namespace, slots=True)
+
+    def to_dict(self: object) -> dict:
+        """"""
+        d: dict = {name: getattr(self, name) for name in slotted_class.__slots__}
+
+        # Same as data class, extra only exists after being assigned
+        if d["extra"] is None:
+            d.pop("extra")
+
+        return d
+
+    return type(name, (slotted_class,), {
+        "__slots__": (),
+        "__dict__": property(to_dict),
+        "__doc__": data_class.__doc__,
+        "__module__": __name__
+    })
+
+
+# Opt-in compact tick and bar data, with the same fields and constructor
+CompactTickData = create_compact_class(TickData)
+CompactBarData = create_compact_class(BarData)
+
+
+class TickBatch:
+    """
+    Struct-of-arrays storage of tick data for bulk processing,
+    numeric fields are stored as numpy arrays.
+    """
+
+    float_fields: list[str] = [f.name for f in fields(TickData) if f.type in {float, "float"}]
+    object_fields: list[str] = ["gateway_name", "symbol", "exchange", "datetime", "name", "localtime"]
+
+    def __init__(self, columns: dict[str, np.ndarray | list]) -> None:
+        """"""
+        self.columns: dict[str, np.ndarray | list] = columns
+
+    @classmethod
+    def from_ticks(cls, ticks: list[TickData]) -> "TickBatch":
+        """"""
+        columns: dict[str, np.ndarray | list] = {}
+
+        values: np.ndarray = np.array(list(map(attrgetter(*cls.float_fields), ticks)), dtype=float)
+        values = values.reshape(len(ticks), len(cls.float_fields))
+
+        for i, name in enumerate(cls.float_fields):
+            columns[name] = np.ascontiguousarray(values[:, i])
+
+        for name in cls.object_fields:
+            columns[name] = list(map(attrgetter(name), ticks))
+
+        return cls(columns)
+
+    def to_ticks(self, compact: bool = False) -> list[TickData]:
+        """"""
+        tick_class: type = CompactTickData if compact else TickData
+
+        names: list[str] = self.float_fields + self.object_fields
+        values: list[list] = [
+            self.columns[name].tolist() if name in self.float_fields else self.columns[name]
+            for name in names
+        ]
+
+        return [tick_class(**dict(zip(names, row, strict=True))) for row in zip(*values, strict=True)]
+
+    def __getitem__(self, name: str) -> np.ndarray | list:
+        """"""
+        return self.columns[name]
+
+    def __len__(self) -> int:
+        """"""
+        return len(self.columns["datetime"])
 
 
 @dataclass
@@ -1,11 +1,16 @@
+import inspect
+import pickle
+import sqlite3
 from collections.abc import Callable
-from itertools import product
+from itertools import product, repeat
 from concurrent.futures import ProcessPoolExecutor
-from random import random, choice
+from hashlib import sha1
+from math import ceil, log
+from pathlib import Path
+from random import random, choice, Random
 from time import perf_counter
 from multiprocessing import get_context
 from multiprocessing.context import BaseContext
-from multiprocessing.managers import DictProxy
 from _collections_abc import dict_keys, dict_values, Iterable
 
 from tqdm import tqdm
@@ -15,6 +20,7 @@ from .locale import _
 
 OUTPUT_FUNC = Callable[[str], None]
 EVALUATE_FUNC = Callable[[dict], dict]
+BUDGET_EVALUATE_FUNC = Callable[[dict, float], tuple]
 KEY_FUNC = Callable[[tuple], float]
 
 
@@ -101,7 +107,8 @@ def run_bf_optimization(
     optimization_setting: OptimizationSetting,
     key_func: KEY_FUNC,
     max_workers: int | None = None,
-    output: OUTPUT_FUNC = print
+    output: OUTPUT_FUNC = print,
+    chunksize: int = 1
 ) -> list[tuple]:
     """Run brutal force optimization"""
     settings: list[dict] = optimization_setting.generate_settings()
@@ -116,7 +123,7 @@ def run_bf_optimization(
         mp_context=get_context("spawn")
     ) as executor:
         it: Iterable = tqdm(
-            executor.map(evaluate_func, settings),
+            executor.map(evaluate_func, settings, chunksize=chunksize),
             total=len(settings)
         )
         results: list[tuple] = list(it)
@@ -129,6 +136,279 @@ def run_bf_optimization(
         return results
 
 
+class OptimizationStudy:
+    """
+    Results of evaluated settings and budgets.
+
+    With file path given, results are appended into the study file as they
+    are evaluated, and loaded again when an interrupted optimization
+    is resumed with the same file. The file starts with the context key of
+    the backtest (see get_context_key), results saved for another context
+    are discarded.
+    """
+
+    def __init__(self, file_path: str = "", context_key: str = "") -> None:
+        """"""
+        self.file_path: str = file_path
+        self.context_key: str = context_key
+        self.results: dict[tuple, tuple] = {}
+        self.discarded: int = 0
+
+        if self.file_path:
+            self.load()
+
+    def load(self) -> None:
+        """Load results from study file, dropping record broken by interruption"""
+        path: Path = Path(self.file_path)
+        if not path.exists():
+            self.restart()
+            return
+
+        results: dict[tuple, tuple] = {}
+        context_key: str | None = None
+
+        with open(path, "rb+") as f:
+            offset: int = 0
+
+            while True:
+                try:
+                    key, result = pickle.load(f)
+                except (EOFError, ValueError, pickle.UnpicklingError):
+                    break
+
+                # Header record of context key
+                if key == "context":
+                    context_key = result
+                else:
+                    results[key] = result
+
+                offset = f.tell()
+
+            f.truncate(offset)
+
+        if context_key == self.context_key:
+            self.results = results
+        else:
+            self.discarded = len(results)
+            self.restart()
+
+    def restart(self) -> None:
+        """Start a new study file with the context key"""
+        with open(self.file_path, "wb") as f:
+            pickle.dump(("context", self.context_key), f)
+
+    def get(self, setting: dict, budget: float) -> tuple | None:
+        """"""
+        return self.results.get(get_study_key(setting, budget), None)
+
+    def put(self, setting: dict, budget: float, result: tuple) -> None:
+        """"""
+        key: tuple = get_study_key(setting, budget)
+        self.results[key] = result
+
+        if self.file_path:
+            with open(self.file_path, "ab") as f:
+                pickle.dump((key, result), f)
+
+
+def get_study_key(setting: dict, budget: float) -> tuple:
+    """"""
+    return (tuple(setting.items()), round(budget, 6))
+
+
+class EvaluationCache:
+    """
+    Content-addressed store of evaluation results in a sqlite file.
+
+    Each result is keyed by hash of the context key and setting, so that
+    results can be shared by optimization runs in different processes
+    as long as strategy code, data range and engine parameters are same.
+    """
+
+    def __init__(self, file_path: str, context_key: str) -> None:
+        """"""
+        self.context_key: str = context_key
+
+        self.connection: sqlite3.Connection = sqlite3.connect(file_path, timeout=60)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, data BLOB)")
+        self.connection.commit()
+
+    def get_key(self, setting: dict) -> str:
+        """"""
+        content: str = self.context_key + repr(tuple(setting.items()))
+        return sha1(content.encode()).hexdigest()
+
+    def load(self, settings: list[dict]) -> list[tuple | None]:
+        """Load results of settings, None for those not evaluated yet"""
+        results: list[tuple | None] = []
+
+        for setting in settings:
+            row: tuple | None = self.connection.execute(
+                "SELECT data FROM results WHERE key = ?",
+                (self.get_key(setting),)
+            ).fetchone()
+
+            results.append(pickle.loads(row[0]) if row else None)
+
+        return results
+
+    def save(self, settings: list[dict], results: list[tuple]) -> None:
+        """"""
+        rows: list[tuple] = [
+            (self.get_key(setting), pickle.dumps(result))
+            for setting, result in zip(settings, results, strict=True)
+        ]
+        self.connection.executemany("INSERT OR REPLACE INTO results VALUES (?, ?)", rows)
+        self.connection.commit()
+
+    def close(self) -> None:
+        """"""
+        self.connection.close()
+
+
+def get_context_key(strategy_class: type, *args: object) -> str:
+    """
+    Hash evaluation context of strategy source code and engine parameters,
+    which should have repr stable between processes.
+    """
+    try:
+        source: str = inspect.getsource(inspect.getmodule(strategy_class))      # type: ignore
+    except (OSError, TypeError):
+        source = ""
+
+    content: str = repr((strategy_class.__module__, strategy_class.__qualname__, source, args))
+    return sha1(content.encode()).hexdigest()
+
+
+def run_sh_optimization(
+    evaluate_func: BUDGET_EVALUATE_FUNC,
+    optimization_setting: OptimizationSetting,
+    key_func: KEY_FUNC,
+    max_workers: int | None = None,
+    min_budget: float = 1 / 9,              # fraction of backtesting period used in the first round
+    eta: int = 3,                           # 1 / eta of settings are promoted to eta times longer budget
+    hyperband: bool = False,                # run hyperband brackets with randomly sampled settings
+    study_path: str = "",                   # file for saving results and resuming optimization
+    context_key: str = "",                  # hash of evaluation context saved in study file, see get_context_key
+    seed: int = 0,                          # random seed for sampling settings of hyperband brackets
+    output: OUTPUT_FUNC = print,
+    chunksize: int = 1
+) -> list[tuple]:
+    """
+    Run successive halving optimization.
+
+    Settings are first evaluated with a short part of the backtesting
+    period, then only the best of them are evaluated again with longer
+    periods, until the full period. evaluate_func is called with setting
+    and budget, the fraction of backtesting period to be used.
+    """
+    settings: list[dict] = optimization_setting.generate_settings()
+    study: OptimizationStudy = OptimizationStudy(study_path, context_key)
+
+    # Number of rounds to reach full budget from min_budget
+    max_round: int = max(int(log(1 / min_budget, eta) + 1e-9), 0)
+
+    brackets: list[tuple[int, list[dict]]] = []
+
+    if hyperband:
+        rng: Random = Random(seed)
+
+        for s in range(max_round, -1, -1):
+            n: int = ceil((max_round + 1) / (s + 1) * eta ** s)
+            brackets.append((s, rng.sample(settings, min(n, len(settings)))))
+    else:
+        brackets.append((max_round, settings))
+
+    output(_("Starting optimization with successive halving algorithm"))
+    output(_("Parameter optimization space: {}").format(len(settings)))
+    output(_("Number of brackets: {}, rounds of each bracket: {}").format(len(brackets), max_round + 1))
+
+    if study.discarded:
+        output(_("Discarded {} results of study file saved for different backtesting context").format(study.discarded))
+
+    if study.results:
+        output(_("Loaded {} results from study file").format(len(study.results)))
+
+    start: float = perf_counter()
+    final_results: dict[tuple, tuple] = {}
+
+    with ProcessPoolExecutor(
+        max_workers,
+        mp_context=get_context("spawn")
+    ) as executor:
+        for s, candidates in brackets:
+            for i in range(s + 1):
+                budget: float = eta ** (i - s)
+
+                results: list[tuple] = evaluate_settings(
+                    executor,
+                    evaluate_func,
+                    study,
+                    candidates,
+                    budget,
+                    chunksize
+                )
+
+                output(_("Round with budget {:.2%} complete, settings evaluated: {}").format(budget, len(candidates)))
+
+                # Promote the best settings to next round
+                ranked: list[tuple[dict, tuple]] = sorted(
+                    zip(candidates, results, strict=True),
+                    key=lambda item: key_func(item[1]),
+                    reverse=True
+                )
+
+                if i < s:
+                    count: int = max(len(candidates) // eta, 1)
+                    candidates = [setting for setting, result in ranked[:count]]
+                else:
+                    for setting, result in ranked:
+                        final_results[tuple(setting.items())] = result
+
+    end: float = perf_counter()
+    cost: int = int(end - start)
+    output(_("Optimization with successive halving algorithm complete, {} seconds elapsed").format(cost))
+
+    final: list[tuple] = list(final_results.values())
+    final.sort(reverse=True, key=key_func)
+    return final
+
+
+def evaluate_settings(
+    executor: ProcessPoolExecutor,
+    evaluate_func: BUDGET_EVALUATE_FUNC,
+    study: OptimizationStudy,
+    settings: list[dict],
+    budget: float,
+    chunksize: int
+) -> list[tuple]:
+    """
+    Evaluate settings with budget in process pool, results already in
+    study (including duplicate settings) are not evaluated again.
+    """
+    pending: dict[tuple, dict] = {}
+    for setting in settings:
+        if study.get(setting, budget) is None:
+            pending[tuple(setting.items())] = setting
+
+    if pending:
+        it: Iterable = tqdm(
+            executor.map(
+                evaluate_func,
+                pending.values(),
+                repeat(budget),
+                chunksize=chunksize
+            ),
+            total=len(pending)
+        )
+
+        for setting, result in zip(pending.values(), it, strict=True):
+            study.put(setting, budget, result)
+
+    return [study.get(setting, budget) for setting in settings]
+
+
 def run_ga_optimization(
     evaluate_func: EVALUATE_FUNC,
     optimization_setting: OptimizationSetting,
@@ -142,8 +422,18 @@ def run_ga_optimization(
     mutpb: float | None = None,             # mutation probability: probability that an offspring is produced by mutation
     indpb: float = 1.0,                     # independent probability: probability for each gene to be mutated
     output: OUTPUT_FUNC = print,
+    chunksize: int = 1,                     # number of individuals evaluated per task in the pool
+    cache_path: str = "",                   # sqlite file of results shared between runs
+    cache_key: str = ""                     # hash of evaluation context, see get_context_key
 ) -> list[tuple]:
-    """Run genetic algorithm optimization"""
+    """
+    Run genetic algorithm optimization
+
+    Individuals are looked up in result cache before dispatched to pool,
+    so that duplicate settings generated by crossover and mutation are
+    evaluated only once. With cache path given, results are also loaded
+    from and saved into the evaluation cache file.
+    """
     # Define functions for generate parameter randomly
     settings: list[dict] = optimization_setting.generate_settings()
     parameter_tuples: list[list[tuple]] = [list(d.items()) for d in settings]
@@ -161,11 +451,46 @@ def run_ga_optimization(
                 individual[i] = paramlist[i]
         return individual,
 
-    # Set up multiprocessing Pool and Manager
+    # Result cache of this run, and evaluation cache shared between runs
+    cache: dict[tuple, tuple] = {}
+    stats: dict[str, int] = {"requests": 0, "disk_hits": 0, "misses": 0}
+
+    store: EvaluationCache | None = None
+    if cache_path:
+        store = EvaluationCache(cache_path, cache_key)
+
+    # Set up multiprocessing Pool
     ctx: BaseContext = get_context("spawn")
-    with ctx.Manager() as manager, ctx.Pool(max_workers) as pool:
-        # Create shared dict for result cache
-        cache: DictProxy[tuple, tuple] = manager.dict()
+    with ctx.Pool(max_workers) as pool:
+        def evaluate_population(func: Callable, population: list) -> list[tuple[float, ]]:
+            """Evaluate settings not found in cache with pool, then get fitness from cache"""
+            pending: dict[tuple, dict] = {}
+            for individual in population:
+                tp: tuple = tuple(individual)
+                if tp not in cache:
+                    pending[tp] = dict(individual)
+
+            if store and pending:
+                loaded: list[tuple | None] = store.load(list(pending.values()))
+
+                for tp, result in zip(list(pending), loaded, strict=True):
+                    if result:
+                        cache[tp] = result
+                        pending.pop(tp)
+                        stats["disk_hits"] += 1
+
+            if pending:
+                settings: list[dict] = list(pending.values())
+                results: list[tuple] = pool.map(evaluate_func, settings, chunksize)
+
+                cache.update(zip(pending, results, strict=True))
+                stats["misses"] += len(results)
+
+                if store:
+                    store.save(settings, results)
+
+            stats["requests"] += len(population)
+            return [func(individual) for individual in population]
 
         # Set up toolbox
         toolbox: base.Toolbox = base.Toolbox()
@@ -174,7 +499,7 @@ def run_ga_optimization(
         toolbox.register("mate", tools.cxTwoPoint)
         toolbox.register("mutate", mutate_individual, indpb=indpb)
         toolbox.register("select", tools.selNSGA2)
-        toolbox.register("map", pool.map)
+        toolbox.register("map", evaluate_population)
         toolbox.register(
             "evaluate",
             ga_evaluate,
@@ -224,9 +549,22 @@ def run_ga_optimization(
 
         output(_("Genetic algorithm optimization is completed, taking {} seconds").format(cost))
 
-        results: list = list(cache.values())
-        results.sort(reverse=True, key=key_func)
-        return results
+        # Let workers exit normally to run their cleanup, instead of being terminated
+        pool.close()
+        pool.join()
+
+    if store:
+        store.close()
+
+    requests: int = stats["requests"]
+    hits: int = requests - stats["misses"]
+    output(_("Evaluation cache requests: {}, hits: {} (disk: {}), hit rate: {:.0%}").format(
+        requests, hits, stats["disk_hits"], hits / requests if requests else 0
+    ))
+
+    results: list = list(cache.values())
+    results.sort(reverse=True, key=key_func)
+    return results
 
 
 def ga_evaluate(
@@ -236,7 +574,8 @@ def ga_evaluate(
     parameters: list
 ) -> tuple[float, ]:
     """
-    Functions to be run in genetic algorithm optimization.
+    Get fitness of individual in genetic algorithm optimization,
+    evaluating the setting if not found in cache.
     """
     tp: tuple = tuple(parameters)
     if tp in cache:
@@ -34,7 +34,15 @@ SETTINGS: dict = {
     "database.host": "",
     "database.port": 0,
     "database.user": "",
-    "database.password": ""
+    "database.password": "",
+
+    "oms.retention": 0,
+    "oms.archive": "oms_archive.db",
+
+    "history.cache_size": 512,
+    "history.spill_size": 0,
+
+    "cta.init_workers": 1
 }
 
 
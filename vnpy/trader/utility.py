@@ -3,8 +3,11 @@ General utility functions.
 """
 
 import json
+import os
 import sys
 from datetime import datetime, time
+from threading import Thread, Lock, Event
+from time import monotonic
 from pathlib import Path
 from collections.abc import Callable
 from decimal import Decimal
@@ -117,6 +120,173 @@ def save_json(filename: str, data: dict) -> None:
         )
 
 
+class StateStore:
+    """
+    Write-behind store of per-key data (e.g. strategy variables).
+
+    Updates are coalesced in memory and appended by a background thread
+    to a journal of compact records, which is replayed on load and
+    periodically compacted into the json snapshot file.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        write_interval: float = 0.5,
+        fsync_interval: float = 5.0,
+        compact_count: int = 10000
+    ) -> None:
+        """"""
+        self.filename: str = filename
+        self.file_path: Path = get_file_path(filename)
+        self.journal_path: Path = self.file_path.with_name(self.file_path.name + ".journal")
+
+        self.write_interval: float = write_interval         # seconds between background writes
+        self.fsync_interval: float = fsync_interval         # seconds between fsync of journal, 0 for every write
+        self.compact_count: int = compact_count             # journal records before compaction
+
+        self.data: dict = {}
+        self.dirty: dict = {}                               # key: latest data, None if removed
+
+        self.lock: Lock = Lock()                            # for data and dirty
+        self.write_lock: Lock = Lock()                      # for files
+
+        self.journal_count: int = 0
+        self.fsync_time: float = 0
+
+        self.loaded: bool = False                           # snapshot is only written after load
+        self.active: bool = False
+        self.event: Event = Event()
+        self.thread: Thread = Thread(target=self.run, daemon=True)
+
+    def load(self) -> dict:
+        """
+        Load data from snapshot and journal, then start background writer.
+        """
+        self.data = load_json(self.filename)
+
+        # Replay journal written after last compaction
+        if self.journal_path.exists():
+            with open(self.journal_path, encoding="UTF-8") as f:
+                for line in f:
+                    try:
+                        key, value = json.loads(line)
+                    except ValueError:
+                        break       # Incomplete record at the end
+
+                    if value is None:
+                        self.data.pop(key, None)
+                    else:
+                        self.data[key] = value
+
+        self.loaded = True
+        self.flush(compact=True)
+
+        if not self.active:
+            self.active = True
+            self.thread.start()
+
+        return dict(self.data)
+
+    def put(self, key: str, value: dict) -> None:
+        """
+        Update data of a key, which is written to disk in background.
+        """
+        with self.lock:
+            self.data[key] = value
+            self.dirty[key] = value
+
+    def remove(self, key: str) -> None:
+        """
+        Remove data of a key.
+        """
+        with self.lock:
+            if self.data.pop(key, None) is not None:
+                self.dirty[key] = None
+
+    def get(self, key: str) -> dict | None:
+        """"""
+        return self.data.get(key, None)
+
+    def run(self) -> None:
+        """
+        Write dirty data periodically.
+        """
+        while self.active:
+            self.event.wait(self.write_interval)
+            self.flush()
+
+    def flush(self, sync: bool = False, compact: bool = False) -> None:
+        """
+        Append dirty data to journal, and compact if journal is too long.
+
+        Compaction is skipped before load, as data in memory is incomplete
+        and would overwrite the existing snapshot.
+        """
+        with self.write_lock:
+            # Copy data together with dirty, so the snapshot matches the journal
+            with self.lock:
+                dirty: dict = self.dirty
+                self.dirty = {}
+
+                compact = compact or self.journal_count + len(dirty) >= self.compact_count
+                compact = compact and self.loaded
+                if compact:
+                    data: dict = dict(self.data)
+
+            if dirty:
+                self.write_journal(dirty, sync)
+
+            if compact:
+                self.write_snapshot(data)
+
+    def write_journal(self, dirty: dict, sync: bool) -> None:
+        """"""
+        with open(self.journal_path, mode="a", encoding="UTF-8") as f:
+            for key, value in dirty.items():
+                record: str = json.dumps([key, value], ensure_ascii=False, separators=(",", ":"))
+                f.write(record + "\n")
+
+            self.journal_count += len(dirty)
+
+            now: float = monotonic()
+            if sync or now - self.fsync_time >= self.fsync_interval:
+                f.flush()
+                os.fsync(f.fileno())
+                self.fsync_time = now
+
+    def write_snapshot(self, data: dict) -> None:
+        """
+        Replace snapshot file atomically and clear journal.
+        """
+        temp_path: Path = self.file_path.with_name(self.file_path.name + ".tmp")
+        with open(temp_path, mode="w+", encoding="UTF-8") as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temp_path, self.file_path)
+
+        with open(self.journal_path, mode="w", encoding="UTF-8"):
+            pass
+
+        self.journal_count = 0
+
+    def close(self) -> None:
+        """
+        Stop background writer and save all data.
+        """
+        if self.active:
+            self.active = False
+            self.event.set()
+            self.thread.join()
+
+        with self.lock:
+            changed: bool = bool(self.dirty) or self.journal_count > 0
+
+        self.flush(sync=True, compact=changed)
+
+
 def round_to(value: float, target: float) -> float:
     """
     Round price to price tick value.
@@ -6,11 +6,11 @@ from datetime import (
 )
 from typing import cast, Any
 from collections.abc import Callable
-from functools import lru_cache, partial
+from functools import partial
 import traceback
 
 import numpy as np
-from pandas import DataFrame, Series
+from pandas import DataFrame, Index, Series
 from pandas.core.window import ExponentialMovingWindow
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
@@ -23,14 +23,16 @@ from vnpy.trader.constant import (
     Interval,
     Status
 )
-from vnpy.trader.database import get_database, BaseDatabase
+from vnpy.trader.cache import load_bar_data, load_tick_data
 from vnpy.trader.object import OrderData, TradeData, BarData, TickData
 from vnpy.trader.utility import round_to, extract_vt_symbol
 from vnpy.trader.optimize import (
     OptimizationSetting,
     check_optimization_setting,
+    get_context_key,
     run_bf_optimization,
-    run_ga_optimization
+    run_ga_optimization,
+    run_sh_optimization
 )
 
 from .base import (
@@ -67,6 +69,7 @@ class BacktestingEngine:
         self.annual_days: int = 240
         self.half_life: int = 120
         self.mode: BacktestingMode = BacktestingMode.BAR
+        self.vectorized: bool = False
 
         self.strategy_class: type[CtaTemplate]
         self.strategy: CtaTemplate
@@ -127,9 +130,17 @@ class BacktestingEngine:
         mode: BacktestingMode = BacktestingMode.BAR,
         risk_free: float = 0,
         annual_days: int = 240,
-        half_life: int = 120
+        half_life: int = 120,
+        vectorized: bool = False
     ) -> None:
-        """"""
+        """
+        Set parameters
+
+        With vectorized enabled, daily mark-to-market result is calculated
+        from arrays of trade log and daily close prices, producing the same
+        DataFrame as the default object-based path without filling the
+        DailyResult objects.
+        """
         self.mode = mode
         self.vt_symbol = vt_symbol
         self.interval = Interval(interval)
@@ -152,6 +163,7 @@ class BacktestingEngine:
         self.risk_free = risk_free
         self.annual_days = annual_days
         self.half_life = half_life
+        self.vectorized = vectorized
 
     def add_strategy(self, strategy_class: type[CtaTemplate], setting: dict) -> None:
         """"""
@@ -257,6 +269,9 @@ class BacktestingEngine:
         if not self.trades:
             self.output(_("回测成交记录为空"))
 
+        if self.vectorized:
+            return self.calculate_vectorized_result()
+
         # Add trade data into daily reuslt.
         for trade in self.trades.values():
             if not trade.datetime:
@@ -295,6 +310,48 @@ class BacktestingEngine:
         self.output(_("逐日盯市盈亏计算完成"))
         return self.daily_df
 
+    def calculate_vectorized_result(self) -> DataFrame:
+        """Calculate daily mark-to-market result with arrays"""
+        if not self.daily_results:
+            self.output(_("逐日盯市盈亏计算完成"))
+            return self.daily_df
+
+        close: Series = Series(
+            [daily_result.close_price for daily_result in self.daily_results.values()],
+            index=Index(list(self.daily_results.keys()), name="date")
+        )
+
+        # Collect trade log into arrays
+        trades: list[TradeData] = [trade for trade in self.trades.values() if trade.datetime]
+
+        trade_dates: np.ndarray = np.array([trade.datetime.date() for trade in trades], dtype=object)
+        directions: np.ndarray = np.array([trade.direction == Direction.LONG for trade in trades], dtype=bool)
+        prices: np.ndarray = np.array([trade.price for trade in trades], dtype=float)
+        volumes: np.ndarray = np.array([trade.volume for trade in trades])
+
+        df: DataFrame = calculate_daily_df(
+            close,
+            trade_dates,
+            directions,
+            prices,
+            volumes,
+            self.size,
+            self.rate,
+            self.slippage
+        )
+
+        # Trades of each day in the order they happened
+        day_trades: dict[Date, list[TradeData]] = {d: [] for d in self.daily_results}
+        for d, trade in zip(trade_dates, trades, strict=True):
+            day_trades[d].append(trade)
+
+        df.insert(2, "trades", list(day_trades.values()))
+
+        self.daily_df = df
+
+        self.output(_("逐日盯市盈亏计算完成"))
+        return self.daily_df
+
     def calculate_statistics(
         self,
         df: DataFrame | None = None,
@@ -354,7 +411,7 @@ class BacktestingEngine:
             x[x <= 0] = np.nan
             df["return"] = np.log(x).fillna(0)
 
-            df["highlevel"] = df["balance"].rolling(min_periods=1, window=len(df), center=False).max()
+            df["highlevel"] = df["balance"].cummax()
             df["drawdown"] = df["balance"] - df["highlevel"]
             df["ddpercent"] = df["drawdown"] / df["highlevel"] * 100
 
@@ -370,8 +427,8 @@ class BacktestingEngine:
             end_date = df.index[-1]
 
             total_days = len(df)
-            profit_days = len(df[df["net_pnl"] > 0])
-            loss_days = len(df[df["net_pnl"] < 0])
+            profit_days = int((df["net_pnl"] > 0).sum())
+            loss_days = int((df["net_pnl"] < 0).sum())
 
             end_balance = df["balance"].iloc[-1]
             max_drawdown = df["drawdown"].min()
@@ -566,6 +623,23 @@ class BacktestingEngine:
         fig.update_layout(height=1000, width=1000)
         return fig
 
+    def get_optimization_key(self, target_name: str) -> str:
+        """Hash of backtesting context, for caching and resuming optimization results"""
+        return get_context_key(
+            self.strategy_class,
+            target_name,
+            self.vt_symbol,
+            self.interval,
+            self.start,
+            self.rate,
+            self.slippage,
+            self.size,
+            self.pricetick,
+            self.capital,
+            self.end,
+            self.mode
+        )
+
     def run_bf_optimization(
         self,
         optimization_setting: OptimizationSetting,
@@ -605,13 +679,15 @@ class BacktestingEngine:
         lambda_: int | None = None,
         cxpb: float = 0.95,
         mutpb: float | None = None,
-        indpb: float = 1.0
+        indpb: float = 1.0,
+        cache_path: str = ""
     ) -> list:
         """"""
         if not check_optimization_setting(optimization_setting):
             return []
 
         evaluate_func: Callable = wrap_evaluate(self, optimization_setting.target_name)
+        cache_key: str = self.get_optimization_key(optimization_setting.target_name)
         results: list = run_ga_optimization(
             evaluate_func,
             optimization_setting,
@@ -624,6 +700,46 @@ class BacktestingEngine:
             cxpb=cxpb,
             mutpb=mutpb,
             indpb=indpb,
+            output=self.output,
+            cache_path=cache_path,
+            cache_key=cache_key
+        )
+
+        if output:
+            for result in results:
+                msg: str = _("参数：{}, 目标：{}").format(result[0], result[1])
+                self.output(msg)
+
+        return results
+
+    def run_sh_optimization(
+        self,
+        optimization_setting: OptimizationSetting,
+        output: bool = True,
+        max_workers: int | None = None,
+        min_budget: float = 1 / 9,
+        eta: int = 3,
+        hyperband: bool = False,
+        study_path: str = ""
+    ) -> list:
+        """
+        Successive halving optimization, evaluating settings with the
+        starting part of backtesting period before the full period.
+        """
+        if not check_optimization_setting(optimization_setting):
+            return []
+
+        evaluate_func: Callable = wrap_evaluate(self, optimization_setting.target_name)
+        results: list = run_sh_optimization(
+            evaluate_func,
+            optimization_setting,
+            get_target_value,
+            max_workers=max_workers,
+            min_budget=min_budget,
+            eta=eta,
+            hyperband=hyperband,
+            study_path=study_path,
+            context_key=self.get_optimization_key(optimization_setting.target_name),
             output=self.output
         )
 
@@ -1125,31 +1241,95 @@ class DailyResult:
         self.net_pnl = self.total_pnl - self.commission - self.slippage
 
 
-@lru_cache(maxsize=999)
-def load_bar_data(
-    symbol: str,
-    exchange: Exchange,
-    interval: Interval,
-    start: datetime,
-    end: datetime
-) -> list[BarData]:
-    """"""
-    database: BaseDatabase = get_database()
+def calculate_daily_df(
+    close: Series,
+    trade_dates: np.ndarray,
+    directions: np.ndarray,
+    prices: np.ndarray,
+    volumes: np.ndarray,
+    size: float,
+    rate: float,
+    slippage: float
+) -> DataFrame:
+    """
+    Calculate daily mark-to-market result from trade log arrays and
+    close price series indexed by date.
+
+    Trades are accumulated into each day in the given order, so that
+    values are identical to DailyResult.calculate_pnl.
+    """
+    day_count: int = len(close)
 
-    return database.load_bar_data(symbol, exchange, interval, start, end)
+    day_ix: np.ndarray = close.index.get_indexer(trade_dates)
+    if (day_ix < 0).any():
+        raise KeyError(trade_dates[day_ix < 0][0])
 
+    # Sort trades by day, keeping the order within each day
+    order: np.ndarray = np.argsort(day_ix, kind="stable")
+    day_ix = day_ix[order]
+    directions = directions[order]
+    prices = prices[order]
+    volumes = volumes[order]
 
-@lru_cache(maxsize=999)
-def load_tick_data(
-    symbol: str,
-    exchange: Exchange,
-    start: datetime,
-    end: datetime
-) -> list[TickData]:
-    """"""
-    database: BaseDatabase = get_database()
+    close_price: np.ndarray = close.to_numpy()
+
+    # If no pre_close provided, use value 1 to avoid zero division error
+    pre_close: np.ndarray = np.zeros(day_count, dtype=close_price.dtype)
+    pre_close[1:] = close_price[:-1]
+    pre_close[pre_close == 0] = 1
+
+    # Positions are accumulated trade by trade and carried forward
+    changes: np.ndarray = np.where(directions, volumes, -volumes)
+    running_pos: np.ndarray = np.cumsum(changes)
+
+    trade_count: np.ndarray = np.bincount(day_ix, minlength=day_count)
+    last_ix: np.ndarray = np.cumsum(trade_count) - 1
+
+    end_pos: np.ndarray = np.zeros(day_count, dtype=changes.dtype)
+    end_pos[last_ix >= 0] = running_pos[last_ix[last_ix >= 0]]
+
+    start_pos: np.ndarray = np.zeros(day_count, dtype=changes.dtype)
+    start_pos[1:] = end_pos[:-1]
 
-    return database.load_tick_data(symbol, exchange, start, end)
+    holding_pnl: np.ndarray = start_pos * (close_price - pre_close) * size
+
+    # Trade values are summed up per day with sequential bincount
+    turnover: np.ndarray = volumes * size * prices
+
+    trading_pnl: np.ndarray = np.bincount(
+        day_ix, changes * (close_price[day_ix] - prices) * size, day_count
+    )
+    day_slippage: np.ndarray = np.bincount(day_ix, volumes * size * slippage, day_count)
+    day_turnover: np.ndarray = np.bincount(day_ix, turnover, day_count)
+    commission: np.ndarray = np.bincount(day_ix, turnover * rate, day_count)
+
+    total_pnl: np.ndarray = trading_pnl + holding_pnl
+    net_pnl: np.ndarray = total_pnl - commission - day_slippage
+
+    df: DataFrame = DataFrame(
+        {
+            "close_price": close_price,
+            "pre_close": pre_close,
+            "trade_count": trade_count,
+            "start_pos": start_pos,
+            "end_pos": end_pos,
+            "turnover": day_turnover,
+            "commission": commission,
+            "slippage": day_slippage,
+            "trading_pnl": trading_pnl,
+            "holding_pnl": holding_pnl,
+            "total_pnl": total_pnl,
+            "net_pnl": net_pnl
+        },
+        index=close.index
+    )
+
+    # Days without trades keep integer zero values, same as DailyResult
+    if not len(day_ix):
+        for name in ["start_pos", "end_pos", "turnover", "commission", "slippage", "trading_pnl"]:
+            df[name] = df[name].astype(int)
+
+    return df
 
 
 def evaluate(
@@ -1165,11 +1345,17 @@ def evaluate(
     capital: int,
     end: datetime,
     mode: BacktestingMode,
-    setting: dict
+    setting: dict,
+    budget: float = 1
 ) -> tuple:
     """
     Function for running in multiprocessing.pool
+
+    Only the starting budget fraction of backtesting period is used.
     """
+    if budget < 1:
+        end = start + (end - start) * budget
+
     engine: BacktestingEngine = BacktestingEngine()
 
     engine.set_parameters(
@@ -1182,7 +1368,8 @@ def evaluate(
         pricetick=pricetick,
         capital=capital,
         end=end,
-        mode=mode
+        mode=mode,
+        vectorized=True
     )
 
     engine.add_strategy(strategy_class, setting)
@@ -5,6 +5,7 @@ Defines constants and objects used in CtaStrategy App.
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, timedelta
+from heapq import heappush, heappop, heapify
 
 from vnpy.trader.constant import Direction, Offset, Interval
 from .locale import _
@@ -45,6 +46,94 @@ class StopOrder:
     status: StopOrderStatus = StopOrderStatus.WAITING
 
 
+class StopOrderBook:
+    """
+    Resting local stop orders of one symbol, indexed by trigger price.
+
+    Long stop orders are kept in a min-heap of price and short stop orders
+    in a max-heap, so that only the orders crossed by the latest price are
+    visited. Removed orders are deleted lazily from the heaps.
+    """
+
+    def __init__(self) -> None:
+        """"""
+        self.long_heap: list[tuple[float, int, str]] = []
+        self.short_heap: list[tuple[float, int, str]] = []
+
+        self.orders: dict[str, tuple[int, StopOrder]] = {}      # stop_orderid: (sequence, stop_order)
+        self.sequence: int = 0
+        self.stale_count: int = 0
+
+    def __len__(self) -> int:
+        """"""
+        return len(self.orders)
+
+    def add(self, stop_order: StopOrder) -> None:
+        """Add a waiting stop order"""
+        self.sequence += 1
+        self.orders[stop_order.stop_orderid] = (self.sequence, stop_order)
+
+        if stop_order.direction == Direction.LONG:
+            heappush(self.long_heap, (stop_order.price, self.sequence, stop_order.stop_orderid))
+        else:
+            heappush(self.short_heap, (-stop_order.price, self.sequence, stop_order.stop_orderid))
+
+    def remove(self, stop_orderid: str) -> None:
+        """Remove a stop order, its heap entry is dropped when reached"""
+        if not self.orders.pop(stop_orderid, None):
+            return
+
+        # Rebuild heaps when stale entries dominate
+        self.stale_count += 1
+        if self.stale_count > 64 and self.stale_count > len(self.orders):
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        """Rebuild heaps from waiting stop orders only"""
+        self.long_heap = []
+        self.short_heap = []
+
+        for sequence, stop_order in self.orders.values():
+            if stop_order.direction == Direction.LONG:
+                self.long_heap.append((stop_order.price, sequence, stop_order.stop_orderid))
+            else:
+                self.short_heap.append((-stop_order.price, sequence, stop_order.stop_orderid))
+
+        heapify(self.long_heap)
+        heapify(self.short_heap)
+        self.stale_count = 0
+
+    def pop_triggered(self, last_price: float) -> list[StopOrder]:
+        """
+        Remove and return stop orders triggered by the price, in the order
+        they were added.
+        """
+        triggered: list[tuple[int, StopOrder]] = []
+
+        # Long stop orders trigger when price rises to or above stop price
+        while self.long_heap and self.long_heap[0][0] <= last_price:
+            _, sequence, stop_orderid = heappop(self.long_heap)
+            self.pop_entry(stop_orderid, sequence, triggered)
+
+        # Short stop orders trigger when price falls to or below stop price
+        while self.short_heap and -self.short_heap[0][0] >= last_price:
+            _, sequence, stop_orderid = heappop(self.short_heap)
+            self.pop_entry(stop_orderid, sequence, triggered)
+
+        triggered.sort(key=lambda item: item[0])
+        return [stop_order for _, stop_order in triggered]
+
+    def pop_entry(self, stop_orderid: str, sequence: int, triggered: list[tuple[int, StopOrder]]) -> None:
+        """Collect the order of a popped heap entry if it is still waiting"""
+        item: tuple[int, StopOrder] | None = self.orders.get(stop_orderid, None)
+
+        if item and item[0] == sequence:
+            self.orders.pop(stop_orderid)
+            triggered.append(item)
+        else:
+            self.stale_count -= 1
+
+
 EVENT_CTA_LOG = "eCtaLog"
 EVENT_CTA_STRATEGY = "eCtaStrategy"
 EVENT_CTA_STOPORDER = "eCtaStopOrder"
@@ -10,6 +10,7 @@ from concurrent.futures import ThreadPoolExecutor
 from copy import copy
 from glob import glob
 from concurrent.futures import Future
+from threading import Lock
 
 from vnpy.event import Event, EventEngine
 from vnpy.trader.engine import BaseEngine, MainEngine, LogEngine
@@ -38,7 +39,8 @@ from vnpy.trader.constant import (
     Offset,
     Status
 )
-from vnpy.trader.utility import load_json, save_json, extract_vt_symbol, round_to
+from vnpy.trader.utility import load_json, save_json, extract_vt_symbol, round_to, StateStore
+from vnpy.trader.setting import SETTINGS
 from vnpy.trader.database import BaseDatabase, get_database, DB_TZ
 from vnpy.trader.datafeed import BaseDatafeed, get_datafeed
 
@@ -49,6 +51,7 @@ from .base import (
     EVENT_CTA_STOPORDER,
     EngineType,
     StopOrder,
+    StopOrderBook,
     StopOrderStatus,
     STOPORDER_PREFIX
 )
@@ -73,6 +76,7 @@ class CtaEngine(BaseEngine):
 
     setting_filename: str = "cta_strategy_setting.json"
     data_filename: str = "cta_strategy_data.json"
+    warmup_filename: str = "cta_strategy_warmup.json"
 
     def __init__(self, main_engine: MainEngine, event_engine: EventEngine) -> None:
         """"""
@@ -80,6 +84,7 @@ class CtaEngine(BaseEngine):
 
         self.strategy_setting: dict = {}                                # strategy_name: dict
         self.strategy_data: dict = {}                                   # strategy_name: dict
+        self.data_store: StateStore = StateStore(self.data_filename)
 
         self.classes: dict = {}                                         # class_name: stategy_class
         self.strategies: dict = {}                                      # strategy_name: strategy
@@ -90,8 +95,17 @@ class CtaEngine(BaseEngine):
 
         self.stop_order_count: int = 0                                  # for generating stop_orderid
         self.stop_orders: dict[str, StopOrder] = {}                     # stop_orderid: stop_order
+        self.stop_order_books: dict[str, StopOrderBook] = {}            # vt_symbol: stop order book
 
-        self.init_executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+        # Number of strategies initialized in parallel
+        self.init_workers: int = max(int(SETTINGS["cta.init_workers"]), 1)
+        self.init_executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=self.init_workers)
+        self.init_count: int = 0                                        # unfinished init tasks
+
+        self.history_lock: Lock = Lock()
+        self.history_cache: dict[tuple, tuple[int, Future]] = {}        # (vt_symbol, interval, use_database): (days, future)
+        self.warmup_requests: dict[str, list] = {}                      # vt_symbol: [[interval, days, use_database]]
+        self.warmup_symbols: set[str] = set()                           # vt_symbols requested in this process
 
         self.vt_tradeids: set = set()                                   # for filtering duplicate trade
 
@@ -104,12 +118,14 @@ class CtaEngine(BaseEngine):
         self.load_strategy_class()
         self.load_strategy_setting()
         self.load_strategy_data()
+        self.load_warmup_requests()
         self.register_event()
         self.write_log(_("CTA策略引擎初始化成功"))
 
     def close(self) -> None:
         """"""
         self.stop_all_strategies()
+        self.data_store.close()
 
     def register_event(self) -> None:
         """"""
@@ -219,66 +235,67 @@ class CtaEngine(BaseEngine):
 
     def check_stop_order(self, tick: TickData) -> None:
         """"""
-        for stop_order in list(self.stop_orders.values()):
-            if stop_order.vt_symbol != tick.vt_symbol:
+        book: StopOrderBook | None = self.stop_order_books.get(tick.vt_symbol, None)
+        if not book:
+            return
+
+        contract: ContractData | None = self.main_engine.get_contract(tick.vt_symbol)
+        if not contract:
+            return
+
+        # Only visit stop orders whose trigger price is crossed
+        for stop_order in book.pop_triggered(tick.last_price):
+            # Skip stop order cancelled by callback of previous one
+            if stop_order.stop_orderid not in self.stop_orders:
                 continue
 
-            long_triggered = (
-                stop_order.direction == Direction.LONG and tick.last_price >= stop_order.price
-            )
-            short_triggered = (
-                stop_order.direction == Direction.SHORT and tick.last_price <= stop_order.price
-            )
+            strategy: CtaTemplate = self.strategies[stop_order.strategy_name]
 
-            if long_triggered or short_triggered:
-                strategy: CtaTemplate = self.strategies[stop_order.strategy_name]
-
-                # To get excuted immediately after stop order is
-                # triggered, use limit price if available, otherwise
-                # use ask_price_5 or bid_price_5
-                if stop_order.direction == Direction.LONG:
-                    if tick.limit_up:
-                        price = tick.limit_up
-                    else:
-                        price = tick.ask_price_5
+            # To get excuted immediately after stop order is
+            # triggered, use limit price if available, otherwise
+            # use ask_price_5 or bid_price_5
+            if stop_order.direction == Direction.LONG:
+                if tick.limit_up:
+                    price = tick.limit_up
                 else:
-                    if tick.limit_down:
-                        price = tick.limit_down
-                    else:
-                        price = tick.bid_price_5
-
-                contract: ContractData | None = self.main_engine.get_contract(stop_order.vt_symbol)
-                if not contract:
-                    continue
-
-                vt_orderids: list = self.send_limit_order(
-                    strategy,
-                    contract,
-                    stop_order.direction,
-                    stop_order.offset,
-                    price,
-                    stop_order.volume,
-                    stop_order.lock,
-                    stop_order.net
-                )
+                    price = tick.ask_price_5
+            else:
+                if tick.limit_down:
+                    price = tick.limit_down
+                else:
+                    price = tick.bid_price_5
+
+            vt_orderids: list = self.send_limit_order(
+                strategy,
+                contract,
+                stop_order.direction,
+                stop_order.offset,
+                price,
+                stop_order.volume,
+                stop_order.lock,
+                stop_order.net
+            )
 
-                # Update stop order status if placed successfully
-                if vt_orderids:
-                    # Remove from relation map.
-                    self.stop_orders.pop(stop_order.stop_orderid)
+            # Update stop order status if placed successfully
+            if vt_orderids:
+                # Remove from relation map.
+                self.stop_orders.pop(stop_order.stop_orderid)
 
-                    strategy_vt_orderids: set = self.strategy_orderid_map[strategy.strategy_name]
-                    if stop_order.stop_orderid in strategy_vt_orderids:
-                        strategy_vt_orderids.remove(stop_order.stop_orderid)
+                strategy_vt_orderids: set = self.strategy_orderid_map[strategy.strategy_name]
+                if stop_order.stop_orderid in strategy_vt_orderids:
+                    strategy_vt_orderids.remove(stop_order.stop_orderid)
 
-                    # Change stop order status to cancelled and update to strategy.
-                    stop_order.status = StopOrderStatus.TRIGGERED
-                    stop_order.vt_orderids = vt_orderids
+                # Change stop order status to cancelled and update to strategy.
+                stop_order.status = StopOrderStatus.TRIGGERED
+                stop_order.vt_orderids = vt_orderids
 
-                    self.call_strategy_func(
-                        strategy, strategy.on_stop_order, stop_order
-                    )
-                    self.put_stop_order_event(stop_order)
+                self.call_strategy_func(
+                    strategy, strategy.on_stop_order, stop_order
+                )
+                self.put_stop_order_event(stop_order)
+            # Otherwise keep waiting for the next tick
+            else:
+                book.add(stop_order)
 
     def send_server_order(
         self,
@@ -421,6 +438,12 @@ class CtaEngine(BaseEngine):
 
         self.stop_orders[stop_orderid] = stop_order
 
+        book: StopOrderBook | None = self.stop_order_books.get(stop_order.vt_symbol, None)
+        if book is None:
+            book = StopOrderBook()
+            self.stop_order_books[stop_order.vt_symbol] = book
+        book.add(stop_order)
+
         vt_orderids: set = self.strategy_orderid_map[strategy.strategy_name]
         vt_orderids.add(stop_orderid)
 
@@ -452,6 +475,7 @@ class CtaEngine(BaseEngine):
 
         # Remove from relation map.
         self.stop_orders.pop(stop_orderid)
+        self.stop_order_books[stop_order.vt_symbol].remove(stop_orderid)
 
         vt_orderids: set = self.strategy_orderid_map[strategy.strategy_name]
         if stop_orderid in vt_orderids:
@@ -553,6 +577,43 @@ class CtaEngine(BaseEngine):
         use_database: bool
     ) -> list[BarData]:
         """"""
+        # Query directly when no strategy is being initialized
+        with self.history_lock:
+            if not self.init_count:
+                cached: tuple[int, Future, bool] | None = None
+            else:
+                self.update_warmup_request(vt_symbol, interval, days, use_database)
+                cached = self.get_history_future(vt_symbol, interval, days, use_database)
+
+        if not cached:
+            return self.query_bar(vt_symbol, days, interval, use_database)
+
+        # Load history shared with other strategies of the same symbol
+        cached_days, future, created = cached
+        if created:
+            self.query_history_future(future, vt_symbol, interval, days, use_database)
+
+        bars: list[BarData] = future.result()
+
+        if cached_days > days and bars:
+            start: datetime = datetime.now(DB_TZ) - timedelta(days)
+            if not bars[0].datetime.tzinfo:
+                start = start.replace(tzinfo=None)
+
+            bars = [bar for bar in bars if bar.datetime >= start]
+
+        return [copy(bar) for bar in bars]
+
+    def query_bar(
+        self,
+        vt_symbol: str,
+        days: int,
+        interval: Interval,
+        use_database: bool
+    ) -> list[BarData]:
+        """
+        Query bar data from gateway, datafeed or database.
+        """
         symbol, exchange = extract_vt_symbol(vt_symbol)
         end: datetime = datetime.now(DB_TZ)
         start: datetime = end - timedelta(days)
@@ -588,6 +649,60 @@ class CtaEngine(BaseEngine):
 
         return bars
 
+    def get_history_future(
+        self,
+        vt_symbol: str,
+        interval: Interval,
+        days: int,
+        use_database: bool
+    ) -> tuple[int, Future, bool]:
+        """
+        Get cached history covering the days, or create a new one to be
+        queried by the caller. Must be called with history_lock held.
+        """
+        key: tuple = (vt_symbol, interval, use_database)
+
+        cached: tuple[int, Future] | None = self.history_cache.get(key, None)
+        if cached and cached[0] >= days:
+            return cached[0], cached[1], False
+
+        future: Future = Future()
+        self.history_cache[key] = (days, future)
+        return days, future, True
+
+    def query_history_future(
+        self,
+        future: Future,
+        vt_symbol: str,
+        interval: Interval,
+        days: int,
+        use_database: bool
+    ) -> None:
+        """
+        Query history for a cached future.
+        """
+        try:
+            bars: list[BarData] = self.query_bar(vt_symbol, days, interval, use_database)
+            future.set_result(bars)
+        except Exception as e:
+            # Failed query should not be reused by other strategies
+            with self.history_lock:
+                key: tuple = (vt_symbol, interval, use_database)
+                if self.history_cache.get(key, None) == (days, future):
+                    self.history_cache.pop(key)
+
+            future.set_exception(e)
+
+    def prefetch_history(self, vt_symbol: str, interval: Interval, days: int, use_database: bool) -> None:
+        """
+        Load history needed by strategies of a symbol into cache.
+        """
+        with self.history_lock:
+            days, future, created = self.get_history_future(vt_symbol, interval, days, use_database)
+
+        if created:
+            self.query_history_future(future, vt_symbol, interval, days, use_database)
+
     def load_tick(
         self,
         vt_symbol: str,
@@ -666,7 +781,29 @@ class CtaEngine(BaseEngine):
         """
         Init a strategy.
         """
-        return self.init_executor.submit(self._init_strategy, strategy_name)
+        return self.submit_init_task(self._init_strategy, strategy_name)
+
+    def submit_init_task(self, func: Callable, *args: Any) -> Future:
+        """
+        Submit a task to init executor, history cache is kept until all tasks finished.
+        """
+        with self.history_lock:
+            self.init_count += 1
+
+        return self.init_executor.submit(self.run_init_task, func, *args)
+
+    def run_init_task(self, func: Callable, *args: Any) -> None:
+        """
+        Run an init task and clear history cache after all tasks finished.
+        """
+        try:
+            func(*args)
+        finally:
+            with self.history_lock:
+                self.init_count -= 1
+
+                if not self.init_count:
+                    self.history_cache.clear()
 
     def _init_strategy(self, strategy_name: str) -> None:
         """
@@ -772,6 +909,12 @@ class CtaEngine(BaseEngine):
         strategies: list = self.symbol_strategy_map[strategy.vt_symbol]
         strategies.remove(strategy)
 
+        # Remove warm-up requests of symbol not traded by other strategies
+        if not strategies:
+            with self.history_lock:
+                if self.warmup_requests.pop(strategy.vt_symbol, None) is not None:
+                    save_json(self.warmup_filename, self.warmup_requests)
+
         # Remove from active orderid map
         if strategy_name in self.strategy_orderid_map:
             vt_orderids: set = self.strategy_orderid_map.pop(strategy_name)
@@ -834,7 +977,46 @@ class CtaEngine(BaseEngine):
         """
         Load strategy data from json file.
         """
-        self.strategy_data = load_json(self.data_filename)
+        self.strategy_data = self.data_store.load()
+
+    def load_warmup_requests(self) -> None:
+        """
+        Load history requested by strategies during last initialization.
+        """
+        requests: dict[str, list] = load_json(self.warmup_filename)
+
+        # Symbols no longer traded by any strategy are pruned
+        self.warmup_requests = {
+            vt_symbol: symbol_requests for vt_symbol, symbol_requests in requests.items()
+            if self.symbol_strategy_map.get(vt_symbol)
+        }
+
+        if len(self.warmup_requests) != len(requests):
+            save_json(self.warmup_filename, self.warmup_requests)
+
+    def update_warmup_request(
+        self,
+        vt_symbol: str,
+        interval: Interval,
+        days: int,
+        use_database: bool
+    ) -> None:
+        """
+        Record history requested during initialization for prefetching next time.
+        """
+        request: list = [interval.value, days, use_database]
+
+        # Requests recorded by last process are replaced, so old windows are not kept forever
+        if vt_symbol not in self.warmup_symbols:
+            self.warmup_symbols.add(vt_symbol)
+            self.warmup_requests[vt_symbol] = []
+
+        requests: list = self.warmup_requests[vt_symbol]
+        if request in requests:
+            return
+
+        requests.append(request)
+        save_json(self.warmup_filename, self.warmup_requests)
 
     def sync_strategy_data(self, strategy: CtaTemplate) -> None:
         """
@@ -845,7 +1027,7 @@ class CtaEngine(BaseEngine):
         data.pop("trading")
 
         self.strategy_data[strategy.strategy_name] = data
-        save_json(self.data_filename, self.strategy_data)
+        self.data_store.put(strategy.strategy_name, data)
 
     def get_all_strategy_class_names(self) -> list:
         """
@@ -875,6 +1057,17 @@ class CtaEngine(BaseEngine):
     def init_all_strategies(self) -> dict[str, Future]:
         """
         """
+        # Prefetch history for all strategies with one query per symbol and interval
+        prefetch_requests: dict[tuple, int] = {}
+
+        for vt_symbol in self.symbol_strategy_map.keys():
+            for interval, days, use_database in self.warmup_requests.get(vt_symbol, []):
+                key: tuple = (vt_symbol, Interval(interval), use_database)
+                prefetch_requests[key] = max(days, prefetch_requests.get(key, 0))
+
+        for (vt_symbol, interval, use_database), days in prefetch_requests.items():
+            self.submit_init_task(self.prefetch_history, vt_symbol, interval, days, use_database)
+
         futures: dict[str, Future] = {}
         for strategy_name in self.strategies.keys():
             futures[strategy_name] = self.init_strategy(strategy_name)
@@ -930,7 +1123,7 @@ class CtaEngine(BaseEngine):
         save_json(self.setting_filename, self.strategy_setting)
 
         self.strategy_data.pop(strategy_name, None)
-        save_json(self.data_filename, self.strategy_data)
+        self.data_store.remove(strategy_name)
 
     def put_stop_order_event(self, stop_order: StopOrder) -> None:
         """
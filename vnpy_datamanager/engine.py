@@ -1,16 +1,82 @@
-import csv
-from datetime import datetime
-from collections.abc import Callable
+from datetime import datetime, timedelta
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import polars as pl
 
 from vnpy.trader.engine import BaseEngine, MainEngine, EventEngine
 from vnpy.trader.constant import Interval, Exchange
 from vnpy.trader.object import BarData, TickData, ContractData, HistoryRequest
 from vnpy.trader.database import BaseDatabase, get_database, BarOverview, DB_TZ
 from vnpy.trader.datafeed import BaseDatafeed, get_datafeed
-from vnpy.trader.utility import ZoneInfo
 
 APP_NAME = "DataManager"
 
+# Rows of each chunk when importing data from file
+CHUNK_SIZE: int = 500_000
+
+# Time range of bars loaded from database at once when exporting data to file
+EXPORT_WINDOWS: dict[Interval, timedelta] = {
+    Interval.MINUTE: timedelta(days=30),
+    Interval.HOUR: timedelta(days=720)
+}
+DEFAULT_EXPORT_WINDOW: timedelta = timedelta(days=3650)
+
+EXPORT_SCHEMA: pl.Schema = pl.Schema({
+    "symbol": pl.String,
+    "exchange": pl.String,
+    "datetime": pl.Datetime("us"),
+    "open": pl.Float64,
+    "high": pl.Float64,
+    "low": pl.Float64,
+    "close": pl.Float64,
+    "volume": pl.Float64,
+    "turnover": pl.Float64,
+    "open_interest": pl.Float64
+})
+
+
+def scan_file(file_path: str) -> pl.LazyFrame:
+    """Scan csv, parquet or feather file according to file suffix"""
+    suffix: str = Path(file_path).suffix.lower()
+
+    if suffix == ".parquet":
+        return pl.scan_parquet(file_path)
+    elif suffix in {".feather", ".arrow", ".ipc"}:
+        return pl.scan_ipc(file_path)
+    else:
+        # Read all csv columns as string, parsed later with given format
+        return pl.scan_csv(file_path, infer_schema=False)
+
+
+def clean_string(expr: pl.Expr) -> pl.Expr:
+    """Remove null characters and surrounding whitespaces"""
+    return expr.str.replace_all("\0", "", literal=True).str.strip_chars()
+
+
+def parse_datetime(expr: pl.Expr, dtype: pl.DataType, datetime_format: str, tz_name: str) -> pl.Expr:
+    """Parse column into datetime localized in tz_name"""
+    if dtype == pl.String:
+        expr = clean_string(expr)
+
+        if datetime_format:
+            expr = expr.str.strptime(pl.Datetime("us"), datetime_format)
+        else:
+            expr = expr.str.to_datetime(time_unit="us")
+    elif isinstance(dtype, pl.Datetime) and dtype.time_zone:
+        return expr.dt.convert_time_zone(tz_name)
+
+    return expr.dt.replace_time_zone(tz_name, ambiguous="earliest", non_existent="null")
+
+
+def parse_float(expr: pl.Expr, dtype: pl.DataType) -> pl.Expr:
+    """Parse column into float, with missing values as 0"""
+    if dtype == pl.String:
+        expr = clean_string(expr)
+
+    return expr.cast(pl.Float64).fill_null(0)
+
 
 class ManagerEngine(BaseEngine):
     """"""
@@ -41,57 +107,65 @@ class ManagerEngine(BaseEngine):
         volume_head: str,
         turnover_head: str,
         open_interest_head: str,
-        datetime_format: str
+        datetime_format: str,
+        progress: Callable[[int], None] | None = None,
+        chunk_size: int = CHUNK_SIZE
     ) -> tuple:
-        """"""
-        with open(file_path) as f:
-            buf: list = [line.replace("\0", "") for line in f]
+        """
+        Import bar data from csv, parquet or feather file.
 
-        reader: csv.DictReader = csv.DictReader(buf, delimiter=",")
+        The file is read in chunks, each chunk is parsed with vectorized
+        expressions and saved into database in columnar form. Rows of local
+        times not existing in tz_name (skipped by daylight saving) are dropped
+        and returned as skipped count.
+        """
+        lf: pl.LazyFrame = scan_file(file_path)
+        schema: pl.Schema = lf.collect_schema()
+
+        columns: list[pl.Expr] = [
+            parse_datetime(pl.col(datetime_head), schema[datetime_head], datetime_format, tz_name).alias("datetime")
+        ]
+
+        for name, head in [
+            ("open_price", open_head),
+            ("high_price", high_head),
+            ("low_price", low_head),
+            ("close_price", close_head),
+            ("volume", volume_head),
+            ("turnover", turnover_head),
+            ("open_interest", open_interest_head)
+        ]:
+            if name in {"turnover", "open_interest"} and head not in schema:
+                columns.append(pl.lit(0.0).alias(name))
+            else:
+                columns.append(parse_float(pl.col(head), schema[head]).alias(name))
+
+        lf = lf.select(columns)
 
-        bars: list[BarData] = []
         start: datetime | None = None
+        end: datetime | None = None
         count: int = 0
-        tz: ZoneInfo = ZoneInfo(tz_name)
+        skipped: int = 0
 
-        for item in reader:
-            if datetime_format:
-                dt: datetime = datetime.strptime(item[datetime_head], datetime_format)
-            else:
-                dt = datetime.fromisoformat(item[datetime_head])
-            dt = dt.replace(tzinfo=tz)
-
-            turnover = item.get(turnover_head, 0)
-            open_interest = item.get(open_interest_head, 0)
-
-            bar: BarData = BarData(
-                symbol=symbol,
-                exchange=exchange,
-                datetime=dt,
-                interval=interval,
-                volume=float(item[volume_head]),
-                open_price=float(item[open_head]),
-                high_price=float(item[high_head]),
-                low_price=float(item[low_head]),
-                close_price=float(item[close_head]),
-                turnover=float(turnover),
-                open_interest=float(open_interest),
-                gateway_name="DB",
-            )
+        for df in lf.collect_batches(chunk_size=chunk_size):
+            skipped += df["datetime"].null_count()
+            df = df.filter(pl.col("datetime").is_not_null())
+
+            if df.is_empty():
+                continue
 
-            bars.append(bar)
+            self.database.save_bar_df(df, symbol, exchange, interval)
 
             # do some statistics
-            count += 1
+            count += df.height
             if not start:
-                start = bar.datetime
-
-        end: datetime = bar.datetime
+                start = df["datetime"][0]
+            end = df["datetime"][-1]
 
-        # insert into database
-        self.database.save_bar_data(bars)
+            if progress:
+                progress(count)
 
-        return start, end, count
+        return start, end, count, skipped
 
     def output_data_to_csv(
         self,
@@ -100,48 +174,99 @@ class ManagerEngine(BaseEngine):
         exchange: Exchange,
         interval: Interval,
         start: datetime,
-        end: datetime
+        end: datetime,
+        progress: Callable[[int], None] | None = None
     ) -> bool:
-        """"""
-        bars: list[BarData] = self.load_bar_data(symbol, exchange, interval, start, end)
-
-        fieldnames: list = [
-            "symbol",
-            "exchange",
-            "datetime",
-            "open",
-            "high",
-            "low",
-            "close",
-            "volume",
-            "turnover",
-            "open_interest"
-        ]
+        """
+        Export bar data into csv, parquet or feather file.
+
+        Bars are loaded from database window by window, csv file is
+        written chunk by chunk while parquet and feather files are
+        streamed from chunks spilled into temporary ipc files, so memory
+        usage does not grow with the exported range.
+        """
+        suffix: str = Path(file_path).suffix.lower()
+        chunks: Iterator[pl.DataFrame] = self.iter_bar_df(symbol, exchange, interval, start, end, progress)
 
         try:
-            with open(file_path, "w") as f:
-                writer: csv.DictWriter = csv.DictWriter(f, fieldnames=fieldnames, lineterminator="\n")
-                writer.writeheader()
-
-                for bar in bars:
-                    d: dict = {
-                        "symbol": bar.symbol,
-                        "exchange": bar.exchange.value,
-                        "datetime": bar.datetime.strftime("%Y-%m-%d %H:%M:%S"),
-                        "open": bar.open_price,
-                        "high": bar.high_price,
-                        "low": bar.low_price,
-                        "close": bar.close_price,
-                        "turnover": bar.turnover,
-                        "volume": bar.volume,
-                        "open_interest": bar.open_interest,
-                    }
-                    writer.writerow(d)
+            if suffix in {".parquet", ".feather", ".arrow", ".ipc"}:
+                with TemporaryDirectory() as temp_dir:
+                    chunk_paths: list[Path] = []
+                    for df in chunks:
+                        chunk_path: Path = Path(temp_dir).joinpath(f"{len(chunk_paths)}.arrow")
+                        df.write_ipc(chunk_path)
+                        chunk_paths.append(chunk_path)
+
+                    lf: pl.LazyFrame = pl.scan_ipc(chunk_paths) if chunk_paths else EXPORT_SCHEMA.to_frame().lazy()
+
+                    if suffix == ".parquet":
+                        lf.sink_parquet(file_path)
+                    else:
+                        lf.sink_ipc(file_path)
+            else:
+                with open(file_path, "w", newline="") as f:
+                    EXPORT_SCHEMA.to_frame().write_csv(f)
+
+                    for df in chunks:
+                        df.write_csv(f, include_header=False, datetime_format="%Y-%m-%d %H:%M:%S")
 
             return True
         except PermissionError:
             return False
 
+    def iter_bar_df(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        progress: Callable[[int], None] | None = None
+    ) -> Iterator[pl.DataFrame]:
+        """
+        Load bar data from database in time windows and convert into columnar chunks.
+        """
+        window: timedelta = EXPORT_WINDOWS.get(interval, DEFAULT_EXPORT_WINDOW)
+
+        window_start: datetime = start
+        last_dt: datetime | None = None
+        count: int = 0
+
+        while window_start <= end:
+            window_end: datetime = min(window_start + window, end)
+            bars: list[BarData] = self.load_bar_data(symbol, exchange, interval, window_start, window_end)
+            window_start = window_end + timedelta(seconds=1)
+
+            # Range query includes both ends, skip bars already exported
+            if last_dt:
+                bars = [bar for bar in bars if bar.datetime > last_dt]
+
+            if not bars:
+                continue
+            last_dt = bars[-1].datetime
+
+            df: pl.DataFrame = pl.DataFrame(
+                {
+                    "symbol": [symbol] * len(bars),
+                    "exchange": [exchange.value] * len(bars),
+                    "datetime": [bar.datetime.replace(tzinfo=None) for bar in bars],
+                    "open": [bar.open_price for bar in bars],
+                    "high": [bar.high_price for bar in bars],
+                    "low": [bar.low_price for bar in bars],
+                    "close": [bar.close_price for bar in bars],
+                    "volume": [bar.volume for bar in bars],
+                    "turnover": [bar.turnover for bar in bars],
+                    "open_interest": [bar.open_interest for bar in bars],
+                },
+                schema=EXPORT_SCHEMA
+            )
+
+            count += df.height
+            if progress:
+                progress(count)
+
+            yield df
+
     def get_bar_overview(self) -> list[BarOverview]:
         """"""
         overview: list[BarOverview] = self.database.get_bar_overview()
@@ -212,7 +212,7 @@ class ManagerWidget(QtWidgets.QWidget):
         open_interest_head: str = dialog.open_interest_edit.text()
         datetime_format: str = dialog.format_edit.text()
 
-        start, end, count = self.engine.import_data_from_csv(
+        start, end, count, skipped = self.engine.import_data_from_csv(
             file_path,
             symbol,
             exchange,
@@ -237,6 +237,7 @@ class ManagerWidget(QtWidgets.QWidget):
         Start：{start}\n\
         End：{end}\n\
         Total Count：{count}\n\
+        Skipped Count：{skipped}\n\
         "
         QtWidgets.QMessageBox.information(self, "Load Successful！", msg)
 
@@ -261,7 +262,7 @@ class ManagerWidget(QtWidgets.QWidget):
             self,
             "Export Data",
             "",
-            "CSV(*.csv)"
+            "CSV(*.csv);;Parquet(*.parquet);;Feather(*.feather)"
         )
         if not path:
             return
@@ -538,7 +539,7 @@ class ImportDialog(QtWidgets.QDialog):
     def select_file(self) -> None:
         """"""
         result: str = QtWidgets.QFileDialog.getOpenFileName(
-            self, filter="CSV (*.csv)")
+            self, filter="Data File (*.csv *.parquet *.feather)")
         filename: str = result[0]
         if filename:
             self.file_edit.setText(filename)
@@ -122,12 +122,6 @@ class PortfolioResult:
         self.holding_pnl: float = 0
         self.total_pnl: float = 0
 
-    def clear_pnl(self) -> None:
-        """"""
-        self.trading_pnl = 0
-        self.holding_pnl = 0
-        self.total_pnl = 0
-
     def get_data(self) -> dict:
         """Get data dictionary"""
         data: dict = {
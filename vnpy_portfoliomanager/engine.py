@@ -1,4 +1,5 @@
 from typing import Any
+from collections import defaultdict
 from collections.abc import Callable
 from datetime import datetime
 
@@ -12,7 +13,8 @@ from vnpy.trader.event import (
     EVENT_ORDER,
     EVENT_CONTRACT,
     EVENT_TIMER,
-    EVENT_TRADE
+    EVENT_TRADE,
+    EVENT_TICK
 )
 from vnpy.trader.object import (
     ContractData,
@@ -28,9 +30,8 @@ from .base import ContractResult, PortfolioResult
 
 APP_NAME = "PortfolioManager"
 
-EVENT_PM_CONTRACT = "ePmContract"
-EVENT_PM_PORTFOLIO = "ePmPortfolio"
 EVENT_PM_TRADE = "ePmTrade"
+EVENT_PM_SNAPSHOT = "ePmSnapshot"
 
 
 class PortfolioEngine(BaseEngine):
@@ -52,6 +53,11 @@ class PortfolioEngine(BaseEngine):
         self.contract_results: dict[tuple[str, str], ContractResult] = {}
         self.portfolio_results: dict[str, PortfolioResult] = {}
 
+        # Results to be recalculated, marked by tick and trade updates
+        self.symbol_keys: dict[str, list[tuple[str, str]]] = defaultdict(list)
+        self.dirty_keys: set[tuple[str, str]] = set()
+        self.published_data: dict[tuple[str, str], dict] = {}
+
         self.timer_count: int = 0
         self.timer_interval: int = 5
 
@@ -66,6 +72,7 @@ class PortfolioEngine(BaseEngine):
         self.event_engine.register(EVENT_TRADE, self.process_trade_event)
         self.event_engine.register(EVENT_TIMER, self.process_timer_event)
         self.event_engine.register(EVENT_CONTRACT, self.process_contract_event)
+        self.event_engine.register(EVENT_TICK, self.process_tick_event)
 
     def process_order_event(self, event: Event) -> None:
         """"""
@@ -89,10 +96,10 @@ class PortfolioEngine(BaseEngine):
 
         contract_result: ContractResult | None = self.contract_results.get(key, None)
         if not contract_result:
-            contract_result = ContractResult(self, reference, vt_symbol)
-            self.contract_results[key] = contract_result
+            contract_result = self.add_contract_result(reference, vt_symbol)
 
         contract_result.update_trade(trade)
+        self.dirty_keys.add(key)
 
         # Add trade data
         trade.reference = reference
@@ -109,6 +116,14 @@ class PortfolioEngine(BaseEngine):
         req: SubscribeRequest = SubscribeRequest(contract.symbol, contract.exchange)
         self.main_engine.subscribe(req, contract.gateway_name)
 
+    def process_tick_event(self, event: Event) -> None:
+        """"""
+        tick: TickData = event.data
+
+        keys: list[tuple[str, str]] | None = self.symbol_keys.get(tick.vt_symbol, None)
+        if keys:
+            self.dirty_keys.update(keys)
+
     def process_timer_event(self, event: Event) -> None:
         """"""
         self.timer_count += 1
@@ -116,23 +131,71 @@ class PortfolioEngine(BaseEngine):
             return
         self.timer_count = 0
 
-        for portfolio_result in self.portfolio_results.values():
-            portfolio_result.clear_pnl()
+        self.publish_snapshot()
+
+    def publish_snapshot(self) -> None:
+        """
+        Recalculate results marked dirty, and put one snapshot event
+        with data of changed contract and portfolio results.
+        """
+        if not self.dirty_keys:
+            return
+
+        contract_rows: list[dict] = []
+        changed_references: set[str] = set()
+
+        for key in self.dirty_keys:
+            contract_result: ContractResult = self.contract_results[key]
+
+            trading_pnl: float = contract_result.trading_pnl
+            holding_pnl: float = contract_result.holding_pnl
+            total_pnl: float = contract_result.total_pnl
 
-        for contract_result in self.contract_results.values():
             contract_result.calculate_pnl()
 
-            portfolio_result = self.get_portfolio_result(contract_result.reference)
-            portfolio_result.trading_pnl += contract_result.trading_pnl
-            portfolio_result.holding_pnl += contract_result.holding_pnl
-            portfolio_result.total_pnl += contract_result.total_pnl
+            # Update portfolio result with changes of contract result
+            portfolio_result: PortfolioResult = self.get_portfolio_result(contract_result.reference)
+            portfolio_result.trading_pnl += contract_result.trading_pnl - trading_pnl
+            portfolio_result.holding_pnl += contract_result.holding_pnl - holding_pnl
+            portfolio_result.total_pnl += contract_result.total_pnl - total_pnl
+
+            data: dict = contract_result.get_data()
+            if data != self.published_data.get(key, None):
+                self.published_data[key] = data
+                contract_rows.append(data)
+                changed_references.add(contract_result.reference)
 
-            event = Event(EVENT_PM_CONTRACT, contract_result.get_data())
-            self.event_engine.put(event)
+        self.dirty_keys.clear()
 
-        for portfolio_result in self.portfolio_results.values():
-            event = Event(EVENT_PM_PORTFOLIO, portfolio_result.get_data())
-            self.event_engine.put(event)
+        if not contract_rows:
+            return
+
+        portfolio_rows: list[dict] = [
+            self.portfolio_results[reference].get_data() for reference in changed_references
+        ]
+
+        snapshot: dict[str, list[dict]] = {
+            "contracts": contract_rows,
+            "portfolios": portfolio_rows
+        }
+        self.event_engine.put(Event(EVENT_PM_SNAPSHOT, snapshot))
+
+    def get_snapshot(self) -> dict[str, list[dict]]:
+        """
+        Get data of all published contract and portfolio results,
+        for monitors created after the first snapshot.
+        """
+        contract_rows: list[dict] = list(self.published_data.values())
+        references: set[str] = {data["reference"] for data in contract_rows}
+
+        portfolio_rows: list[dict] = [
+            self.portfolio_results[reference].get_data() for reference in references
+        ]
+
+        return {
+            "contracts": contract_rows,
+            "portfolios": portfolio_rows
+        }
 
     def process_contract_event(self, event: Event) -> None:
         """"""
@@ -140,6 +203,8 @@ class PortfolioEngine(BaseEngine):
         if contract.vt_symbol not in self.result_symbols:
             return
 
+        self.dirty_keys.update(self.symbol_keys[contract.vt_symbol])
+
         req: SubscribeRequest = SubscribeRequest(contract.symbol, contract.exchange)
         self.main_engine.subscribe(req, contract.gateway_name)
 
@@ -165,12 +230,7 @@ class PortfolioEngine(BaseEngine):
                 date_changed = True
 
             self.result_symbols.add(vt_symbol)
-            self.contract_results[(reference, vt_symbol)] = ContractResult(
-                self,
-                reference,
-                vt_symbol,
-                pos
-            )
+            self.add_contract_result(reference, vt_symbol, pos)
 
         # Save again when date changed
         if date_changed:
@@ -223,6 +283,18 @@ class PortfolioEngine(BaseEngine):
         self.save_data()
         self.save_order()
 
+    def add_contract_result(self, reference: str, vt_symbol: str, open_pos: float = 0) -> ContractResult:
+        """"""
+        key: tuple[str, str] = (reference, vt_symbol)
+
+        contract_result: ContractResult = ContractResult(self, reference, vt_symbol, open_pos)
+        self.contract_results[key] = contract_result
+
+        self.symbol_keys[vt_symbol].append(key)
+        self.dirty_keys.add(key)
+
+        return contract_result
+
     def get_portfolio_result(self, reference: str) -> PortfolioResult:
         """"""
         portfolio_result: PortfolioResult | None = self.portfolio_results.get(reference, None)
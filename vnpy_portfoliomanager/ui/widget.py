@@ -12,8 +12,7 @@ from vnpy.trader.ui.widget import (
 
 from ..engine import (
     APP_NAME,
-    EVENT_PM_CONTRACT,
-    EVENT_PM_PORTFOLIO,
+    EVENT_PM_SNAPSHOT,
     EVENT_PM_TRADE,
     PortfolioEngine
 )
@@ -27,8 +26,7 @@ WHITE_COLOR = QtGui.QColor("white")
 class PortfolioManager(QtWidgets.QWidget):
     """"""
 
-    signal_contract: QtCore.Signal = QtCore.Signal(Event)
-    signal_portfolio: QtCore.Signal = QtCore.Signal(Event)
+    signal_snapshot: QtCore.Signal = QtCore.Signal(Event)
     signal_trade: QtCore.Signal = QtCore.Signal(Event)
 
     def __init__(self, main_engine: MainEngine, event_engine: EventEngine) -> None:
@@ -45,6 +43,7 @@ class PortfolioManager(QtWidgets.QWidget):
 
         self.init_ui()
         self.register_event()
+        self.update_results()
         self.update_trades()
 
     def init_ui(self) -> None:
@@ -118,14 +117,23 @@ class PortfolioManager(QtWidgets.QWidget):
 
     def register_event(self) -> None:
         """"""
-        self.signal_contract.connect(self.process_contract_event)
-        self.signal_portfolio.connect(self.process_portfolio_event)
+        self.signal_snapshot.connect(self.process_snapshot_event)
         self.signal_trade.connect(self.process_trade_event)
 
-        self.event_engine.register(EVENT_PM_CONTRACT, self.signal_contract.emit)
-        self.event_engine.register(EVENT_PM_PORTFOLIO, self.signal_portfolio.emit)
+        self.event_engine.register(EVENT_PM_SNAPSHOT, self.signal_snapshot.emit)
         self.event_engine.register(EVENT_PM_TRADE, self.signal_trade.emit)
 
+    def update_results(self) -> None:
+        """"""
+        # Snapshot events are queued to the GUI thread, so deltas are applied after this
+        snapshot: dict[str, list[dict]] = self.portfolio_engine.get_snapshot()
+
+        for contract_result in snapshot["contracts"]:
+            self.update_contract_result(contract_result)
+
+        for portfolio_result in snapshot["portfolios"]:
+            self.update_portfolio_result(portfolio_result)
+
     def update_trades(self) -> None:
         """"""
         trades: list[TradeData] = self.main_engine.get_all_trades()
@@ -169,10 +177,18 @@ class PortfolioManager(QtWidgets.QWidget):
 
         return contract_item
 
-    def process_contract_event(self, event: Event) -> None:
+    def process_snapshot_event(self, event: Event) -> None:
         """"""
-        contract_result: dict = event.data
+        snapshot: dict[str, list[dict]] = event.data
 
+        for contract_result in snapshot["contracts"]:
+            self.update_contract_result(contract_result)
+
+        for portfolio_result in snapshot["portfolios"]:
+            self.update_portfolio_result(portfolio_result)
+
+    def update_contract_result(self, contract_result: dict) -> None:
+        """"""
         contract_item: QtWidgets.QTreeWidgetItem = self.get_contract_item(
             contract_result["reference"],
             contract_result["vt_symbol"]
@@ -187,10 +203,8 @@ class PortfolioManager(QtWidgets.QWidget):
 
         self.update_item_color(contract_item, contract_result)
 
-    def process_portfolio_event(self, event: Event) -> None:
+    def update_portfolio_result(self, portfolio_result: dict) -> None:
         """"""
-        portfolio_result: dict = event.data
-
         portfolio_item: QtWidgets.QTreeWidgetItem = self.get_portfolio_item(portfolio_result["reference"])
         portfolio_item.setText(4, str(portfolio_result["trading_pnl"]))
         portfolio_item.setText(5, str(portfolio_result["holding_pnl"]))
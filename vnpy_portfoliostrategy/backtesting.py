@@ -1,6 +1,6 @@
 from collections import defaultdict
 from datetime import date, datetime, timedelta
-from functools import lru_cache, partial
+from functools import partial
 from copy import copy
 import traceback
 
@@ -11,19 +11,22 @@ from pandas import DataFrame
 from collections.abc import Callable
 
 from vnpy.trader.constant import Direction, Offset, Interval, Status
-from vnpy.trader.database import get_database, BaseDatabase
+from vnpy.trader import cache
 from vnpy.trader.object import OrderData, TradeData, BarData
 from vnpy.trader.utility import round_to, extract_vt_symbol
 from vnpy.trader.optimize import (
     OptimizationSetting,
     check_optimization_setting,
+    get_context_key,
     run_bf_optimization,
-    run_ga_optimization
+    run_ga_optimization,
+    run_sh_optimization
 )
 
 from .base import EngineType
 from .locale import _
 from .template import StrategyTemplate
+from .utility import align_bars
 
 
 INTERVAL_DELTA_MAP: dict[Interval, timedelta] = {
@@ -64,6 +67,16 @@ class BacktestingEngine:
         self.history_data: dict[tuple, BarData] = {}
         self.dts: set[datetime] = set()
 
+        # 面板回放模式数据：时间 x 合约 x 开高低收，缺失K线已用前收盘价填充
+        self.panel: bool = False
+        self.panel_dts: list[datetime] = []
+        self.panel_prices: np.ndarray = np.empty((0, 0, 4))
+        self.panel_present: np.ndarray = np.empty((0, 0), dtype=bool)
+        self.panel_day_end: np.ndarray = np.empty(0, dtype=bool)
+        self.panel_bars: list[list[BarData]] = []
+        self.panel_cursors: list[int] = []
+        self.panel_ix: int = 0
+
         self.limit_order_count: int = 0
         self.limit_orders: dict[str, OrderData] = {}
         self.active_limit_orders: dict[str, OrderData] = {}
@@ -101,7 +114,8 @@ class BacktestingEngine:
         capital: float = 0,
         end: datetime | None = None,
         risk_free: float = 0,
-        annual_days: int = 240
+        annual_days: int = 240,
+        panel: bool = False
     ) -> None:
         """设置参数"""
         self.vt_symbols = vt_symbols
@@ -121,6 +135,7 @@ class BacktestingEngine:
         self.capital = capital
         self.risk_free = risk_free
         self.annual_days = annual_days
+        self.panel = panel
 
     def add_strategy(self, strategy_class: type[StrategyTemplate], setting: dict) -> None:
         """增加策略"""
@@ -144,12 +159,17 @@ class BacktestingEngine:
         self.history_data.clear()
         self.dts.clear()
 
+        symbol_bars: dict[str, list[BarData]] = {}
+
         # 每次加载30天历史数据
         progress_delta: timedelta = timedelta(days=30)
         total_delta: timedelta = self.end - self.start
         interval_delta: timedelta = INTERVAL_DELTA_MAP[self.interval]
 
         for vt_symbol in self.vt_symbols:
+            bars: list[BarData] = []
+            symbol_bars[vt_symbol] = bars
+
             if self.interval == Interval.MINUTE:
                 start: datetime = self.start
                 end: datetime = self.start + progress_delta
@@ -166,10 +186,14 @@ class BacktestingEngine:
                         end
                     )
 
-                    for bar in data:
-                        self.dts.add(bar.datetime)
-                        self.history_data[(bar.datetime, vt_symbol)] = bar
-                        data_count += 1
+                    if self.panel:
+                        bars.extend(data)
+                    else:
+                        for bar in data:
+                            self.dts.add(bar.datetime)
+                            self.history_data[(bar.datetime, vt_symbol)] = bar
+
+                    data_count += len(data)
 
                     progress += progress_delta / total_delta
                     progress = min(progress, 1)
@@ -188,22 +212,64 @@ class BacktestingEngine:
                     self.end
                 )
 
-                for bar in data:
-                    self.dts.add(bar.datetime)
-                    self.history_data[(bar.datetime, vt_symbol)] = bar
+                if self.panel:
+                    bars.extend(data)
+                else:
+                    for bar in data:
+                        self.dts.add(bar.datetime)
+                        self.history_data[(bar.datetime, vt_symbol)] = bar
 
                 data_count = len(data)
 
             self.output(_("{}历史数据加载完成，数据量：{}").format(vt_symbol, data_count))
 
+        if self.panel:
+            self.load_panel(symbol_bars)
+
         self.output(_("所有历史数据加载完成"))
 
+    def load_panel(self, symbol_bars: dict[str, list[BarData]]) -> None:
+        """将各合约K线对齐到统一时间轴，并预先计算缺失K线的前收盘价填充"""
+        dts, present, sorted_bars = align_bars([symbol_bars[vt_symbol] for vt_symbol in self.vt_symbols])
+
+        rows: np.ndarray = np.arange(len(dts))
+        prices: np.ndarray = np.full((len(dts), len(self.vt_symbols), 4), np.nan)
+
+        for j, bars in enumerate(sorted_bars):
+            if not bars:
+                continue
+
+            ix: np.ndarray = np.flatnonzero(present[:, j])
+            prices[ix, j, 0] = [bar.open_price for bar in bars]
+            prices[ix, j, 1] = [bar.high_price for bar in bars]
+            prices[ix, j, 2] = [bar.low_price for bar in bars]
+            prices[ix, j, 3] = [bar.close_price for bar in bars]
+
+            # 缺失K线的开高低收均为最近一根K线的收盘价
+            last: np.ndarray = np.maximum.accumulate(np.where(present[:, j], rows, -1))
+            fill: np.ndarray = (last >= 0) & ~present[:, j]
+            prices[fill, j] = prices[last[fill], j, 3:4]
+
+        day_end: np.ndarray = np.ones(len(dts), dtype=bool)
+        day_end[:-1] = [dt.date() != next_dt.date() for dt, next_dt in zip(dts, dts[1:])]
+
+        self.panel_dts = dts
+        self.panel_prices = prices
+        self.panel_present = present
+        self.panel_day_end = day_end
+        self.panel_bars = sorted_bars
+
     def run_backtesting(self) -> None:
         """开始回测"""
         self.strategy.on_init()
 
-        dts: list = list(self.dts)
-        dts.sort()
+        if self.panel:
+            dts: list = self.panel_dts
+            self.panel_ix = 0
+            self.panel_cursors = [0] * len(self.vt_symbols)
+        else:
+            dts = list(self.dts)
+            dts.sort()
 
         # 使用指定时间的历史数据初始化策略
         day_count: int = 0
@@ -498,6 +564,22 @@ class BacktestingEngine:
         fig.update_layout(height=1000, width=1000)
         fig.show()
 
+    def get_optimization_key(self, target_name: str) -> str:
+        """Hash of backtesting context, for caching and resuming optimization results"""
+        return get_context_key(
+            self.strategy_class,
+            target_name,
+            self.vt_symbols,
+            self.interval,
+            self.start,
+            self.rates,
+            self.slippages,
+            self.sizes,
+            self.priceticks,
+            self.capital,
+            self.end
+        )
+
     def run_bf_optimization(
         self,
         optimization_setting: OptimizationSetting,
@@ -531,19 +613,58 @@ class BacktestingEngine:
         optimization_setting: OptimizationSetting,
         max_workers: int | None = None,
         ngen: int = 30,
-        output: bool = True
+        output: bool = True,
+        cache_path: str = ""
     ) -> list:
         """遗传算法优化"""
         if not check_optimization_setting(optimization_setting):
             return []
 
         evaluate_func: Callable = wrap_evaluate(self, optimization_setting.target_name)
+        cache_key: str = self.get_optimization_key(optimization_setting.target_name)
         results: list = run_ga_optimization(
             evaluate_func,
             optimization_setting,
             get_target_value,
             max_workers=max_workers,
             ngen=ngen,
+            output=self.output,
+            cache_path=cache_path,
+            cache_key=cache_key
+        )
+
+        if output:
+            for result in results:
+                msg: str = _("参数：{}, 目标：{}").format(result[0], result[1])
+                self.output(msg)
+
+        return results
+
+    def run_sh_optimization(
+        self,
+        optimization_setting: OptimizationSetting,
+        max_workers: int | None = None,
+        min_budget: float = 1 / 9,
+        eta: int = 3,
+        hyperband: bool = False,
+        study_path: str = "",
+        output: bool = True
+    ) -> list:
+        """逐次减半优化"""
+        if not check_optimization_setting(optimization_setting):
+            return []
+
+        evaluate_func: Callable = wrap_evaluate(self, optimization_setting.target_name)
+        results: list = run_sh_optimization(
+            evaluate_func,
+            optimization_setting,
+            get_target_value,
+            max_workers=max_workers,
+            min_budget=min_budget,
+            eta=eta,
+            hyperband=hyperband,
+            study_path=study_path,
+            context_key=self.get_optimization_key(optimization_setting.target_name),
             output=self.output
         )
 
@@ -571,6 +692,10 @@ class BacktestingEngine:
 
     def new_bars(self, dt: datetime) -> None:
         """历史数据推送"""
+        if self.panel:
+            self.new_panel_bars(dt)
+            return
+
         self.datetime = dt
 
         bars: dict[str, BarData] = {}
@@ -605,6 +730,127 @@ class BacktestingEngine:
         if self.strategy.inited:
             self.update_daily_close(self.bars, dt)
 
+    def new_panel_bars(self, dt: datetime) -> None:
+        """
+        面板模式历史数据推送，必须按时间顺序调用
+
+        推送给策略的K线和原模式一致，缺失K线不再创建填充对象，
+        撮合和收盘价直接使用面板中填充后的价格
+        """
+        ix: int = self.panel_ix
+        columns: list[int]
+
+        # 初始化用完全部数据时，回放开始会再次推送最后一个时间点
+        if ix and self.panel_dts[ix - 1] == dt:
+            ix -= 1
+            columns = np.flatnonzero(self.panel_present[ix]).tolist()
+            for j in columns:
+                self.panel_cursors[j] -= 1
+        else:
+            self.panel_ix += 1
+            columns = np.flatnonzero(self.panel_present[ix]).tolist()
+
+        self.datetime = dt
+
+        bars: dict[str, BarData] = {}
+        for j in columns:
+            vt_symbol: str = self.vt_symbols[j]
+            bar: BarData = self.panel_bars[j][self.panel_cursors[j]]
+            self.panel_cursors[j] += 1
+
+            self.bars[vt_symbol] = bar
+            bars[vt_symbol] = bar
+
+        self.cross_panel_order(self.panel_prices[ix])
+        self.strategy.on_bars(bars)
+
+        # 每日收盘价只取决于当日最后一个时间点，此前的更新会被覆盖
+        if self.strategy.inited and self.panel_day_end[ix]:
+            close_prices: dict[str, float] = {
+                vt_symbol: close_price
+                for vt_symbol, close_price in zip(self.vt_symbols, self.panel_prices[ix, :, 3].tolist())
+                if close_price == close_price
+            }
+
+            d: date = dt.date()
+            daily_result: PortfolioDailyResult | None = self.daily_results.get(d, None)
+
+            if daily_result:
+                daily_result.update_close_prices(close_prices)
+            else:
+                self.daily_results[d] = PortfolioDailyResult(d, close_prices)
+
+    def cross_panel_order(self, prices: np.ndarray) -> None:
+        """基于当前时间点面板价格，批量判断所有活动委托的撮合"""
+        if not self.active_limit_orders:
+            return
+
+        orders: list[OrderData] = list(self.active_limit_orders.values())
+        symbol_index: dict[str, int] = {vt_symbol: j for j, vt_symbol in enumerate(self.vt_symbols)}
+
+        order_prices: np.ndarray = np.array([order.price for order in orders])
+        long_orders: np.ndarray = np.array([order.direction == Direction.LONG for order in orders])
+        order_bars: np.ndarray = prices[[symbol_index[order.vt_symbol] for order in orders]]
+
+        open_prices: np.ndarray = order_bars[:, 0]
+        long_cross_prices: np.ndarray = order_bars[:, 2]
+        short_cross_prices: np.ndarray = order_bars[:, 1]
+
+        # 尚无K线的合约价格为nan，比较结果为False
+        long_crosses: list[bool] = (
+            long_orders
+            & (order_prices >= long_cross_prices)
+            & (long_cross_prices > 0)
+        ).tolist()
+        short_crosses: list[bool] = (
+            ~long_orders
+            & (order_prices <= short_cross_prices)
+            & (short_cross_prices > 0)
+        ).tolist()
+
+        for order, long_cross, short_cross, open_price in zip(
+            orders, long_crosses, short_crosses, open_prices.tolist()
+        ):
+            # 推送委托未成交状态更新
+            if order.status == Status.SUBMITTING:
+                order.status = Status.NOTTRADED
+                self.strategy.update_order(order)
+
+            if not long_cross and not short_cross:
+                continue
+
+            # 推送委托成交状态更新
+            order.traded = order.volume
+            order.status = Status.ALLTRADED
+            self.strategy.update_order(order)
+
+            if order.vt_orderid in self.active_limit_orders:
+                self.active_limit_orders.pop(order.vt_orderid)
+
+            # 推送成交信息
+            self.trade_count += 1
+
+            if long_cross:
+                trade_price: float = min(order.price, open_price)
+            else:
+                trade_price = max(order.price, open_price)
+
+            trade: TradeData = TradeData(
+                symbol=order.symbol,
+                exchange=order.exchange,
+                orderid=order.orderid,
+                tradeid=str(self.trade_count),
+                direction=order.direction,
+                offset=order.offset,
+                price=trade_price,
+                volume=order.volume,
+                datetime=self.datetime,
+                gateway_name=self.gateway_name,
+            )
+
+            self.strategy.update_trade(trade)
+            self.trades[trade.vt_tradeid] = trade
+
     def cross_limit_order(self) -> None:
         """撮合限价委托"""
         for order in list(self.active_limit_orders.values()):
@@ -914,19 +1160,16 @@ class PortfolioDailyResult:
                 self.contract_results[vt_symbol] = ContractDailyResult(self.date, close_price)
 
 
-@lru_cache(maxsize=999)
 def load_bar_data(
     vt_symbol: str,
     interval: Interval,
     start: datetime,
     end: datetime
 ) -> list[BarData]:
-    """通过数据库获取历史数据"""
+    """通过历史数据缓存获取数据库数据"""
     symbol, exchange = extract_vt_symbol(vt_symbol)
 
-    database: BaseDatabase = get_database()
-
-    bars: list[BarData] = database.load_bar_data(
+    bars: list[BarData] = cache.load_bar_data(
         symbol, exchange, interval, start, end
     )
 
@@ -945,9 +1188,13 @@ def evaluate(
     priceticks: dict[str, float],
     capital: float,
     end: datetime,
-    setting: dict
+    setting: dict,
+    budget: float = 1
 ) -> tuple:
-    """包装回测相关函数以供进程池内运行"""
+    """包装回测相关函数以供进程池内运行，只使用回测区间开始的budget比例部分"""
+    if budget < 1:
+        end = start + (end - start) * budget
+
     engine: BacktestingEngine = BacktestingEngine()
 
     engine.set_parameters(
@@ -960,6 +1207,7 @@ def evaluate(
         priceticks=priceticks,
         capital=capital,
         end=end,
+        panel=True
     )
 
     engine.add_strategy(strategy_class, setting)
@@ -2,11 +2,15 @@ import importlib
 import glob
 import traceback
 from collections import defaultdict
+from copy import copy
 from pathlib import Path
+from threading import Lock
 from types import ModuleType
 from collections.abc import Callable
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
 
 from vnpy.event import Event, EventEngine
 from vnpy.trader.engine import BaseEngine, MainEngine, LogEngine
@@ -34,7 +38,7 @@ from vnpy.trader.constant import (
     Exchange,
     Offset
 )
-from vnpy.trader.utility import load_json, save_json, extract_vt_symbol, round_to
+from vnpy.trader.utility import load_json, save_json, extract_vt_symbol, round_to, StateStore
 from vnpy.trader.datafeed import BaseDatafeed, get_datafeed
 from vnpy.trader.database import BaseDatabase, get_database, DB_TZ
 
@@ -46,6 +50,7 @@ from .base import (
 )
 from .locale import _
 from .template import StrategyTemplate
+from .utility import align_bars
 
 
 class StrategyEngine(BaseEngine):
@@ -56,11 +61,14 @@ class StrategyEngine(BaseEngine):
     setting_filename: str = "portfolio_strategy_setting.json"
     data_filename: str = "portfolio_strategy_data.json"
 
+    load_workers: int = 8                       # 并发加载历史数据的合约数量
+
     def __init__(self, main_engine: MainEngine, event_engine: EventEngine) -> None:
         """"""
         super().__init__(main_engine, event_engine, APP_NAME)
 
         self.strategy_data: dict[str, dict] = {}
+        self.data_store: StateStore = StateStore(self.data_filename)
 
         self.classes: dict[str, type[StrategyTemplate]] = {}
         self.strategies: dict[str, StrategyTemplate] = {}
@@ -69,6 +77,12 @@ class StrategyEngine(BaseEngine):
         self.orderid_strategy_map: dict[str, StrategyTemplate] = {}
 
         self.init_executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+        self.init_count: int = 0
+
+        # 初始化期间各策略共享的历史数据，(vt_symbol, interval): (days, future)
+        self.load_executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=self.load_workers)
+        self.history_lock: Lock = Lock()
+        self.history_cache: dict[tuple, tuple[int, Future]] = {}
 
         self.vt_tradeids: set[str] = set()
 
@@ -88,6 +102,7 @@ class StrategyEngine(BaseEngine):
     def close(self) -> None:
         """关闭"""
         self.stop_all_strategies()
+        self.data_store.close()
 
     def register_event(self) -> None:
         """注册事件引擎"""
@@ -253,46 +268,121 @@ class StrategyEngine(BaseEngine):
     def load_bars(self, strategy: StrategyTemplate, days: int, interval: Interval) -> None:
         """加载历史数据"""
         vt_symbols: list = strategy.vt_symbols
-        dts_set: set[datetime] = set()
-        history_data: dict[tuple, BarData] = {}
 
-        # 通过接口、数据服务、数据库获取历史数据
-        for vt_symbol in vt_symbols:
-            data: list[BarData] = self.load_bar(vt_symbol, days, interval)
+        # 并发获取各合约历史数据，并对齐到统一时间轴
+        symbol_bars: list[list[BarData]] = self.load_symbol_bars(vt_symbols, days, interval)
+        dts, present, sorted_bars = align_bars(symbol_bars)
+        started: np.ndarray = np.logical_or.accumulate(present, axis=0)
 
-            for bar in data:
-                dts_set.add(bar.datetime)
-                history_data[(bar.datetime, vt_symbol)] = bar
+        cursors: list[int] = [0] * len(vt_symbols)
+        last_bars: list[BarData] = []
+        bars: dict = {}
 
-        dts: list[datetime] = list(dts_set)
-        dts.sort()
+        for ix, dt in enumerate(dts):
+            # 如果获取到合约指定时间的历史数据，缓存进bars字典
+            for j in np.flatnonzero(present[ix]).tolist():
+                bar: BarData = sorted_bars[j][cursors[j]]
+                cursors[j] += 1
+                bars[vt_symbols[j]] = bar
+
+            # 如果获取不到，但此前已有合约数据, 使用最近一根K线的收盘价填充
+            for j in np.flatnonzero(started[ix] & ~present[ix]).tolist():
+                old_bar: BarData = sorted_bars[j][cursors[j] - 1]
+
+                bars[vt_symbols[j]] = BarData(
+                    symbol=old_bar.symbol,
+                    exchange=old_bar.exchange,
+                    datetime=dt,
+                    open_price=old_bar.close_price,
+                    high_price=old_bar.close_price,
+                    low_price=old_bar.close_price,
+                    close_price=old_bar.close_price,
+                    gateway_name=old_bar.gateway_name
+                )
 
-        bars: dict = {}
+            self.call_strategy_func(strategy, strategy.on_bars, bars)
+
+    def load_symbol_bars(self, vt_symbols: list[str], days: int, interval: Interval) -> list[list[BarData]]:
+        """
+        并发加载多个合约历史数据
+
+        策略初始化期间，历史数据在所有策略间共享，每个合约只查询一次
+        """
+        futures: list[tuple[int, Future]] = []
+
+        with self.history_lock:
+            shared: bool = bool(self.init_count)
 
-        for dt in dts:
             for vt_symbol in vt_symbols:
-                bar = history_data.get((dt, vt_symbol), None)
-
-                # 如果获取到合约指定时间的历史数据，缓存进bars字典
-                if bar:
-                    bars[vt_symbol] = bar
-                # 如果获取不到，但bars字典中已有合约数据缓存, 使用之前的数据填充
-                elif vt_symbol in bars:
-                    old_bar: BarData = bars[vt_symbol]
-
-                    bar = BarData(
-                        symbol=old_bar.symbol,
-                        exchange=old_bar.exchange,
-                        datetime=dt,
-                        open_price=old_bar.close_price,
-                        high_price=old_bar.close_price,
-                        low_price=old_bar.close_price,
-                        close_price=old_bar.close_price,
-                        gateway_name=old_bar.gateway_name
+                if shared:
+                    cached_days, future, created = self.get_history_future(vt_symbol, interval, days)
+                else:
+                    cached_days, future, created = days, Future(), True
+
+                if created:
+                    self.load_executor.submit(
+                        self.query_history_future, future, vt_symbol, interval, days
                     )
-                    bars[vt_symbol] = bar
 
-            self.call_strategy_func(strategy, strategy.on_bars, bars)
+                futures.append((cached_days, future))
+
+        symbol_bars: list[list[BarData]] = []
+
+        for cached_days, future in futures:
+            bars: list[BarData] = future.result()
+
+            # 不在初始化期间时，历史数据不会被共享
+            if not shared:
+                symbol_bars.append(bars)
+                continue
+
+            if cached_days > days and bars:
+                start: datetime = datetime.now(DB_TZ) - timedelta(days)
+                if not bars[0].datetime.tzinfo:
+                    start = start.replace(tzinfo=None)
+
+                bars = [bar for bar in bars if bar.datetime >= start]
+
+            symbol_bars.append([copy(bar) for bar in bars])
+
+        return symbol_bars
+
+    def get_history_future(
+        self,
+        vt_symbol: str,
+        interval: Interval,
+        days: int
+    ) -> tuple[int, Future, bool]:
+        """获取覆盖指定天数的共享历史数据，或创建新的由调用者查询，必须持有history_lock调用"""
+        key: tuple = (vt_symbol, interval)
+
+        cached: tuple[int, Future] | None = self.history_cache.get(key, None)
+        if cached and cached[0] >= days:
+            return cached[0], cached[1], False
+
+        future: Future = Future()
+        self.history_cache[key] = (days, future)
+        return days, future, True
+
+    def query_history_future(
+        self,
+        future: Future,
+        vt_symbol: str,
+        interval: Interval,
+        days: int
+    ) -> None:
+        """查询历史数据并设置到future"""
+        try:
+            bars: list[BarData] = self.load_bar(vt_symbol, days, interval)
+            future.set_result(bars)
+        except Exception as e:
+            # 查询失败的结果不应被其他策略复用
+            with self.history_lock:
+                key: tuple = (vt_symbol, interval)
+                if self.history_cache.get(key, None) == (days, future):
+                    self.history_cache.pop(key)
+
+            future.set_exception(e)
 
     def load_bar(self, vt_symbol: str, days: int, interval: Interval) -> list[BarData]:
         """加载单个合约历史数据"""
@@ -366,9 +456,23 @@ class StrategyEngine(BaseEngine):
         self.save_strategy_setting()
         self.put_strategy_event(strategy)
 
-    def init_strategy(self, strategy_name: str) -> None:
+    def init_strategy(self, strategy_name: str) -> Future:
         """初始化策略"""
-        self.init_executor.submit(self._init_strategy, strategy_name)
+        with self.history_lock:
+            self.init_count += 1
+
+        return self.init_executor.submit(self.run_init_task, strategy_name)
+
+    def run_init_task(self, strategy_name: str) -> None:
+        """执行策略初始化，所有初始化任务完成后清空共享历史数据"""
+        try:
+            self._init_strategy(strategy_name)
+        finally:
+            with self.history_lock:
+                self.init_count -= 1
+
+                if not self.init_count:
+                    self.history_cache.clear()
 
     def _init_strategy(self, strategy_name: str) -> None:
         """初始化策略"""
@@ -480,7 +584,7 @@ class StrategyEngine(BaseEngine):
         self.save_strategy_setting()
 
         self.strategy_data.pop(strategy_name, None)
-        save_json(self.data_filename, self.strategy_data)
+        self.data_store.remove(strategy_name)
 
         return True
 
@@ -516,7 +620,7 @@ class StrategyEngine(BaseEngine):
 
     def load_strategy_data(self) -> None:
         """加载策略数据"""
-        self.strategy_data = load_json(self.data_filename)
+        self.strategy_data = self.data_store.load()
 
     def sync_strategy_data(self, strategy: StrategyTemplate) -> None:
         """保存策略数据到文件"""
@@ -525,7 +629,7 @@ class StrategyEngine(BaseEngine):
         data.pop("trading")
 
         self.strategy_data[strategy.strategy_name] = data
-        save_json(self.data_filename, self.strategy_data)
+        self.data_store.put(strategy.strategy_name, data)
 
     def get_all_strategy_class_names(self) -> list:
         """获取所有加载策略类名"""
@@ -546,10 +650,12 @@ class StrategyEngine(BaseEngine):
         strategy: StrategyTemplate = self.strategies[strategy_name]
         return strategy.get_parameters()
 
-    def init_all_strategies(self) -> None:
+    def init_all_strategies(self) -> dict[str, Future]:
         """初始化所有策略"""
+        futures: dict[str, Future] = {}
         for strategy_name in self.strategies.keys():
-            self.init_strategy(strategy_name)
+            futures[strategy_name] = self.init_strategy(strategy_name)
+        return futures
 
     def start_all_strategies(self) -> None:
         """启动所有策略"""
@@ -1,6 +1,8 @@
 from datetime import datetime, time
 from collections.abc import Callable
 
+import numpy as np
+
 from vnpy.trader.object import BarData, TickData, Interval
 
 
@@ -309,3 +311,43 @@ class PortfolioBarGenerator:
                 if self.on_window_bars:
                     self.on_window_bars(self.window_bars)
                 self.window_bars = {}
+
+
+def align_bars(symbol_bars: list[list[BarData]]) -> tuple[list[datetime], np.ndarray, list[list[BarData]]]:
+    """
+    将多个合约的K线对齐到统一时间轴
+
+    返回所有合约K线时间的并集、每个时间点各合约是否有K线的矩阵，以及按时间
+    排序的各合约K线（重复时间只保留最后一根）。同一时间点的时间对象取自
+    排在最前的合约，和逐个合约加入集合的结果一致。
+    """
+    symbol_times: list[np.ndarray] = []
+    symbol_dts: list[list[datetime]] = []
+    sorted_bars: list[list[BarData]] = []
+
+    for bars in symbol_bars:
+        dts: list[datetime] = [bar.datetime for bar in bars]
+        times: np.ndarray = np.round(np.array([dt.timestamp() for dt in dts], dtype=float) * 1_000_000).astype(np.int64)
+
+        order: np.ndarray = np.argsort(times, kind="stable")
+        times = times[order]
+
+        keep: np.ndarray = np.ones(len(times), dtype=bool)
+        keep[:-1] = times[1:] != times[:-1]
+        ix: list[int] = order[keep].tolist()
+
+        symbol_times.append(times[keep])
+        symbol_dts.append([dts[i] for i in ix])
+        sorted_bars.append([bars[i] for i in ix])
+
+    all_times: np.ndarray = np.unique(np.concatenate(symbol_times)) if symbol_times else np.empty(0, dtype=np.int64)
+
+    present: np.ndarray = np.zeros((len(all_times), len(symbol_bars)), dtype=bool)
+    all_dts: np.ndarray = np.empty(len(all_times), dtype=object)
+
+    for j in reversed(range(len(symbol_bars))):
+        rows: np.ndarray = np.searchsorted(all_times, symbol_times[j])
+        present[rows, j] = True
+        all_dts[rows] = symbol_dts[j]
+
+    return all_dts.tolist(), present, sorted_bars
@@ -19,8 +19,10 @@ from vnpy.trader.object import TradeData, BarData, TickData
 from vnpy.trader.optimize import (
     OptimizationSetting,
     check_optimization_setting,
+    get_context_key,
     run_bf_optimization,
-    run_ga_optimization
+    run_ga_optimization,
+    run_sh_optimization
 )
 
 from .template import SpreadStrategyTemplate, SpreadAlgoTemplate
@@ -175,7 +177,8 @@ class BacktestingEngine:
             self.history_data = load_tick_data(
                 self.spread,
                 self.start,
-                self.end
+                self.end,
+                backtesting=True
             )
 
         self.output(f"Historical data loading completed, data volume: {len(self.history_data)}")
@@ -455,6 +458,29 @@ class BacktestingEngine:
         fig.update_layout(height=1000, width=1000)
         fig.show()
 
+    def get_optimization_key(self, target_name: str) -> str:
+        """Hash of backtesting context, for caching and resuming optimization results"""
+        # Spread object has no stable repr, use its definition instead
+        return get_context_key(
+            self.strategy_class,
+            target_name,
+            self.spread.name,
+            self.spread.price_formula,
+            self.spread.trading_formula,
+            sorted(self.spread.variable_symbols.items()),
+            sorted(self.spread.variable_directions.items()),
+            sorted(self.spread.trading_multipliers.items()),
+            self.spread.min_volume,
+            self.interval,
+            self.start,
+            self.rate,
+            self.slippage,
+            self.size,
+            self.pricetick,
+            self.capital,
+            self.end
+        )
+
     def run_bf_optimization(
         self,
         optimization_setting: OptimizationSetting,
@@ -488,19 +514,59 @@ class BacktestingEngine:
         optimization_setting: OptimizationSetting,
         output: bool = True,
         max_workers: int | None = None,
-        ngen: int = 30
+        ngen: int = 30,
+        cache_path: str = ""
     ) -> list:
         """"""
         if not check_optimization_setting(optimization_setting):
             return []
 
         evaluate_func: Callable = wrap_evaluate(self, optimization_setting.target_name)
+
+        cache_key: str = self.get_optimization_key(optimization_setting.target_name)
         results: list = run_ga_optimization(
             evaluate_func,
             optimization_setting,
             get_target_value,
             max_workers=max_workers,
             ngen=ngen,
+            output=self.output,
+            cache_path=cache_path,
+            cache_key=cache_key
+        )
+
+        if output:
+            for result in results:
+                msg: str = f"Parameters: {result[0]}, Target: {result[1]}"
+                self.output(msg)
+
+        return results
+
+    def run_sh_optimization(
+        self,
+        optimization_setting: OptimizationSetting,
+        output: bool = True,
+        max_workers: int | None = None,
+        min_budget: float = 1 / 9,
+        eta: int = 3,
+        hyperband: bool = False,
+        study_path: str = ""
+    ) -> list:
+        """"""
+        if not check_optimization_setting(optimization_setting):
+            return []
+
+        evaluate_func: Callable = wrap_evaluate(self, optimization_setting.target_name)
+        results: list = run_sh_optimization(
+            evaluate_func,
+            optimization_setting,
+            get_target_value,
+            max_workers=max_workers,
+            min_budget=min_budget,
+            eta=eta,
+            hyperband=hyperband,
+            study_path=study_path,
+            context_key=self.get_optimization_key(optimization_setting.target_name),
             output=self.output
         )
 
@@ -647,7 +713,8 @@ class BacktestingEngine:
         ticks: list[TickData] = load_tick_data(
             self.spread,
             init_start,
-            init_end
+            init_end,
+            backtesting=True
         )
 
         for _tick in ticks:
@@ -818,11 +885,17 @@ def evaluate(
     pricetick: float,
     capital: int,
     end: datetime,
-    setting: dict
+    setting: dict,
+    budget: float = 1
 ) -> tuple:
     """
     Function for running in multiprocessing.pool
+
+    Only the starting budget fraction of backtesting period is used.
     """
+    if budget < 1:
+        end = start + (end - start) * budget
+
     engine: BacktestingEngine = BacktestingEngine()
 
     engine.set_parameters(
@@ -12,6 +12,7 @@ from vnpy.trader.object import (
 from vnpy.trader.constant import Direction, Offset, Exchange, Interval, Status
 from vnpy.trader.utility import floor_to, ceil_to, round_to, extract_vt_symbol, ZoneInfo
 from vnpy.trader.database import BaseDatabase, get_database
+from vnpy.trader import cache
 from vnpy.trader.datafeed import BaseDatafeed, get_datafeed
 
 
@@ -443,11 +444,17 @@ def load_bar_data(
                 symbol, exchange, interval, start, end, output
             )
 
-        # If query fails, attempt to load from database
+        # If query fails, attempt to load from database,
+        # history cache is only used in backtesting
         if not bar_data:
-            bar_data = database.load_bar_data(
-                symbol, exchange, interval, start, end
-            )
+            if backtesting:
+                bar_data = cache.load_bar_data(
+                    symbol, exchange, interval, start, end
+                )
+            else:
+                bar_data = database.load_bar_data(
+                    symbol, exchange, interval, start, end
+                )
 
         bars: dict[datetime, BarData] = {bar.datetime: bar for bar in bar_data}
         leg_bars[vt_symbol] = bars
@@ -499,11 +506,18 @@ def load_bar_data(
 def load_tick_data(
     spread: SpreadData,
     start: datetime,
-    end: datetime
+    end: datetime,
+    backtesting: bool = False
 ) -> list[TickData]:
     """"""
+    # History cache is only used in backtesting
+    if backtesting:
+        return cache.load_tick_data(
+            spread.name, Exchange.LOCAL, start, end
+        )
+
     database: BaseDatabase = get_database()
-    data: list =  database.load_tick_data(
+    data: list = database.load_tick_data(
         spread.name, Exchange.LOCAL, start, end
     )
     return data
@@ -16,7 +16,7 @@ from vnpy.trader.event import (
     EVENT_TICK, EVENT_POSITION, EVENT_CONTRACT,
     EVENT_ORDER, EVENT_TRADE, EVENT_TIMER
 )
-from vnpy.trader.utility import load_json, save_json
+from vnpy.trader.utility import load_json, save_json, StateStore
 from vnpy.trader.object import (
     TickData, ContractData, BarData,
     PositionData, OrderData, TradeData, LogData,
@@ -107,6 +107,10 @@ class SpreadEngine(BaseEngine):
         self.algo_engine.stop()
         self.strategy_engine.stop()
 
+    def close(self) -> None:
+        """"""
+        self.data_engine.close()
+
     def write_log(self, msg: str) -> None:
         """"""
         log: LegData = LogData(
@@ -148,6 +152,8 @@ class SpreadDataEngine:
         self.symbol_spread_map: dict[str, list[SpreadData]] = defaultdict(list)
         self.order_spread_map: dict[str, SpreadData] = {}
 
+        self.pos_store: StateStore = StateStore(self.pos_filename)
+
         self.tradeid_history: set[str] = set()
 
     def start(self) -> None:
@@ -162,6 +168,10 @@ class SpreadDataEngine:
         """"""
         pass
 
+    def close(self) -> None:
+        """"""
+        self.pos_store.close()
+
     def load_setting(self) -> None:
         """"""
         setting: dict = load_json(self.setting_filename)
@@ -206,18 +216,13 @@ class SpreadDataEngine:
 
         save_json(self.setting_filename, setting)
 
-    def save_pos(self) -> None:
+    def save_pos(self, spread: SpreadData) -> None:
         """Save spread position"""
-        pos_data: dict = {}
-
-        for spread in self.spreads.values():
-            pos_data[spread.name] = spread.leg_pos
-
-        save_json(self.pos_filename, pos_data)
+        self.pos_store.put(spread.name, dict(spread.leg_pos))
 
     def load_pos(self) -> None:
         """Load spread position"""
-        pos_data: dict = load_json(self.pos_filename)
+        pos_data: dict = self.pos_store.load()
 
         for name, leg_pos in pos_data.items():
             spread: SpreadData | None = self.spreads.get(name, None)
@@ -273,7 +278,7 @@ class SpreadDataEngine:
             spread.calculate_pos()
             self.put_pos_event(spread)
 
-            self.save_pos()
+            self.save_pos(spread)
 
     def process_contract_event(self, event: Event) -> None:
         """"""
@@ -391,6 +396,7 @@ class SpreadDataEngine:
             self.symbol_spread_map[leg.vt_symbol].remove(spread)
 
         self.save_setting()
+        self.pos_store.remove(name)
         self.write_log(f"Spread removed successfully: {name}, effective after restart")
 
     def get_spread(self, name: str) -> SpreadData | None:
@@ -1,5 +1,9 @@
+from collections.abc import Iterable
 from datetime import datetime
+from operator import attrgetter
+from sqlite3 import Cursor
 
+import polars as pl
 from peewee import (
     AutoField,
     CharField,
@@ -9,7 +13,6 @@ from peewee import (
     SqliteDatabase as PeeweeSqliteDatabase,
     ModelSelect,
     ModelDelete,
-    chunked,
     fn
 )
 
@@ -21,13 +24,22 @@ from vnpy.trader.database import (
     BarOverview,
     DB_TZ,
     TickOverview,
+    BAR_COLUMNS,
+    TICK_COLUMNS,
     convert_tz
 )
 from vnpy.trader.setting import SETTINGS
 
 filename: str = SETTINGS["database.database"] or "database.db"
 path: CharField = str(get_file_path(filename))
-db: PeeweeSqliteDatabase = PeeweeSqliteDatabase(path)
+
+#WAL journal with normal synchronous keeps the database consistent while writing much faster
+pragmas: dict = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "cache_size": -64 * 1024
+}
+db: PeeweeSqliteDatabase = PeeweeSqliteDatabase(path, pragmas=pragmas)
 
 
 class DbBarData(Model):
@@ -140,6 +152,38 @@ class DbTickOverview(Model):
         indexes: tuple = ((("symbol", "exchange"), True),)
 
 
+def to_db_df(df: pl.DataFrame, columns: list[str]) -> pl.DataFrame:
+    """Select columns in order with default values, and convert datetime into naive DB_TZ"""
+    defaults: dict = {"name": "", "localtime": None}
+
+    df = df.select([
+        pl.col(c) if c in df.columns else pl.lit(defaults.get(c, 0.0)).alias(c)
+        for c in columns
+    ])
+
+    return df.with_columns(
+        pl.col("datetime").dt.convert_time_zone(DB_TZ.key).dt.replace_time_zone(None)
+    )
+
+
+def format_datetime(expr: pl.Expr) -> pl.Expr:
+    """Format naive datetime into string, same as stored by peewee"""
+    return (
+        pl.when(expr.dt.microsecond() == 0)
+        .then(expr.dt.strftime("%Y-%m-%d %H:%M:%S"))
+        .otherwise(expr.dt.strftime("%Y-%m-%d %H:%M:%S%.6f"))
+    )
+
+
+def count_range(model: type[Model], conditions: list, start: datetime, end: datetime) -> int:
+    """Count rows of one contract within time range"""
+    s: ModelSelect = model.select().where(
+        *conditions,
+        (model.datetime >= start) & (model.datetime <= end)
+    )
+    return s.count()
+
+
 class SqliteDatabase(BaseDatabase):
     """SQLite database interface"""
 
@@ -153,116 +197,202 @@ class SqliteDatabase(BaseDatabase):
         """Save K-line data"""
         #Read primary key parameters
         bar: BarData = bars[0]
-        symbol: CharField = bar.symbol
+        symbol: str = bar.symbol
         exchange: Exchange = bar.exchange
         interval: Interval = bar.interval
 
-        #Convert BarData data to dictionary and adjust time zone
-        data: list = []
+        #Convert BarData data to rows in database time zone, bars are not modified
+        dts: list[datetime] = [convert_tz(bar.datetime) for bar in bars]
+        rows: list[tuple] = [
+            (
+                str(dt),
+                bar.open_price,
+                bar.high_price,
+                bar.low_price,
+                bar.close_price,
+                bar.volume,
+                bar.turnover,
+                bar.open_interest
+            )
+            for dt, bar in zip(dts, bars, strict=True)
+        ]
 
-        for bar in bars:
-            bar.datetime = convert_tz(bar.datetime)
+        self.save_bar_rows(symbol, exchange, interval, rows, min(dts), max(dts))
 
-            d: dict = bar.__dict__
-            d["exchange"] = d["exchange"].value
-            d["interval"] = d["interval"].value
-            d.pop("gateway_name")
-            d.pop("vt_symbol")
-            d.pop("extra", None)
-            data.append(d)
+        return True
 
-        #Use the upsert operation to update data into the database
-        with self.db.atomic():
-            for c in chunked(data, 50):
-                DbBarData.insert_many(c).on_conflict_replace().execute()
-
-        #Update K-line summary data
-        overview: DbBarOverview = DbBarOverview.get_or_none(
-            DbBarOverview.symbol == symbol,
-            DbBarOverview.exchange == exchange.value,
-            DbBarOverview.interval == interval.value,
-        )
+    def save_bar_df(
+        self,
+        df: pl.DataFrame,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        stream: bool = False
+    ) -> bool:
+        """Save K-line data in columnar form with bulk insert"""
+        if df.is_empty():
+            return True
 
-        if not overview:
-            overview = DbBarOverview()
-            overview.symbol = symbol
-            overview.exchange = exchange.value
-            overview.interval = interval.value
-            overview.start = bars[0].datetime
-            overview.end = bars[-1].datetime
-            overview.count = len(bars)
-        elif stream:
-            overview.end = bars[-1].datetime
-            overview.count += len(bars)
-        else:
-            overview.start = min(bars[0].datetime, overview.start)
-            overview.end = max(bars[-1].datetime, overview.end)
-
-            s: ModelSelect = DbBarData.select().where(
-                (DbBarData.symbol == symbol)
-                & (DbBarData.exchange == exchange.value)
-                & (DbBarData.interval == interval.value)
-            )
-            overview.count = s.count()
+        df = to_db_df(df, BAR_COLUMNS)
+        start, end = df["datetime"].min(), df["datetime"].max()
+        df = df.with_columns(format_datetime(pl.col("datetime")))
 
-        overview.save()
+        self.save_bar_rows(symbol, exchange, interval, df.iter_rows(), start, end)
 
         return True
 
+    def save_bar_rows(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        rows: Iterable[tuple],
+        start: datetime,
+        end: datetime
+    ) -> None:
+        """Insert rows of BAR_COLUMNS in one transaction and update summary data incrementally"""
+        conditions: list = [
+            DbBarData.symbol == symbol,
+            DbBarData.exchange == exchange.value,
+            DbBarData.interval == interval.value
+        ]
+        keys: dict = {
+            "symbol": symbol,
+            "exchange": exchange.value,
+            "interval": interval.value
+        }
+
+        with self.db.atomic():
+            overview: DbBarOverview = DbBarOverview.get_or_none(
+                DbBarOverview.symbol == symbol,
+                DbBarOverview.exchange == exchange.value,
+                DbBarOverview.interval == interval.value,
+            )
+
+            #Only rows in the time range of new data can be replaced
+            before: int = 0
+            if overview and start <= overview.end and end >= overview.start:
+                before = count_range(DbBarData, conditions, start, end)
+
+            self.insert_rows(DbBarData, keys, BAR_COLUMNS, rows)
+            after: int = count_range(DbBarData, conditions, start, end)
+
+            #Update K-line summary data
+            if not overview:
+                overview = DbBarOverview()
+                overview.symbol = symbol
+                overview.exchange = exchange.value
+                overview.interval = interval.value
+                overview.start = start
+                overview.end = end
+                overview.count = after
+            else:
+                overview.start = min(start, overview.start)
+                overview.end = max(end, overview.end)
+                overview.count += after - before
+
+            overview.save()
+
     def save_tick_data(self, ticks: list[TickData], stream: bool = False) -> bool:
         """Save TICK data"""
         #Read primary key parameters
         tick: TickData = ticks[0]
-        symbol: CharField = tick.symbol
+        symbol: str = tick.symbol
         exchange: Exchange = tick.exchange
 
-        #Convert TickData data to dictionary and adjust time zone
-        data: list = []
-
-        for tick in ticks:
-            tick.datetime = convert_tz(tick.datetime)
+        #Convert TickData data to rows in database time zone, ticks are not modified
+        dts: list[datetime] = [convert_tz(tick.datetime) for tick in ticks]
+        getter: attrgetter = attrgetter(*TICK_COLUMNS[1:-1])
+        rows: list[tuple] = [
+            (str(dt), *getter(tick), str(tick.localtime) if tick.localtime else None)
+            for dt, tick in zip(dts, ticks, strict=True)
+        ]
 
-            d: dict = tick.__dict__
-            d["exchange"] = d["exchange"].value
-            d.pop("gateway_name")
-            d.pop("vt_symbol")
-            d.pop("extra", None)
-            data.append(d)
+        self.save_tick_rows(symbol, exchange, rows, min(dts), max(dts))
 
-        #Use the upsert operation to update data into the database
-        with self.db.atomic():
-            for c in chunked(data, 10):
-                DbTickData.insert_many(c).on_conflict_replace().execute()
+        return True
 
-        #Update Tick summary data
-        overview: DbTickOverview = DbTickOverview.get_or_none(
-            DbTickOverview.symbol == symbol,
-            DbTickOverview.exchange == exchange.value,
+    def save_tick_df(
+        self,
+        df: pl.DataFrame,
+        symbol: str,
+        exchange: Exchange,
+        stream: bool = False
+    ) -> bool:
+        """Save TICK data in columnar form with bulk insert"""
+        if df.is_empty():
+            return True
+
+        df = to_db_df(df, TICK_COLUMNS)
+        start, end = df["datetime"].min(), df["datetime"].max()
+        df = df.with_columns(
+            format_datetime(pl.col("datetime")),
+            pl.col("localtime").cast(pl.String)
         )
 
-        if not overview:
-            overview = DbTickOverview()
-            overview.symbol = symbol
-            overview.exchange = exchange.value
-            overview.start = ticks[0].datetime
-            overview.end = ticks[-1].datetime
-            overview.count = len(ticks)
-        elif stream:
-            overview.end = ticks[-1].datetime
-            overview.count += len(ticks)
-        else:
-            overview.start = min(ticks[0].datetime, overview.start)
-            overview.end = max(ticks[-1].datetime, overview.end)
-
-            s: ModelSelect = DbTickData.select().where(
-                (DbTickData.symbol == symbol)
-                & (DbTickData.exchange == exchange.value)
+        self.save_tick_rows(symbol, exchange, df.iter_rows(), start, end)
+
+        return True
+
+    def save_tick_rows(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        rows: Iterable[tuple],
+        start: datetime,
+        end: datetime
+    ) -> None:
+        """Insert rows of TICK_COLUMNS in one transaction and update summary data incrementally"""
+        conditions: list = [
+            DbTickData.symbol == symbol,
+            DbTickData.exchange == exchange.value
+        ]
+        keys: dict = {
+            "symbol": symbol,
+            "exchange": exchange.value
+        }
+
+        with self.db.atomic():
+            overview: DbTickOverview = DbTickOverview.get_or_none(
+                DbTickOverview.symbol == symbol,
+                DbTickOverview.exchange == exchange.value,
             )
-            overview.count = s.count()
 
-        overview.save()
+            #Only rows in the time range of new data can be replaced
+            before: int = 0
+            if overview and start <= overview.end and end >= overview.start:
+                before = count_range(DbTickData, conditions, start, end)
+
+            self.insert_rows(DbTickData, keys, TICK_COLUMNS, rows)
+            after: int = count_range(DbTickData, conditions, start, end)
+
+            #Update Tick summary data
+            if not overview:
+                overview = DbTickOverview()
+                overview.symbol = symbol
+                overview.exchange = exchange.value
+                overview.start = start
+                overview.end = end
+                overview.count = after
+            else:
+                overview.start = min(start, overview.start)
+                overview.end = max(end, overview.end)
+                overview.count += after - before
 
-        return True
+            overview.save()
+
+    def insert_rows(self, model: type[Model], keys: dict, columns: list[str], rows: Iterable[tuple]) -> None:
+        """Upsert rows of one contract with a single prepared statement"""
+        names: list[str] = list(keys) + columns
+        key_values: tuple = tuple(keys.values())
+
+        sql: str = (
+            f'INSERT OR REPLACE INTO "{model._meta.table_name}" '
+            f'({", ".join(names)}) VALUES ({", ".join("?" * len(names))})'
+        )
+
+        cursor: Cursor = self.db.cursor()
+        cursor.executemany(sql, (key_values + tuple(row) for row in rows))
 
     def load_bar_data(
         self,
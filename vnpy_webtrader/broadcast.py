@@ -0,0 +1,187 @@
+import asyncio
+import json
+from collections import deque
+from typing import Any
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from vnpy.trader.event import EVENT_TICK
+
+
+#Websocket close code for clients dropped for lagging behind
+LAGGING_CLOSE_CODE = 1013
+
+
+class WebsocketClient:
+    """
+    Subscriptions and send queue of one websocket connection.
+
+    Ticks are conflated to the latest message of each symbol, other
+    messages are queued in order and bounded by max_pending.
+    """
+
+    def __init__(self, websocket: Any, binary: bool = False, max_pending: int = 1000) -> None:
+        """"""
+        self.websocket: Any = websocket
+        self.binary: bool = binary and msgpack is not None
+        self.max_pending: int = max_pending
+
+        #Empty set means subscribing all
+        self.topics: set[str] = set()
+        self.vt_symbols: set[str] = set()
+
+        self.ticks: dict[str, str | bytes] = {}
+        self.messages: deque[str | bytes] = deque()
+
+        self.active: bool = True
+        self.pending: asyncio.Event = asyncio.Event()
+
+    def is_subscribed(self, topic: str, vt_symbol: str) -> bool:
+        """Check if message of topic and symbol should be sent"""
+        if self.topics and topic not in self.topics:
+            return False
+
+        if self.vt_symbols and vt_symbol and vt_symbol not in self.vt_symbols:
+            return False
+
+        return True
+
+    def put(self, topic: str, vt_symbol: str, msg: str | bytes) -> bool:
+        """Put message into send queue, return False if client is lagging"""
+        if topic == EVENT_TICK and vt_symbol:
+            self.ticks[vt_symbol] = msg
+        else:
+            if len(self.messages) >= self.max_pending:
+                return False
+            self.messages.append(msg)
+
+        self.pending.set()
+        return True
+
+    def process_request(self, text: str) -> None:
+        """
+        Update subscriptions with request from client, e.g.
+        {"action": "subscribe", "topics": ["eTick."], "vt_symbols": ["rb2501.SHFE"]}
+        """
+        try:
+            req: dict = json.loads(text)
+        except ValueError:
+            return
+
+        if not isinstance(req, dict):
+            return
+
+        action: str = req.get("action", "")
+        topics: set[str] = set(req.get("topics", []))
+        vt_symbols: set[str] = set(req.get("vt_symbols", []))
+
+        if action == "subscribe":
+            self.topics |= topics
+            self.vt_symbols |= vt_symbols
+        elif action == "unsubscribe":
+            self.topics -= topics
+            self.vt_symbols -= vt_symbols
+
+            for vt_symbol in vt_symbols:
+                self.ticks.pop(vt_symbol, None)
+
+    async def run(self) -> None:
+        """Send queued messages until client is closed"""
+        while self.active:
+            await self.pending.wait()
+            self.pending.clear()
+
+            while self.messages or self.ticks:
+                if self.messages:
+                    msg: str | bytes = self.messages.popleft()
+                else:
+                    vt_symbol: str = next(iter(self.ticks))
+                    msg = self.ticks.pop(vt_symbol)
+
+                if isinstance(msg, bytes):
+                    await self.websocket.send_bytes(msg)
+                else:
+                    await self.websocket.send_text(msg)
+
+    def close(self) -> None:
+        """Stop sending"""
+        self.active = False
+        self.messages.clear()
+        self.ticks.clear()
+        self.pending.set()
+
+
+class WebsocketBroadcaster:
+    """
+    Fan-out of rpc events to websocket clients, each message is encoded
+    once for all clients subscribing it.
+    """
+
+    def __init__(self, max_pending: int = 1000) -> None:
+        """"""
+        self.max_pending: int = max_pending
+        self.clients: dict[Any, WebsocketClient] = {}
+        self.tasks: dict[Any, asyncio.Task] = {}
+
+    def add_client(self, websocket: Any, binary: bool = False) -> WebsocketClient:
+        """Add client and start its send task"""
+        client: WebsocketClient = WebsocketClient(websocket, binary, self.max_pending)
+        self.clients[websocket] = client
+        self.tasks[websocket] = asyncio.create_task(self.run_client(client))
+        return client
+
+    def remove_client(self, websocket: Any) -> None:
+        """Remove client and stop its send task"""
+        client: WebsocketClient | None = self.clients.pop(websocket, None)
+        if client:
+            client.close()
+
+        self.tasks.pop(websocket, None)
+
+    async def run_client(self, client: WebsocketClient) -> None:
+        """Run send task of client, removing it when sending fails"""
+        try:
+            await client.run()
+        except Exception:
+            self.remove_client(client.websocket)
+
+    def publish(self, topic: str, vt_symbol: str, data: dict) -> None:
+        """Put message into queues of subscribing clients"""
+        text: str | None = None
+        binary: bytes | None = None
+        lagging: list[WebsocketClient] = []
+
+        for client in self.clients.values():
+            if not client.is_subscribed(topic, vt_symbol):
+                continue
+
+            msg: str | bytes
+            if client.binary:
+                if binary is None:
+                    binary = msgpack.packb({"topic": topic, "data": data})
+                msg = binary
+            else:
+                if text is None:
+                    text = json.dumps({"topic": topic, "data": data}, ensure_ascii=False)
+                msg = text
+
+            if not client.put(topic, vt_symbol, msg):
+                lagging.append(client)
+
+        for client in lagging:
+            self.drop_client(client)
+
+    def drop_client(self, client: WebsocketClient) -> None:
+        """Drop client lagging behind"""
+        self.remove_client(client.websocket)
+        asyncio.create_task(self.close_websocket(client.websocket))
+
+    async def close_websocket(self, websocket: Any) -> None:
+        """"""
+        try:
+            await websocket.close(code=LAGGING_CLOSE_CODE)
+        except Exception:
+            pass
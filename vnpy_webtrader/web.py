@@ -1,7 +1,6 @@
 from enum import Enum
 from typing import Any, Literal
 import asyncio
-import json
 from datetime import datetime, timedelta
 import secrets
 
@@ -33,6 +32,8 @@ from vnpy.trader.constant import (
 )
 from vnpy.trader.utility import load_json, get_file_path
 
+from .broadcast import WebsocketBroadcaster, WebsocketClient
+
 
 #Web service run configuration
 SETTING_FILENAME = "web_trader_setting.json"
@@ -43,6 +44,7 @@ USERNAME = setting["username"]              #Username
 PASSWORD = setting["password"]              #Password
 REQ_ADDRESS = setting["req_address"]        #Request service address
 SUB_ADDRESS = setting["sub_address"]        #Subscription service address
+MAX_PENDING = setting.get("max_pending", 1000)  #Queued messages before a websocket client is dropped
 
 
 SECRET_KEY = "test"                     #Data encryption key
@@ -260,8 +262,8 @@ def get_all_contracts(access: bool = Depends(get_access)) -> list:
     return [to_dict(contract) for contract in contracts]
 
 
-#Active websocket connection
-active_websockets: list[WebSocket] = []
+#Fan-out of rpc events to active websocket connections
+broadcaster: WebsocketBroadcaster = WebsocketBroadcaster(MAX_PENDING)
 
 #Global event loop
 event_loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
@@ -296,41 +298,44 @@ async def get_websocket_access(
 
 #Websocket transfers data
 @app.websocket("/ws/")
-async def websocket_endpoint(websocket: WebSocket, access: bool = Depends(get_websocket_access)) -> None:
-    """Weboskcet connection handling"""
+async def websocket_endpoint(
+    websocket: WebSocket,
+    encoding: str = Query("json"),
+    access: bool = Depends(get_websocket_access)
+) -> None:
+    """
+    Weboskcet connection handling
+
+    All topics and symbols are pushed by default, client can narrow them by sending
+    {"action": "subscribe", "topics": [...], "vt_symbols": [...]}.
+    Connect with encoding=msgpack for binary messages.
+    """
     await websocket.accept()
-    active_websockets.append(websocket)
+    client: WebsocketClient = broadcaster.add_client(websocket, encoding == "msgpack")
 
     try:
         while True:
-            await websocket.receive_text()
+            text: str = await websocket.receive_text()
+            client.process_request(text)
     except WebSocketDisconnect:
-        active_websockets.remove(websocket)
-
-
-async def websocket_broadcast(msg: str) -> None:
-    """Websocket data broadcast"""
-    for websocket in active_websockets:
-        await websocket.send_text(msg)
+        broadcaster.remove_client(websocket)
 
 
 def rpc_callback(topic: str, data: Any) -> None:
     """Rpc callback function"""
-    if not active_websockets:
+    if not broadcaster.clients:
         return
 
-    message_data: dict = {
-        "topic": topic,
-        "data": to_dict(data)
-    }
-    msg: str = json.dumps(message_data, ensure_ascii=False)
-    asyncio.run_coroutine_threadsafe(websocket_broadcast(msg), event_loop)
+    vt_symbol: str = getattr(data, "vt_symbol", "")
+    event_loop.call_soon_threadsafe(broadcaster.publish, topic, vt_symbol, to_dict(data))
 
 
 @app.on_event("startup")
 def startup_event() -> None:
     """Application start event"""
-    global rpc_client
+    global rpc_client, event_loop
+    event_loop = asyncio.get_event_loop()
+
     rpc_client = RpcClient()
     rpc_client.callback = rpc_callback
     rpc_client.subscribe_topic("")